@@ -205,11 +205,17 @@ def _get_firestore_service():
     from ...dependencies import get_firestore_service as get_main_firestore_service
     return get_main_firestore_service()
 
+def _get_review_persistence():
+    """Get the review dual-write layer from main dependencies"""
+    from ...dependencies import get_review_persistence
+    return get_review_persistence()
+
 async def get_submission_service(
     review_service: ReviewService = Depends(get_review_service),
     competency_service: CompetencyService = Depends(get_competency_service),
     cosmos_service: CosmosDBService = Depends(get_cosmos_service),
-    firestore_service=Depends(_get_firestore_service)
+    firestore_service=Depends(_get_firestore_service),
+    review_persistence=Depends(_get_review_persistence)
 ) -> SubmissionService:
     """Get submission service instance with proper dependency injection"""
     return SubmissionService(
@@ -217,6 +223,7 @@ async def get_submission_service(
         competency_service=competency_service,
         cosmos_db=cosmos_service,
         firestore_service=firestore_service,
+        review_persistence=review_persistence,
     )
 
 async def get_assessment_service(
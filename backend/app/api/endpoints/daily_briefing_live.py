@@ -1,5 +1,6 @@
 # backend/app/api/endpoints/daily_briefing_live.py
-# Simple fix - keep original audio format, just make sends non-blocking
+# Client sends go through the shared LiveRelay writer (ordered, non-blocking
+# for the Gemini receive loop) — original audio format unchanged.
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, HTTPException
 import asyncio
@@ -17,6 +18,7 @@ from ...core.config import settings
 from ...services.daily_activities import DailyActivitiesService, DailyPlan
 from ...services.bigquery_analytics import BigQueryAnalyticsService
 from ...db.cosmos_db import CosmosDBService
+from ...services.live_relay import LiveRelay
 
 # Enhanced logging configuration - CLEANED UP VERSION
 logging.basicConfig(
@@ -371,9 +373,11 @@ async def daily_briefing_session(websocket: WebSocket, student_id: Optional[int]
             gemini_logger.info(f"🎯 Using personalization source: {daily_plan.personalization_source}")
             gemini_logger.info(f"📊 System instruction length: {len(system_instruction)} chars")
             
-            # Communication queues - back to simple approach
-            text_queue = asyncio.Queue()
-            audio_queue = asyncio.Queue()
+            # Shared relay core: bounded queues toward Gemini and one ordered
+            # writer toward the client (replaces fire-and-forget send tasks).
+            relay = LiveRelay(websocket, "daily_briefing")
+            text_queue = relay.queue("text")
+            audio_queue = relay.queue("audio")
             
             # Handle messages from client
             # Clean up the audio handling functions with less verbose logging
@@ -381,6 +385,7 @@ async def daily_briefing_session(websocket: WebSocket, student_id: Optional[int]
                 while True:
                     try:
                         message = await asyncio.wait_for(websocket.receive(), timeout=5.0)
+                        relay.record_inbound(len(message.get("bytes") or message.get("text") or ""))
                         
                         if message.get("type") == "websocket.disconnect":
                             logger.info("🔌 Client disconnected")
@@ -493,7 +498,8 @@ async def daily_briefing_session(websocket: WebSocket, student_id: Optional[int]
                     except Exception as e:
                         gemini_logger.error(f"❌ Gemini send error: {str(e)}")
             
-            # Receive responses from Gemini - MAKE NON-BLOCKING
+            # Receive responses from Gemini — client sends are queued on the
+            # relay writer, so a slow client never stalls this loop unboundedly
             async def receive_from_gemini():
                 audio_receive_count = 0
                 while True:
@@ -511,12 +517,11 @@ async def daily_briefing_session(websocket: WebSocket, student_id: Optional[int]
                                             if hasattr(part, 'text') and part.text:
                                                 gemini_logger.info(f"📥 Received text from Gemini: {part.text[:100]}...")
                                                 
-                                                # Send without awaiting to prevent blocking
-                                                asyncio.create_task(websocket.send_json({
+                                                await relay.send_json({
                                                     "type": "ai_text",
                                                     "content": part.text,
                                                     "personalization_source": daily_plan.personalization_source
-                                                }))
+                                                })
                                             
                                             # Handle inline_data (audio) parts - MUCH LESS VERBOSE
                                             elif hasattr(part, 'inline_data') and part.inline_data:
@@ -526,39 +531,35 @@ async def daily_briefing_session(websocket: WebSocket, student_id: Optional[int]
                                                     if audio_receive_count % 20 == 0:
                                                         gemini_logger.debug(f"📥 Received audio batch #{audio_receive_count} from Gemini: {len(part.inline_data.data)} bytes")
                                                     
-                                                    audio_b64 = base64.b64encode(part.inline_data.data).decode('utf-8')
-                                                    
-                                                    # Send without awaiting to prevent blocking
-                                                    asyncio.create_task(websocket.send_json({
-                                                        "type": "ai_audio",
-                                                        "format": "raw-pcm",
-                                                        "sampleRate": RECEIVE_SAMPLE_RATE,
-                                                        "bitsPerSample": 16,
-                                                        "channels": CHANNELS,
-                                                        "data": audio_b64
-                                                    }))
+                                                    # Base64-encoded by the relay writer
+                                                    await relay.send_audio(
+                                                        part.inline_data.data,
+                                                        type="ai_audio",
+                                                        format="raw-pcm",
+                                                        sampleRate=RECEIVE_SAMPLE_RATE,
+                                                        bitsPerSample=16,
+                                                        channels=CHANNELS,
+                                                    )
                                 
                                 # Handle input transcription
                                 if hasattr(response.server_content, 'input_transcription') and response.server_content.input_transcription:
                                     if hasattr(response.server_content.input_transcription, 'text') and response.server_content.input_transcription.text:
                                         logger.info(f"🎤 User transcription: {response.server_content.input_transcription.text}")
                                         
-                                        # Send without awaiting to prevent blocking
-                                        asyncio.create_task(websocket.send_json({
+                                        await relay.send_json({
                                             "type": "user_transcription",
                                             "content": response.server_content.input_transcription.text
-                                        }))
+                                        })
                                 
                                 # Handle output transcription  
                                 if hasattr(response.server_content, 'output_transcription') and response.server_content.output_transcription:
                                     if hasattr(response.server_content.output_transcription, 'text') and response.server_content.output_transcription.text:
                                         logger.info(f"🎯 AI transcription: {response.server_content.output_transcription.text}")
                                         
-                                        # Send without awaiting to prevent blocking
-                                        asyncio.create_task(websocket.send_json({
+                                        await relay.send_json({
                                             "type": "ai_transcription", 
                                             "content": response.server_content.output_transcription.text
-                                        }))
+                                        })
                                         
                     except asyncio.CancelledError:
                         break
@@ -566,26 +567,21 @@ async def daily_briefing_session(websocket: WebSocket, student_id: Optional[int]
                         gemini_logger.error(f"❌ Gemini receive error: {str(e)}")
                         break
             
-            # Start all communication tasks
-            tasks = [
-                asyncio.create_task(handle_client_messages()),
-                asyncio.create_task(send_to_gemini()),
-                asyncio.create_task(receive_from_gemini())
-            ]
-            
-            # Send welcome message to start conversation
+            # Send welcome message to start conversation (the receive worker
+            # below picks up the reply)
             gemini_logger.info("🚀 Sending welcome message to Gemini...")
             gemini_logger.debug(f"🚀 Welcome message content: {welcome_message}")
             await session.send(input=welcome_message, end_of_turn=True)
             gemini_logger.info("✅ Welcome message sent")
             
-            # Wait for any task to complete (usually means session ended)
-            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
-            
-            # Clean up remaining tasks
-            for task in pending:
-                task.cancel()
-            await asyncio.gather(*pending, return_exceptions=True)
+            # Run until any worker completes (usually means session ended);
+            # the relay cancels the rest and flushes the writer on exit.
+            async with relay:
+                await relay.run({
+                    "client": handle_client_messages(),
+                    "send_to_gemini": send_to_gemini(),
+                    "receive_from_gemini": receive_from_gemini(),
+                })
     
     except Exception as e:
         logger.error(f"❌ Daily briefing session error: {str(e)}", exc_info=True)
@@ -22,6 +22,7 @@ from ...core.config import settings
 from ...core.middleware import get_user_context, require_auth  # ADD THIS LINE
 from ...services.user_profiles import user_profiles_service  # FIXED: Import the service instance
 from ...models.user_profiles import ActivityLog  # FIXED: Import ActivityLog model
+from ...services.live_relay import LiveRelay
 
 
 # Set up logging
@@ -182,16 +183,16 @@ async def websocket_bidirectional_endpoint(websocket: WebSocket,
     except Exception as e:
         logger.warning(f"Failed to log session start activity: {str(e)}")
     
-    # Create task groups and queues
-    audio_in_queue = asyncio.Queue()  # Queue for incoming audio from Gemini
-    text_queue = asyncio.Queue()      # Queue for text messages
-    media_queue = asyncio.Queue()     # Queue for media (screen/camera)
-    client_audio_queue = asyncio.Queue()  # Queue for audio from client
+    # Shared relay core: single ordered writer to the client, bounded queues
+    # toward Gemini, supervised workers and per-session metrics.
+    relay = LiveRelay(websocket, "gemini_bidirectional")
+    text_queue = relay.queue("text")      # Queue for text messages
+    media_queue = relay.queue("media")    # Queue for media (screen/camera)
+    client_audio_queue = relay.queue("audio")  # Queue for audio from client
     
     logger.info(f"Queues initialized")
     
     session = None
-    tasks = []
     
     # Flag to track if we've already handled a disconnect
     disconnect_handled = False
@@ -274,6 +275,7 @@ async def websocket_bidirectional_endpoint(websocket: WebSocket,
                             # Use a timeout to avoid blocking forever if client disconnects
                             logger.info("Waiting to receive message from client...")
                             message = await asyncio.wait_for(websocket.receive(), timeout=5.0)
+                            relay.record_inbound(len(message.get("bytes") or message.get("text") or ""))
                             
                             # Add debug logging to see exactly what message is received
                             message_type = message.get("type", "unknown")
@@ -468,23 +470,21 @@ async def websocket_bidirectional_endpoint(websocket: WebSocket,
                             turn = session.receive()
                             async for response in turn:
                                 if hasattr(response, "data") and response.data:
-                                    # Handle audio data from Gemini
-                                    audio_b64 = base64.b64encode(response.data).decode('utf-8')
+                                    # Handle audio data from Gemini (base64-encoded by the relay writer)
+                                    await relay.send_audio(
+                                        response.data,
+                                        type="audio",
+                                        format="raw-pcm",
+                                        sampleRate=RECEIVE_SAMPLE_RATE,
+                                        bitsPerSample=16,
+                                        channels=CHANNELS,
+                                    )
                                     
-                                    await websocket.send_json({
-                                        "type": "audio",
-                                        "format": "raw-pcm",
-                                        "sampleRate": RECEIVE_SAMPLE_RATE,
-                                        "bitsPerSample": 16,
-                                        "channels": CHANNELS,
-                                        "data": audio_b64,
-                                    })
-                                    
-                                    logger.info(f"Sent {len(response.data)} bytes of audio as base64")
+                                    logger.info(f"Queued {len(response.data)} bytes of audio for the client")
                                 
                                 if hasattr(response, "text") and response.text:
                                     # Handle text response from Gemini
-                                    await websocket.send_json({
+                                    await relay.send_json({
                                         "type": "text",
                                         "content": response.text
                                     })
@@ -492,7 +492,7 @@ async def websocket_bidirectional_endpoint(websocket: WebSocket,
                                     logger.info(f"Sent text response: {response.text[:50]}...")
                                  # New: Handle input transcriptions
                                 if hasattr(response, "input_transcription") and response.input_transcription:
-                                    await websocket.send_json({
+                                    await relay.send_json({
                                         "type": "input_transcription",
                                         "content": response.input_transcription
                                     })
@@ -501,7 +501,7 @@ async def websocket_bidirectional_endpoint(websocket: WebSocket,
                                 
                                 # New: Handle output transcriptions
                                 if hasattr(response, "output_transcription") and response.output_transcription:
-                                    await websocket.send_json({
+                                    await relay.send_json({
                                         "type": "output_transcription",
                                         "content": response.output_transcription
                                     })
@@ -520,7 +520,7 @@ async def websocket_bidirectional_endpoint(websocket: WebSocket,
                                 
                                 # Notify client about the error
                                 try:
-                                    await websocket.send_json({
+                                    await relay.send_json({
                                         "type": "error",
                                         "content": "The AI service connection timed out. Please refresh to start a new session."
                                     })
@@ -533,53 +533,19 @@ async def websocket_bidirectional_endpoint(websocket: WebSocket,
                             # For other types of errors, just wait a bit and continue
                             await asyncio.sleep(0.5)
                 
-                # Start all tasks with names
-                logger.info("Starting background tasks for WebSocket communication")
-                tasks = [
-                    asyncio.create_task(receive_from_client(), name="receive_from_client"),
-                    asyncio.create_task(send_text_to_gemini(), name="send_text_to_gemini"),
-                    asyncio.create_task(send_audio_to_gemini(), name="send_audio_to_gemini"),
-                    asyncio.create_task(send_media_to_gemini(), name="send_media_to_gemini"),
-                    asyncio.create_task(receive_from_gemini(), name="receive_from_gemini"),
-                ]
-                logger.info(f"Started {len(tasks)} background tasks")
-                
-                # Wait for the first task to complete (usually when client disconnects)
-                logger.info("Waiting for any task to complete...")
-                done, pending = await asyncio.wait(
-                    tasks, 
-                    return_when=asyncio.FIRST_COMPLETED
-                )
-                
-                for completed_task in done:
-                    task_name = completed_task.get_name()
-                    if completed_task.exception():
-                        logger.error(f"Task {task_name} completed with exception: {completed_task.exception()}")
-                    else:
-                        logger.info(f"Task {task_name} completed successfully")
+                # Run all workers; the first to finish (usually the client
+                # disconnecting) ends the session and the relay cancels the rest.
+                logger.info("Starting relay workers for WebSocket communication")
+                await relay.run({
+                    "receive_from_client": receive_from_client(),
+                    "send_text_to_gemini": send_text_to_gemini(),
+                    "send_audio_to_gemini": send_audio_to_gemini(),
+                    "send_media_to_gemini": send_media_to_gemini(),
+                    "receive_from_gemini": receive_from_gemini(),
+                })
                 
                 # Set the disconnect flag to avoid duplicate handling
                 disconnect_handled = True
-                
-                # Cancel remaining tasks gracefully
-                logger.info(f"Cancelling {len(pending)} remaining tasks")
-                for task in pending:
-                    task_name = task.get_name()
-                    logger.info(f"Cancelling task: {task_name}")
-                    task.cancel()
-                
-                # Wait for tasks to be cancelled with a timeout
-                try:
-                    logger.info("Waiting for tasks to complete cancellation...")
-                    await asyncio.wait_for(
-                        asyncio.gather(*pending, return_exceptions=True),
-                        timeout=2.0
-                    )
-                    logger.info("All tasks cancelled successfully")
-                except asyncio.TimeoutError:
-                    logger.warning("Some tasks took too long to cancel and timed out")
-                except Exception as e:
-                    logger.error(f"Error during task cancellation: {str(e)}")
         
         except Exception as gemini_connect_error:
             logger.error(f"Error connecting to Gemini API: {str(gemini_connect_error)}")
@@ -591,24 +557,14 @@ async def websocket_bidirectional_endpoint(websocket: WebSocket,
         if not disconnect_handled:
             logger.info("WebSocket disconnected via exception")
             disconnect_handled = True
-            # Cancel any running tasks
-            for task in tasks:
-                task_name = task.get_name() if hasattr(task, 'get_name') else str(task)
-                logger.info(f"Cancelling task after disconnect: {task_name}")
-                if not task.done():
-                    task.cancel()
     except Exception as e:
         logger.error(f"WebSocket error: {str(e)}")
         logger.error(f"WebSocket error traceback: {traceback.format_exc()}")
-        if not disconnect_handled:
-            disconnect_handled = True
-            # Cancel any running tasks
-            for task in tasks:
-                task_name = task.get_name() if hasattr(task, 'get_name') else str(task)
-                logger.info(f"Cancelling task after error: {task_name}")
-                if not task.done():
-                    task.cancel()
+        disconnect_handled = True
     finally:
+        # Workers are already torn down by relay.run(); flush and stop the writer.
+        await relay.aclose()
+
         # ADD: Log session completion and duration
         session_duration = asyncio.get_event_loop().time() - session_start_time
         try:
@@ -639,12 +595,6 @@ async def websocket_bidirectional_endpoint(websocket: WebSocket,
         except Exception as e:
             logger.error(f"Error during disconnection: {str(e)}")
             
-        # Final status report on any remaining tasks
-        for task in tasks:
-            task_name = task.get_name() if hasattr(task, 'get_name') else str(task)
-            status = "Done" if task.done() else "Not Done"
-            logger.info(f"Final task status - {task_name}: {status}")
-            
         logger.info("Cleaned up resources")
 
 
@@ -1,7 +1,6 @@
 # backend/app/api/endpoints/lumina_tutor.py
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 import asyncio
-import base64
 import json
 import logging
 import os
@@ -16,6 +15,7 @@ from google.genai import types
 from google.genai.types import LiveConnectConfig, SpeechConfig, VoiceConfig, PrebuiltVoiceConfig, Content
 
 from ...core.config import settings
+from ...services.live_relay import LiveRelay
 from ...services.session_ledger import SessionLedger, classify_cue
 
 # Enhanced logging configuration
@@ -763,6 +763,7 @@ async def lumina_tutor_session(websocket: WebSocket):
     ledger.write("connection-accepted", client=str(websocket.client))
 
     gemini_session = None
+    relay: Optional[LiveRelay] = None
 
     # Metrics tracking
     counters = SessionCounters()
@@ -948,9 +949,12 @@ async def lumina_tutor_session(websocket: WebSocket):
         # The client WebSocket, queues, and the latest resumption handle all
         # outlive any single Gemini connection so a transparent resume keeps the
         # student's session unbroken.
-        text_queue: asyncio.Queue = asyncio.Queue()
-        audio_queue: asyncio.Queue = asyncio.Queue()
-        ws_send_queue: asyncio.Queue[dict] = asyncio.Queue()
+        # The relay's writer is the ONE path to the client socket (ordered,
+        # bounded); its queues apply backpressure instead of growing unbounded.
+        relay = LiveRelay(websocket, "lumina_tutor")
+        relay.start()
+        text_queue: asyncio.Queue = relay.queue("text")
+        audio_queue: asyncio.Queue = relay.queue("audio")
         # Set when the client disconnects or a fatal error makes resuming moot —
         # breaks the reconnection loop below.
         stop_event = asyncio.Event()
@@ -1018,7 +1022,7 @@ async def lumina_tutor_session(websocket: WebSocket):
         primitive_state.reset(primitive_data)
 
         # Send session ready message via the send queue
-        await ws_send_queue.put({
+        await relay.send_json({
             "type": "session_ready",
             "message": "Lumina AI is ready to help you learn!"
         })
@@ -1074,23 +1078,6 @@ async def lumina_tutor_session(websocket: WebSocket):
             await text_queue.put(TextQueueEntry(text=greeting, end_of_turn=True))
             logger.info("Initial greeting prompt queued")
 
-        # ------------------------------------------------------------------
-        # Serialized WebSocket sender — all outbound messages go through here
-        # Fixes race condition from asyncio.create_task(websocket.send_json())
-        # ------------------------------------------------------------------
-        async def ws_sender():
-            """Send messages to the client WebSocket serially."""
-            try:
-                while True:
-                    message = await ws_send_queue.get()
-                    await websocket.send_json(message)
-            except WebSocketDisconnect:
-                logger.info("WebSocket disconnected during send")
-            except asyncio.CancelledError:
-                logger.info("WebSocket sender cancelled")
-            except Exception as e:
-                logger.error(f"Error in ws_sender: {e}")
-
         async def handle_client_messages():
             """Client protocol — the minimal set that drives Gemini Live.
 
@@ -1108,6 +1095,7 @@ async def lumina_tutor_session(websocket: WebSocket):
                 while True:
                     message = await websocket.receive_json()
                     message_type = message.get("type")
+                    relay.record_inbound()
 
                     # Track interactions (audio frames are transport, not turns)
                     counters.observe(message_type)
@@ -1185,7 +1173,7 @@ async def lumina_tutor_session(websocket: WebSocket):
 
                         # Confirm switch to frontend immediately (UI state
                         # never waits on the settle window)
-                        await ws_send_queue.put({
+                        await relay.send_json({
                             "type": "primitive_switched",
                             "primitive_type": primitive_type,
                             "instance_id": instance_id,
@@ -1464,7 +1452,7 @@ async def lumina_tutor_session(websocket: WebSocket):
                 logger.error(f"Error sending audio to Gemini: {e}")
 
         async def handle_gemini_responses(session) -> str:
-            """Handle responses from Gemini and send to client via ws_send_queue.
+            """Handle responses from Gemini and send to client via the relay writer.
 
             Returns a signal for the reconnection loop:
               - 'reconnect': Gemini sent GoAway, or the connection aborted while
@@ -1502,7 +1490,7 @@ async def lumina_tutor_session(websocket: WebSocket):
                     audio_frames=audio_frames, audio_bytes=audio_bytes,
                 )
                 floor.release()
-                await ws_send_queue.put({"type": "ai_turn_end"})
+                await relay.send_json({"type": "ai_turn_end"})
 
             try:
                 while True:
@@ -1540,7 +1528,7 @@ async def lumina_tutor_session(websocket: WebSocket):
                             gemini_logger.debug("Stored session resumption handle")
                             # Forward to the client too, so that if the whole
                             # client socket drops, its reconnect can resume warm.
-                            await ws_send_queue.put({
+                            await relay.send_json({
                                 "type": "resumption_handle",
                                 "handle": sru.new_handle,
                             })
@@ -1579,7 +1567,7 @@ async def lumina_tutor_session(websocket: WebSocket):
                                 # The tutor abandoned this turn — the floor
                                 # is free NOW, not at turn_complete.
                                 floor.release()
-                                await ws_send_queue.put({"type": "ai_interrupted"})
+                                await relay.send_json({"type": "ai_interrupted"})
 
                             # Handle model turn (AI speaking)
                             model_turn = getattr(sc, 'model_turn', None)
@@ -1596,7 +1584,7 @@ async def lumina_tutor_session(websocket: WebSocket):
                                     if clean_text and not fault_muted():
                                         logger.info(f"AI text response: {clean_text}")
 
-                                        await ws_send_queue.put({
+                                        await relay.send_json({
                                             "type": "ai_response",
                                             "content": clean_text
                                         })
@@ -1608,17 +1596,17 @@ async def lumina_tutor_session(websocket: WebSocket):
                                         audio_frames += 1
                                         audio_bytes += len(audio_data)
                                         if not fault_muted():
-                                            audio_b64 = base64.b64encode(audio_data).decode()
                                             logger.debug("Sending audio chunk to client (%d bytes)", len(audio_data))
 
-                                            await ws_send_queue.put({
-                                                "type": "ai_audio",
-                                                "format": "raw-pcm",
-                                                "sampleRate": RECEIVE_SAMPLE_RATE,
-                                                "bitsPerSample": 16,
-                                                "channels": CHANNELS,
-                                                "data": audio_b64
-                                            })
+                                            # Base64-encoded by the relay writer
+                                            await relay.send_audio(
+                                                audio_data,
+                                                type="ai_audio",
+                                                format="raw-pcm",
+                                                sampleRate=RECEIVE_SAMPLE_RATE,
+                                                bitsPerSample=16,
+                                                channels=CHANNELS,
+                                            )
                                     else:
                                         gemini_logger.warning(f"inline_data present but no data: {part.inline_data}")
 
@@ -1628,7 +1616,7 @@ async def lumina_tutor_session(websocket: WebSocket):
                                 logger.info(f"User transcription: {user_text}")
                                 ledger.write("user-transcript", turn=turn_count, text=user_text)
 
-                                await ws_send_queue.put({
+                                await relay.send_json({
                                     "type": "user_transcription",
                                     "content": user_text
                                 })
@@ -1644,7 +1632,7 @@ async def lumina_tutor_session(websocket: WebSocket):
                                 ledger.write("ai-transcript", turn=turn_count, text=ai_text)
 
                                 if not fault_muted():
-                                    await ws_send_queue.put({
+                                    await relay.send_json({
                                         "type": "ai_transcription",
                                         "content": ai_text
                                     })
@@ -1660,7 +1648,7 @@ async def lumina_tutor_session(websocket: WebSocket):
                             # the floor or every queued cue waits out the
                             # watchdog on a connection that no longer exists.
                             floor.release()
-                            await ws_send_queue.put({
+                            await relay.send_json({
                                 "type": "session_resuming",
                                 "message": "Reconnecting to keep your tutor live…",
                             })
@@ -1697,7 +1685,7 @@ async def lumina_tutor_session(websocket: WebSocket):
                     # student heard the tutor cut off mid-sentence; the
                     # resume must finish the thought, not re-greet.
                     interrupt_state["mid_turn"] = turn_had_content
-                    await ws_send_queue.put({
+                    await relay.send_json({
                         "type": "session_resuming",
                         "message": "Reconnecting to keep your tutor live…",
                     })
@@ -1711,7 +1699,6 @@ async def lumina_tutor_session(websocket: WebSocket):
         # ------------------------------------------------------------------
         client_tasks = [
             asyncio.create_task(handle_client_messages()),
-            asyncio.create_task(ws_sender()),
         ]
         logger.info(f"Client-facing tasks started (mode={session_mode})")
 
@@ -1743,7 +1730,7 @@ async def lumina_tutor_session(websocket: WebSocket):
                         )
 
                         if resuming:
-                            await ws_send_queue.put({
+                            await relay.send_json({
                                 "type": "session_resumed",
                                 "message": "Tutor reconnected — right where you left off.",
                             })
@@ -1854,6 +1841,9 @@ async def lumina_tutor_session(websocket: WebSocket):
                 if not t.done():
                     t.cancel()
             await asyncio.gather(*client_tasks, return_exceptions=True)
+            # Flush queued frames and stop the writer before the direct
+            # session_ended send below — the socket keeps a single writer.
+            await relay.aclose()
 
         # Notify the client the tutor session has truly ended (we exhausted
         # resumes or there was nothing to resume). Skipped if the client itself
@@ -1890,6 +1880,8 @@ async def lumina_tutor_session(websocket: WebSocket):
         except:
             pass
     finally:
+        if relay is not None:
+            await relay.aclose()
         if gemini_session:
             try:
                 await gemini_session.close()
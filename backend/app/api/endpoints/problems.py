@@ -15,7 +15,7 @@ from ...services.user_profiles import user_profiles_service
 from ...services.engagement_service import engagement_service
 from ...core.decorators import log_engagement_activity
 from ...models.user_profiles import ActivityLog
-from ...dependencies import get_problem_service, get_competency_service, get_review_service, get_problem_recommender, get_cosmos_db, get_problem_optimizer, get_curriculum_mapping_service, get_firestore_service
+from ...dependencies import get_problem_service, get_competency_service, get_review_service, get_problem_recommender, get_cosmos_db, get_problem_optimizer, get_curriculum_mapping_service, get_firestore_service, get_misconception_pipeline, get_review_persistence
 from ...services.problems import ProblemService
 from ...services.competency import CompetencyService
 from ...services.review import ReviewService
@@ -479,6 +479,8 @@ async def submit_problem(
             user_profiles_service,  # Enable misconception resolution
             curriculum_mapping_service,  # Enable curriculum mapping for Lumina primitives
             firestore_service=get_firestore_service(),  # Enable Firestore dual-write
+            misconception_pipeline=get_misconception_pipeline(),  # Deferred misconception analysis
+            review_persistence=get_review_persistence(),  # Concurrent dual-write + outbox
         )
 
         # The endpoint is now ONLY responsible for the submission logic
@@ -547,6 +549,8 @@ async def submit_problem_batch(
             user_profiles_service,  # Enable misconception resolution
             curriculum_mapping_service,  # Enable curriculum mapping for Lumina primitives
             firestore_service=get_firestore_service(),  # Enable Firestore dual-write
+            misconception_pipeline=get_misconception_pipeline(),  # Deferred misconception analysis
+            review_persistence=get_review_persistence(),  # Concurrent dual-write + outbox
         )
 
         import uuid
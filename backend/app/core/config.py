@@ -103,7 +103,97 @@ class Settings(BaseSettings):
     # Cache Configuration
     ANALYTICS_CACHE_TTL_MINUTES: int = Field(default=15, env="ANALYTICS_CACHE_TTL_MINUTES")
     ENABLE_QUERY_CACHING: bool = Field(default=True, env="ENABLE_QUERY_CACHING")
-    
+
+    # LLM response cache (services/llm_response_cache.py). Call sites opt in
+    # per request with cache=True; this flag is the global kill switch. An
+    # empty path puts the SQLite file under the system temp dir.
+    LLM_RESPONSE_CACHE_ENABLED: bool = Field(default=True, env="LLM_RESPONSE_CACHE_ENABLED")
+    LLM_RESPONSE_CACHE_PATH: str = Field(default="", env="LLM_RESPONSE_CACHE_PATH")
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = Field(default=7 * 24 * 3600, env="LLM_RESPONSE_CACHE_TTL_SECONDS")
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=5000, env="LLM_RESPONSE_CACHE_MAX_ENTRIES")
+    LLM_RESPONSE_CACHE_MAX_BYTES: int = Field(default=256 * 1024 * 1024, env="LLM_RESPONSE_CACHE_MAX_BYTES")
+
+    # Outbound model call governor (services/model_governor.py). Concurrency is
+    # per process; BATCH lanes (ETL, preloader) may hold at most the batch cap
+    # so live requests always have slots. Rates apply per model name.
+    MODEL_GOVERNOR_MAX_CONCURRENCY: int = Field(default=16, env="MODEL_GOVERNOR_MAX_CONCURRENCY")
+    MODEL_GOVERNOR_BATCH_MAX_CONCURRENCY: int = Field(default=6, env="MODEL_GOVERNOR_BATCH_MAX_CONCURRENCY")
+    MODEL_GOVERNOR_REQUESTS_PER_MINUTE: float = Field(default=600, env="MODEL_GOVERNOR_REQUESTS_PER_MINUTE")
+    MODEL_GOVERNOR_TOKENS_PER_MINUTE: float = Field(default=1_000_000, env="MODEL_GOVERNOR_TOKENS_PER_MINUTE")
+    MODEL_GOVERNOR_MAX_RETRIES: int = Field(default=4, env="MODEL_GOVERNOR_MAX_RETRIES")
+    # Fraction of each rate bucket BATCH calls may not spend (kept for INTERACTIVE)
+    MODEL_GOVERNOR_INTERACTIVE_RESERVE: float = Field(default=0.2, env="MODEL_GOVERNOR_INTERACTIVE_RESERVE")
+
+    # In-process background jobs (services/background_jobs.py). The pass-rate
+    # flush is debounced so a burst of evals for one student is one write.
+    BACKGROUND_JOBS_MAX_WORKERS: int = Field(default=4, env="BACKGROUND_JOBS_MAX_WORKERS")
+    GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S: float = Field(default=2.0, env="GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S")
+    # While a student's flushes keep failing, a full-scan reconcile runs this often.
+    GLOBAL_PASS_RATE_RECONCILE_INTERVAL_S: float = Field(default=600.0, env="GLOBAL_PASS_RATE_RECONCILE_INTERVAL_S")
+
+    # Deferred misconception analysis (services/misconception_pipeline.py).
+    # Wrong answers are queued and diagnosed per student/subskill after the
+    # debounce; at most MAX_BATCH queued attempts are considered per pass and
+    # startup resumes up to RECOVER_LIMIT pending student/subskill batches.
+    MISCONCEPTION_PIPELINE_DEBOUNCE_S: float = Field(default=5.0, env="MISCONCEPTION_PIPELINE_DEBOUNCE_S")
+    MISCONCEPTION_PIPELINE_MAX_BATCH: int = Field(default=20, env="MISCONCEPTION_PIPELINE_MAX_BATCH")
+    MISCONCEPTION_PIPELINE_RECOVER_LIMIT: int = Field(default=500, env="MISCONCEPTION_PIPELINE_RECOVER_LIMIT")
+
+    # Review dual-write outbox (services/review_persistence.py): failed Cosmos
+    # or Firestore review writes are replayed every RETRY_INTERVAL_S, backing
+    # off exponentially up to MAX_BACKOFF_S; after MAX_ATTEMPTS they move to
+    # the outbox's dead/ folder.
+    REVIEW_OUTBOX_RETRY_INTERVAL_S: float = Field(default=30.0, env="REVIEW_OUTBOX_RETRY_INTERVAL_S")
+    REVIEW_OUTBOX_MAX_BACKOFF_S: float = Field(default=900.0, env="REVIEW_OUTBOX_MAX_BACKOFF_S")
+    REVIEW_OUTBOX_MAX_ATTEMPTS: int = Field(default=8, env="REVIEW_OUTBOX_MAX_ATTEMPTS")
+
+    # Engagement ledger (services/engagement_ledger.py): a user's activities
+    # are written to their profile in one etag-guarded write per FLUSH_DEBOUNCE_S
+    # burst; cached XP/streak state is re-read after SNAPSHOT_TTL_S when idle.
+    ENGAGEMENT_FLUSH_DEBOUNCE_S: float = Field(default=2.0, env="ENGAGEMENT_FLUSH_DEBOUNCE_S")
+    ENGAGEMENT_SNAPSHOT_TTL_S: float = Field(default=300.0, env="ENGAGEMENT_SNAPSHOT_TTL_S")
+    ENGAGEMENT_MAX_CONFLICT_RETRIES: int = Field(default=8, env="ENGAGEMENT_MAX_CONFLICT_RETRIES")
+
+    # Parent dashboard (services/parent_portal.py): sections are fetched
+    # concurrently, each cut off after SECTION_TIMEOUT_S (the dashboard then
+    # lists it in incomplete_sections); complete dashboards are reused for
+    # TTL_S per parent/student, and verified parent→student links for
+    # ACCESS_CACHE_TTL_S.
+    PARENT_DASHBOARD_SECTION_TIMEOUT_S: float = Field(default=8.0, env="PARENT_DASHBOARD_SECTION_TIMEOUT_S")
+    PARENT_DASHBOARD_TTL_S: float = Field(default=60.0, env="PARENT_DASHBOARD_TTL_S")
+    PARENT_ACCESS_CACHE_TTL_S: float = Field(default=300.0, env="PARENT_ACCESS_CACHE_TTL_S")
+
+    # Assessment scoring: max problems evaluated concurrently per submission
+    # (each may call the review model through SubmissionService).
+    ASSESSMENT_SCORING_CONCURRENCY: int = Field(default=8, env="ASSESSMENT_SCORING_CONCURRENCY")
+
+    # Overnight pre-materialization of session plans + forecasts
+    # (scripts/prematerialize_daily_plans.py): students built at once, and how
+    # recently a student must have been active to be included.
+    PREMATERIALIZE_CONCURRENCY: int = Field(default=8, env="PREMATERIALIZE_CONCURRENCY")
+    PREMATERIALIZE_ACTIVE_DAYS: int = Field(default=14, env="PREMATERIALIZE_ACTIVE_DAYS")
+
+    # Session ledger (services/session_ledger.py): records are serialized and
+    # written by one background thread, flushed every N records or T seconds;
+    # a file rotates past ROTATE_MB, and rotated/closed files are gzipped.
+    SESSION_LEDGER_FLUSH_RECORDS: int = Field(default=64, env="SESSION_LEDGER_FLUSH_RECORDS")
+    SESSION_LEDGER_FLUSH_INTERVAL_S: float = Field(default=0.5, env="SESSION_LEDGER_FLUSH_INTERVAL_S")
+    SESSION_LEDGER_ROTATE_MB: int = Field(default=16, env="SESSION_LEDGER_ROTATE_MB")
+    SESSION_LEDGER_COMPRESS: bool = Field(default=True, env="SESSION_LEDGER_COMPRESS")
+    SESSION_LEDGER_QUEUE_SIZE: int = Field(default=10000, env="SESSION_LEDGER_QUEUE_SIZE")
+
+    # Startup warm-up (services/warmup.py): caches preloaded concurrently
+    # before the instance reports ready on /health/ready. BLOCK_STARTUP holds
+    # the server's startup until warm; otherwise it warms in the background.
+    # retrieval_embeddings (Gemini embedding calls per instance) is opt-in.
+    WARMUP_ENABLED: bool = Field(default=True, env="WARMUP_ENABLED")
+    WARMUP_BLOCK_STARTUP: bool = Field(default=True, env="WARMUP_BLOCK_STARTUP")
+    WARMUP_TIMEOUT_S: float = Field(default=60.0, env="WARMUP_TIMEOUT_S")
+    WARMUP_COMPONENTS: str = Field(
+        default="curriculum,lineage,subskill_locations,learning_graphs,pulse_engine",
+        env="WARMUP_COMPONENTS",
+    )
+
     # ETL Configuration
     ETL_BATCH_SIZE: int = Field(default=1000, env="ETL_BATCH_SIZE")
     ETL_MAX_RETRIES: int = Field(default=3, env="ETL_MAX_RETRIES")
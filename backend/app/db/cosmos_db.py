@@ -4,6 +4,7 @@ from azure.cosmos import CosmosClient, PartitionKey
 from azure.cosmos.exceptions import CosmosResourceExistsError, CosmosResourceNotFoundError
 from datetime import datetime
 from typing import Dict, List, Any, Optional
+import asyncio
 import os
 import uuid
 from ..core.config import settings
@@ -193,11 +194,12 @@ class CosmosDBService:
             
             params = [{"name": "@firebase_uid", "value": firebase_uid}]
             
-            results = list(self.student_mappings.query_items(
+            # Blocking SDK call: keep it off the event loop
+            results = await asyncio.to_thread(lambda: list(self.student_mappings.query_items(
                 query=query,
                 parameters=params,
                 partition_key=firebase_uid
-            ))
+            )))
             
             return results[0] if results else None
             
@@ -1180,9 +1182,13 @@ class CosmosDBService:
         problem_id: str,
         review_data: Dict[str, Any],
         problem_content: Dict[str, Any] = None,
-        firebase_uid: Optional[str] = None
+        firebase_uid: Optional[str] = None,
+        review_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Save problem review with user validation"""
+        """Save problem review with user validation.
+
+        Upserts by id, so replaying a write with the same `review_id` is safe.
+        """
         
         # Validate user access
         if firebase_uid:
@@ -1191,7 +1197,7 @@ class CosmosDBService:
                 raise PermissionError(f"User {firebase_uid} does not have access to student {student_id}")
         
         timestamp = datetime.utcnow().isoformat()
-        review_id = str(uuid.uuid4())
+        review_id = review_id or str(uuid.uuid4())
 
         logger.info(f"Saving problem review with ID: {review_id} for student {student_id}")
 
@@ -1216,7 +1222,7 @@ class CosmosDBService:
             "created_at": timestamp
         }
         
-        return self.reviews.create_item(body=review_item)
+        return await asyncio.to_thread(self.reviews.upsert_item, body=review_item)
 
     async def get_problem_reviews(
         self,
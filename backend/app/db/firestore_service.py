@@ -110,7 +110,7 @@ class FirestoreService:
             }
             if firebase_uid:
                 data["firebase_uid"] = firebase_uid
-            doc_ref.set(data, merge=True)
+            await asyncio.to_thread(doc_ref.set, data, merge=True)
         except Exception as e:
             logger.warning(f"Failed to ensure student document for {student_id}: {e}")
 
@@ -521,6 +521,28 @@ class FirestoreService:
             logger.error(f"Error reading profile summary for student {student_id}: {str(e)}")
             return None
 
+    async def list_active_student_ids(self, since: str) -> List[int]:
+        """Student ids whose profile summary shows activity at or after `since` (ISO).
+
+        One collection-group query over the profile/summary docs — the same
+        last_activity_at the rollup write path maintains on every attempt.
+        """
+        try:
+            docs = (
+                self.client.collection_group("profile")
+                .where("last_activity_at", ">=", since)
+                .stream()
+            )
+            ids = set()
+            for doc in docs:
+                student_ref = doc.reference.parent.parent
+                if student_ref is not None and student_ref.id.isdigit():
+                    ids.add(int(student_ref.id))
+            return sorted(ids)
+        except Exception as e:
+            logger.error(f"Error listing active students since {since}: {str(e)}")
+            return []
+
     # ============================================================================
     # REVIEWS METHODS
     # ============================================================================
@@ -535,15 +557,18 @@ class FirestoreService:
         review_data: Dict[str, Any],
         problem_content: Dict[str, Any] = None,
         firebase_uid: Optional[str] = None,
-        attempt_id: Optional[str] = None
+        attempt_id: Optional[str] = None,
+        review_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Save problem review to Firestore under students/{student_id}/reviews/
 
         `attempt_id` links this review to the attempt doc written in the same
-        submission (shared id generated by the submission handler).
+        submission (shared id generated by the submission handler). A given
+        `review_id` (shared with the Cosmos copy) makes a replayed write
+        overwrite rather than duplicate.
         """
         try:
-            review_id = str(uuid.uuid4())
+            review_id = review_id or str(uuid.uuid4())
             timestamp = datetime.now(timezone.utc).isoformat()
 
             review_item = {
@@ -577,7 +602,7 @@ class FirestoreService:
             # Ensure student doc exists, then save to subcollection
             await self._ensure_student_document(student_id, firebase_uid)
             doc_ref = self._reviews_subcollection(student_id).document(review_id)
-            doc_ref.set(firestore_data)
+            await asyncio.to_thread(doc_ref.set, firestore_data)
 
             logger.info(f"Saved review {review_id} to Firestore for student {student_id}")
             return firestore_data
@@ -1047,6 +1072,62 @@ class FirestoreService:
             logger.error(f"Error reading misconceptions from Firestore: {str(e)}")
             return {}
 
+    # ------------------------------------------------------------------
+    # Pending misconception analysis (services/misconception_pipeline.py)
+    # ------------------------------------------------------------------
+    # One doc per incorrect attempt at
+    # students/{student_id}/pending_misconceptions/{attempt_id}, written on
+    # the submission path and deleted once the pipeline has analyzed the
+    # student/subskill batch it belongs to. Doc-id = attempt_id keeps a
+    # retried submit idempotent; anything still here after a restart is
+    # picked up again by the pipeline's startup recovery.
+
+    def _pending_misconceptions_subcollection(self, student_id: int):
+        """Get reference to students/{student_id}/pending_misconceptions"""
+        return self._student_doc(student_id).collection('pending_misconceptions')
+
+    async def queue_pending_misconception(self, student_id: int, attempt: Dict[str, Any]) -> None:
+        """Persist one incorrect attempt awaiting misconception analysis."""
+        doc_ref = self._pending_misconceptions_subcollection(student_id).document(attempt["attempt_id"])
+        doc_ref.set(self._prepare_firestore_data({**attempt, "student_id": student_id}))
+
+    async def get_pending_misconceptions(self, student_id: int, subskill_id: str) -> List[Dict[str, Any]]:
+        """Pending attempts for one student/subskill, oldest first."""
+        query = self._pending_misconceptions_subcollection(student_id).where('subskill_id', '==', subskill_id)
+        attempts = [doc.to_dict() for doc in query.stream()]
+        return sorted(attempts, key=lambda a: a.get("queued_at") or "")
+
+    async def delete_pending_misconceptions(self, student_id: int, attempt_ids: List[str]) -> None:
+        """Drop analyzed attempts (one batched write)."""
+        collection = self._pending_misconceptions_subcollection(student_id)
+        for start in range(0, len(attempt_ids), 500):
+            batch = self.client.batch()
+            for attempt_id in attempt_ids[start:start + 500]:
+                batch.delete(collection.document(attempt_id))
+            batch.commit()
+
+    async def list_pending_misconception_keys(self, limit: int = 500) -> List[Dict[str, Any]]:
+        """Distinct (student_id, subskill_id) pairs with attempts still pending.
+
+        One collection-group query; used at startup to resume work a previous
+        instance queued but did not finish.
+        """
+        try:
+            keys: Dict[tuple, Dict[str, Any]] = {}
+            for doc in self.client.collection_group("pending_misconceptions").limit(limit).stream():
+                data = doc.to_dict()
+                student_id, subskill_id = data.get("student_id"), data.get("subskill_id")
+                if student_id is not None and subskill_id:
+                    keys.setdefault((student_id, subskill_id), {
+                        "student_id": student_id,
+                        "subskill_id": subskill_id,
+                        "firebase_uid": data.get("firebase_uid"),
+                    })
+            return list(keys.values())
+        except Exception as e:
+            logger.error(f"Error listing pending misconception analyses: {str(e)}")
+            return []
+
     # ============================================================================
     # CURRICULUM GRAPH METHODS (READ-ONLY)
     # ============================================================================
@@ -1900,6 +1981,26 @@ class FirestoreService:
             logger.error(f"Error updating global practice pass rate: {e}")
             raise
 
+    async def increment_global_practice_pass_rate(
+        self,
+        student_id: int,
+        passes: float,
+        fails: float
+    ) -> None:
+        """Atomically add pass/fail deltas to the global counters (PRD 6.4).
+
+        The rate itself is derived from the counters on read.
+        """
+        try:
+            await self._ensure_student_document(student_id)
+            self._student_doc(student_id).set({
+                "global_practice_passes": firestore.Increment(passes),
+                "global_practice_fails": firestore.Increment(fails),
+            }, merge=True)
+        except Exception as e:
+            logger.error(f"Error incrementing global practice pass rate: {e}")
+            raise
+
     async def get_global_practice_pass_rate(
         self,
         student_id: int
@@ -1914,10 +2015,17 @@ class FirestoreService:
                     "global_practice_pass_rate": 0.8,  # default prior
                 }
             data = doc.to_dict()
+            passes = data.get("global_practice_passes", 0)
+            fails = data.get("global_practice_fails", 0)
+            total = passes + fails
             return {
-                "global_practice_passes": data.get("global_practice_passes", 0),
-                "global_practice_fails": data.get("global_practice_fails", 0),
-                "global_practice_pass_rate": data.get("global_practice_pass_rate", 0.8),
+                "global_practice_passes": passes,
+                "global_practice_fails": fails,
+                # Counters are incremented independently of the stored rate.
+                "global_practice_pass_rate": (
+                    round(passes / total, 4) if total > 0
+                    else data.get("global_practice_pass_rate", 0.8)
+                ),
             }
         except Exception as e:
             logger.error(f"Error getting global practice pass rate: {e}")
@@ -1927,6 +2035,110 @@ class FirestoreService:
                 "global_practice_pass_rate": 0.8,
             }
 
+    # ------------------------------------------------------------------
+    # Mastery aggregate (read model for velocity / summary / forecast —
+    # see services/mastery_aggregate.py)
+    # ------------------------------------------------------------------
+
+    def _mastery_aggregate_subcollection(self, student_id: int):
+        """Get reference to students/{student_id}/mastery_aggregate"""
+        return self._student_doc(student_id).collection('mastery_aggregate')
+
+    async def apply_mastery_aggregate_delta(
+        self,
+        student_id: int,
+        updates: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """Apply one lifecycle write's counter deltas and subskill rows.
+
+        `updates` is mastery_aggregate.lifecycle_delta() output. Counters use
+        Increment sentinels so concurrent evals compose; rows land on the
+        canonical subskill id, like the lifecycle doc itself. The same batch
+        bumps `_meta.version` so a concurrent rebuild can tell it landed.
+        """
+        try:
+            collection = self._mastery_aggregate_subcollection(student_id)
+            batch = self.client.batch()
+            for key, update in updates.items():
+                doc: Dict[str, Any] = {"subject": update["subject"]}
+                for path, delta in update["counters"].items():
+                    node = doc
+                    for part in path[:-1]:
+                        node = node.setdefault(part, {})
+                    node[path[-1]] = firestore.Increment(delta)
+                rows = {}
+                for subskill_id, row in update["rows"].items():
+                    canonical = await self._resolver.resolve(subskill_id)
+                    if row is None:
+                        rows[canonical] = firestore.DELETE_FIELD
+                    else:
+                        rows[canonical] = {**row, "subskill_id": canonical}
+                if rows:
+                    doc["subskills"] = rows
+                batch.set(collection.document(key), doc, merge=True)
+            batch.set(collection.document("_meta"), {"version": firestore.Increment(1)}, merge=True)
+            batch.commit()
+        except Exception as e:
+            logger.error(f"Error applying mastery aggregate delta for student {student_id}: {e}")
+            raise
+
+    async def get_mastery_aggregates(self, student_id: int) -> Optional[Dict[str, Dict[str, Any]]]:
+        """All subject aggregate docs, or None if the aggregate was never built
+        (or was invalidated by a bulk lifecycle write)."""
+        try:
+            docs = {doc.id: doc.to_dict() for doc in self._mastery_aggregate_subcollection(student_id).stream()}
+        except Exception as e:
+            logger.error(f"Error getting mastery aggregates for student {student_id}: {e}")
+            return None
+        if "built_at" not in (docs.pop("_meta", None) or {}):
+            return None
+        return docs
+
+    async def get_mastery_aggregate_version(self, student_id: int) -> int:
+        """Count of deltas applied to the aggregate (`_meta.version`)."""
+        try:
+            snapshot = self._mastery_aggregate_subcollection(student_id).document("_meta").get()
+        except Exception as e:
+            logger.error(f"Error getting mastery aggregate version for student {student_id}: {e}")
+            raise
+        return (snapshot.to_dict() or {}).get("version", 0) if snapshot.exists else 0
+
+    async def replace_mastery_aggregates(
+        self,
+        student_id: int,
+        aggregates: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """Overwrite the aggregate with a rebuilt one and mark it complete.
+
+        `_meta` is merged so its delta version survives the rebuild.
+        """
+        try:
+            await self._ensure_student_document(student_id)
+            collection = self._mastery_aggregate_subcollection(student_id)
+            batch = self.client.batch()
+            for doc in collection.stream():
+                if doc.id != "_meta" and doc.id not in aggregates:
+                    batch.delete(doc.reference)
+            for key, aggregate in aggregates.items():
+                batch.set(collection.document(key), aggregate)
+            batch.set(collection.document("_meta"), {
+                "built_at": datetime.now(timezone.utc).isoformat(),
+                "subjects": len(aggregates),
+            }, merge=True)
+            batch.commit()
+        except Exception as e:
+            logger.error(f"Error replacing mastery aggregates for student {student_id}: {e}")
+            raise
+
+    async def invalidate_mastery_aggregates(self, student_id: int) -> None:
+        """Drop the completeness marker so the next read rebuilds from a scan."""
+        try:
+            self._mastery_aggregate_subcollection(student_id).document("_meta").set(
+                {"built_at": firestore.DELETE_FIELD}, merge=True
+            )
+        except Exception as e:
+            logger.error(f"Error invalidating mastery aggregates for student {student_id}: {e}")
+
     async def batch_write_mastery_lifecycles(
         self,
         student_id: int,
@@ -1952,6 +2164,8 @@ class FirestoreService:
                     firestore_data = self._prepare_firestore_data(lc)
                     batch.set(doc_ref, firestore_data, merge=True)
                 batch.commit()
+            # Seeding bypasses the eval path's aggregate deltas
+            await self.invalidate_mastery_aggregates(student_id)
 
             logger.info(
                 f"Batch wrote {len(lifecycles)} mastery lifecycles "
@@ -2349,6 +2563,80 @@ class FirestoreService:
             logger.error(f"Error reading prior forecast for {student_id}: {e}")
             return None
 
+    # ============================================================================
+    # PROBLEM POOL (services/problem_pool.py)
+    # ============================================================================
+    #
+    #   problem_pool/{pool_key}                         — one doc per (subject, subskill, band)
+    #       items.{problem_type}.{pool_problem_id}      — pre-generated problems
+    #   students/{id}/served_pool_problems/{pool_key}   — per-student de-dup set
+    #
+    # Items live inline in the pool doc so serving is a single document read.
+
+    def _problem_pool_doc(self, pool_key: str):
+        return self.client.collection("problem_pool").document(pool_key)
+
+    def _served_pool_doc(self, student_id: int, pool_key: str):
+        return (
+            self._student_doc(student_id)
+            .collection("served_pool_problems")
+            .document(pool_key)
+        )
+
+    async def get_problem_pool(self, pool_key: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Pool items as {problem_type: {pool_problem_id: problem}} (empty if none)."""
+        try:
+            doc = self._problem_pool_doc(pool_key).get()
+            if not doc.exists:
+                return {}
+            return (doc.to_dict() or {}).get("items", {}) or {}
+        except Exception as e:
+            logger.error(f"Error reading problem pool {pool_key}: {e}")
+            return {}
+
+    async def add_problem_pool_items(
+        self,
+        pool_key: str,
+        pool_meta: Dict[str, Any],
+        items: List[Dict[str, Any]],
+    ) -> bool:
+        """Merge new items into the pool doc; each item needs pool_problem_id + problem_type."""
+        try:
+            nested: Dict[str, Dict[str, Any]] = {}
+            for item in items:
+                nested.setdefault(item["problem_type"], {})[item["pool_problem_id"]] = (
+                    self._prepare_firestore_data(item)
+                )
+            self._problem_pool_doc(pool_key).set({
+                **pool_meta,
+                "items": nested,
+                "size": firestore.Increment(len(items)),
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }, merge=True)
+            return True
+        except Exception as e:
+            logger.error(f"Error adding {len(items)} items to problem pool {pool_key}: {e}")
+            return False
+
+    async def get_served_pool_problem_ids(self, student_id: int, pool_key: str) -> set:
+        try:
+            doc = self._served_pool_doc(student_id, pool_key).get()
+            return set((doc.to_dict() or {}).get("problem_ids", [])) if doc.exists else set()
+        except Exception as e:
+            logger.error(f"Error reading served pool problems {student_id}/{pool_key}: {e}")
+            return set()
+
+    async def mark_pool_problems_served(
+        self, student_id: int, pool_key: str, pool_problem_ids: List[str]
+    ) -> None:
+        try:
+            self._served_pool_doc(student_id, pool_key).set({
+                "problem_ids": firestore.ArrayUnion(list(pool_problem_ids)),
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }, merge=True)
+        except Exception as e:
+            logger.error(f"Error marking pool problems served {student_id}/{pool_key}: {e}")
+
     # ============================================================================
     # SCHOOL YEAR CONFIG
     # ============================================================================
@@ -1,7 +1,7 @@
 # backend/app/dependencies.py
 
 import logging
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from fastapi import Depends, BackgroundTasks
 
 from .services.azure_tts import AzureSpeechService
@@ -73,6 +73,8 @@ _firestore_analytics_service: Optional[FirestoreAnalyticsService] = None
 _forecast_service = None  # ForecastService (imported lazily in its getter)
 _progress_display_service: Optional[ProgressDisplayService] = None
 _pulse_engine: Optional[PulseEngine] = None
+_misconception_pipeline = None  # MisconceptionPipeline (imported lazily in its getter)
+_review_persistence = None  # ReviewPersistence (imported lazily in its getter)
 
 
 # 🔥 UPDATED: Authentication dependency functions using service layer
@@ -382,6 +384,15 @@ async def get_problem_service(
         logger.info("Setting user_profiles_service on ProblemService for misconception-driven remediation")
         _problem_service.user_profiles_service = user_profiles_service
 
+    # Pre-generated problem pool (Firestore-backed, in-memory if Firestore is down)
+    if _problem_service.problem_pool is None:
+        logger.info("Setting problem_pool on ProblemService")
+        from .services.problem_pool import InMemoryProblemPoolStore, ProblemPoolService
+        _problem_service.problem_pool = ProblemPoolService(
+            store=get_firestore_service() or InMemoryProblemPoolStore(),
+            generator=_problem_service.generate_pool_problems,
+        )
+
     return _problem_service
 
 def get_review_service(
@@ -411,6 +422,39 @@ def get_review_service(
     return _review_service
 
 
+def get_misconception_pipeline() -> "MisconceptionPipeline":
+    """Get or create the deferred misconception analysis pipeline singleton."""
+    global _misconception_pipeline
+    if _misconception_pipeline is None:
+        from .services.misconception_pipeline import MisconceptionPipeline
+        logger.info("Initializing MisconceptionPipeline")
+        firestore_service = get_firestore_service()
+        _misconception_pipeline = MisconceptionPipeline(
+            store=firestore_service,
+            review_service=get_review_service(get_cosmos_db(), firestore_service),
+            user_profiles_service=user_profiles_service,
+            debounce_s=settings.MISCONCEPTION_PIPELINE_DEBOUNCE_S,
+            max_batch=settings.MISCONCEPTION_PIPELINE_MAX_BATCH,
+        )
+    return _misconception_pipeline
+
+
+def get_review_persistence() -> "ReviewPersistence":
+    """Get or create the review dual-write (Cosmos + Firestore) singleton."""
+    global _review_persistence
+    if _review_persistence is None:
+        from .services.review_persistence import ReviewPersistence
+        logger.info("Initializing ReviewPersistence")
+        _review_persistence = ReviewPersistence(
+            cosmos_db=get_cosmos_db(),
+            firestore_service=get_firestore_service(),
+            retry_interval_s=settings.REVIEW_OUTBOX_RETRY_INTERVAL_S,
+            max_backoff_s=settings.REVIEW_OUTBOX_MAX_BACKOFF_S,
+            max_attempts=settings.REVIEW_OUTBOX_MAX_ATTEMPTS,
+        )
+    return _review_persistence
+
+
 # Keep other functions that don't need curriculum/competency services as sync
 async def get_learning_paths_service(
     firestore_service: FirestoreService = Depends(get_firestore_service)
@@ -602,6 +646,58 @@ def get_gemini_problem_integration(
     return gemini_problem
 
 
+def warmup_components(names: List[str]) -> Dict[str, Callable[[], Awaitable[Any]]]:
+    """Startup warm-up steps (services/warmup.py), keyed by WARMUP_COMPONENTS name.
+
+    Each builds its singleton through the normal getter and fills the cache
+    the first request would otherwise fill.
+    """
+
+    async def curriculum():
+        curriculum_service = await get_curriculum_service()
+        return len(await curriculum_service.get_available_subjects())
+
+    async def lineage():
+        from .services.subskill_id_resolver import subskill_id_resolver
+        get_firestore_service()  # binds the resolver's client
+        await subskill_id_resolver._ensure_cache()
+
+    async def subskill_locations():
+        firestore_service = get_firestore_service()
+        await firestore_service._ensure_subskill_loc_cache()
+        return len(firestore_service._subskill_loc_cache)
+
+    async def learning_graphs():
+        learning_paths = await get_learning_paths_service(get_firestore_service())
+        return await learning_paths.warm_graphs()
+
+    async def pulse_engine():
+        firestore_service = get_firestore_service()
+        await get_pulse_engine(
+            firestore_service,
+            get_calibration_engine(firestore_service),
+            get_mastery_lifecycle_engine(firestore_service),
+            await get_learning_paths_service(firestore_service),
+        )
+
+    async def retrieval_embeddings():
+        mapping_service = await get_curriculum_mapping_service()
+        return await mapping_service.retrieval_matcher.warm()
+
+    available = {
+        "curriculum": curriculum,
+        "lineage": lineage,
+        "subskill_locations": subskill_locations,
+        "learning_graphs": learning_graphs,
+        "pulse_engine": pulse_engine,
+        "retrieval_embeddings": retrieval_embeddings,
+    }
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        logger.warning(f"Unknown warm-up components ignored: {unknown}")
+    return {name: available[name] for name in names if name in available}
+
+
 async def initialize_services():
     """Initialize all singleton services for ETL processes."""
     logger.info("Initializing all services for ETL processes")
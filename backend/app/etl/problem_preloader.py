@@ -14,6 +14,7 @@ import os
 from ..core.config import settings
 from app.services.analytics import AnalyticsExtension
 from app.services.problems import ProblemService
+from app.services.model_governor import Priority, model_call_priority
 from app.db.cosmos_db import CosmosDBService
 from app.services.competency import CompetencyService
 from app.services.recommender import ProblemRecommender
@@ -616,8 +617,10 @@ class ProblemPreloaderETL:
             self.batch_size = batch_size
             logger.info(f"Set batch_size to {batch_size}")
         
-        # Run the batch preloading process
-        result = await self.batch_preload_problems(subject, specific_students)
+        # Run the batch preloading process in the BATCH lane so live requests
+        # on the same instance are admitted ahead of preloader model calls.
+        with model_call_priority(Priority.BATCH):
+            result = await self.batch_preload_problems(subject, specific_students)
         
         if result.get("success", False):
             logger.info("Problem preloader ETL completed successfully")
@@ -1,4 +1,5 @@
 # backend/app/core/generators/base_generator.py
+import json
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
@@ -8,6 +9,8 @@ from google import genai
 from google.genai import types
 
 from ..core.config import settings
+from ..services.llm_response_cache import get_llm_response_cache
+from ..services.model_governor import govern_genai_client
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +30,37 @@ class BaseContentGenerator(ABC):
         if not settings.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY is required. Please check your configuration.")
         
-        self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        self.client = govern_genai_client(genai.Client(api_key=settings.GEMINI_API_KEY))
         logger.info(f"Gemini client initialized for {self.__class__.__name__}")
     
+    async def _generate_text(self, model: str, prompt: str, config, cache: bool = False) -> str:
+        """Run one generate_content call and return response.text.
+
+        cache=True routes the call through the shared LLM response cache, keyed
+        on (model, prompt, response_schema, temperature). Use it only where the
+        prompt is a pure function of curriculum inputs. JSON responses are
+        cached only once they parse.
+        """
+        async def _call() -> str:
+            response = await self.client.aio.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=config
+            )
+            return response.text
+
+        if not cache:
+            return await _call()
+        return await get_llm_response_cache().get_or_generate(
+            _call,
+            model=model,
+            prompt=prompt,
+            schema=getattr(config, "response_schema", None),
+            temperature=getattr(config, "temperature", None),
+            namespace=f"generators.{self.__class__.__name__}",
+            validate=json.loads if getattr(config, "response_mime_type", None) == "application/json" else None,
+        )
+
     def _extract_grade_info(self, request) -> str:
         """Extract grade information from request with fallback"""
         return getattr(request, 'grade', None) or "appropriate grade level"
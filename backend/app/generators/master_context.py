@@ -89,18 +89,19 @@ class MasterContextGenerator(BaseContentGenerator):
         """
         
         try:
-            response = await self.client.aio.models.generate_content(
+            response_text = await self._generate_text(
                 model='gemini-flash-latest',
-                contents=prompt,
+                prompt=prompt,
                 config=GenerateContentConfig(
                     response_mime_type='application/json',
                     response_schema=MASTER_CONTEXT_SCHEMA,
                     temperature=0.3,
                     max_output_tokens=25000
-                )
+                ),
+                cache=True
             )
             
-            context_data = self._safe_json_loads(response.text, "Master context generation")
+            context_data = self._safe_json_loads(response_text, "Master context generation")
 
             # Convert array of term-definition objects back to dictionary
             key_terminology_dict = {}
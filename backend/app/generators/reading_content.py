@@ -52,18 +52,19 @@ class ReadingContentGenerator(BaseContentGenerator):
         """
 
         try:
-            response = await self.client.aio.models.generate_content(
+            response_text = await self._generate_text(
                 model='gemini-2.5-flash-preview-05-20',
-                contents=prompt,
+                prompt=prompt,
                 config=GenerateContentConfig(
                     response_mime_type='application/json',
                     response_schema=READING_CONTENT_SCHEMA,
                     temperature=0.4,
                     max_output_tokens=25000
-                )
+                ),
+                cache=True
             )
 
-            content_data = self._safe_json_loads(response.text, "Reading content generation")
+            content_data = self._safe_json_loads(response_text, "Reading content generation")
 
             return ContentComponent(
                 package_id=package_id,
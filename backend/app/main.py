@@ -360,10 +360,142 @@ async def health_check():
             "analytics": "/api/analytics/health",
             "daily_activities": "/api/daily-activities/health",  # 🔥 NEW: Added health endpoint
             "assessments": "/api/assessments/health",  # 🔥 NEW: Assessment health endpoint
+            "ready": "/health/ready",
             "docs": "/docs"
         }
     }
 
+@app.on_event("startup")
+async def warm_up_caches():
+    """Preload curriculum/graph caches before the instance takes traffic."""
+    from .dependencies import warmup_components
+    from .services.warmup import get_warmup
+    warmup = get_warmup()
+    if not settings.WARMUP_ENABLED:
+        warmup.disable()
+        return
+    names = [n.strip() for n in settings.WARMUP_COMPONENTS.split(",") if n.strip()]
+    components = warmup_components(names)
+    if settings.WARMUP_BLOCK_STARTUP:
+        await warmup.run(components, timeout=settings.WARMUP_TIMEOUT_S)
+    else:
+        warmup.start(components, timeout=settings.WARMUP_TIMEOUT_S)
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness: 503 until startup warm-up finishes, with per-component timings."""
+    from fastapi.responses import JSONResponse
+    from .services.warmup import get_warmup
+    warmup = get_warmup()
+    return JSONResponse(warmup.stats(), status_code=200 if warmup.ready else 503)
+
+@app.get("/health/llm-cache")
+async def llm_cache_stats():
+    """Hit-rate metrics for the LLM response cache, per call site."""
+    from .services.llm_response_cache import get_llm_response_cache
+    return get_llm_response_cache().stats()
+
+@app.get("/health/model-governor")
+async def model_governor_stats():
+    """Queue wait, utilization and rate-limit retries for outbound model calls."""
+    from .services.model_governor import get_model_governor
+    return get_model_governor().stats()
+
+@app.get("/health/live-relay")
+async def live_relay_stats():
+    """Active Gemini Live sessions, queue depths and client send latency."""
+    from .services.live_relay import registry
+    return registry.stats()
+
+@app.on_event("shutdown")
+async def drain_background_jobs():
+    """Let in-flight background jobs finish before the process exits, then
+    write pass-rate deltas whose debounced or retrying flush was cancelled."""
+    from . import dependencies
+    from .services.background_jobs import get_background_jobs
+    await get_background_jobs().drain(timeout=10.0)
+    if dependencies._mastery_lifecycle_engine is not None:
+        await dependencies._mastery_lifecycle_engine.flush_all_pass_deltas(timeout=5.0)
+
+@app.on_event("shutdown")
+async def flush_session_ledgers():
+    """Get buffered session ledger records onto disk before the process exits."""
+    import asyncio
+    from .services.session_ledger import get_ledger_writer
+    await asyncio.to_thread(get_ledger_writer().flush, 5.0)
+
+@app.get("/health/session-ledger")
+async def session_ledger_stats():
+    """Ledger writer queue depth, batching, rotation and drop counts."""
+    from .services.session_ledger import get_ledger_writer
+    return get_ledger_writer().stats()
+
+@app.get("/health/background-jobs")
+async def background_jobs_stats():
+    """Background job counts, coalescing and recent failures."""
+    from .services.background_jobs import get_background_jobs
+    return get_background_jobs().stats()
+
+@app.on_event("startup")
+async def resume_misconception_pipeline():
+    """Reschedule misconception analyses a previous instance queued but did not finish."""
+    from .dependencies import get_misconception_pipeline
+    try:
+        await get_misconception_pipeline().recover(limit=settings.MISCONCEPTION_PIPELINE_RECOVER_LIMIT)
+    except Exception as e:
+        logger.error(f"Misconception pipeline recovery failed: {e}")
+
+@app.on_event("startup")
+async def start_review_outbox():
+    """Replay failed review dual-writes (including any left from a previous run)."""
+    from .dependencies import get_review_persistence
+    try:
+        get_review_persistence().start()
+    except Exception as e:
+        logger.error(f"Review outbox retry loop not started: {e}")
+
+@app.on_event("shutdown")
+async def stop_review_outbox():
+    """Stop the outbox retry loop; unreplayed entries stay on disk."""
+    from . import dependencies
+    if dependencies._review_persistence is not None:
+        await dependencies._review_persistence.stop()
+
+@app.get("/health/review-persistence")
+async def review_persistence_stats():
+    """Review dual-write outcomes, store divergence and outbox depth."""
+    from .dependencies import get_review_persistence
+    return get_review_persistence().stats()
+
+@app.get("/health/misconception-pipeline")
+async def misconception_pipeline_stats():
+    """Queued, batched, deduplicated and written misconception analyses."""
+    from .dependencies import get_misconception_pipeline
+    return get_misconception_pipeline().stats()
+
+@app.get("/health/engagement-ledger")
+async def engagement_ledger_stats():
+    """Coalesced XP writes, etag conflicts and activities still pending."""
+    from .services.engagement_service import engagement_service
+    return engagement_service.ledger.stats()
+
+@app.get("/health/parent-dashboard")
+async def parent_dashboard_stats():
+    """Parent dashboard snapshot/access cache hits and per-section latency."""
+    from .services import parent_portal
+    if parent_portal.parent_portal_service is None:
+        return {"status": "not_initialized"}
+    return parent_portal.parent_portal_service.stats()
+
+@app.get("/health/problem-pool")
+async def problem_pool_stats():
+    """Pool hit rate and background replenishment activity."""
+    from . import dependencies
+    service = dependencies._problem_service
+    if service is None or service.problem_pool is None:
+        return {"status": "not_initialized"}
+    return service.problem_pool.stats()
+
 # ============================================================================
 # TEST ENDPOINTS - For verifying the simplified auth
 # ============================================================================
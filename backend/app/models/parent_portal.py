@@ -112,6 +112,7 @@ class ParentDashboard(BaseModel):
     todays_plan: TodaysPlanSummary = Field(..., description="Today's learning plan summary")
     weekly_summary: WeeklySummaryMetrics = Field(..., description="Past 7 days summary")
     key_insights: List[KeyInsight] = Field(..., description="Top 3-5 AI insights")
+    incomplete_sections: List[str] = Field(default_factory=list, description="Sections that timed out or failed and hold empty placeholders")
     generated_at: datetime = Field(default_factory=datetime.utcnow, description="Dashboard generation timestamp")
 
 
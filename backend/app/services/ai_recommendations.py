@@ -11,6 +11,7 @@ from google.genai.types import GenerateContentConfig
 from google.cloud.exceptions import NotFound
 
 from ..core.config import settings
+from .model_governor import govern_genai_client
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +27,7 @@ class AIRecommendationService:
         if not settings.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY is required. Please check your configuration.")
         
-        self.gemini_client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        self.gemini_client = govern_genai_client(genai.Client(api_key=settings.GEMINI_API_KEY))
         
         logger.info("Parsimonious AI Recommendation Service initialized")
     
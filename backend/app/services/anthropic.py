@@ -3,6 +3,8 @@
 from anthropic import Anthropic, AsyncAnthropic
 from ..core.config import settings
 from .base_ai_service import BaseAIService
+from .llm_response_cache import get_llm_response_cache
+from .model_governor import get_model_governor
 from typing import List, Dict, Any, Optional, Union
 
 class AnthropicService(BaseAIService):
@@ -14,21 +16,43 @@ class AnthropicService(BaseAIService):
     async def generate_response(
         self, 
         prompt: Union[str, List[Dict[str, Any]]], 
-        system_instructions: Optional[str] = None
+        system_instructions: Optional[str] = None,
+        cache: bool = False
     ) -> str:
         try:
             print("Generating response with:", prompt)  # Debug log
-            
-            # Create messages list in correct format for the API
-            response = await self.client.messages.create(
+
+            messages = prompt if isinstance(prompt, list) else [{"role": "user", "content": prompt}]
+            system = system_instructions if system_instructions else "You are a friendly and encouraging kindergarten tutor."
+            temperature = 0.6
+
+            async def _create():
+                # Create messages list in correct format for the API
+                return await self.client.messages.create(
+                    model=self.model,
+                    max_tokens=2048,
+                    messages=messages,
+                    system=system,
+                    # Add this line to fix the temperature setting:
+                    temperature=temperature
+                )
+
+            async def _call() -> str:
+                response = await get_model_governor().run(
+                    self.model, _create, est_tokens=len(str(messages)) // 4 + 2048
+                )
+                return response.content[0].text.strip()
+
+            if not cache:
+                return await _call()
+            return await get_llm_response_cache().get_or_generate(
+                _call,
                 model=self.model,
-                max_tokens=2048,
-                messages=prompt if isinstance(prompt, list) else [{"role": "user", "content": prompt}],
-                system=system_instructions if system_instructions else "You are a friendly and encouraging kindergarten tutor.",
-                # Add this line to fix the temperature setting:
-                temperature=0.6
+                prompt=messages,
+                system_instructions=system,
+                temperature=temperature,
+                namespace="anthropic.generate_response",
             )
-            return response.content[0].text.strip()
         except Exception as e:
             print(f"Error in generate_response: {str(e)}")
             raise
@@ -120,12 +144,16 @@ class AnthropicService(BaseAIService):
             messages = [{"role": "user", "content": user_prompt}]
             
             # Call the Anthropic API directly for this specific use case
-            response = await self.client.messages.create(
-                model=session_model,
-                max_tokens=600,  # Shorter summary
-                messages=messages,
-                system=system_instructions,
-                temperature=0.3  # Lower temperature for more consistent summaries
+            response = await get_model_governor().run(
+                session_model,
+                lambda: self.client.messages.create(
+                    model=session_model,
+                    max_tokens=600,  # Shorter summary
+                    messages=messages,
+                    system=system_instructions,
+                    temperature=0.3  # Lower temperature for more consistent summaries
+                ),
+                est_tokens=len(str(messages)) // 4 + 600
             )
             
             return response.content[0].text.strip()
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import random
+import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass
@@ -12,6 +13,7 @@ from .submission_service import SubmissionService
 from .engagement_service import engagement_service
 from .ai_assessment_service import AIAssessmentService
 from .user_profiles import user_profiles_service
+from ..core.config import settings
 from ..db.cosmos_db import CosmosDBService
 from ..schemas.problem_submission import ProblemSubmission
 from ..schemas.assessment_problems import (
@@ -1297,9 +1299,27 @@ class AssessmentService:
         time_taken_minutes: Optional[int] = None,
         firebase_uid: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
-        """Orchestrates the scoring of an assessment using the new Mise en Place architecture."""
+        """Orchestrates the scoring of an assessment using the new Mise en Place architecture.
+
+        Problems on different skills are scored concurrently (bounded by
+        ASSESSMENT_SCORING_CONCURRENCY); problems sharing a skill run one after
+        another in problem order, because each submission read-modify-writes
+        that skill's ability and its subskills' competency and lifecycle docs.
+        The AI summary starts as soon as the
+        deterministic summary exists; misconception writes and the results
+        write then run in parallel. Per-stage timings are stored under
+        results.timings_ms.
+        """
 
         try:
+            started = time.perf_counter()
+            timings_ms: Dict[str, int] = {}
+
+            def mark(stage: str, since: float) -> float:
+                now = time.perf_counter()
+                timings_ms[stage] = round((now - since) * 1000)
+                return now
+
             # 1. SETUP: Fetch the assessment definition
             assessment = await self.get_assessment(assessment_id, student_id, firebase_uid)
             if not assessment:
@@ -1308,28 +1328,60 @@ class AssessmentService:
             problems = assessment.get("problems", [])
             if not problems:
                 raise ValueError("Assessment contains no problems to score.")
+            stage_start = mark("fetch", started)
 
             # 2. PREP WORK (Transformation): Create the "Mise en Place"
-            # This loop's ONLY job is to convert raw submissions into our clean intermediate format.
-            processed_reviews: List[ProcessedReview] = []
+            # Each problem is converted into our clean intermediate format.
+            # Skills are scored concurrently; within a skill, submissions are
+            # applied in problem order so their state updates never interleave.
             blueprint = assessment.get("blueprint", {})
-            for problem in problems:
-                student_answer = answers.get(str(problem.get("id") or problem.get("problem_id")))
-                review = await self._process_single_problem(problem, student_answer, blueprint)
-                processed_reviews.append(review)
+            semaphore = asyncio.Semaphore(max(1, settings.ASSESSMENT_SCORING_CONCURRENCY))
+            by_skill: Dict[str, List[int]] = {}
+            for index, problem in enumerate(problems):
+                key = problem.get("skill_id") or problem.get("subskill_id") or f"problem-{index}"
+                by_skill.setdefault(key, []).append(index)
+            reviews_by_index: Dict[int, ProcessedReview] = {}
+
+            async def process(indexes: List[int]) -> None:
+                async with semaphore:
+                    for index in indexes:
+                        problem = problems[index]
+                        student_answer = answers.get(str(problem.get("id") or problem.get("problem_id")))
+                        reviews_by_index[index] = await self._process_single_problem(
+                            problem, student_answer, blueprint
+                        )
+
+            await asyncio.gather(*(process(indexes) for indexes in by_skill.values()))
+            processed_reviews: List[ProcessedReview] = [reviews_by_index[i] for i in range(len(problems))]
+            stage_start = mark("process_problems", stage_start)
 
             # 3. ASSEMBLY (Building): Delegate to specialized, independent functions.
             summary_data = self._build_summary(processed_reviews)
 
-            skill_analysis_data = self._build_skill_analysis(processed_reviews)
+            # The AI summary only needs the deterministic summary — start it now
+            # and build the remaining sections while it runs.
+            ai_summary_start = time.perf_counter()
+            ai_insights_task = asyncio.create_task(
+                self.ai_assessment.generate_enhanced_assessment_summary(
+                    blueprint=blueprint,
+                    submission_result=summary_data,
+                    review_items_data=[pr.full_review_payload for pr in processed_reviews]
+                )
+            )
 
-            problem_reviews_data = self._build_problem_reviews(processed_reviews)
+            try:
+                skill_analysis_data = self._build_skill_analysis(processed_reviews)
 
-            ai_insights_data = await self.ai_assessment.generate_enhanced_assessment_summary(
-                blueprint=assessment.get("blueprint", {}),
-                submission_result=summary_data,
-                review_items_data=[pr.full_review_payload for pr in processed_reviews]
-            )
+                problem_reviews_data = self._build_problem_reviews(processed_reviews)
+                mark("build", stage_start)
+
+                ai_insights_data = await ai_insights_task
+            finally:
+                # A failed build (or a cancelled request) must not leave the
+                # model call running unawaited.
+                if not ai_insights_task.done():
+                    ai_insights_task.cancel()
+            stage_start = mark("ai_summary", ai_summary_start)
 
             # Add comprehensive logging for assessment insights generation
             logger.info(f"🔍 ASSESSMENT_INSIGHTS: Generated insights for assessment {assessment_id}")
@@ -1355,47 +1407,17 @@ class AssessmentService:
                     if pr.misconception and not pr.is_correct:
                         logger.info(f"💡 MISCONCEPTION: Problem {pr.problem_id} (subskill {pr.subskill_id}): {pr.misconception}")
 
-            # ============================================================================
-            # MISCONCEPTION-DRIVEN PRACTICE ENGINE
-            # Persist problem-specific misconceptions for targeted remediation
-            # ============================================================================
-            if firebase_uid:
-                misconceptions_stored = 0
-                for pr in processed_reviews:
-                    # Only store misconceptions for incorrect problems that have a misconception identified
-                    if not pr.is_correct and pr.misconception and pr.misconception.strip():
-                        try:
-                            success = await user_profiles_service.add_or_update_misconception(
-                                uid=firebase_uid,
-                                subskill_id=pr.subskill_id,
-                                misconception_text=pr.misconception,
-                                assessment_id=assessment_id
-                            )
-                            if success:
-                                misconceptions_stored += 1
-                                logger.info(f"✅ MISCONCEPTION_ENGINE: Stored misconception for problem {pr.problem_id}")
-                                logger.info(f"   Subskill: {pr.subskill_id} - {pr.subskill_description}")
-                                logger.info(f"   Category: {pr.category}")
-                                logger.info(f"   Misconception: {pr.misconception}")
-                        except Exception as e:
-                            logger.error(f"❌ MISCONCEPTION_ENGINE: Error storing misconception for problem {pr.problem_id}: {e}")
-
-                if misconceptions_stored > 0:
-                    logger.info(f"💡 MISCONCEPTION_ENGINE: Stored {misconceptions_stored} problem-specific misconceptions")
-                else:
-                    logger.info(f"✨ MISCONCEPTION_ENGINE: No misconceptions identified or all answers correct!")
-            else:
-                logger.info(f"ℹ️ MISCONCEPTION_ENGINE: No firebase_uid provided, skipping misconception storage")
-
             # 4. FINAL ASSEMBLY: Combine the built parts into the final results object.
             final_results = {
                 "summary": summary_data,
                 "problem_reviews": problem_reviews_data,
-                "ai_insights": ai_insights_data
+                "ai_insights": ai_insights_data,
+                "timings_ms": dict(timings_ms)
             }
 
-            # 5. PERSISTENCE: Update the assessment document in Cosmos DB.
-            await self.cosmos.update_assessment_with_results(
+            # 5. PERSISTENCE: The results write (Cosmos DB) and the misconception
+            # writes are independent — run them together.
+            results_write = self.cosmos.update_assessment_with_results(
                 assessment_id,
                 student_id,
                 final_results,
@@ -1403,6 +1425,13 @@ class AssessmentService:
                 time_taken_minutes,
                 firebase_uid
             )
+            await asyncio.gather(
+                results_write,
+                self._store_assessment_misconceptions(assessment_id, processed_reviews, firebase_uid)
+            )
+            mark("persist", stage_start)
+            mark("total", started)
+            logger.info(f"[ASSESSMENT_SERVICE] Scored assessment {assessment_id} ({len(problems)} problems): {timings_ms}")
 
             # 6. ASSESSMENT FEEDBACK: No longer needed - daily plan will query assessment documents directly
 
@@ -1420,6 +1449,52 @@ class AssessmentService:
             logger.error(f"Failed to score assessment {assessment_id}: {e}")
             raise
 
+    async def _store_assessment_misconceptions(
+        self,
+        assessment_id: str,
+        processed_reviews: List[ProcessedReview],
+        firebase_uid: Optional[str]
+    ) -> int:
+        """
+        MISCONCEPTION-DRIVEN PRACTICE ENGINE
+        Persist problem-specific misconceptions for targeted remediation.
+        Every misconception lands in the same profile document, so writes run
+        one at a time; returns how many were stored.
+        """
+        if not firebase_uid:
+            logger.info(f"ℹ️ MISCONCEPTION_ENGINE: No firebase_uid provided, skipping misconception storage")
+            return 0
+
+        async def store(pr: ProcessedReview) -> bool:
+            try:
+                success = await user_profiles_service.add_or_update_misconception(
+                    uid=firebase_uid,
+                    subskill_id=pr.subskill_id,
+                    misconception_text=pr.misconception,
+                    assessment_id=assessment_id
+                )
+                if success:
+                    logger.info(f"✅ MISCONCEPTION_ENGINE: Stored misconception for problem {pr.problem_id}")
+                    logger.info(f"   Subskill: {pr.subskill_id} - {pr.subskill_description}")
+                    logger.info(f"   Category: {pr.category}")
+                    logger.info(f"   Misconception: {pr.misconception}")
+                return bool(success)
+            except Exception as e:
+                logger.error(f"❌ MISCONCEPTION_ENGINE: Error storing misconception for problem {pr.problem_id}: {e}")
+                return False
+
+        # Only store misconceptions for incorrect problems that have a misconception identified
+        pending = [pr for pr in processed_reviews if not pr.is_correct and pr.misconception and pr.misconception.strip()]
+        misconceptions_stored = 0
+        for pr in pending:
+            misconceptions_stored += await store(pr)
+
+        if misconceptions_stored > 0:
+            logger.info(f"💡 MISCONCEPTION_ENGINE: Stored {misconceptions_stored} problem-specific misconceptions")
+        else:
+            logger.info(f"✨ MISCONCEPTION_ENGINE: No misconceptions identified or all answers correct!")
+        return misconceptions_stored
+
     async def get_assessment_summary(
         self,
         assessment_id: str,
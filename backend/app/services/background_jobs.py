@@ -0,0 +1,177 @@
+# backend/app/services/background_jobs.py
+"""In-process runner for fire-and-forget work off the request path.
+
+Bare `asyncio.create_task` calls keep no reference (the task can be garbage
+collected mid-flight), never surface their errors, and pile up duplicates when
+the same follow-up work is triggered by every request. Jobs submitted here are:
+
+  keyed      — one pending job per key; a submit while the key is pending
+               replaces the job (latest wins), a submit while it is running
+               schedules exactly one re-run afterwards.
+  debounced  — optional delay before a job starts, so a burst of submits for
+               one key collapses into a single run.
+  bounded    — at most `max_workers` jobs execute at once.
+  drained    — `drain()` on shutdown starts debounced jobs at once, waits for
+               in-flight work up to its deadline, then cancels.
+
+Failures are logged and counted, never raised to the submitter.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JobFactory = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class _Job:
+    factory: JobFactory
+    task: Optional[asyncio.Task] = None
+    running: bool = False
+    rerun: bool = False
+    wake: Optional[asyncio.Event] = None  # cuts the debounce short on drain
+
+
+class BackgroundJobRunner:
+    """Keyed, debounced, bounded background jobs for one event loop."""
+
+    def __init__(self, max_workers: int = 4, max_recent_errors: int = 20):
+        self.max_workers = max_workers
+        self._jobs: Dict[str, _Job] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._closed = False
+        self._recent_errors: Deque[Dict[str, Any]] = deque(maxlen=max_recent_errors)
+        self._counters = {"submitted": 0, "coalesced": 0, "completed": 0, "failed": 0, "cancelled": 0}
+        self._by_kind: Dict[str, Dict[str, int]] = {}
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        # asyncio primitives belong to one loop; tests and scripts that run
+        # several asyncio.run() calls get fresh state per loop.
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._jobs = {}
+            self._closed = False
+        return loop
+
+    @staticmethod
+    def _kind(key: str) -> str:
+        return key.split(":", 1)[0]
+
+    def _count(self, key: str, field: str) -> None:
+        self._counters[field] += 1
+        kind = self._by_kind.setdefault(self._kind(key), {"submitted": 0, "completed": 0, "failed": 0})
+        if field in kind:
+            kind[field] += 1
+
+    def submit(self, key: str, factory: JobFactory, *, debounce_s: float = 0.0) -> bool:
+        """Queue `factory()` under `key`. Returns False if it coalesced into an existing job.
+
+        Must be called from a running event loop.
+        """
+        loop = self._bind_loop()
+        if self._closed:
+            logger.warning(f"[BACKGROUND_JOBS] Runner draining; dropped job {key}")
+            return False
+
+        self._count(key, "submitted")
+        job = self._jobs.get(key)
+        if job is not None:
+            job.factory = factory
+            if job.running:
+                job.rerun = True
+            self._counters["coalesced"] += 1
+            return False
+
+        job = _Job(factory=factory, wake=asyncio.Event())
+        self._jobs[key] = job
+        job.task = loop.create_task(self._run(key, job, debounce_s), name=f"job:{key}")
+        return True
+
+    async def _run(self, key: str, job: _Job, debounce_s: float) -> None:
+        try:
+            if debounce_s > 0:
+                try:
+                    await asyncio.wait_for(job.wake.wait(), debounce_s)
+                except asyncio.TimeoutError:
+                    pass
+            while True:
+                async with self._slots:
+                    job.running = True
+                    job.rerun = False
+                    started = time.monotonic()
+                    try:
+                        await job.factory()
+                        self._count(key, "completed")
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        self._count(key, "failed")
+                        self._recent_errors.append({
+                            "key": key,
+                            "error": f"{type(e).__name__}: {e}",
+                            "duration_ms": round((time.monotonic() - started) * 1000),
+                        })
+                        logger.error(f"[BACKGROUND_JOBS] Job {key} failed: {e}", exc_info=True)
+                    finally:
+                        job.running = False
+                if not job.rerun:
+                    break
+        except asyncio.CancelledError:
+            self._counters["cancelled"] += 1
+            raise
+        finally:
+            if self._jobs.get(key) is job:
+                del self._jobs[key]
+
+    async def drain(self, timeout: float = 10.0) -> int:
+        """Stop accepting jobs, wait up to `timeout` for pending ones, cancel the rest.
+
+        Jobs still debouncing start immediately, so a long debounce or retry
+        backoff cannot outlast the deadline. Returns the number of jobs that
+        had to be cancelled.
+        """
+        self._closed = True
+        for job in self._jobs.values():
+            job.wake.set()
+        tasks = [job.task for job in self._jobs.values() if job.task is not None]
+        if not tasks:
+            return 0
+        logger.info(f"[BACKGROUND_JOBS] Draining {len(tasks)} job(s)")
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(f"[BACKGROUND_JOBS] Cancelled {len(pending)} job(s) still running at shutdown")
+        return len(pending)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "max_workers": self.max_workers,
+            "pending": sum(1 for job in self._jobs.values() if not job.running),
+            "running": sum(1 for job in self._jobs.values() if job.running),
+            "by_kind": {kind: dict(counts) for kind, counts in self._by_kind.items()},
+            "recent_errors": list(self._recent_errors),
+        }
+
+
+_runner: Optional[BackgroundJobRunner] = None
+
+
+def get_background_jobs() -> BackgroundJobRunner:
+    """Process-wide runner, sized from settings."""
+    global _runner
+    if _runner is None:
+        from ..core.config import settings
+        _runner = BackgroundJobRunner(max_workers=settings.BACKGROUND_JOBS_MAX_WORKERS)
+    return _runner
@@ -9,9 +9,14 @@ class BaseAIService(ABC):
     async def generate_response(
         self, 
         prompt: Union[str, List[Dict[str, Any]]], 
-        system_instructions: Optional[str] = None
+        system_instructions: Optional[str] = None,
+        cache: bool = False
     ) -> str:
-        """Generate a text response from the AI model"""
+        """Generate a text response from the AI model.
+
+        cache=True serves repeat requests from the shared LLM response cache
+        (services/llm_response_cache.py). Only pass it for deterministic prompts.
+        """
         pass
     
     @abstractmethod
@@ -501,12 +501,10 @@ class CompetencyService:
                     )
                     logger.info(f"✅ COMPETENCY_SERVICE: Mastery lifecycle engine processed eval")
 
-                    # Update global practice pass rate (fire-and-forget — acceptable
-                    # to lag by one event, avoids O(n) scan on the hot path)
-                    if source == "practice":
-                        asyncio.create_task(
-                            self.mastery_lifecycle_engine.update_global_pass_rate(student_id)
-                        )
+                    # Flush this eval's pass/fail delta into the global pass rate
+                    # off the request path — one pending flush per student, so a
+                    # burst of evals costs a single increment write.
+                    self.mastery_lifecycle_engine.schedule_global_pass_rate_flush(student_id)
                 except Exception as ml_err:
                     logger.error(f"⚠️ COMPETENCY_SERVICE: Mastery lifecycle engine error (non-fatal): {ml_err}")
 
@@ -7,6 +7,7 @@ import logging
 from google import genai
 from google.genai.types import GenerateContentConfig
 from ..core.config import settings
+from .model_governor import govern_genai_client
 from ..schemas.composable_problems import (
     ComposableProblem, 
     ProblemGenerationRequest, 
@@ -38,7 +39,7 @@ class ComposableProblemGenerationService:
         if not settings.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY is required")
         
-        self.gemini_client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        self.gemini_client = govern_genai_client(genai.Client(api_key=settings.GEMINI_API_KEY))
         logger.info("ComposableProblemGenerationService initialized with Gemini 2.5 Flash")
     
     def set_problem_service(self, problem_service: ProblemService) -> None:
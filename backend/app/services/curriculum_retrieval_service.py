@@ -36,7 +36,7 @@ sensible default; the cross-primitive calibration sweep is the deferred §11
 import asyncio
 import logging
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -119,6 +119,19 @@ def _skill_family(skill_id: str) -> str:
         return skill_id
     return re.sub(r"-[^-]+$", "", skill_id)
 
+
+def _abstain_reason(best: float, coherent: int, coherent_skill: int) -> Optional[str]:
+    """The per-grade gate: None for a MATCH, else why this grade abstains."""
+    # Gate on unit dominance; a moderate unit peak additionally needs a pinned skill.
+    if best < _TAU:
+        return "weak"
+    if coherent < _MIN_COHERENT:
+        return "diffuse"        # top-k spread across unrelated units — no home
+    if coherent < _STRONG_UNIT and coherent_skill < _MIN_COHERENT_SKILL:
+        return "scattered"      # moderate unit peak, no skill pinned — under-informed query
+    return None
+
+
 _ORDINAL_WORDS = {
     "first": "1", "second": "2", "third": "3", "fourth": "4", "fifth": "5",
     "sixth": "6", "seventh": "7", "eighth": "8", "ninth": "9", "tenth": "10",
@@ -264,27 +277,8 @@ class CurriculumRetrievalMatcher:
         # or anything unresolvable widens to all published grades for the subject —
         # never abstain just because the grade is coarse.
         grade_keys = await self._resolve_grades(subject, grade_level)
-        base: Dict = {
-            "subject": subject,
-            "grade": grade_keys,
-            "grade_requested": grade_level,
-            "n_candidates": 0,
-            "best_cosine": None,
-            "coherent": 0,
-            "top_k": [],
-            "verdict": "abstain",
-            "abstain_reason": None,
-            "mapping": None,
-            "tau": _TAU,
-            "min_coherent": _MIN_COHERENT,
-        }
-
+        base = self._probe_base(subject, grade_keys, grade_level)
         if not grade_keys:
-            base["abstain_reason"] = "no_scope"
-            logger.info(
-                f"[CURRICULUM_RETRIEVAL] No published grades for {subject} "
-                f"(requested={grade_level!r}) — abstaining"
-            )
             return base
 
         try:
@@ -341,15 +335,7 @@ class CurriculumRetrievalMatcher:
                 "unit_id": nodes[attr_i][4], "unit_title": nodes[attr_i][5],
             }
 
-            # Gate on unit dominance; a moderate unit peak additionally needs a pinned skill.
-            if best < _TAU:
-                reason = "weak"
-            elif coherent < _MIN_COHERENT:
-                reason = "diffuse"        # top-k spread across unrelated units — no home
-            elif coherent < _STRONG_UNIT and coherent_skill < _MIN_COHERENT_SKILL:
-                reason = "scattered"      # moderate unit peak, no skill pinned — under-informed query
-            else:
-                reason = None
+            reason = _abstain_reason(best, coherent, coherent_skill)
             per_grade.append({
                 "grade": gk,
                 "best": best,
@@ -368,6 +354,155 @@ class CurriculumRetrievalMatcher:
                 ],
             })
 
+        return self._finalize(base, per_grade, total_candidates, primitive_type)
+
+    async def probe_many(self, queries: Sequence[Dict]) -> List[Dict]:
+        """Batch `probe()`: one result per query, same verdicts, in order.
+
+        Each query is a dict of probe()'s keyword arguments (subject,
+        grade_level, query_text, primitive_type). All query texts are embedded
+        in one request; each subject's candidate grade matrices are stacked
+        and scored against every query of that subject with a single matrix
+        multiply, and the top-k / coherence gate runs vectorized per grade.
+        Sweeps and regression suites use this; `match()` keeps the single path.
+        """
+        results: List[Optional[Dict]] = [None] * len(queries)
+        scopes: List[List[str]] = []
+        for n, q in enumerate(queries):
+            grade_keys = await self._resolve_grades(q["subject"], q.get("grade_level"))
+            scopes.append(grade_keys)
+            results[n] = self._probe_base(q["subject"], grade_keys, q.get("grade_level"))
+        live = [n for n, grade_keys in enumerate(scopes) if grade_keys]
+        if not live:
+            return results
+
+        texts = list(dict.fromkeys(queries[n]["query_text"] for n in live))
+        try:
+            qmat = await asyncio.to_thread(self._embed, texts)
+        except Exception as e:
+            logger.warning(f"[CURRICULUM_RETRIEVAL] Batch query embedding failed: {e}")
+            for n in live:
+                results[n]["abstain_reason"] = "embed_error"
+            return results
+        row_of = {text: r for r, text in enumerate(texts)}
+
+        by_subject: Dict[str, List[int]] = {}
+        for n in live:
+            by_subject.setdefault(queries[n]["subject"], []).append(n)
+
+        for subject, members in by_subject.items():
+            grades = list(dict.fromkeys(gk for n in members for gk in scopes[n]))
+            blocks, matrices, offset = [], [], 0
+            for gk in grades:
+                nodes, matrix = await self._node_matrix(subject, gk)
+                if not nodes or matrix is None:
+                    continue
+                blocks.append((gk, nodes, offset, offset + len(nodes)))
+                matrices.append(matrix)
+                offset += len(nodes)
+
+            per_grade: Dict[int, List[Dict]] = {n: [] for n in members}
+            totals: Dict[int, int] = {n: 0 for n in members}
+            if blocks:
+                sims = qmat[[row_of[queries[n]["query_text"]] for n in members]] @ np.vstack(matrices).T
+                for gk, nodes, start, end in blocks:
+                    rows = [r for r, n in enumerate(members) if gk in scopes[n]]
+                    if not rows:
+                        continue
+                    for r, entry in zip(rows, self._score_grade_batch(nodes, sims[rows, start:end], gk)):
+                        per_grade[members[r]].append(entry)
+                        totals[members[r]] += len(nodes)
+
+            for n in members:
+                per_grade[n].sort(key=lambda g: scopes[n].index(g["grade"]))
+                results[n] = self._finalize(
+                    results[n], per_grade[n], totals[n], queries[n].get("primitive_type", "")
+                )
+        return results
+
+    @staticmethod
+    def _probe_base(subject: str, grade_keys: List[str], grade_level: Optional[str]) -> Dict:
+        """The abstaining result skeleton probe() fills in."""
+        base: Dict = {
+            "subject": subject,
+            "grade": grade_keys,
+            "grade_requested": grade_level,
+            "n_candidates": 0,
+            "best_cosine": None,
+            "coherent": 0,
+            "top_k": [],
+            "verdict": "abstain",
+            "abstain_reason": None,
+            "mapping": None,
+            "tau": _TAU,
+            "min_coherent": _MIN_COHERENT,
+        }
+        if not grade_keys:
+            base["abstain_reason"] = "no_scope"
+            logger.info(
+                f"[CURRICULUM_RETRIEVAL] No published grades for {subject} "
+                f"(requested={grade_level!r}) — abstaining"
+            )
+        return base
+
+    @staticmethod
+    def _score_grade_batch(nodes: List[Tuple], sims: np.ndarray, grade: str) -> List[Dict]:
+        """Per-grade entries for every row of `sims` (queries x this grade's nodes).
+
+        The vectorized twin of probe()'s per-grade loop: top-k, UNIT coherence,
+        dominant-SKILL votes and the attribution row are computed for all
+        queries at once, then gated by the same `_abstain_reason`.
+        """
+        unit_ids: Dict[str, int] = {}
+        skill_ids: Dict[str, int] = {}
+        unit_codes = np.array([unit_ids.setdefault(_skill_family(n[0]), len(unit_ids)) for n in nodes])
+        skill_codes = np.array([skill_ids.setdefault(n[0], len(skill_ids)) for n in nodes])
+
+        rows = np.arange(sims.shape[0])
+        order = np.argsort(-sims, axis=1)[:, :_TOP_K]                  # cosine-desc per query
+        units = unit_codes[order]
+        in_unit = units == units[:, :1]                                 # shares the top-1's UNIT
+        coherent = in_unit.sum(axis=1)
+        skills = skill_codes[order]
+        # votes[q, j]: unit members of query q sharing position j's skill (0 outside the unit).
+        same_skill = (skills[:, :, None] == skills[:, None, :]) & in_unit[:, None, :]
+        votes = np.where(in_unit, same_skill.sum(axis=2), 0)
+        coherent_skill = votes.max(axis=1)
+        # First position with the most votes == dominant skill, ties to best cosine,
+        # at its top-ranked instance.
+        attr_rows = order[rows, votes.argmax(axis=1)]
+        best = sims[rows, order[:, 0]]
+
+        entries = []
+        for q in range(sims.shape[0]):
+            a = nodes[attr_rows[q]]
+            entries.append({
+                "grade": grade,
+                "best": float(best[q]),
+                "coherent": int(coherent[q]),
+                "coherent_skill": int(coherent_skill[q]),
+                "reason": _abstain_reason(float(best[q]), int(coherent[q]), int(coherent_skill[q])),
+                "attr": {
+                    "cosine": round(float(sims[q, attr_rows[q]]), 4),
+                    "skill_id": a[0], "skill_description": a[1],
+                    "subskill_id": a[2], "subskill_description": a[3],
+                    "unit_id": a[4], "unit_title": a[5],
+                },
+                "top_k": [
+                    {
+                        "rank": rank, "cosine": round(float(sims[q, i]), 4),
+                        "skill_id": nodes[i][0], "skill_description": nodes[i][1],
+                        "subskill_id": nodes[i][2], "subskill_description": nodes[i][3],
+                        "grade": grade,
+                    }
+                    for rank, i in enumerate(order[q], 1)
+                ],
+            })
+        return entries
+
+    def _finalize(self, base: Dict, per_grade: List[Dict], total_candidates: int, primitive_type: str) -> Dict:
+        """Pick the best home across the scored grades and write the verdict into `base`."""
+        subject, grade_keys = base["subject"], base["grade"]
         base["n_candidates"] = total_candidates
         if not per_grade:
             base["abstain_reason"] = "no_scope"
@@ -421,6 +556,20 @@ class CurriculumRetrievalMatcher:
         )
         return base
 
+    async def warm(self) -> int:
+        """Embed every published (subject, grade) subskill matrix concurrently.
+
+        Startup warm-up hook; returns how many matrices are cached.
+        """
+        subjects = await self.curriculum_service.get_available_subjects()
+        scopes = {
+            (s.get("subject_id") or s.get("subject_name", ""), s["grade"])
+            for s in subjects
+            if isinstance(s, dict) and s.get("grade")
+        }
+        loaded = await asyncio.gather(*(self._node_matrix(subject, grade) for subject, grade in scopes))
+        return sum(1 for _, matrix in loaded if matrix is not None)
+
     def clear_cache(self) -> None:
         self._embed_cache.clear()
         self._grade_keys_cache.clear()
@@ -434,7 +583,8 @@ class CurriculumRetrievalMatcher:
         if self._client is None:
             from google import genai
             from app.core.config import settings
-            self._client = genai.Client(api_key=settings.GEMINI_API_KEY)
+            from app.services.model_governor import govern_genai_client
+            self._client = govern_genai_client(genai.Client(api_key=settings.GEMINI_API_KEY))
         return self._client
 
     async def _published_grade_keys(self, subject: str) -> List[str]:
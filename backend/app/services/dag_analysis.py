@@ -3,7 +3,10 @@ DAG Analysis Engine — Pure Graph Algorithms for Curriculum DAGs
 
 Stateless, IO-free analysis of curriculum prerequisite graphs (DAGs).
 All methods are static/pure: given nodes + edges, produce topological
-metrics, probe selections, and inference propagations.
+metrics, probe selections, and inference propagations. Structures derived
+from a whole graph (reachability index) are memoized in `graph_cache`,
+keyed by graph fingerprint, so repeated queries against one graph version
+do not rebuild them.
 
 Used by PulseEngine for cold-start probes, leapfrog ancestor walks,
 and frontier computation.
@@ -12,20 +15,29 @@ Key algorithms:
   - Kahn's topological sort
   - Longest-path depth/height via DP on topological order
   - BFS ancestor/descendant traversal for inference propagation
+  - Transitive-closure bitsets (ReachabilityIndex) for repeated
+    ancestor/descendant queries against one graph version
   - Union-Find for connected component (independent chain) detection
   - Midpoint selection for initial + adaptive probe placement
 """
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
+import hashlib
+import json
+import threading
+from collections import OrderedDict, defaultdict, deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 # Default number of items per probe
 DEFAULT_PROBE_ITEMS = 3
 
+# Graph versions kept in the derived-structure cache. Each entry is one
+# (subject, version) worth of indexes — a handful of subjects in practice.
+GRAPH_CACHE_MAX_ENTRIES = 32
+
 
 class DiagnosticStatus(str, Enum):
     """Classification status for a subskill during DAG inference."""
@@ -45,6 +57,22 @@ class NodeMetrics:
     chain_length: int = 0
 
 
+@dataclass(frozen=True)
+class DAGStructure:
+    """Student-independent structure of one prerequisite DAG version.
+
+    Everything here depends only on the graph, so it is computed once per
+    fingerprint (DAGAnalysisEngine.structure) and shared across sessions.
+    Treat as read-only.
+    """
+    fingerprint: str
+    topo_order: List[str]
+    metrics: Dict[str, NodeMetrics]
+    chains: List[List[str]]
+    max_depth: int
+    descendant_counts: Dict[str, int]
+
+
 @dataclass
 class ProbeRequest:
     """A request to probe a specific subskill."""
@@ -76,6 +104,247 @@ class InferenceMade:
     new_status: DiagnosticStatus
 
 
+def graph_fingerprint(nodes: Iterable[Dict], edges: Iterable[Dict]) -> str:
+    """Content hash identifying one graph version.
+
+    Order-insensitive over node IDs and edge (source, target, prerequisite
+    flag, relationship) tuples — the fields every derived index depends on.
+    """
+    node_ids = sorted({n["id"] for n in nodes})
+    edge_keys = sorted(
+        (
+            e["source"],
+            e["target"],
+            str(e.get("is_prerequisite", "")),
+            str(e.get("relationship", "")),
+        )
+        for e in edges
+    )
+    payload = json.dumps([node_ids, edge_keys], separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class _GraphCache:
+    """Bounded LRU of structures derived from a graph version.
+
+    Keys are (fingerprint, kind, ...) tuples; values are immutable once
+    built. Builds run outside the lock — two threads racing on a cold key
+    both build and the second store wins, which is harmless.
+    """
+
+    def __init__(self, max_entries: int = GRAPH_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Tuple, build: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+graph_cache = _GraphCache()
+
+
+class ReachabilityIndex:
+    """
+    Transitive closure of a directed graph as per-node bitsets.
+
+    Built once per graph version; afterwards "all prerequisites of X" and
+    "all dependents of X" are a dict lookup plus O(result) bit decoding,
+    and set algebra over node groups (union of ancestors for a probe
+    group, intersection with an unknown set) is integer OR/AND.
+
+    Cycles are allowed (the full knowledge graph has parallel edges):
+    closure is computed over strongly connected components in topological
+    order, so results match the BFS in get_ancestors/get_descendants —
+    a node on a cycle is its own ancestor and descendant.
+    """
+
+    def __init__(self, node_ids: Iterable[str], edges: List[Dict]):
+        ids: Dict[str, int] = {}
+        for nid in node_ids:
+            ids.setdefault(nid, len(ids))
+        for edge in edges:
+            ids.setdefault(edge["source"], len(ids))
+            ids.setdefault(edge["target"], len(ids))
+        self._pos = ids
+        self._ids: List[str] = list(ids)
+
+        succ: List[List[int]] = [[] for _ in self._ids]
+        for edge in edges:
+            succ[ids[edge["source"]]].append(ids[edge["target"]])
+
+        comp, comps = self._strongly_connected(succ)
+
+        # Tarjan emits components sinks-first (reverse topological order).
+        comp_succ: List[Set[int]] = [set() for _ in comps]
+        cyclic = [len(members) > 1 for members in comps]
+        for v, targets in enumerate(succ):
+            for w in targets:
+                if comp[v] == comp[w]:
+                    cyclic[comp[v]] = True
+                else:
+                    comp_succ[comp[v]].add(comp[w])
+        comp_pred: List[Set[int]] = [set() for _ in comps]
+        for c, targets in enumerate(comp_succ):
+            for d in targets:
+                comp_pred[d].add(c)
+
+        member_bits = [0] * len(comps)
+        for c, members in enumerate(comps):
+            for v in members:
+                member_bits[c] |= 1 << v
+
+        desc = [0] * len(comps)
+        for c in range(len(comps)):  # sinks first
+            bits = member_bits[c] if cyclic[c] else 0
+            for d in comp_succ[c]:
+                bits |= desc[d] | member_bits[d]
+            desc[c] = bits
+
+        anc = [0] * len(comps)
+        for c in reversed(range(len(comps))):  # sources first
+            bits = member_bits[c] if cyclic[c] else 0
+            for p in comp_pred[c]:
+                bits |= anc[p] | member_bits[p]
+            anc[c] = bits
+
+        self._anc_bits = [anc[comp[v]] for v in range(len(self._ids))]
+        self._desc_bits = [desc[comp[v]] for v in range(len(self._ids))]
+
+    @staticmethod
+    def _strongly_connected(succ: List[List[int]]) -> Tuple[List[int], List[List[int]]]:
+        """Iterative Tarjan. Returns (component of each vertex, components)."""
+        n = len(succ)
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        comp = [-1] * n
+        comps: List[List[int]] = []
+        counter = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, 0)]
+            while work:
+                v, i = work[-1]
+                if i < len(succ[v]):
+                    work[-1] = (v, i + 1)
+                    w = succ[v][i]
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, 0))
+                    elif on_stack[w]:
+                        low[v] = min(low[v], index[w])
+                    continue
+                work.pop()
+                if low[v] == index[v]:
+                    members = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp[w] = len(comps)
+                        members.append(w)
+                        if w == v:
+                            break
+                    comps.append(members)
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[v])
+
+        return comp, comps
+
+    # -- bit helpers -----------------------------------------------------
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._pos
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def bits_of(self, node_ids: Iterable[str]) -> int:
+        """Bitmap of the given node IDs (unknown IDs are ignored)."""
+        bits = 0
+        for nid in node_ids:
+            pos = self._pos.get(nid)
+            if pos is not None:
+                bits |= 1 << pos
+        return bits
+
+    def to_ids(self, bits: int) -> Set[str]:
+        """Decode a bitmap into node IDs — O(popcount)."""
+        out: Set[str] = set()
+        while bits:
+            low = bits & -bits
+            out.add(self._ids[low.bit_length() - 1])
+            bits ^= low
+        return out
+
+    # -- queries ---------------------------------------------------------
+
+    def ancestor_bits(self, node_id: str) -> int:
+        pos = self._pos.get(node_id)
+        return self._anc_bits[pos] if pos is not None else 0
+
+    def descendant_bits(self, node_id: str) -> int:
+        pos = self._pos.get(node_id)
+        return self._desc_bits[pos] if pos is not None else 0
+
+    def ancestors(self, node_id: str) -> Set[str]:
+        """All transitive prerequisites of node_id (same result as get_ancestors)."""
+        return self.to_ids(self.ancestor_bits(node_id))
+
+    def descendants(self, node_id: str) -> Set[str]:
+        """All transitive dependents of node_id (same result as get_descendants)."""
+        return self.to_ids(self.descendant_bits(node_id))
+
+    def ancestors_of_all(self, node_ids: Iterable[str]) -> Set[str]:
+        """Union of ancestors over a node group, computed on bitmaps."""
+        bits = 0
+        for nid in node_ids:
+            bits |= self.ancestor_bits(nid)
+        return self.to_ids(bits)
+
+    def descendants_of_all(self, node_ids: Iterable[str]) -> Set[str]:
+        bits = 0
+        for nid in node_ids:
+            bits |= self.descendant_bits(nid)
+        return self.to_ids(bits)
+
+    def is_ancestor(self, ancestor_id: str, node_id: str) -> bool:
+        pos = self._pos.get(ancestor_id)
+        return pos is not None and bool(self.ancestor_bits(node_id) >> pos & 1)
+
+
 class DAGAnalysisEngine:
     """
     Stateless DAG analysis for diagnostic placement.
@@ -274,6 +543,55 @@ class DAGAnalysisEngine:
                 )
         return visited
 
+    @staticmethod
+    def reachability_index(
+        nodes: List[Dict],
+        edges: List[Dict],
+        fingerprint: Optional[str] = None,
+    ) -> ReachabilityIndex:
+        """
+        Transitive-closure index for this graph version, memoized by
+        fingerprint. Use it instead of get_ancestors/get_descendants when
+        querying more than one node against the same graph.
+        """
+        fp = fingerprint or graph_fingerprint(nodes, edges)
+        return graph_cache.get_or_build(
+            (fp, "reachability"),
+            lambda: ReachabilityIndex((n["id"] for n in nodes), edges),
+        )
+
+    @staticmethod
+    def structure(
+        nodes: List[Dict],
+        edges: List[Dict],
+        fingerprint: Optional[str] = None,
+    ) -> DAGStructure:
+        """
+        Topological order, node metrics, independent chains and descendant
+        counts for a prerequisite DAG, memoized by graph fingerprint.
+
+        Raises ValueError (uncached) if the graph contains a cycle.
+        """
+        fp = fingerprint or graph_fingerprint(nodes, edges)
+
+        def build() -> DAGStructure:
+            topo_order = DAGAnalysisEngine.topological_sort(nodes, edges)
+            metrics = DAGAnalysisEngine.compute_node_metrics(nodes, edges, topo_order)
+            index = DAGAnalysisEngine.reachability_index(nodes, edges, fingerprint=fp)
+            return DAGStructure(
+                fingerprint=fp,
+                topo_order=topo_order,
+                metrics=metrics,
+                chains=DAGAnalysisEngine.identify_independent_chains(nodes, edges),
+                max_depth=max((m.depth for m in metrics.values()), default=0),
+                descendant_counts={
+                    nid: bin(index.descendant_bits(nid)).count("1")
+                    for nid in topo_order
+                },
+            )
+
+        return graph_cache.get_or_build((fp, "structure"), build)
+
     # ------------------------------------------------------------------
     # Connected components (independent chains)
     # ------------------------------------------------------------------
@@ -326,10 +644,13 @@ class DAGAnalysisEngine:
         nodes: List[Dict],
         edges: List[Dict],
         max_probes: int = 5,
+        chains: Optional[List[List[str]]] = None,
     ) -> List[ProbeRequest]:
         """
         Select initial probe points — one midpoint per independent chain.
 
+        Pass `chains` (e.g. DAGStructure.chains) to skip the Union-Find.
+
         Algorithm:
         1. Find independent chains (connected components)
         2. For each chain, find the node closest to chain_length / 2
@@ -340,7 +661,8 @@ class DAGAnalysisEngine:
         Each ProbeRequest includes a human-readable `reason` for transparency.
         """
         node_map = {n["id"]: n for n in nodes}
-        chains = DAGAnalysisEngine.identify_independent_chains(nodes, edges)
+        if chains is None:
+            chains = DAGAnalysisEngine.identify_independent_chains(nodes, edges)
 
         probes: List[ProbeRequest] = []
 
@@ -396,6 +718,7 @@ class DAGAnalysisEngine:
         passed: bool,
         edges: List[Dict],
         classifications: Dict[str, SubskillClassification],
+        index: Optional[ReachabilityIndex] = None,
     ) -> Tuple[Dict[str, SubskillClassification], List[InferenceMade]]:
         """
         Propagate inference from a probe result.
@@ -406,6 +729,9 @@ class DAGAnalysisEngine:
         NEVER overwrites a PROBED status (probed_mastered / probed_not_mastered)
         with an inferred status.  Direct evidence always wins.
 
+        Pass the graph's ReachabilityIndex when the caller already holds one;
+        without it this single query is a BFS over edges.
+
         Returns:
             (updated_classifications, inferences_made)
         """
@@ -413,7 +739,10 @@ class DAGAnalysisEngine:
 
         if passed:
             # Upward inference: ancestors are mastered
-            ancestors = DAGAnalysisEngine.get_ancestors(probed_node_id, edges)
+            ancestors = (
+                index.ancestors(probed_node_id) if index is not None
+                else DAGAnalysisEngine.get_ancestors(probed_node_id, edges)
+            )
             for ancestor_id in ancestors:
                 if ancestor_id in classifications:
                     current = classifications[ancestor_id].status
@@ -432,8 +761,9 @@ class DAGAnalysisEngine:
                         ))
         else:
             # Downward inference: descendants are not mastered
-            descendants = DAGAnalysisEngine.get_descendants(
-                probed_node_id, edges,
+            descendants = (
+                index.descendants(probed_node_id) if index is not None
+                else DAGAnalysisEngine.get_descendants(probed_node_id, edges)
             )
             for desc_id in descendants:
                 if desc_id in classifications:
@@ -469,6 +799,7 @@ class DAGAnalysisEngine:
         last_probed_id: str,
         last_passed: bool,
         max_probes: int = 3,
+        index: Optional[ReachabilityIndex] = None,
     ) -> List[ProbeRequest]:
         """
         Select next probes after receiving a probe result.
@@ -479,6 +810,9 @@ class DAGAnalysisEngine:
         3. Fallback: if no UNKNOWN nodes in that direction, pick midpoints
            of the longest remaining UNKNOWN chains anywhere in the graph
 
+        Ancestor/descendant lookups use index when given, else BFS over
+        edges (a handful of queries — cheaper than fingerprinting the graph).
+
         Returns up to max_probes ProbeRequests.
         """
         node_map = {n["id"]: n for n in nodes}
@@ -492,19 +826,21 @@ class DAGAnalysisEngine:
         if not unknown_ids:
             return []
 
+        if index is not None:
+            ancestors_of, descendants_of = index.ancestors, index.descendants
+        else:
+            ancestors_of = lambda nid: DAGAnalysisEngine.get_ancestors(nid, edges)
+            descendants_of = lambda nid: DAGAnalysisEngine.get_descendants(nid, edges)
+
         # Directional search
         if last_passed:
             # Look among UNKNOWN descendants
-            descendants = DAGAnalysisEngine.get_descendants(
-                last_probed_id, edges,
-            )
+            descendants = descendants_of(last_probed_id)
             candidates = unknown_ids & descendants
             direction = "deeper"
         else:
             # Look among UNKNOWN ancestors
-            ancestors = DAGAnalysisEngine.get_ancestors(
-                last_probed_id, edges,
-            )
+            ancestors = ancestors_of(last_probed_id)
             candidates = unknown_ids & ancestors
             direction = "shallower"
 
@@ -568,8 +904,8 @@ class DAGAnalysisEngine:
 
             # Exclude ancestors and descendants of this probe to diversify
             used_ids.add(m.node_id)
-            used_ids |= DAGAnalysisEngine.get_ancestors(m.node_id, edges)
-            used_ids |= DAGAnalysisEngine.get_descendants(m.node_id, edges)
+            used_ids |= ancestors_of(m.node_id)
+            used_ids |= descendants_of(m.node_id)
 
         return probes
 
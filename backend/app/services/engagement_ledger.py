@@ -0,0 +1,475 @@
+# backend/app/services/engagement_ledger.py
+"""XP / streak accounting for EngagementService.
+
+process_activity used to read the profile, compute new absolute totals, and
+hand them to a per-activity background write that read the profile again and
+overwrote total_xp/current_streak. Two activities in flight at once both
+started from the same total, so one of them lost its XP, and every activity
+cost two profile reads plus a write.
+
+  cached     — each user's XP/level/streak is loaded once and then advanced
+               in memory under a per-user lock, so activities from one
+               process are computed in order and without a profile read.
+  coalesced  — activities are queued per user and written by one debounced
+               job (`engagement_profile:{uid}`): a burst of activities is a
+               single profile write.
+  conditional— the write re-reads the profile and applies the batch as
+               deltas (XP added, streak advanced per activity date), then
+               replaces it only if its etag is unchanged; on conflict it
+               re-reads and re-applies. The doc remembers the ids of recently
+               applied activities, so a retried batch is never counted twice.
+  replayable — activity docs carry their xp_earned and are written before
+               the profile, so rebuild() can recompute the totals from the
+               activity log alone.
+  counters   — the same write keeps `engagement_counters` on the profile:
+               XP per UTC day (last COUNTER_DAYS days), activity counts by
+               type and an accuracy sum, so user stats come from the profile
+               instead of a scan of recent activities. Profiles created
+               before the counters existed get them from backfill_counters()
+               (counters only — totals are left alone) or rebuild(); until
+               then flushes leave them absent rather than partial.
+
+The cache is a read model: another instance's writes show up once a user's
+snapshot is older than snapshot_ttl_s and nothing is pending for them. The
+stored totals never depend on it. It holds at most max_cached_users users
+(least recently used are dropped once idle). A failed flush keeps its batch
+and retries on its own with exponential backoff.
+"""
+
+import asyncio
+import copy
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .background_jobs import BackgroundJobRunner, get_background_jobs
+
+logger = logging.getLogger(__name__)
+
+APPLIED_IDS_KEPT = 200
+MAX_CACHED_USERS = 10_000
+RETRY_MAX_DELAY_S = 300.0
+COUNTER_DAYS = 31  # covers the 30-day "month" window
+
+
+def empty_counters() -> Dict[str, Any]:
+    return {"activities": 0, "by_type": {}, "daily_xp": {}, "accuracy_sum": 0.0, "accuracy_count": 0}
+
+
+def xp_windows(counters: Dict[str, Any], today: date) -> Dict[str, int]:
+    """XP earned today, over the last 7 and over the last 30 UTC days (today included)."""
+    daily = counters.get("daily_xp") or {}
+    windows = {"today": 0, "week": 0, "month": 0}
+    for day, xp in daily.items():
+        age = (today - date.fromisoformat(day)).days
+        if 0 <= age < 30:
+            windows["month"] += xp
+            if age < 7:
+                windows["week"] += xp
+            if age == 0:
+                windows["today"] += xp
+    return windows
+
+
+def _parse_dt(value: Any) -> Optional[datetime]:
+    # Stored timestamps are naive UTC (datetime.utcnow().isoformat()).
+    if isinstance(value, str) and value:
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return None
+
+
+@dataclass
+class EngagementState:
+    """XP/level/streak for one user (duck-types the UserProfile fields the
+    EngagementService helpers read)."""
+
+    total_xp: int = 0
+    current_level: int = 1
+    xp_for_next_level: int = 100
+    current_streak: int = 0
+    longest_streak: int = 0
+    last_activity_date: Optional[datetime] = None
+    counters: Optional[Dict[str, Any]] = None  # None: not yet backfilled
+    loaded_at: float = 0.0
+
+    @classmethod
+    def from_doc(cls, doc: Dict[str, Any], loaded_at: float = 0.0) -> "EngagementState":
+        return cls(
+            total_xp=doc.get("total_xp", doc.get("total_points", 0)) or 0,
+            current_level=doc.get("current_level", doc.get("level", 1)) or 1,
+            xp_for_next_level=doc.get("xp_for_next_level", 100),
+            current_streak=doc.get("current_streak", 0) or 0,
+            longest_streak=doc.get("longest_streak", 0) or 0,
+            last_activity_date=_parse_dt(doc.get("last_activity_date")) or _parse_dt(doc.get("last_activity")),
+            counters=copy.deepcopy(doc.get("engagement_counters")),
+            loaded_at=loaded_at,
+        )
+
+    def apply(self, entry: Dict[str, Any]) -> None:
+        """Advance by one activity: add its XP, move the streak on its date.
+
+        The streak moves on the activity's own timestamp (consecutive UTC
+        days extend it, a gap restarts it at 1), so replays and late batches
+        agree. An activity older than the last one recorded adds XP only.
+        """
+        xp = int(entry.get("xp_earned", entry.get("points_earned", 0)) or 0)
+        self.total_xp += xp
+        at = _parse_dt(entry.get("timestamp"))
+        if self.counters is not None:
+            self._count(entry, xp, at)
+        if at is None:
+            return
+        last = self.last_activity_date
+        if last is None or at.date() > last.date():
+            if last is not None and last.date() == at.date() - timedelta(days=1):
+                self.current_streak += 1
+            else:
+                self.current_streak = 1
+            self.longest_streak = max(self.longest_streak, self.current_streak)
+        if last is None or at > last:
+            self.last_activity_date = at
+
+    def _count(self, entry: Dict[str, Any], xp: int, at: Optional[datetime]) -> None:
+        counters = self.counters
+        counters["activities"] += 1
+        activity_type = entry.get("activity_type", "unknown")
+        counters["by_type"][activity_type] = counters["by_type"].get(activity_type, 0) + 1
+        if entry.get("accuracy_percentage") is not None:
+            counters["accuracy_sum"] += entry["accuracy_percentage"]
+            counters["accuracy_count"] += 1
+        if at is not None:
+            day = at.date().isoformat()
+            counters["daily_xp"][day] = counters["daily_xp"].get(day, 0) + xp
+
+    def prune_counters(self, today: date) -> None:
+        if self.counters is None:
+            return
+        oldest = (today - timedelta(days=COUNTER_DAYS - 1)).isoformat()
+        self.counters["daily_xp"] = {day: xp for day, xp in sorted(self.counters["daily_xp"].items()) if day >= oldest}
+
+
+class EngagementLedger:
+    """Per-user cached engagement state with coalesced, etag-guarded writes."""
+
+    def __init__(
+        self,
+        level_for: Callable[[int], int],
+        xp_for_next_level: Callable[[int, int], int],
+        store=None,
+        jobs: Optional[BackgroundJobRunner] = None,
+        debounce_s: float = 2.0,
+        snapshot_ttl_s: float = 300.0,
+        max_conflict_retries: int = 8,
+        max_cached_users: int = MAX_CACHED_USERS,
+    ):
+        # store: user_profiles_service-shaped (get_profile_document,
+        # replace_profile_document_if_unchanged, upsert_activity_log_entries,
+        # get_all_user_activities). Resolved lazily — the default singleton
+        # connects to Cosmos on import.
+        self._store = store
+        self.level_for = level_for
+        self.xp_for_next_level = xp_for_next_level
+        self._jobs = jobs
+        self.debounce_s = debounce_s
+        self.snapshot_ttl_s = snapshot_ttl_s
+        self.max_conflict_retries = max_conflict_retries
+        self.max_cached_users = max_cached_users
+        # LRU order: least recently used first
+        self._locks: "OrderedDict[str, asyncio.Lock]" = OrderedDict()
+        self._states: "OrderedDict[str, EngagementState]" = OrderedDict()
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._in_flight: Dict[str, List[Dict[str, Any]]] = {}  # batch being flushed
+        self._failures: Dict[str, int] = {}  # consecutive failed flushes
+        self._counters = {
+            "recorded": 0,
+            "snapshot_loads": 0,
+            "flushes": 0,
+            "activities_written": 0,
+            "conflicts": 0,
+            "already_applied": 0,
+            "flush_failed": 0,
+            "rebuilds": 0,
+            "counter_backfills": 0,
+            "flush_retries": 0,
+            "evicted": 0,
+        }
+
+    @property
+    def store(self):
+        if self._store is None:
+            from .user_profiles import user_profiles_service
+            self._store = user_profiles_service
+        return self._store
+
+    @property
+    def jobs(self) -> BackgroundJobRunner:
+        if self._jobs is None:
+            self._jobs = get_background_jobs()
+        return self._jobs
+
+    def lock(self, uid: str) -> asyncio.Lock:
+        """Serializes snapshot() → record() for one user within this process."""
+        lock = self._locks.get(uid)
+        if lock is None:
+            lock = self._locks[uid] = asyncio.Lock()
+            self._evict(self._locks, keep=uid)
+        else:
+            self._locks.move_to_end(uid)
+        return lock
+
+    def _cache(self, uid: str, state: EngagementState) -> EngagementState:
+        self._states[uid] = state
+        self._states.move_to_end(uid)
+        self._evict(self._states, keep=uid)
+        self._evict(self._locks, keep=uid)
+        return state
+
+    def _evict(self, cache: "OrderedDict[str, Any]", keep: str) -> None:
+        """Drop least recently used users beyond max_cached_users, skipping
+        `keep` and any user with unwritten activities or a held lock."""
+        excess = len(cache) - self.max_cached_users
+        if excess <= 0:
+            return
+        victims = []
+        for uid in cache:
+            lock = self._locks.get(uid)
+            if uid == keep or uid in self._pending or uid in self._in_flight or (lock is not None and lock.locked()):
+                continue
+            victims.append(uid)
+            if len(victims) == excess:
+                break
+        for uid in victims:
+            del cache[uid]
+        self._counters["evicted"] += len(victims)
+
+    # ------------------------------------------------------------------
+    # Read model
+    # ------------------------------------------------------------------
+
+    def _with_pending(self, uid: str, doc: Dict[str, Any]) -> EngagementState:
+        state = EngagementState.from_doc(doc, loaded_at=asyncio.get_running_loop().time())
+        applied = set(doc.get("engagement_applied_ids") or ())
+        for entry in [*self._in_flight.get(uid, ()), *self._pending.get(uid, ())]:
+            if entry["id"] not in applied:
+                state.apply(entry)
+        self._finish(state)
+        return state
+
+    def _finish(self, state: EngagementState) -> None:
+        state.current_level = self.level_for(state.total_xp)
+        state.xp_for_next_level = self.xp_for_next_level(state.current_level, state.total_xp)
+
+    async def snapshot(self, uid: str) -> Optional[EngagementState]:
+        """Current state for `uid` (None if the user has no profile).
+
+        Call under lock(uid). Reads the profile only on first use and when
+        the cached copy has expired with nothing pending.
+        """
+        state = self._states.get(uid)
+        now = asyncio.get_running_loop().time()
+        unwritten = self._pending.get(uid) or self._in_flight.get(uid)
+        if state is not None and (unwritten or now - state.loaded_at < self.snapshot_ttl_s):
+            self._states.move_to_end(uid)
+            return state
+        doc = await self.store.get_profile_document(uid)
+        self._counters["snapshot_loads"] += 1
+        if doc is None:
+            self._states.pop(uid, None)
+            return None
+        return self._cache(uid, self._with_pending(uid, doc))
+
+    def record(self, uid: str, entry: Dict[str, Any]) -> EngagementState:
+        """Apply one activity doc to the cached state and queue it for writing.
+
+        Call under lock(uid), after snapshot(). `entry` must carry `id`,
+        `timestamp` and `xp_earned`.
+        """
+        state = self._states[uid]
+        state.apply(entry)
+        self._finish(state)
+        self._pending.setdefault(uid, []).append(entry)
+        self._counters["recorded"] += 1
+        self._schedule(uid)
+        return state
+
+    def _schedule(self, uid: str) -> None:
+        self.jobs.submit(f"engagement_profile:{uid}", lambda: self.flush(uid), debounce_s=self.debounce_s)
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    def _apply_to_doc(self, doc: Dict[str, Any], entries: Iterable[Dict[str, Any]]) -> None:
+        applied_ids = list(doc.get("engagement_applied_ids") or [])
+        seen = set(applied_ids)
+        state = EngagementState.from_doc(doc)
+        for entry in entries:
+            if entry["id"] in seen:
+                self._counters["already_applied"] += 1
+                continue
+            state.apply(entry)
+            applied_ids.append(entry["id"])
+            seen.add(entry["id"])
+        self._finish(state)
+        self._write_state(doc, state)
+        doc["engagement_applied_ids"] = applied_ids[-APPLIED_IDS_KEPT:]
+
+    @staticmethod
+    def _write_state(doc: Dict[str, Any], state: EngagementState) -> None:
+        now = datetime.utcnow()
+        doc.update({
+            "total_xp": state.total_xp,
+            "current_level": state.current_level,
+            "xp_for_next_level": state.xp_for_next_level,
+            "current_streak": state.current_streak,
+            "longest_streak": state.longest_streak,
+            "updated_at": now.isoformat(),
+        })
+        if state.counters is not None:
+            state.prune_counters(now.date())
+            doc["engagement_counters"] = state.counters
+        if state.last_activity_date is not None:
+            doc["last_activity_date"] = state.last_activity_date.isoformat()
+            doc["last_activity"] = state.last_activity_date.isoformat()
+
+    async def _replace_with_retry(self, uid: str, mutate: Callable[[Dict[str, Any]], Any]) -> Optional[Dict[str, Any]]:
+        for _ in range(self.max_conflict_retries + 1):
+            doc = await self.store.get_profile_document(uid)
+            if doc is None:
+                return None
+            if await mutate(doc) is False:
+                return doc  # nothing to change
+            written = await self.store.replace_profile_document_if_unchanged(doc, doc.get("_etag"))
+            if written is not None:
+                return written
+            self._counters["conflicts"] += 1
+        raise RuntimeError(f"profile {uid} still conflicting after {self.max_conflict_retries} retries")
+
+    async def flush(self, uid: str) -> int:
+        """Write every queued activity for `uid`. Returns how many were written.
+
+        On failure the batch goes back to the front of the queue and a retry
+        is scheduled with exponential backoff (or it goes out earlier with
+        the user's next activity).
+        """
+        if uid in self._in_flight or not self._pending.get(uid):
+            return 0
+        batch = self._pending.pop(uid)
+        self._counters["flushes"] += 1
+        self._in_flight[uid] = batch
+        try:
+            await self.store.upsert_activity_log_entries(uid, batch)
+
+            async def apply(doc):
+                self._apply_to_doc(doc, batch)
+
+            written = await self._replace_with_retry(uid, apply)
+        except Exception as e:
+            del self._in_flight[uid]
+            self._pending[uid] = batch + self._pending.get(uid, [])
+            self._counters["flush_failed"] += 1
+            failures = self._failures[uid] = self._failures.get(uid, 0) + 1
+            delay = min(RETRY_MAX_DELAY_S, max(self.debounce_s, 0.01) * 2 ** failures)
+            logger.error(f"[ENGAGEMENT_LEDGER] Flush of {len(batch)} activities for {uid} failed "
+                         f"(attempt {failures}), retrying in {delay:.1f}s: {e}")
+            self._counters["flush_retries"] += 1
+            # Separate key: a submit to the running flush's own key would re-run it at once
+            self.jobs.submit(f"engagement_profile_retry:{uid}", lambda: self.flush(uid), debounce_s=delay)
+            return 0
+
+        del self._in_flight[uid]
+        self._failures.pop(uid, None)
+        if written is None:
+            logger.error(f"[ENGAGEMENT_LEDGER] Profile {uid} missing; {len(batch)} activities logged without totals")
+            self._states.pop(uid, None)
+            return 0
+        self._counters["activities_written"] += len(batch)
+        self._cache(uid, self._with_pending(uid, written))
+        logger.info(f"📈 [ENGAGEMENT_LEDGER] {uid}: {len(batch)} activities written "
+                    f"(total {written.get('total_xp')} XP, streak {written.get('current_streak')})")
+        return len(batch)
+
+    async def rebuild(self, uid: str, dry_run: bool = False) -> Optional[Dict[str, Any]]:
+        """Recompute a user's totals by replaying their activity log.
+
+        Returns {"before": {...}, "after": {...}} (None if the user has no
+        profile). With dry_run nothing is written.
+        """
+        await self.flush(uid)
+        result: Dict[str, Any] = {}
+
+        async def replay(doc):
+            activities = await self.store.get_all_user_activities(uid)
+            state = EngagementState(counters=empty_counters())
+            for activity in activities:
+                state.apply(activity)
+            self._finish(state)
+            result["before"] = {k: doc.get(k) for k in ("total_xp", "current_level", "current_streak", "longest_streak")}
+            self._write_state(doc, state)
+            doc["engagement_applied_ids"] = [a["id"] for a in activities[-APPLIED_IDS_KEPT:]]
+            result["after"] = {k: doc.get(k) for k in ("total_xp", "current_level", "current_streak", "longest_streak")}
+            result["activities"] = len(activities)
+
+        if dry_run:
+            doc = await self.store.get_profile_document(uid)
+            if doc is None:
+                return None
+            await replay(doc)
+            return result
+
+        written = await self._replace_with_retry(uid, replay)
+        if written is None:
+            return None
+        self._counters["rebuilds"] += 1
+        self._cache(uid, self._with_pending(uid, written))
+        return result
+
+    async def backfill_counters(self, uid: str) -> Optional[Dict[str, Any]]:
+        """Add `engagement_counters` to a profile from before they existed.
+
+        Replays the activity log into the counters ONLY: XP, level, streaks
+        and applied ids stay as stored, so this is safe on a read path.
+        Conditional on the etag and a no-op if the counters are already
+        there. Returns the profile doc (None if there is no profile).
+        """
+        await self.flush(uid)
+
+        async def fill(doc):
+            if doc.get("engagement_counters") is not None:
+                return False
+            # Activities after the profile's last applied one are still on
+            # their way to it; the flush that applies them counts them.
+            applied_through = _parse_dt(doc.get("last_activity_date")) or _parse_dt(doc.get("last_activity"))
+            state = EngagementState(counters=empty_counters())
+            for activity in await self.store.get_all_user_activities(uid):
+                at = _parse_dt(activity.get("timestamp"))
+                if applied_through is None or at is None or at > applied_through:
+                    continue
+                state._count(activity, int(activity.get("xp_earned", activity.get("points_earned", 0)) or 0), at)
+            state.prune_counters(datetime.utcnow().date())
+            doc["engagement_counters"] = state.counters
+
+        written = await self._replace_with_retry(uid, fill)
+        if written is not None:
+            self._counters["counter_backfills"] += 1
+            self._cache(uid, self._with_pending(uid, written))
+        return written
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "cached_users": len(self._states),
+            "pending_users": len(self._pending),
+            "pending_activities": sum(len(entries) for entries in self._pending.values()),
+        }
@@ -5,11 +5,13 @@ Implements the Student Engagement & Progression System as outlined in the PRD
 Optimized for async operations and minimal blocking
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Optional, Dict, Any, Tuple
 import logging
-import asyncio
+import uuid
 
+from .engagement_ledger import EngagementLedger
+from ..core.config import settings
 from ..models.user_profiles import ActivityLog, ActivityResponse
 
 logger = logging.getLogger(__name__)
@@ -21,7 +23,7 @@ class EngagementService:
     Implements the gamified progression system as per PRD
     """
     
-    def __init__(self):
+    def __init__(self, profile_store=None, jobs=None):
         # XP Configuration from PRD
         self.xp_config = {
             "problem_submitted_incorrect": 10,
@@ -49,6 +51,18 @@ class EngagementService:
         
         # Pre-calculate level thresholds for performance
         self._level_thresholds = self._precalculate_level_thresholds()
+        
+        # Cached XP/streak state with coalesced, conditional profile writes
+        # (profile_store defaults to user_profiles_service, jobs to the shared runner)
+        self.ledger = EngagementLedger(
+            level_for=self._get_level_from_xp,
+            xp_for_next_level=self._calculate_xp_for_next_level,
+            store=profile_store,
+            jobs=jobs,
+            debounce_s=settings.ENGAGEMENT_FLUSH_DEBOUNCE_S,
+            snapshot_ttl_s=settings.ENGAGEMENT_SNAPSHOT_TTL_S,
+            max_conflict_retries=settings.ENGAGEMENT_MAX_CONFLICT_RETRIES,
+        )
     
     async def process_activity(
         self,
@@ -59,56 +73,72 @@ class EngagementService:
     ) -> ActivityResponse:
         """
         Process activity and return complete engagement transaction data synchronously
-        Updates profile in background for performance
+        Profile totals are written by the engagement ledger in the background
         """
         try:
             metadata = metadata or {}
             
-            # Get current profile for accurate calculations
-            from ..services.user_profiles import user_profiles_service
-            user_profile = await user_profiles_service.get_user_profile(user_id)
-            
-            if not user_profile:
-                logger.error(f"User profile not found: {user_id}")
-                return ActivityResponse(
-                    activity_id=f"error_{datetime.utcnow().timestamp()}",
-                    xp_earned=0,
-                    points_earned=0,
-                    total_xp=0,
-                    level_up=False,
-                    badges_earned=[]
+            async with self.ledger.lock(user_id):
+                # Cached per-user state; the profile is only read on first use
+                state = await self.ledger.snapshot(user_id)
+                
+                if not state:
+                    logger.error(f"User profile not found: {user_id}")
+                    return ActivityResponse(
+                        activity_id=f"error_{datetime.utcnow().timestamp()}",
+                        xp_earned=0,
+                        points_earned=0,
+                        total_xp=0,
+                        level_up=False,
+                        badges_earned=[]
+                    )
+                
+                # Calculate complete engagement transaction
+                base_xp = self._calculate_base_xp(activity_type, metadata)
+                is_first_today = self._is_first_activity_today(state)
+                streak_bonus = self._calculate_streak_bonus(state.current_streak + 1) if is_first_today else 0
+                total_xp_earned = base_xp + streak_bonus
+                previous_level = state.current_level
+                previous_streak = state.current_streak
+                
+                now = datetime.utcnow()
+                activity_log = ActivityLog(
+                    activity_type=activity_type,
+                    activity_name=metadata.get('activity_name', activity_type.replace('_', ' ').title()),
+                    xp_earned=total_xp_earned,
+                    points_earned=total_xp_earned,
+                    metadata={
+                        **metadata,
+                        'base_xp': base_xp,
+                        'streak_bonus_xp': streak_bonus,
+                        'level_before': previous_level,
+                        'level_after': self._get_level_from_xp(state.total_xp + total_xp_earned)
+                    }
                 )
-            
-            # Calculate complete engagement transaction
-            base_xp = self._calculate_base_xp(activity_type, metadata)
-            is_first_today = self._is_first_activity_today(user_profile)
-            streak_bonus = self._calculate_streak_bonus(user_profile.current_streak + 1) if is_first_today else 0
-            total_xp_earned = base_xp + streak_bonus
-            
-            new_total_xp = user_profile.total_xp + total_xp_earned
-            new_level = self._get_level_from_xp(new_total_xp)
-            level_up = new_level > user_profile.current_level
-            new_streak = self._calculate_new_streak(user_profile, is_first_today)
-            
-            # Fire-and-forget profile update to avoid blocking the response
-            asyncio.create_task(
-                self._update_user_profile_async(user_id, student_id, activity_type, base_xp, metadata, 
-                                              new_total_xp, new_level, new_streak, total_xp_earned)
-            )
+                entry = {
+                    **activity_log.dict(),
+                    'id': str(uuid.uuid4()),
+                    'student_id': student_id,
+                    'timestamp': now.isoformat(),
+                    'created_at': now.isoformat(),
+                }
+                
+                # Queued for the coalesced, etag-guarded profile write
+                state = self.ledger.record(user_id, entry)
             
             # Return complete engagement transaction data for frontend animations
             return ActivityResponse(
-                activity_id=f"activity_{datetime.utcnow().timestamp()}",
+                activity_id=entry['id'],
                 xp_earned=total_xp_earned,
                 points_earned=total_xp_earned,  # Backward compatibility
-                total_xp=new_total_xp,
-                level_up=level_up,
-                new_level=new_level,
-                previous_level=user_profile.current_level,
+                total_xp=state.total_xp,
+                level_up=state.current_level > previous_level,
+                new_level=state.current_level,
+                previous_level=previous_level,
                 streak_bonus_xp=streak_bonus,
                 base_xp=base_xp,
-                current_streak=new_streak,
-                previous_streak=user_profile.current_streak,
+                current_streak=state.current_streak,
+                previous_streak=previous_streak,
                 badges_earned=[]
             )
             
@@ -124,88 +154,13 @@ class EngagementService:
                 badges_earned=[]
             )
     
-    async def _update_user_profile_async(
-        self,
-        user_id: str,
-        student_id: int,
-        activity_type: str,
-        base_xp: int,
-        metadata: Dict[str, Any],
-        new_total_xp: int = None,
-        new_level: int = None,
-        new_streak: int = None,
-        total_xp_earned: int = None
-    ):
-        """Background task to update user profile with pre-calculated values"""
-        try:
-            from ..services.user_profiles import user_profiles_service
-            
-            # Use pre-calculated values if provided (from synchronous calculation)
-            if new_total_xp is not None and new_level is not None and new_streak is not None:
-                # Use pre-calculated values for efficiency
-                xp_for_next = self._calculate_xp_for_next_level(new_level, new_total_xp)
-                streak_bonus = total_xp_earned - base_xp if total_xp_earned else 0
-                
-                # Get current profile for reference
-                user_profile = await user_profiles_service.get_user_profile(user_id)
-                if not user_profile:
-                    logger.error(f"User profile not found: {user_id}")
-                    return
-            else:
-                # Fallback: calculate values if not provided
-                user_profile = await user_profiles_service.get_user_profile(user_id)
-                if not user_profile:
-                    logger.error(f"User profile not found: {user_id}")
-                    return
-                
-                is_first_today = self._is_first_activity_today(user_profile)
-                streak_bonus = self._calculate_streak_bonus(user_profile.current_streak + 1) if is_first_today else 0
-                total_xp_earned = base_xp + streak_bonus
-                
-                new_total_xp = user_profile.total_xp + total_xp_earned
-                new_level = self._get_level_from_xp(new_total_xp)
-                xp_for_next = self._calculate_xp_for_next_level(new_level, new_total_xp)
-                new_streak = self._calculate_new_streak(user_profile, is_first_today)
-            
-            # Create activity log
-            activity_log = ActivityLog(
-                activity_type=activity_type,
-                activity_name=metadata.get('activity_name', activity_type.replace('_', ' ').title()),
-                xp_earned=total_xp_earned,
-                points_earned=total_xp_earned,
-                metadata={
-                    **metadata,
-                    'base_xp': base_xp,
-                    'streak_bonus_xp': streak_bonus,
-                    'level_before': user_profile.current_level,
-                    'level_after': new_level
-                }
-            )
-            
-            # Update profile (single batch update)
-            profile_updates = {
-                'total_xp': new_total_xp,
-                'current_level': new_level,
-                'xp_for_next_level': xp_for_next,
-                'current_streak': new_streak,
-                'longest_streak': max(user_profile.longest_streak, new_streak),
-                'last_activity_date': datetime.utcnow(),
-                'last_activity': datetime.utcnow()
-            }
-            
-            # Execute both operations concurrently
-            await asyncio.gather(
-                user_profiles_service.add_activity_log_entry(user_id, student_id, activity_log),
-                user_profiles_service.update_user_profile(user_id, profile_updates)
-            )
-            
-            logger.info(
-                f"📈 Profile updated: {user_id} - {activity_type} "
-                f"(+{total_xp_earned} XP, Level {new_level}, Streak {new_streak})"
-            )
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to update user profile async: {str(e)}")
+    async def rebuild_totals(self, user_id: str, dry_run: bool = False) -> Optional[Dict[str, Any]]:
+        """Recompute a user's XP, level and streaks from their activity log"""
+        return await self.ledger.rebuild(user_id, dry_run=dry_run)
+    
+    async def backfill_counters(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Add engagement counters to an older profile without touching its totals"""
+        return await self.ledger.backfill_counters(user_id)
     
     def _calculate_base_xp(self, activity_type: str, metadata: Dict[str, Any]) -> int:
         """Fast, non-blocking XP calculation"""
@@ -326,25 +281,6 @@ class EngagementService:
             last_date = user_profile.last_activity.date()
         
         return last_date != today
-    
-    def _calculate_new_streak(self, user_profile, is_first_activity_today: bool) -> int:
-        """Fast streak calculation"""
-        if not is_first_activity_today:
-            return user_profile.current_streak
-        
-        today = datetime.utcnow().date()
-        yesterday = today - timedelta(days=1)
-        
-        last_date = None
-        if hasattr(user_profile, 'last_activity_date') and user_profile.last_activity_date:
-            last_date = user_profile.last_activity_date.date()
-        elif hasattr(user_profile, 'last_activity') and user_profile.last_activity:
-            last_date = user_profile.last_activity.date()
-        
-        if last_date == yesterday:
-            return user_profile.current_streak + 1
-        else:
-            return 1
 
 
 # ============================================================================
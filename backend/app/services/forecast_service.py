@@ -274,14 +274,20 @@ class ForecastService:
         logger.info("ForecastService initialized")
 
     async def get_student_forecast(
-        self, student_id: int, force_refresh: bool = False
+        self,
+        student_id: int,
+        force_refresh: bool = False,
+        forecast_date: Optional[str] = None,
     ) -> StudentForecast:
         """
         Get-or-create today's materialized forecast (one doc per day, like
         the daily session plan). Drift is computed against the most recent
         prior doc and stored on today's doc at generation time.
+
+        forecast_date (YYYY-MM-DD) targets another day's doc — the overnight
+        pre-materialization job builds tomorrow's ahead of the first visit.
         """
-        today_str = datetime.now(timezone.utc).date().isoformat()
+        today_str = forecast_date or datetime.now(timezone.utc).date().isoformat()
         if not force_refresh:
             stored = await self.firestore.get_forecast_doc(student_id, today_str)
             if stored:
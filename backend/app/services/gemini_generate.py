@@ -10,6 +10,8 @@ import logging
 import re  # Add the missing import
 
 from .base_ai_service import BaseAIService
+from .llm_response_cache import get_llm_response_cache
+from .model_governor import govern_genai_client
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +20,10 @@ class GeminiGenerateService(BaseAIService):
         # Initialize with the client approach (similar to gemini_read_along.py)
         try:
             # Configure using Client like in the working gemini_read_along.py
-            self.client = genai.Client(
+            self.client = govern_genai_client(genai.Client(
                 api_key=settings.GEMINI_GENERATE_KEY,
                 http_options={"api_version": "v1alpha"},
-            )
+            ))
             
             # Store model ID for reference.
             # gemini-2.0-flash-lite was retired (404); 2.5-flash-lite is the
@@ -36,7 +38,8 @@ class GeminiGenerateService(BaseAIService):
         self, 
         prompt: Union[str, List[Dict[str, Any]]], 
         system_instructions: Optional[str] = None,
-        clean_json: bool = True  # Default to cleaning JSON responses
+        clean_json: bool = True,  # Default to cleaning JSON responses
+        cache: bool = False
     ) -> str:
         """
         Generate a response using Gemini API with compatible interface to AnthropicService
@@ -45,10 +48,21 @@ class GeminiGenerateService(BaseAIService):
             prompt: Either a string or a list of message objects
             system_instructions: System instructions (will be prepended to prompt)
             clean_json: Whether to clean JSON responses from markdown formatting
+            cache: Serve repeat requests from the LLM response cache (deterministic prompts only)
             
         Returns:
             Generated text response
         """
+        if cache:
+            return await get_llm_response_cache().get_or_generate(
+                lambda: self.generate_response(prompt, system_instructions, clean_json),
+                model=self.model_id,
+                prompt={"prompt": prompt, "clean_json": clean_json},
+                system_instructions=system_instructions,
+                temperature=0.6,
+                namespace="gemini_generate.generate_response",
+            )
+
         try:
             print("Generating response with Gemini:", prompt)  # Debug log
             
@@ -45,6 +45,12 @@ class LearningPathsService:
 
         # In-memory cache for curriculum graphs (they change infrequently)
         self._graph_cache: Dict[str, Dict[str, Any]] = {}
+        # In-flight cold loads, one per cache key: concurrent callers join the
+        # load (and the JIT flatten behind it) instead of each starting one.
+        self._graph_loads: Dict[str, asyncio.Task] = {}
+        # cache key -> (graph, prerequisites map, node_id -> entity type),
+        # derived once per cached graph for unlock evaluation.
+        self._unlock_index: Dict[str, Tuple[Dict[str, Any], Dict[str, List[Tuple[str, float]]], Dict[str, str]]] = {}
 
         logger.info(f"Initialized LearningPathsService (Firestore-native) for {project_id}")
 
@@ -64,19 +70,54 @@ class LearningPathsService:
         # Normalize display name to Firestore subject_id
         # e.g. "Language Arts" → "LANGUAGE_ARTS", "Mathematics" → "MATHEMATICS"
         subject_id = subject_id.upper().replace(" ", "_")
-        cache_key = f"{subject_id}:{version_type}"
+        cache_key = self._graph_key(subject_id, version_type)
 
-        if cache_key not in self._graph_cache:
-            graph_data = await self.firestore.get_curriculum_graph(
-                subject_id=subject_id,
-                version_type=version_type
+        if cache_key in self._graph_cache:
+            return self._graph_cache[cache_key]
+
+        task = self._graph_loads.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._load_graph(subject_id, version_type, cache_key))
+            self._graph_loads[cache_key] = task
+            task.add_done_callback(
+                lambda t, k=cache_key: self._graph_loads.pop(k, None) if self._graph_loads.get(k) is t else None
             )
-            if graph_data and graph_data.get("graph"):
-                self._graph_cache[cache_key] = graph_data
-            else:
-                raise ValueError(f"No curriculum graph found for {subject_id} ({version_type})")
+        # Shielded: one caller giving up must not cancel the load for the rest.
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _graph_key(subject_id: str, version_type: str = "published") -> str:
+        return f"{subject_id.upper().replace(' ', '_')}:{version_type}"
+
+    async def _load_graph(self, subject_id: str, version_type: str, cache_key: str) -> Dict[str, Any]:
+        graph_data = await self.firestore.get_curriculum_graph(
+            subject_id=subject_id,
+            version_type=version_type
+        )
+        if graph_data and graph_data.get("graph"):
+            self._graph_cache[cache_key] = graph_data
+            return graph_data
+        raise ValueError(f"No curriculum graph found for {subject_id} ({version_type})")
+
+    async def _get_graph_or_none(self, subject_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(cache key, graph) for a subject, or None when it has no graph."""
+        try:
+            return self._graph_key(subject_id), await self._get_graph(subject_id)
+        except ValueError:
+            logger.debug(f"No graph for subject {subject_id}, skipping")
+            return None
 
-        return self._graph_cache[cache_key]
+    async def warm_graphs(self) -> int:
+        """Load every published subject's graph (and its unlock index) at once.
+
+        Startup warm-up hook; returns how many graphs are cached.
+        """
+        subjects = await self._get_available_subjects()
+        loaded = await asyncio.gather(*(self._get_graph_or_none(subj) for subj in subjects))
+        for entry in loaded:
+            if entry is not None:
+                self._get_unlock_index(*entry)
+        return sum(1 for entry in loaded if entry is not None)
 
     def _invalidate_graph_cache(self, subject_id: Optional[str] = None):
         """Clear graph cache (call when curriculum is updated)."""
@@ -84,8 +125,10 @@ class LearningPathsService:
             for key in list(self._graph_cache.keys()):
                 if key.startswith(f"{subject_id}:"):
                     del self._graph_cache[key]
+                    self._unlock_index.pop(key, None)
         else:
             self._graph_cache.clear()
+            self._unlock_index.clear()
 
     # ==================== Core Prerequisite Methods ====================
 
@@ -335,46 +378,35 @@ class LearningPathsService:
             Set of unlocked entity IDs
         """
         try:
-            # Determine which subjects to check
-            subjects = [subject] if subject else await self._get_available_subjects()
+            async def load_graphs() -> List[Tuple[str, Dict[str, Any]]]:
+                # Determine which subjects to check; cold graphs load concurrently.
+                subjects = [subject] if subject else await self._get_available_subjects()
+                graphs = await asyncio.gather(*(self._get_graph_or_none(subj) for subj in subjects))
+                return [g for g in graphs if g is not None]
+
+            # Student proficiency map (all subjects) is read alongside the graphs.
+            graphs, prof_map = await asyncio.gather(
+                load_graphs(),
+                self.firestore.get_student_proficiency_map(student_id),
+            )
 
-            # Get student proficiency map (all subjects)
-            prof_map = await self.firestore.get_student_proficiency_map(student_id)
+            # One pass over the proficiency map serves every subject's unlock check.
+            levels = {
+                entity_id: (data or {}).get("proficiency", 0.0)
+                for entity_id, data in prof_map.items()
+            }
 
             unlocked = set()
-
-            for subj in subjects:
-                try:
-                    graph_data = await self._get_graph(subj)
-                except ValueError:
-                    logger.debug(f"No graph for subject {subj}, skipping")
-                    continue
-
-                graph = graph_data["graph"]
-                nodes = graph["nodes"]
-                edges = graph["edges"]
-
-                # Build prerequisites map and determine unlocked nodes
-                prereqs_map = self._build_prerequisites_map(edges)
-                unlocked_ids = self._determine_unlocked_nodes(
-                    nodes=nodes,
-                    edges=edges,
-                    prereqs_map=prereqs_map,
-                    student_prof_map=prof_map
-                )
-
-                # Filter by entity_type if specified
-                if entity_type:
-                    node_types = {
-                        n["id"]: n.get("type", n.get("entity_type", self._detect_entity_type(n["id"])))
-                        for n in nodes
-                    }
-                    unlocked_ids = {
-                        nid for nid in unlocked_ids
-                        if node_types.get(nid, self._detect_entity_type(nid)) == entity_type
-                    }
-
-                unlocked.update(unlocked_ids)
+            for cache_key, graph_data in graphs:
+                prereqs_map, node_types = self._get_unlock_index(cache_key, graph_data)
+                for node_id, node_type in node_types.items():
+                    if entity_type and node_type != entity_type:
+                        continue
+                    if all(
+                        levels.get(prereq_id, 0.0) >= threshold
+                        for prereq_id, threshold in prereqs_map.get(node_id, ())
+                    ):
+                        unlocked.add(node_id)
 
             logger.info(
                 f"Student {student_id} has {len(unlocked)} unlocked entities "
@@ -1239,6 +1271,25 @@ class LearningPathsService:
 
     # ==================== Graph Helper Methods ====================
 
+    def _get_unlock_index(
+        self,
+        cache_key: str,
+        graph_data: Dict[str, Any],
+    ) -> Tuple[Dict[str, List[Tuple[str, float]]], Dict[str, str]]:
+        """Prerequisites map + node types for a cached graph, built once per graph."""
+        memo = self._unlock_index.get(cache_key)
+        if memo is not None and memo[0] is graph_data:
+            return memo[1], memo[2]
+
+        graph = graph_data["graph"]
+        prereqs_map = self._build_prerequisites_map(graph["edges"])
+        node_types = {
+            n["id"]: n.get("type", n.get("entity_type", self._detect_entity_type(n["id"])))
+            for n in graph["nodes"]
+        }
+        self._unlock_index[cache_key] = (graph_data, prereqs_map, node_types)
+        return prereqs_map, node_types
+
     def _build_prerequisites_map(
         self,
         edges: List[Dict[str, Any]]
@@ -0,0 +1,313 @@
+# backend/app/services/live_relay.py
+"""Shared relay core for the Gemini Live WebSocket endpoints.
+
+The bidirectional tutor (gemini.py), the daily briefing and the Lumina tutor
+all bridge one client WebSocket to one Gemini Live session. Each used to own
+its own unbounded queues, its own sender (or `asyncio.create_task(
+websocket.send_json(...))` fire-and-forget sends, which reorder frames and
+swallow errors) and its own teardown. `LiveRelay` is the one implementation:
+
+  single writer  — every client-bound message goes through one send loop, so
+                   frames leave in the order they were produced and a failed
+                   send ends the session instead of vanishing.
+  bounded        — the send queue and every inbound queue have a max size; a
+                   slow side applies backpressure instead of growing memory.
+  audio path     — model audio is handed over as raw bytes and base64-encoded
+                   (or sent as a binary frame) in the writer, off the Gemini
+                   receive loop.
+  shutdown       — `run()` supervises the session's workers: the first one to
+                   finish ends the session, the rest are cancelled and awaited
+                   with a timeout; `aclose()` drains the writer then stops it.
+  metrics        — per-session frame/byte counts, drops, queue high-water
+                   mark and enqueue→sent latency, aggregated process-wide for
+                   /health/live-relay.
+
+    async with LiveRelay(websocket, "daily_briefing") as relay:
+        audio_in = relay.queue("audio")
+        await relay.run({"client": read_client(), "gemini": read_gemini()})
+"""
+
+import asyncio
+import base64
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Deque, Dict, List, Optional, Set
+
+from fastapi import WebSocketDisconnect
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEND_QUEUE_SIZE = 256
+DEFAULT_INBOUND_QUEUE_SIZE = 256
+
+_CLOSE = object()
+
+
+def _percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, math.ceil(p * len(ordered)) - 1)], 2)
+
+
+@dataclass
+class RelayMetrics:
+    """Counters for one relay session."""
+
+    frames_in: int = 0
+    bytes_in: int = 0
+    frames_out: int = 0
+    audio_frames_out: int = 0
+    audio_bytes_out: int = 0
+    dropped: int = 0
+    send_errors: int = 0
+    send_queue_high_water: int = 0
+    latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=512))
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies = list(self.latencies_ms)
+        return {
+            "frames_in": self.frames_in,
+            "bytes_in": self.bytes_in,
+            "frames_out": self.frames_out,
+            "audio_frames_out": self.audio_frames_out,
+            "audio_bytes_out": self.audio_bytes_out,
+            "dropped": self.dropped,
+            "send_errors": self.send_errors,
+            "send_queue_high_water": self.send_queue_high_water,
+            "send_latency_p50_ms": _percentile(latencies, 0.50),
+            "send_latency_p95_ms": _percentile(latencies, 0.95),
+        }
+
+
+class LiveRelay:
+    """One client WebSocket ↔ Gemini Live bridge: writer, queues, workers, metrics."""
+
+    def __init__(
+        self,
+        websocket,
+        name: str,
+        *,
+        send_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+        inbound_queue_size: int = DEFAULT_INBOUND_QUEUE_SIZE,
+        binary_audio: bool = False,
+    ):
+        self.websocket = websocket
+        self.name = name
+        self.binary_audio = binary_audio
+        self.inbound_queue_size = inbound_queue_size
+        self.metrics = RelayMetrics()
+        self._send_queue: asyncio.Queue = asyncio.Queue(maxsize=send_queue_size)
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+        self._started = time.monotonic()
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def __aenter__(self) -> "LiveRelay":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    def start(self) -> None:
+        """Start the writer loop (idempotent) and register for /health stats."""
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop(), name=f"{self.name}:writer")
+            registry.register(self)
+
+    @property
+    def closed(self) -> bool:
+        """True once the client can no longer be written to."""
+        return self._closed
+
+    async def aclose(self, drain_timeout: float = 1.0) -> None:
+        """Flush what is already queued (up to `drain_timeout`), then stop the writer."""
+        if self._writer is None:
+            return
+        writer, self._writer = self._writer, None
+        if not writer.done():
+            try:
+                await asyncio.wait_for(self._send_queue.put((0.0, "close", _CLOSE)), drain_timeout)
+                await asyncio.wait_for(asyncio.shield(writer), drain_timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            if not writer.done():
+                writer.cancel()
+                await asyncio.gather(writer, return_exceptions=True)
+        self._closed = True
+        registry.unregister(self)
+        logger.info(f"[LIVE_RELAY] {self.name} closed: {self.metrics.to_dict()}")
+
+    # -- client-bound ------------------------------------------------------
+
+    async def send_json(self, message: Dict[str, Any]) -> bool:
+        """Queue a JSON message for the client. Waits while the queue is full.
+
+        Returns False (and counts a drop) once the client side is closed.
+        """
+        return await self._enqueue("json", message)
+
+    async def send_audio(self, pcm: bytes, **fields: Any) -> bool:
+        """Queue a model audio frame. `fields` are the JSON envelope (type,
+        format, sampleRate, ...); base64 encoding happens in the writer."""
+        return await self._enqueue("audio", (pcm, fields))
+
+    async def _enqueue(self, kind: str, payload: Any) -> bool:
+        if self._closed:
+            self.metrics.dropped += 1
+            return False
+        await self._send_queue.put((time.monotonic(), kind, payload))
+        depth = self._send_queue.qsize()
+        if depth > self.metrics.send_queue_high_water:
+            self.metrics.send_queue_high_water = depth
+        return True
+
+    async def _write_loop(self) -> None:
+        try:
+            while True:
+                enqueued, kind, payload = await self._send_queue.get()
+                if payload is _CLOSE:
+                    return
+                if kind == "audio":
+                    pcm, fields = payload
+                    if self.binary_audio:
+                        await self.websocket.send_bytes(pcm)
+                    else:
+                        await self.websocket.send_json(
+                            {**fields, "data": base64.b64encode(pcm).decode("utf-8")}
+                        )
+                    self.metrics.audio_frames_out += 1
+                    self.metrics.audio_bytes_out += len(pcm)
+                else:
+                    await self.websocket.send_json(payload)
+                self.metrics.frames_out += 1
+                self.metrics.latencies_ms.append((time.monotonic() - enqueued) * 1000)
+        except asyncio.CancelledError:
+            raise
+        except WebSocketDisconnect:
+            logger.info(f"[LIVE_RELAY] {self.name}: client disconnected during send")
+        except Exception as e:
+            self.metrics.send_errors += 1
+            logger.error(f"[LIVE_RELAY] {self.name}: send failed: {e}")
+        finally:
+            self._closed = True
+            # Wake producers blocked on a full queue; what they queue next is dropped.
+            while not self._send_queue.empty():
+                self._send_queue.get_nowait()
+                self.metrics.dropped += 1
+
+    # -- inbound -----------------------------------------------------------
+
+    def queue(self, name: str, maxsize: Optional[int] = None) -> asyncio.Queue:
+        """A bounded queue owned by this session (created on first use)."""
+        q = self._queues.get(name)
+        if q is None:
+            q = asyncio.Queue(maxsize=self.inbound_queue_size if maxsize is None else maxsize)
+            self._queues[name] = q
+        return q
+
+    def record_inbound(self, size: int = 0) -> None:
+        """Count one frame received from the client (for metrics)."""
+        self.metrics.frames_in += 1
+        self.metrics.bytes_in += size
+
+    # -- supervision -------------------------------------------------------
+
+    async def run(
+        self,
+        workers: Dict[str, Awaitable[Any]],
+        shutdown_timeout: float = 2.0,
+    ) -> Optional[str]:
+        """Run the session's workers until the first one finishes (or the
+        client write side fails), then cancel and await the rest.
+
+        Returns the name of the worker that ended the session ("writer" when
+        the client went away on send). Cancelling `run()` itself also tears
+        every worker down.
+        """
+        self.start()
+        tasks = {
+            asyncio.create_task(coro, name=f"{self.name}:{worker}"): worker
+            for worker, coro in workers.items()
+        }
+        watch: Set[asyncio.Task] = set(tasks)
+        if self._writer is not None:
+            watch.add(self._writer)
+        finished: Optional[str] = None
+        try:
+            done, _ = await asyncio.wait(watch, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                worker = tasks.get(task, "writer")
+                finished = finished or worker
+                if task is not self._writer and not task.cancelled() and task.exception():
+                    logger.error(f"[LIVE_RELAY] {self.name}: {worker} failed: {task.exception()}")
+            logger.info(f"[LIVE_RELAY] {self.name}: session ended by {finished}")
+            return finished
+        finally:
+            pending = [t for t in tasks if not t.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                try:
+                    await asyncio.wait_for(
+                        asyncio.gather(*pending, return_exceptions=True), shutdown_timeout
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(f"[LIVE_RELAY] {self.name}: workers did not stop within {shutdown_timeout}s")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "age_s": round(time.monotonic() - self._started, 1),
+            "send_queue_depth": self._send_queue.qsize(),
+            "inbound_depth": {name: q.qsize() for name, q in self._queues.items()},
+            **self.metrics.to_dict(),
+        }
+
+
+class _RelayRegistry:
+    """Process-wide view of live sessions for /health/live-relay."""
+
+    def __init__(self, recent: int = 50):
+        self._active: Set[LiveRelay] = set()
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=recent)
+        self.sessions_total = 0
+        self.peak_active = 0
+
+    def register(self, relay: LiveRelay) -> None:
+        self._active.add(relay)
+        self.sessions_total += 1
+        self.peak_active = max(self.peak_active, len(self._active))
+
+    def unregister(self, relay: LiveRelay) -> None:
+        if relay in self._active:
+            self._active.discard(relay)
+            self._recent.append(relay.stats())
+
+    def stats(self) -> Dict[str, Any]:
+        active = [relay.stats() for relay in self._active]
+        by_name: Dict[str, int] = {}
+        for s in active:
+            by_name[s["name"]] = by_name.get(s["name"], 0) + 1
+        latencies: List[float] = [
+            ms for relay in self._active for ms in relay.metrics.latencies_ms
+        ]
+        return {
+            "active": len(active),
+            "active_by_endpoint": by_name,
+            "peak_active": self.peak_active,
+            "sessions_total": self.sessions_total,
+            "send_latency_p50_ms": _percentile(latencies, 0.50),
+            "send_latency_p95_ms": _percentile(latencies, 0.95),
+            "sessions": active,
+            "recently_closed": list(self._recent),
+        }
+
+
+registry = _RelayRegistry()
@@ -13,6 +13,7 @@ import re
 from ..db.cosmos_db import CosmosDBService
 from ..services.bigquery_analytics import BigQueryAnalyticsService
 from ..core.config import settings
+from .model_governor import govern_genai_client
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +47,7 @@ class LLMBriefingContentSelector:
     """Fast, simple LLM-powered content selection using cheap models"""
     
     def __init__(self):
-        self.gemini_client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        self.gemini_client = govern_genai_client(genai.Client(api_key=settings.GEMINI_API_KEY))
         self.analytics_service = BigQueryAnalyticsService(
             project_id=settings.GCP_PROJECT_ID,
             dataset_id=getattr(settings, 'BIGQUERY_DATASET_ID', 'analytics')
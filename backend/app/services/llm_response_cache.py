@@ -0,0 +1,378 @@
+# backend/app/services/llm_response_cache.py
+"""Content-addressed cache for LLM generation responses.
+
+Many generation call sites send byte-identical requests across students —
+the same subskill, objective and schema produce the same prompt. This cache
+keys a response by a SHA-256 of (model, system instructions, prompt, schema,
+temperature) and stores the raw response text in a local SQLite file, so a
+repeat prompt is a disk read instead of a multi-second model call.
+
+Contract:
+  * Opt-in per call site. Only deterministic prompts should pass cache=True —
+    a prompt that embeds random samples or per-student state never repeats
+    and would only fill the cache.
+  * Never raises. Any storage error degrades to a miss and the producer runs;
+    the cache must never be able to break generation.
+  * Bounded. Entries expire after a TTL and the least-recently-used entries
+    are evicted once the entry or byte budget is exceeded.
+
+On Cloud Run the filesystem is per-instance and ephemeral, so hit rate grows
+with instance lifetime; the backend is pluggable (see LLMResponseCacheBackend)
+for a shared store later.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _canonical(value: Any) -> Any:
+    """Reduce a prompt / schema / SDK object to a JSON-stable structure."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (bytes, bytearray)):
+        # Hash binary payloads (images) rather than embedding them in the key.
+        return {"__bytes_sha256__": hashlib.sha256(bytes(value)).hexdigest()}
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if hasattr(value, "model_dump"):
+        # google-genai Schema / Part / Content are pydantic models.
+        return _canonical(value.model_dump(exclude_none=True))
+    return repr(value)
+
+
+def make_cache_key(
+    model: str,
+    prompt: Any,
+    system_instructions: Optional[str] = None,
+    schema: Any = None,
+    temperature: Optional[float] = None,
+) -> str:
+    """Stable content address for one generation request."""
+    payload = {
+        "model": model,
+        "system": system_instructions,
+        "prompt": _canonical(prompt),
+        "schema": _canonical(schema),
+        "temperature": temperature,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCacheBackend(Protocol):
+    """Storage interface — synchronous; the cache runs it off the event loop."""
+
+    def get(self, key: str, now: float) -> Optional[str]: ...
+
+    def set(self, key: str, model: str, response: str, now: float, ttl_seconds: int) -> None: ...
+
+    def evict(self, now: float, max_entries: int, max_bytes: int) -> int: ...
+
+    def clear(self) -> None: ...
+
+    def size(self) -> Dict[str, int]: ...
+
+
+class SQLiteResponseBackend:
+    """Single-file SQLite store. One connection, serialized by a lock."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses(last_accessed)")
+        self._conn.commit()
+
+    def get(self, key: str, now: float) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET last_accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return response
+
+    def set(self, key: str, model: str, response: str, now: float, ttl_seconds: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, model, response, size_bytes, created_at, expires_at, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, response, len(response.encode("utf-8")), now, now + ttl_seconds, now),
+            )
+            self._conn.commit()
+
+    def evict(self, now: float, max_entries: int, max_bytes: int) -> int:
+        """Drop expired rows, then LRU rows until both budgets hold."""
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM responses"
+            ).fetchone()
+            if count > max_entries or total > max_bytes:
+                rows = self._conn.execute(
+                    "SELECT key, size_bytes FROM responses ORDER BY last_accessed ASC"
+                ).fetchall()
+                doomed = []
+                for key, size_bytes in rows:
+                    if count <= max_entries and total <= max_bytes:
+                        break
+                    doomed.append((key,))
+                    count -= 1
+                    total -= size_bytes
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+                removed += len(doomed)
+            self._conn.commit()
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def size(self) -> Dict[str, int]:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM responses"
+            ).fetchone()
+            return {"entries": count, "bytes": total}
+
+
+class LLMResponseCache:
+    """Async facade over a response backend with TTL, eviction and hit metrics."""
+
+    # Run eviction every N stores rather than on every write.
+    EVICT_EVERY = 50
+
+    def __init__(
+        self,
+        backend: LLMResponseCacheBackend,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        enabled: bool = True,
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._stores_since_evict = 0
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    # ------------------------------------------------------------------ #
+    #  Metrics
+    # ------------------------------------------------------------------ #
+
+    def _bump(self, namespace: str, counter: str) -> None:
+        bucket = self._metrics.setdefault(
+            namespace, {"hits": 0, "misses": 0, "stores": 0, "errors": 0, "rejected": 0}
+        )
+        bucket[counter] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics per call-site namespace plus overall totals."""
+        totals = {"hits": 0, "misses": 0, "stores": 0, "errors": 0, "rejected": 0}
+        per_site = {}
+        for namespace, bucket in self._metrics.items():
+            lookups = bucket["hits"] + bucket["misses"]
+            per_site[namespace] = {
+                **bucket,
+                "hit_rate": round(bucket["hits"] / lookups, 4) if lookups else 0.0,
+            }
+            for counter, value in bucket.items():
+                totals[counter] += value
+        lookups = totals["hits"] + totals["misses"]
+        try:
+            storage = self.backend.size()
+        except Exception:
+            storage = {}
+        return {
+            "enabled": self.enabled,
+            **totals,
+            "storage": storage,
+            "hit_rate": round(totals["hits"] / lookups, 4) if lookups else 0.0,
+            "by_call_site": per_site,
+        }
+
+    # ------------------------------------------------------------------ #
+    #  Lookup / store
+    # ------------------------------------------------------------------ #
+
+    async def get(self, key: str, namespace: str = "default") -> Optional[str]:
+        if not self.enabled:
+            return None
+        try:
+            value = await asyncio.to_thread(self.backend.get, key, time.time())
+        except Exception as e:
+            logger.warning(f"LLM response cache read failed ({e}); treating as miss")
+            self._bump(namespace, "errors")
+            value = None
+        self._bump(namespace, "hits" if value is not None else "misses")
+        return value
+
+    async def set(
+        self,
+        key: str,
+        model: str,
+        response: str,
+        namespace: str = "default",
+        ttl_seconds: Optional[int] = None,
+    ) -> None:
+        if not self.enabled or not response:
+            return
+        try:
+            await asyncio.to_thread(
+                self.backend.set, key, model, response, time.time(), ttl_seconds or self.ttl_seconds
+            )
+            self._bump(namespace, "stores")
+            self._stores_since_evict += 1
+            if self._stores_since_evict >= self.EVICT_EVERY:
+                self._stores_since_evict = 0
+                await asyncio.to_thread(
+                    self.backend.evict, time.time(), self.max_entries, self.max_bytes
+                )
+        except Exception as e:
+            logger.warning(f"LLM response cache write failed ({e}); response not cached")
+            self._bump(namespace, "errors")
+
+    async def get_or_generate(
+        self,
+        producer: Callable[[], Awaitable[str]],
+        *,
+        model: str,
+        prompt: Any,
+        system_instructions: Optional[str] = None,
+        schema: Any = None,
+        temperature: Optional[float] = None,
+        namespace: str = "default",
+        ttl_seconds: Optional[int] = None,
+        validate: Optional[Callable[[str], Any]] = None,
+    ) -> str:
+        """Return the cached response for this request, or run producer and store it.
+
+        The producer must return the raw response text. Empty responses are
+        never stored, so a transient empty completion is retried next time.
+
+        validate (e.g. json.loads) must accept a response before it is stored
+        or served from the cache; a response it raises on is still returned to
+        the caller, whose own parsing reports the error, but is never cached —
+        otherwise one malformed completion would be replayed until the TTL.
+        """
+        if not self.enabled:
+            return await producer()
+        key = make_cache_key(model, prompt, system_instructions, schema, temperature)
+        cached = await self.get(key, namespace)
+        if cached is not None and self._accepts(validate, cached, namespace):
+            logger.debug(f"LLM cache hit [{namespace}] {key[:12]}")
+            return cached
+        response = await producer()
+        if response and self._accepts(validate, response, namespace):
+            await self.set(key, model, response, namespace, ttl_seconds)
+        return response
+
+    def _accepts(self, validate: Optional[Callable[[str], Any]], response: str, namespace: str) -> bool:
+        if validate is None:
+            return True
+        try:
+            validate(response)
+            return True
+        except Exception as e:
+            logger.warning(f"LLM cache [{namespace}] rejected response ({e}); not cached")
+            self._bump(namespace, "rejected")
+            return False
+
+    async def clear(self) -> None:
+        try:
+            await asyncio.to_thread(self.backend.clear)
+        except Exception as e:
+            logger.warning(f"LLM response cache clear failed ({e})")
+
+
+class _NullBackend:
+    """Stand-in when the on-disk store cannot be opened."""
+
+    def get(self, key: str, now: float) -> Optional[str]:
+        return None
+
+    def set(self, key: str, model: str, response: str, now: float, ttl_seconds: int) -> None:
+        return None
+
+    def evict(self, now: float, max_entries: int, max_bytes: int) -> int:
+        return 0
+
+    def clear(self) -> None:
+        return None
+
+    def size(self) -> Dict[str, int]:
+        return {"entries": 0, "bytes": 0}
+
+
+_llm_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Process-wide cache singleton, configured from settings."""
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        from ..core.config import settings
+
+        path = settings.LLM_RESPONSE_CACHE_PATH or os.path.join(
+            tempfile.gettempdir(), "ai-tutor", "llm_responses.sqlite3"
+        )
+        enabled = settings.LLM_RESPONSE_CACHE_ENABLED
+        try:
+            backend: LLMResponseCacheBackend = SQLiteResponseBackend(Path(path))
+            logger.info(f"LLM response cache opened at {path} (enabled={enabled})")
+        except Exception as e:
+            logger.warning(f"LLM response cache unavailable ({e}); caching disabled")
+            backend = _NullBackend()
+            enabled = False
+        _llm_response_cache = LLMResponseCache(
+            backend,
+            ttl_seconds=settings.LLM_RESPONSE_CACHE_TTL_SECONDS,
+            max_entries=settings.LLM_RESPONSE_CACHE_MAX_ENTRIES,
+            max_bytes=settings.LLM_RESPONSE_CACHE_MAX_BYTES,
+            enabled=enabled,
+        )
+    return _llm_response_cache
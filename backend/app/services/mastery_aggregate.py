@@ -0,0 +1,220 @@
+# backend/app/services/mastery_aggregate.py
+"""Per-student mastery aggregate: the read model behind velocity, the mastery
+summary and the forecast.
+
+Those reads used to stream every mastery_lifecycle doc for the student and
+re-derive gate counts, earned mastery and pipeline timing on each request.
+The aggregate keeps one doc per subject,
+
+    students/{student_id}/mastery_aggregate/{subject}
+
+holding counters (subskills per gate and retention state, introduced /
+in-pipeline counts, completion and earned-mastery sums, pass/fail weights,
+introductions per date) plus one compact row per subskill for the views that
+list subskills. A `_meta` doc marks the student's aggregate as complete
+(its `built_at`) and carries a `version` every delta increments.
+
+  incremental — process_eval_result() already has the lifecycle before and
+                after each eval; lifecycle_delta() turns that pair into
+                counter deltas, applied with Firestore Increment sentinels so
+                concurrent evals compose without a read-modify-write.
+  rebuildable — build_aggregates() derives the same docs from a full
+                lifecycle scan. load_mastery_aggregates() runs it once for a
+                student whose aggregate predates this module (no `_meta`),
+                and the global pass-rate reconcile (after bulk seeding,
+                which bypasses the eval path) rewrites it from its own scan.
+                A delta landing between the scan and the replace would be
+                overwritten, so rebuild_mastery_aggregates() rescans when
+                the version moved across it.
+
+Introduction date is the lifecycle's created_at (the first eval introduces
+the subskill); a doc without a parseable one counts under "unknown", which
+velocity treats as freshly introduced — as it did when scanning.
+"""
+
+import logging
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .mastery_lifecycle_engine import derive_retention_state
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_DATE = "unknown"
+LOW_PASS_RATE = 0.7  # pipeline subskills below this slow throughput (velocity primary driver)
+
+CounterPath = Tuple[str, ...]
+
+
+META_DOC = "_meta"
+REBUILD_ATTEMPTS = 3
+
+
+def subject_key(subject: Optional[str]) -> str:
+    """Aggregate doc id for a lifecycle's subject (matched exactly, like the
+    `subject ==` filter on the lifecycle scan)."""
+    return (subject or "unknown").replace("/", "_")
+
+
+def introduction_date(lc: Dict[str, Any]) -> str:
+    """YYYY-MM-DD the subskill entered the pipeline, or UNKNOWN_DATE."""
+    raw = lc.get("created_at")
+    if not isinstance(raw, str):
+        return UNKNOWN_DATE
+    try:
+        return date.fromisoformat(raw[:10]).isoformat()
+    except ValueError:
+        return UNKNOWN_DATE
+
+
+def is_introduced(lc: Dict[str, Any]) -> bool:
+    return lc.get("current_gate", 0) > 0 or lc.get("lesson_eval_count", 0) > 0
+
+
+def lifecycle_contribution(lc: Optional[Dict[str, Any]]) -> Dict[CounterPath, float]:
+    """What one lifecycle adds to its subject's counters."""
+    if not lc:
+        return {}
+    gate = int(lc.get("current_gate", 0))
+    rs, _ = derive_retention_state(lc)
+    completion = float(lc.get("completion_pct", 0.0))
+    counters: Dict[CounterPath, float] = {
+        ("total",): 1,
+        ("by_gate", str(gate)): 1,
+        ("by_retention_state", rs): 1,
+        ("completion_sum",): completion,
+        ("passes",): float(lc.get("passes", 0)),
+        ("fails",): float(lc.get("fails", 0)),
+    }
+    if is_introduced(lc):
+        counters[("introduced",)] = 1
+        counters[("intro_dates", introduction_date(lc))] = 1
+        counters[("earned",)] = 1.0 if gate >= 4 else completion
+    if 1 <= gate <= 3:
+        counters[("pipeline",)] = 1
+        counters[("pipeline_completion_sum",)] = completion
+        counters[("pipeline_intro_dates", introduction_date(lc))] = 1
+        if lc.get("blended_pass_rate", 1.0) < LOW_PASS_RATE:
+            counters[("pipeline_low_pass",)] = 1
+    return counters
+
+
+def aggregate_row(lc: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact per-subskill row (enough for the summary listing and ETAs)."""
+    rs, stability = derive_retention_state(lc)
+    return {
+        "subskill_id": lc.get("subskill_id"),
+        "skill_id": lc.get("skill_id", ""),
+        "current_gate": lc.get("current_gate", 0),
+        "retention_state": rs,
+        "stability": stability,
+        "completion_pct": lc.get("completion_pct", 0.0),
+        "passes": lc.get("passes", 0),
+        "fails": lc.get("fails", 0),
+    }
+
+
+def lifecycle_delta(
+    old: Optional[Dict[str, Any]], new: Dict[str, Any]
+) -> Dict[str, Dict[str, Any]]:
+    """Counter deltas and row updates for one lifecycle write.
+
+    Returns {subject_key: {"subject", "counters": {path: delta}, "rows":
+    {subskill_id: row | None}}}; a None row removes the subskill (it moved
+    subject).
+    """
+    subskill_id = new.get("subskill_id")
+    old_key = subject_key(old.get("subject")) if old else None
+    new_key = subject_key(new.get("subject"))
+    updates: Dict[str, Dict[str, Any]] = {}
+
+    def entry(key: str, subject: Optional[str]) -> Dict[str, Any]:
+        return updates.setdefault(key, {"subject": subject, "counters": {}, "rows": {}})
+
+    new_entry = entry(new_key, new.get("subject", "unknown"))
+    for path, value in lifecycle_contribution(new).items():
+        new_entry["counters"][path] = new_entry["counters"].get(path, 0) + value
+    new_entry["rows"][subskill_id] = aggregate_row(new)
+
+    if old:
+        old_entry = entry(old_key, old.get("subject", "unknown"))
+        for path, value in lifecycle_contribution(old).items():
+            old_entry["counters"][path] = old_entry["counters"].get(path, 0) - value
+        if old_key != new_key:
+            old_entry["rows"][subskill_id] = None
+
+    for update in updates.values():
+        update["counters"] = {p: v for p, v in update["counters"].items() if abs(v) > 1e-9}
+    return updates
+
+
+def nest(counters: Dict[CounterPath, float]) -> Dict[str, Any]:
+    """{("by_gate", "2"): 1} → {"by_gate": {"2": 1}}"""
+    nested: Dict[str, Any] = {}
+    for path, value in counters.items():
+        node = nested
+        for part in path[:-1]:
+            node = node.setdefault(part, {})
+        node[path[-1]] = value
+    return nested
+
+
+def build_aggregates(lifecycles: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Full aggregate docs ({subject_key: doc}) from a lifecycle scan."""
+    flat: Dict[str, Dict[str, Any]] = {}
+    for lc in lifecycles:
+        key = subject_key(lc.get("subject"))
+        entry = flat.setdefault(key, {"subject": lc.get("subject", "unknown"), "counters": {}, "rows": {}})
+        for path, value in lifecycle_contribution(lc).items():
+            entry["counters"][path] = entry["counters"].get(path, 0) + value
+        entry["rows"][lc.get("subskill_id")] = aggregate_row(lc)
+    return {
+        key: {"subject": entry["subject"], **nest(entry["counters"]), "subskills": entry["rows"]}
+        for key, entry in flat.items()
+    }
+
+
+async def rebuild_mastery_aggregates(
+    firestore, student_id: int, before_scan: Optional[Callable[[], None]] = None
+) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+    """Rebuild the aggregate from a lifecycle scan; returns (aggregates, scan).
+
+    The version is read before the scan and again after the replace. If an
+    eval's delta moved it in between, the replace may have overwritten that
+    delta, so scan again. Should it keep moving, the aggregate is left
+    incomplete (no `built_at`) and the next read rebuilds it. `before_scan`
+    runs right before each scan, for callers settling state the scan covers.
+    """
+    for attempt in range(1, REBUILD_ATTEMPTS + 1):
+        version = await firestore.get_mastery_aggregate_version(student_id)
+        if before_scan is not None:
+            before_scan()
+        lifecycles = await firestore.get_all_mastery_lifecycles(student_id)
+        aggregates = build_aggregates(lifecycles)
+        await firestore.replace_mastery_aggregates(student_id, aggregates)
+        if await firestore.get_mastery_aggregate_version(student_id) == version:
+            return aggregates, lifecycles
+        logger.info(
+            f"[MASTERY_AGGREGATE] Delta landed during rebuild for student {student_id} "
+            f"(attempt {attempt}/{REBUILD_ATTEMPTS}), rescanning"
+        )
+    await firestore.invalidate_mastery_aggregates(student_id)
+    return aggregates, lifecycles
+
+
+async def load_mastery_aggregates(firestore, student_id: int) -> Dict[str, Dict[str, Any]]:
+    """The student's aggregate docs, building them from a scan the first time."""
+    aggregates = await firestore.get_mastery_aggregates(student_id)
+    if aggregates is not None:
+        return aggregates
+    logger.info(f"[MASTERY_AGGREGATE] Building aggregate for student {student_id} from lifecycles")
+    aggregates, _ = await rebuild_mastery_aggregates(firestore, student_id)
+    return aggregates
+
+
+def find_subject(aggregates: Dict[str, Dict[str, Any]], subject: Optional[str]) -> List[Dict[str, Any]]:
+    """Aggregate docs for one subject (all of them when subject is None)."""
+    if not subject:
+        return list(aggregates.values())
+    doc = aggregates.get(subject_key(subject))
+    return [doc] if doc else []
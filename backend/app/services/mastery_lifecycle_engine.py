@@ -21,15 +21,20 @@ State model:
   active       → mastered (gate == 4 AND earned stability ≥ 30 days)
 """
 
+import asyncio
 import logging
 import math
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 # Maximum gate_history entries to retain per lifecycle document.
 # Prevents unbounded Firestore document growth (1 MiB limit).
 MAX_GATE_HISTORY = 50
 
+# Ceiling on the backoff between retries of a failed pass-rate flush.
+PASS_RATE_RETRY_MAX_DELAY_S = 300.0
+
+from ..core.config import settings
 from ..db.firestore_service import FirestoreService
 from ..models.calibration import DEFAULT_STUDENT_THETA
 from ..models.mastery_lifecycle import (
@@ -56,6 +61,7 @@ from ..models.mastery_lifecycle import (
     MasteryGate,
     MasteryLifecycle,
 )
+from ..services.background_jobs import BackgroundJobRunner, get_background_jobs
 from ..services.calibration_engine import CalibrationEngine, p_correct
 
 logger = logging.getLogger(__name__)
@@ -116,6 +122,15 @@ def derive_retention_state(lifecycle_dict: Dict[str, Any]) -> tuple[str, float]:
         return "active", GATE_TO_STABILITY.get(gate, INITIAL_STABILITY)
 
 
+def _add_counts(into: Dict[str, int], counts: Optional[Dict[str, float]]) -> Dict[str, int]:
+    """Add aggregate counters into `into` (keys that netted out to zero are skipped)."""
+    for key, value in (counts or {}).items():
+        n = int(round(value))
+        if n:
+            into[key] = into.get(key, 0) + n
+    return into
+
+
 def derive_gate_from_irt(
     theta: float,
     sigma: float,
@@ -187,14 +202,30 @@ def derive_gate_from_irt(
 
 class MasteryLifecycleEngine:
     """
-    Stateless service that processes eval results and maintains the
+    Service that processes eval results and maintains the
     mastery_lifecycle subcollection in Firestore.
+
+    Stateless apart from per-student pass/fail deltas awaiting
+    flush_global_pass_rate() (see "Global pass rate maintenance").
     """
 
-    def __init__(self, firestore_service: FirestoreService):
+    def __init__(
+        self,
+        firestore_service: FirestoreService,
+        jobs: Optional[BackgroundJobRunner] = None,
+    ):
         self.firestore = firestore_service
+        self._jobs = jobs
+        self._pending_pass_deltas: Dict[int, List[float]] = {}
+        self._pass_flush_failures: Dict[int, int] = {}  # consecutive failed flushes
         logger.info("MasteryLifecycleEngine initialized")
 
+    @property
+    def jobs(self) -> BackgroundJobRunner:
+        if self._jobs is None:
+            self._jobs = get_background_jobs()
+        return self._jobs
+
     # ------------------------------------------------------------------
     # Main entry point
     # ------------------------------------------------------------------
@@ -318,6 +349,7 @@ class MasteryLifecycleEngine:
         else:
             global_rate_data = await self.firestore.get_global_practice_pass_rate(student_id)
             global_rate = global_rate_data.get("global_practice_pass_rate", 0.8)
+        passes_before, fails_before = lifecycle.passes, lifecycle.fails
         lifecycle = self._handle_practice_eval(
             lifecycle, score, passed, ts, now, global_rate,
             theta=theta, sigma=sigma, item_beta=item_beta, avg_a=avg_a,
@@ -356,6 +388,12 @@ class MasteryLifecycleEngine:
         await self.firestore.upsert_mastery_lifecycle(
             student_id, subskill_id, lifecycle.model_dump()
         )
+        await self._apply_aggregate_delta(student_id, existing, lifecycle.model_dump())
+        self._record_pass_delta(
+            student_id,
+            lifecycle.passes - passes_before,
+            lifecycle.fails - fails_before,
+        )
 
         logger.info(
             f"[MASTERY_ENGINE] Result: retention_state={lifecycle.retention_state}, "
@@ -785,6 +823,105 @@ class MasteryLifecycleEngine:
     # ------------------------------------------------------------------
     # Global pass rate maintenance (PRD 6.4)
     # ------------------------------------------------------------------
+    # The global counters are the sum of passes/fails over every lifecycle
+    # doc. process_eval_result() records each eval's delta in memory;
+    # flush_global_pass_rate() applies the accumulated delta with one atomic
+    # increment, so several evals between flushes cost one write and the hot
+    # path never scans mastery_lifecycle. A failed flush keeps its delta,
+    # reschedules itself with exponential backoff and queues a periodic
+    # full-scan reconcile until one succeeds. update_global_pass_rate() is
+    # that reconcile, also used after bulk seeding. flush_all_pass_deltas()
+    # runs at shutdown, after the job runner has drained.
+    # ------------------------------------------------------------------
+
+    def _record_pass_delta(self, student_id: int, passes: float, fails: float) -> None:
+        if not passes and not fails:
+            return
+        pending = self._pending_pass_deltas.setdefault(student_id, [0.0, 0.0])
+        pending[0] += passes
+        pending[1] += fails
+
+    def schedule_global_pass_rate_flush(self, student_id: int) -> None:
+        """Queue a debounced flush — one pending per student, so a burst of
+        evals costs a single increment write."""
+        self.jobs.submit(
+            f"global_pass_rate:{student_id}",
+            lambda: self.flush_global_pass_rate(student_id),
+            debounce_s=settings.GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S,
+        )
+
+    async def flush_global_pass_rate(self, student_id: int) -> None:
+        """Apply pending pass/fail deltas for the student to the global counters."""
+        delta = self._pending_pass_deltas.pop(student_id, None)
+        if not delta:
+            return
+        try:
+            await self.firestore.increment_global_practice_pass_rate(
+                student_id, delta[0], delta[1]
+            )
+        except asyncio.CancelledError:
+            self._record_pass_delta(student_id, delta[0], delta[1])
+            raise
+        except Exception as e:
+            # Put the delta back and retry it even if no further eval arrives.
+            self._record_pass_delta(student_id, delta[0], delta[1])
+            failures = self._pass_flush_failures[student_id] = (
+                self._pass_flush_failures.get(student_id, 0) + 1
+            )
+            delay = min(
+                PASS_RATE_RETRY_MAX_DELAY_S,
+                max(settings.GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S, 0.01) * 2 ** failures,
+            )
+            logger.warning(
+                f"Global pass rate flush for student {student_id} failed "
+                f"(attempt {failures}), retrying in {delay:.1f}s: {e}"
+            )
+            # Separate key: a submit to the running flush's own key would re-run it at once
+            self.jobs.submit(
+                f"global_pass_rate_retry:{student_id}",
+                lambda: self.flush_global_pass_rate(student_id),
+                debounce_s=delay,
+            )
+            # Coalesces while pending, so failing retries reconcile once per interval.
+            self.jobs.submit(
+                f"global_pass_rate_reconcile:{student_id}",
+                lambda: self._reconcile_failed_pass_rate(student_id),
+                debounce_s=settings.GLOBAL_PASS_RATE_RECONCILE_INTERVAL_S,
+            )
+            raise
+        self._pass_flush_failures.pop(student_id, None)
+
+    async def _reconcile_failed_pass_rate(self, student_id: int) -> None:
+        if student_id in self._pass_flush_failures:
+            await self.update_global_pass_rate(student_id)
+
+    async def flush_all_pass_deltas(self, timeout: float = 5.0) -> int:
+        """Flush every student's pending delta; returns how many are left.
+
+        For shutdown: debounced and backing-off flushes are cancelled when
+        the job runner drains, and their deltas only live in memory.
+        """
+        student_ids = list(self._pending_pass_deltas)
+        if not student_ids:
+            return 0
+
+        async def flush(student_id: int) -> None:
+            try:
+                await self.flush_global_pass_rate(student_id)
+            except Exception:
+                pass  # logged by flush_global_pass_rate; the delta stays pending
+
+        try:
+            await asyncio.wait_for(asyncio.gather(*(flush(sid) for sid in student_ids)), timeout)
+        except asyncio.TimeoutError:
+            pass
+        left = len(self._pending_pass_deltas)
+        if left:
+            logger.warning(
+                f"[MASTERY_ENGINE] {left} student(s) still have unflushed pass-rate deltas "
+                f"at shutdown; the next update_global_pass_rate reconcile repairs them"
+            )
+        return left
 
     async def update_global_pass_rate(
         self,
@@ -793,11 +930,26 @@ class MasteryLifecycleEngine:
         """
         Recalculate and persist the student's global practice pass rate.
 
-        Aggregates passes/fails across all mastery_lifecycle docs.
-        Called after every practice-mode eval.
+        Aggregates passes/fails across all mastery_lifecycle docs. O(lifecycles) —
+        the eval path uses flush_global_pass_rate(); this is the reconcile.
+        The same scan rebuilds the mastery aggregate.
         """
+        from .mastery_aggregate import rebuild_mastery_aggregates  # imports this module
+
+        # Deltas recorded before a scan are already in the lifecycle docs it
+        # reads; ones recorded while it awaits stay pending for the next flush.
+        counted = [0.0, 0.0]
+
+        def take_pending() -> None:
+            delta = self._pending_pass_deltas.pop(student_id, None)
+            if delta:
+                counted[0] += delta[0]
+                counted[1] += delta[1]
+
         try:
-            all_lifecycles = await self.firestore.get_all_mastery_lifecycles(student_id)
+            _, all_lifecycles = await rebuild_mastery_aggregates(
+                self.firestore, student_id, before_scan=take_pending
+            )
 
             total_passes = sum(lc.get("passes", 0) for lc in all_lifecycles)
             total_fails = sum(lc.get("fails", 0) for lc in all_lifecycles)
@@ -805,13 +957,44 @@ class MasteryLifecycleEngine:
             await self.firestore.update_global_practice_pass_rate(
                 student_id, total_passes, total_fails
             )
+            self._pass_flush_failures.pop(student_id, None)
 
         except Exception as e:
+            self._record_pass_delta(student_id, counted[0], counted[1])
             logger.error(
                 f"[MASTERY_ENGINE] Error updating global pass rate for "
                 f"student {student_id}: {e}"
             )
 
+    # ------------------------------------------------------------------
+    # Mastery aggregate maintenance
+    #
+    # Summary, forecast and velocity read the per-subject aggregate
+    # (services/mastery_aggregate.py) instead of scanning mastery_lifecycle.
+    # Each eval applies the difference between the lifecycle before and
+    # after it; update_global_pass_rate() rebuilds it from its scan.
+    # ------------------------------------------------------------------
+
+    async def _apply_aggregate_delta(
+        self,
+        student_id: int,
+        old: Optional[Dict[str, Any]],
+        new: Dict[str, Any],
+    ) -> None:
+        from .mastery_aggregate import lifecycle_delta  # imports this module
+
+        try:
+            await self.firestore.apply_mastery_aggregate_delta(
+                student_id, lifecycle_delta(old, new)
+            )
+        except Exception as e:
+            # The lifecycle write stands; a rebuild on next read repairs the aggregate.
+            logger.warning(
+                f"[MASTERY_ENGINE] Aggregate delta failed for student {student_id}, "
+                f"invalidating: {e}"
+            )
+            await self.firestore.invalidate_mastery_aggregates(student_id)
+
     # ------------------------------------------------------------------
     # Forecasting (PRD Section 7.4)
     # ------------------------------------------------------------------
@@ -825,14 +1008,18 @@ class MasteryLifecycleEngine:
         Aggregated mastery summary for a student.
 
         Returns per-subject and per-skill gate counts, completion averages,
-        and overall progress metrics.
+        and overall progress metrics. Reads the mastery aggregate, not the
+        lifecycle docs.
         """
-        lifecycles = await self.firestore.get_all_mastery_lifecycles(
-            student_id, subject
+        from .mastery_aggregate import find_subject, load_mastery_aggregates
+
+        aggregates = find_subject(
+            await load_mastery_aggregates(self.firestore, student_id), subject
         )
         global_rate = await self.firestore.get_global_practice_pass_rate(student_id)
+        total = sum(int(round(agg.get("total", 0))) for agg in aggregates)
 
-        if not lifecycles:
+        if not total:
             return {
                 "student_id": student_id,
                 "total_subskills": 0,
@@ -847,60 +1034,35 @@ class MasteryLifecycleEngine:
         by_subject: Dict[str, Dict[str, Any]] = {}
         by_gate = {str(g): 0 for g in range(5)}
         by_retention_state = {"not_started": 0, "active": 0, "mastered": 0}
-
-        for lc in lifecycles:
-            # Derive retention state for legacy docs
-            rs, _ = derive_retention_state(lc)
-            by_retention_state[rs] = by_retention_state.get(rs, 0) + 1
-
-            gate = lc.get("current_gate", 0)
-            by_gate[str(gate)] = by_gate.get(str(gate), 0) + 1
-
-            subj = lc.get("subject", "unknown")
-            if subj not in by_subject:
-                by_subject[subj] = {
-                    "total": 0,
-                    "fully_mastered": 0,
-                    "average_completion_pct": 0.0,
-                    "by_gate": {str(g): 0 for g in range(5)},
-                    "by_retention_state": {"not_started": 0, "active": 0, "mastered": 0},
-                    "subskills": [],
-                }
-            entry = by_subject[subj]
-            entry["total"] += 1
-            entry["by_gate"][str(gate)] = entry["by_gate"].get(str(gate), 0) + 1
-            entry["by_retention_state"][rs] = entry["by_retention_state"].get(rs, 0) + 1
-            if rs == "mastered":
-                entry["fully_mastered"] += 1
-            entry["subskills"].append({
-                "subskill_id": lc.get("subskill_id"),
-                "skill_id": lc.get("skill_id"),
-                "current_gate": gate,
-                "retention_state": rs,
-                "stability": lc.get("stability", 0.0),
-                "completion_pct": lc.get("completion_pct", 0.0),
-                "passes": lc.get("passes", 0),
-                "fails": lc.get("fails", 0),
-            })
-
-        # Compute averages
-        total = len(lifecycles)
-        avg_completion = sum(lc.get("completion_pct", 0.0) for lc in lifecycles) / total
-        fully_mastered = by_retention_state.get("mastered", 0)
-
-        for subj, entry in by_subject.items():
-            if entry["total"] > 0:
-                entry["average_completion_pct"] = round(
-                    sum(s["completion_pct"] for s in entry["subskills"]) / entry["total"], 4
-                )
+        completion_sum = 0.0
+
+        for agg in aggregates:
+            subj_total = int(round(agg.get("total", 0)))
+            if not subj_total:
+                continue
+            subj_by_gate = _add_counts({str(g): 0 for g in range(5)}, agg.get("by_gate"))
+            subj_by_rs = _add_counts(
+                {"not_started": 0, "active": 0, "mastered": 0}, agg.get("by_retention_state")
+            )
+            _add_counts(by_gate, subj_by_gate)
+            _add_counts(by_retention_state, subj_by_rs)
+            completion_sum += agg.get("completion_sum", 0.0)
+            by_subject[agg.get("subject", "unknown")] = {
+                "total": subj_total,
+                "fully_mastered": subj_by_rs.get("mastered", 0),
+                "average_completion_pct": round(agg.get("completion_sum", 0.0) / subj_total, 4),
+                "by_gate": subj_by_gate,
+                "by_retention_state": subj_by_rs,
+                "subskills": list(agg.get("subskills", {}).values()),
+            }
 
         return {
             "student_id": student_id,
             "total_subskills": total,
             "by_gate": by_gate,
             "by_retention_state": by_retention_state,
-            "average_completion_pct": round(avg_completion, 4),
-            "fully_mastered": fully_mastered,
+            "average_completion_pct": round(completion_sum / total, 4),
+            "fully_mastered": by_retention_state.get("mastered", 0),
             "global_practice_pass_rate": global_rate.get("global_practice_pass_rate", 0.8),
             "by_subject": by_subject,
         }
@@ -963,11 +1125,19 @@ class MasteryLifecycleEngine:
         """
         Workload forecast at subject level.
 
-        Uses stability-based projections instead of fixed gate intervals.
+        Uses stability-based projections instead of fixed gate intervals,
+        over the subskill rows of the mastery aggregate.
         """
-        lifecycles = await self.firestore.get_all_mastery_lifecycles(
-            student_id, subject
-        )
+        from .mastery_aggregate import find_subject, load_mastery_aggregates
+
+        # Aggregate rows carry the fields get_subskill_eta() reads
+        lifecycles = [
+            {**row, "subject": agg.get("subject", "unknown")}
+            for agg in find_subject(
+                await load_mastery_aggregates(self.firestore, student_id), subject
+            )
+            for row in agg.get("subskills", {}).values()
+        ]
 
         if not lifecycles:
             return {
@@ -0,0 +1,198 @@
+# backend/app/services/misconception_pipeline.py
+"""Deferred misconception analysis for incorrect practice answers.
+
+Every wrong answer used to wait on an LLM diagnosis (ReviewService.
+analyze_misconception) and a user-profile write before the student saw their
+result, so wrong answers were several seconds slower than right ones. The
+submission path now only queues the attempt; the analysis happens here.
+
+  durable   — each queued attempt is a Firestore doc
+              (students/{id}/pending_misconceptions/{attempt_id}) until its
+              batch has been written; startup recovery resumes whatever a
+              previous instance left behind.
+  batched   — one background job per student/subskill, debounced, so a run
+              of wrong answers on one subskill is handled in a single pass.
+  deduped   — the profile keeps one misconception slot per subskill, so a
+              batch needs one diagnosis: repeated identical errors collapse,
+              and only the most recent distinct error is sent to the model.
+
+Jobs run on the shared BackgroundJobRunner; a failed batch keeps its pending
+docs and is retried on the next enqueue for that subskill or on restart.
+"""
+
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from ..shared.question_types import BaseQuestion, QuestionEvaluation, QuestionType
+from .background_jobs import BackgroundJobRunner, get_background_jobs
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_SOURCE = "practice_session_analysis"
+FALLBACK_SOURCE = "practice_session_fallback"
+
+
+class MisconceptionPipeline:
+    """Queues incorrect attempts and diagnoses them per student/subskill."""
+
+    def __init__(
+        self,
+        store,
+        review_service,
+        user_profiles_service,
+        jobs: Optional[BackgroundJobRunner] = None,
+        debounce_s: float = 5.0,
+        max_batch: int = 20,
+    ):
+        self.store = store
+        self.review_service = review_service
+        self.user_profiles_service = user_profiles_service
+        self.jobs = jobs or get_background_jobs()
+        self.debounce_s = debounce_s
+        self.max_batch = max_batch
+        self._counters = {
+            "enqueued": 0,
+            "enqueue_failed": 0,
+            "recovered": 0,
+            "batches": 0,
+            "attempts_processed": 0,
+            "duplicates_collapsed": 0,
+            "analyzed": 0,
+            "fallbacks": 0,
+            "written": 0,
+            "write_failed": 0,
+        }
+
+    @staticmethod
+    def _key(student_id: int, subskill_id: str) -> str:
+        return f"misconception:{student_id}:{subskill_id}"
+
+    async def enqueue(
+        self,
+        *,
+        student_id: int,
+        firebase_uid: str,
+        subskill_id: str,
+        question: Any,
+        evaluation: QuestionEvaluation,
+        attempt_id: Optional[str] = None,
+        skill_description: Optional[str] = None,
+    ) -> bool:
+        """Queue an incorrect attempt for analysis. Never raises.
+
+        Returns False if the attempt could not be persisted (it is then not
+        analyzed — the submission itself is unaffected).
+        """
+        attempt = {
+            "attempt_id": attempt_id or str(uuid.uuid4()),
+            "firebase_uid": firebase_uid,
+            "subskill_id": subskill_id,
+            "skill_description": skill_description,
+            "question": {
+                "id": str(question.id),
+                "type": QuestionType(question.type).value,
+                "question_text": question.question_text,
+            },
+            "evaluation": evaluation.model_dump(mode="json"),
+            "queued_at": datetime.now(timezone.utc).isoformat(),
+        }
+        try:
+            await self.store.queue_pending_misconception(student_id, attempt)
+        except Exception as e:
+            self._counters["enqueue_failed"] += 1
+            logger.error(f"[MISCONCEPTION_PIPELINE] Could not queue attempt for student {student_id}, "
+                         f"subskill {subskill_id}: {e}")
+            return False
+
+        self._counters["enqueued"] += 1
+        self._schedule(student_id, subskill_id, firebase_uid)
+        return True
+
+    def _schedule(self, student_id: int, subskill_id: str, firebase_uid: str) -> None:
+        self.jobs.submit(
+            self._key(student_id, subskill_id),
+            lambda: self.process(student_id, subskill_id, firebase_uid),
+            debounce_s=self.debounce_s,
+        )
+
+    async def recover(self, limit: int = 500) -> int:
+        """Schedule every student/subskill with attempts left pending. Returns the count."""
+        keys = await self.store.list_pending_misconception_keys(limit=limit)
+        for key in keys:
+            self._schedule(key["student_id"], key["subskill_id"], key.get("firebase_uid"))
+        self._counters["recovered"] += len(keys)
+        if keys:
+            logger.info(f"[MISCONCEPTION_PIPELINE] Resumed {len(keys)} pending student/subskill batch(es)")
+        return len(keys)
+
+    @staticmethod
+    def _dedupe(attempts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Collapse repeats of the same answer to the same question (latest kept), oldest first."""
+        latest: Dict[tuple, Dict[str, Any]] = {}
+        for attempt in attempts:
+            signature = (
+                attempt["question"].get("question_text"),
+                str(attempt["evaluation"].get("student_answer")),
+            )
+            latest.pop(signature, None)
+            latest[signature] = attempt
+        return list(latest.values())
+
+    async def process(self, student_id: int, subskill_id: str, firebase_uid: Optional[str] = None) -> bool:
+        """Diagnose and store one student/subskill batch. Returns True if a misconception was written."""
+        attempts = await self.store.get_pending_misconceptions(student_id, subskill_id)
+        if not attempts:
+            return False
+
+        self._counters["batches"] += 1
+        self._counters["attempts_processed"] += len(attempts)
+        window = attempts[-self.max_batch:]
+        distinct = self._dedupe(window)
+        self._counters["duplicates_collapsed"] += len(window) - len(distinct)
+        latest = distinct[-1]
+        firebase_uid = latest.get("firebase_uid") or firebase_uid
+
+        misconception_text = await self.review_service.analyze_misconception(
+            question=BaseQuestion(**latest["question"]),
+            evaluation=QuestionEvaluation(**latest["evaluation"]),
+        )
+        source = ANALYSIS_SOURCE
+        if misconception_text:
+            self._counters["analyzed"] += 1
+        else:
+            self._counters["fallbacks"] += 1
+            skill_desc = latest.get("skill_description") or "this concept"
+            misconception_text = f"Student requires further review on {skill_desc}."
+            source = FALLBACK_SOURCE
+
+        success = await self.user_profiles_service.add_or_update_misconception(
+            uid=firebase_uid,
+            subskill_id=subskill_id,
+            misconception_text=misconception_text,
+            assessment_id=source,
+        )
+        if success:
+            self._counters["written"] += 1
+            logger.info(f"[MISCONCEPTION_PIPELINE] Stored misconception for student {student_id}, "
+                        f"subskill {subskill_id} ({len(attempts)} attempt(s), {len(distinct)} distinct, {source})")
+        else:
+            # add_or_update_misconception reports a missing profile the same
+            # way as a failed write; retrying would not help the former.
+            self._counters["write_failed"] += 1
+            logger.warning(f"[MISCONCEPTION_PIPELINE] Failed to store misconception for student {student_id}, "
+                           f"subskill {subskill_id}")
+
+        # Only the attempts read above: any queued meanwhile stay pending and
+        # are handled by the re-run the job runner schedules for this key.
+        await self.store.delete_pending_misconceptions(student_id, [a["attempt_id"] for a in attempts])
+        return bool(success)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "debounce_s": self.debounce_s,
+            "max_batch": self.max_batch,
+            "jobs": self.jobs.stats()["by_kind"].get("misconception", {}),
+        }
@@ -0,0 +1,481 @@
+# backend/app/services/model_governor.py
+"""Process-wide governor for outbound model calls.
+
+Visual generation, per-type problem generation, the problem preloader and the
+AI services each fan out their own asyncio.gather with nothing coordinating
+them, so one ETL burst can starve live tutoring of quota and trip 429s for
+everybody. Every model client in the backend goes through this governor:
+
+  * Bounded concurrency — at most MODEL_GOVERNOR_MAX_CONCURRENCY calls in
+    flight; BATCH work may only hold MODEL_GOVERNOR_BATCH_MAX_CONCURRENCY of
+    those slots, so interactive traffic always has headroom.
+  * Priority lanes — waiters are served INTERACTIVE first, then BATCH, FIFO
+    within a lane. The lane is read from a context variable, so a job sets it
+    once (`with model_call_priority(Priority.BATCH): ...`) and every nested
+    call — including tasks it gathers — inherits it.
+  * Per-model token buckets for requests/min and tokens/min. BATCH calls may
+    not draw a bucket below MODEL_GOVERNOR_INTERACTIVE_RESERVE of its
+    capacity and hold off while an INTERACTIVE call is waiting on it, so a
+    batch burst cannot spend the rate budget live traffic needs.
+  * Retry with full-jitter exponential backoff on rate-limit errors (429 /
+    RESOURCE_EXHAUSTED). Other errors propagate unchanged on the first try.
+  * Metrics — queue wait, in-flight utilization, retries and throttles per
+    model, served at /health/model-governor.
+
+Gemini clients are wrapped with govern_genai_client(); the wrapper only
+intercepts aio.models.generate_content / embed_content and forwards everything
+else (including aio.live) untouched.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import random
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "model_call_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def model_call_priority(priority: Priority):
+    """Run the enclosed block (and tasks spawned from it) in a priority lane."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _current_priority.get()
+
+
+def _is_rate_limit_status(value: Any) -> bool:
+    # grpc.StatusCode / HTTPStatus enums compare by name or value
+    value = getattr(value, "name", value)
+    return value == 429 or value in ("RESOURCE_EXHAUSTED", "TOO_MANY_REQUESTS")
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Recognise 429s from google-genai, google-api-core, anthropic and httpx.
+
+    Only structured status fields are checked — a message that merely
+    contains "429" (an id, a token count) is not a rate limit.
+    """
+    response = getattr(error, "response", None)
+    candidates = [getattr(error, attr, None) for attr in ("code", "status_code", "status", "grpc_status_code")]
+    candidates.append(getattr(response, "status_code", None))
+    return any(_is_rate_limit_status(value) for value in candidates if value is not None)
+
+
+@dataclass
+class ModelLimits:
+    requests_per_minute: float
+    tokens_per_minute: float
+
+
+class TokenBucket:
+    """Continuous-refill bucket. acquire() sleeps until `amount` is available.
+
+    `reserve` tokens are held back for INTERACTIVE callers: BATCH callers only
+    take what is above it, and wait while any INTERACTIVE caller is waiting.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float, reserve: float = 0.0):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        if not 0.0 <= reserve < self.capacity:
+            raise ValueError(f"reserve must be in [0, {self.capacity}), got {reserve}")
+        self.reserve = float(reserve)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._interactive_waiting = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    async def acquire(self, amount: float, priority: Priority = Priority.INTERACTIVE) -> float:
+        """Take `amount` tokens; returns seconds spent waiting.
+
+        The lock only guards the take; the wait for a deficit happens outside
+        it, so one large request never holds up smaller ones that fit now.
+        """
+        batch = priority == Priority.BATCH
+        floor = self.reserve if batch else 0.0
+        # A single request larger than the lane may hold would wait forever.
+        amount = min(float(amount), self.capacity - floor)
+        waited = 0.0
+        waiting = False
+        try:
+            while True:
+                async with self._lock:
+                    self._refill()
+                    yield_to_interactive = batch and self._interactive_waiting > 0
+                    if self._tokens - amount >= floor and not yield_to_interactive:
+                        self._tokens -= amount
+                        return waited
+                    deficit = max(amount + floor - self._tokens, amount if yield_to_interactive else 0.0)
+                    delay = deficit / self.refill_per_second
+                    if not batch and not waiting:
+                        waiting = True
+                        self._interactive_waiting += 1
+                await asyncio.sleep(delay)
+                waited += delay
+        finally:
+            if waiting:
+                self._interactive_waiting -= 1
+
+
+class PrioritySemaphore:
+    """Counting semaphore whose waiters are woken lowest-priority-value first.
+
+    BATCH acquisitions are additionally capped at `batch_limit` concurrent
+    holders so a backlog of batch work can never occupy every slot.
+    """
+
+    def __init__(self, limit: int, batch_limit: int):
+        self.limit = limit
+        self.batch_limit = min(batch_limit, limit)
+        self.in_flight = 0
+        self.batch_in_flight = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def _can_admit(self, priority: Priority) -> bool:
+        if self.in_flight >= self.limit:
+            return False
+        return priority != Priority.BATCH or self.batch_in_flight < self.batch_limit
+
+    def _admit(self, priority: Priority) -> None:
+        self.in_flight += 1
+        if priority == Priority.BATCH:
+            self.batch_in_flight += 1
+
+    async def acquire(self, priority: Priority) -> None:
+        if not self._waiters and self._can_admit(priority):
+            self._admit(priority)
+            return
+        future = asyncio.get_running_loop().create_future()
+        entry = (int(priority), next(self._seq), future)
+        heapq.heappush(self._waiters, entry)
+        # Queued waiters may all be capped BATCH work this one can overtake.
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed over just as we were cancelled — give it back.
+                self.release(priority)
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+    def release(self, priority: Priority) -> None:
+        self.in_flight -= 1
+        if priority == Priority.BATCH:
+            self.batch_in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # Serve the best waiter that can be admitted; a capped BATCH head must
+        # not block an INTERACTIVE waiter queued behind it.
+        skipped = []
+        while self._waiters and self.in_flight < self.limit:
+            entry = heapq.heappop(self._waiters)
+            priority, _, future = entry
+            if future.done():
+                continue
+            if not self._can_admit(Priority(priority)):
+                skipped.append(entry)
+                continue
+            self._admit(Priority(priority))
+            future.set_result(None)
+        for entry in skipped:
+            heapq.heappush(self._waiters, entry)
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, f in self._waiters if not f.done())
+
+
+class _ModelStats:
+    __slots__ = ("calls", "errors", "retries", "throttled", "queue_wait_s", "max_queue_wait_s", "busy_s")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.throttled = 0
+        self.queue_wait_s = 0.0
+        self.max_queue_wait_s = 0.0
+        self.busy_s = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rate_limited": self.throttled,
+            "avg_queue_wait_ms": round(self.queue_wait_s / self.calls * 1000, 1) if self.calls else 0.0,
+            "max_queue_wait_ms": round(self.max_queue_wait_s * 1000, 1),
+            "busy_seconds": round(self.busy_s, 2),
+        }
+
+
+class ModelCallGovernor:
+    """Shared admission control for every outbound model request."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        batch_max_concurrency: int = 8,
+        default_limits: Optional[ModelLimits] = None,
+        model_limits: Optional[Dict[str, ModelLimits]] = None,
+        max_retries: int = 4,
+        backoff_base_s: float = 1.0,
+        backoff_cap_s: float = 30.0,
+        interactive_reserve: float = 0.2,
+    ):
+        self.max_concurrency = max_concurrency
+        self.default_limits = default_limits or ModelLimits(600, 1_000_000)
+        self.model_limits = dict(model_limits or {})
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_cap_s = backoff_cap_s
+        self.interactive_reserve = interactive_reserve
+        self._semaphore = PrioritySemaphore(max_concurrency, batch_max_concurrency)
+        self._request_buckets: Dict[str, TokenBucket] = {}
+        self._token_buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, _ModelStats] = {}
+        self._started = time.monotonic()
+
+    def configure_model(self, model: str, limits: ModelLimits) -> None:
+        self.model_limits[model] = limits
+        self._request_buckets.pop(model, None)
+        self._token_buckets.pop(model, None)
+
+    def _buckets(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        if model not in self._request_buckets:
+            limits = self.model_limits.get(model, self.default_limits)
+            request_capacity = max(1.0, limits.requests_per_minute / 6)
+            token_capacity = max(1.0, limits.tokens_per_minute / 6)
+            self._request_buckets[model] = TokenBucket(
+                request_capacity, limits.requests_per_minute / 60,
+                reserve=request_capacity * self.interactive_reserve,
+            )
+            self._token_buckets[model] = TokenBucket(
+                token_capacity, limits.tokens_per_minute / 60,
+                reserve=token_capacity * self.interactive_reserve,
+            )
+        return self._request_buckets[model], self._token_buckets[model]
+
+    def _model_stats(self, model: str) -> _ModelStats:
+        stats = self._stats.get(model)
+        if stats is None:
+            stats = self._stats[model] = _ModelStats()
+        return stats
+
+    @asynccontextmanager
+    async def slot(self, model: str, est_tokens: int = 1000, priority: Optional[Priority] = None):
+        """Hold one admission slot for `model` for the duration of the block.
+
+        Rate budget is taken before the concurrency slot, so a call waiting
+        on its model's bucket does not occupy a slot other models could use.
+        """
+        lane = current_priority() if priority is None else priority
+        stats = self._model_stats(model)
+        queued_at = time.monotonic()
+        request_bucket, token_bucket = self._buckets(model)
+        await request_bucket.acquire(1, lane)
+        await token_bucket.acquire(max(1, est_tokens), lane)
+        await self._semaphore.acquire(lane)
+        try:
+            waited = time.monotonic() - queued_at
+            stats.calls += 1
+            stats.queue_wait_s += waited
+            stats.max_queue_wait_s = max(stats.max_queue_wait_s, waited)
+            started = time.monotonic()
+            try:
+                yield
+            finally:
+                stats.busy_s += time.monotonic() - started
+        finally:
+            self._semaphore.release(lane)
+
+    async def run(
+        self,
+        model: str,
+        call: Callable[[], Awaitable[T]],
+        est_tokens: int = 1000,
+        priority: Optional[Priority] = None,
+    ) -> T:
+        """Run `call` under admission control, retrying rate-limit failures.
+
+        The slot is released while backing off so a throttled call does not
+        hold concurrency it cannot use.
+        """
+        stats = self._model_stats(model)
+        attempt = 0
+        while True:
+            try:
+                async with self.slot(model, est_tokens, priority):
+                    return await call()
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                    stats.errors += 1
+                    raise
+                stats.throttled += 1
+                stats.retries += 1
+                delay = random.uniform(0, min(self.backoff_cap_s, self.backoff_base_s * (2 ** attempt)))
+                logger.warning(
+                    f"Model {model} rate limited (attempt {attempt + 1}/{self.max_retries}); "
+                    f"retrying in {delay:.2f}s"
+                )
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = max(1e-6, time.monotonic() - self._started)
+        busy = sum(s.busy_s for s in self._stats.values())
+        return {
+            "max_concurrency": self.max_concurrency,
+            "batch_max_concurrency": self._semaphore.batch_limit,
+            "in_flight": self._semaphore.in_flight,
+            "batch_in_flight": self._semaphore.batch_in_flight,
+            "queued": self._semaphore.queued,
+            # Mean fraction of concurrency slots busy since process start.
+            "utilization": round(busy / (elapsed * self.max_concurrency), 4),
+            "models": {model: s.as_dict() for model, s in self._stats.items()},
+        }
+
+
+# Gemini bills an image (or other inline/file media part) at a fixed 258
+# tokens per tile regardless of its byte size.
+MEDIA_PART_TOKENS = 258
+
+
+def _content_tokens(contents: Any) -> int:
+    """Text parts by length (~4 chars/token); media parts at the fixed cost."""
+    if contents is None:
+        return 0
+    if isinstance(contents, str):
+        return len(contents) // 4
+    if isinstance(contents, (bytes, bytearray, memoryview)):
+        return MEDIA_PART_TOKENS
+    if isinstance(contents, (list, tuple)):
+        return sum(_content_tokens(part) for part in contents)
+    if isinstance(contents, dict):
+        if contents.get("inline_data") is not None or contents.get("file_data") is not None:
+            return MEDIA_PART_TOKENS
+        if "parts" in contents:
+            return _content_tokens(contents["parts"])
+        return _content_tokens(contents.get("text"))
+    # genai types.Content / types.Part
+    if getattr(contents, "inline_data", None) is not None or getattr(contents, "file_data", None) is not None:
+        return MEDIA_PART_TOKENS
+    parts = getattr(contents, "parts", None)
+    if parts is not None:
+        return _content_tokens(parts)
+    text = getattr(contents, "text", None)
+    if isinstance(text, str):
+        return _content_tokens(text)
+    # Anything else (PIL image, uploaded file handle) is a media part
+    return MEDIA_PART_TOKENS
+
+
+def estimate_tokens(contents: Any, config: Any = None) -> int:
+    """Rough prompt + completion token estimate for the tokens/min bucket."""
+    output_tokens = getattr(config, "max_output_tokens", None) or 1024
+    return _content_tokens(contents) + output_tokens
+
+
+class _GovernedModels:
+    def __init__(self, models, governor: "ModelCallGovernor"):
+        self._models = models
+        self._governor = governor
+
+    async def generate_content(self, *, model: str, contents: Any, config: Any = None, **kwargs):
+        return await self._governor.run(
+            model,
+            lambda: self._models.generate_content(model=model, contents=contents, config=config, **kwargs),
+            est_tokens=estimate_tokens(contents, config),
+        )
+
+    async def embed_content(self, *, model: str, contents: Any, **kwargs):
+        return await self._governor.run(
+            model,
+            lambda: self._models.embed_content(model=model, contents=contents, **kwargs),
+            est_tokens=len(str(contents)) // 4 + 1,
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._models, name)
+
+
+class _GovernedAio:
+    def __init__(self, aio, governor: "ModelCallGovernor"):
+        self._aio = aio
+        self.models = _GovernedModels(aio.models, governor)
+
+    def __getattr__(self, name):
+        return getattr(self._aio, name)
+
+
+class GovernedGenAIClient:
+    """Drop-in wrapper for google.genai.Client routing async calls through the governor."""
+
+    def __init__(self, client, governor: Optional["ModelCallGovernor"] = None):
+        self._client = client
+        self.aio = _GovernedAio(client.aio, governor or get_model_governor())
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def govern_genai_client(client) -> GovernedGenAIClient:
+    return GovernedGenAIClient(client)
+
+
+_model_governor: Optional[ModelCallGovernor] = None
+
+
+def get_model_governor() -> ModelCallGovernor:
+    """Process-wide governor singleton, configured from settings."""
+    global _model_governor
+    if _model_governor is None:
+        from ..core.config import settings
+
+        _model_governor = ModelCallGovernor(
+            max_concurrency=settings.MODEL_GOVERNOR_MAX_CONCURRENCY,
+            batch_max_concurrency=settings.MODEL_GOVERNOR_BATCH_MAX_CONCURRENCY,
+            default_limits=ModelLimits(
+                settings.MODEL_GOVERNOR_REQUESTS_PER_MINUTE,
+                settings.MODEL_GOVERNOR_TOKENS_PER_MINUTE,
+            ),
+            max_retries=settings.MODEL_GOVERNOR_MAX_RETRIES,
+            interactive_reserve=settings.MODEL_GOVERNOR_INTERACTIVE_RESERVE,
+        )
+    return _model_governor
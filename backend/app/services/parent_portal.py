@@ -4,9 +4,11 @@ Parent Portal Service
 Orchestrates data from multiple sources to provide parent-facing views
 """
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Set, Tuple
 import uuid
 
 from ..models.parent_portal import (
@@ -23,6 +25,14 @@ from ..core.config import settings
 logger = logging.getLogger(__name__)
 
 
+class PartialSectionError(Exception):
+    """A dashboard section that could only be partly built; carries what it got"""
+
+    def __init__(self, message: str, result: Any):
+        super().__init__(message)
+        self.result = result
+
+
 class ParentPortalService:
     """Service for parent portal functionality"""
 
@@ -31,12 +41,34 @@ class ParentPortalService:
         cosmos_db: CosmosDBService,
         analytics_service: BigQueryAnalyticsService,
         ai_service: AIRecommendationService,
-        daily_activities_service: DailyActivitiesService
+        daily_activities_service: DailyActivitiesService,
+        section_timeout_s: Optional[float] = None,
+        dashboard_ttl_s: Optional[float] = None,
+        access_ttl_s: Optional[float] = None
     ):
         self.cosmos_db = cosmos_db
         self.analytics_service = analytics_service
         self.ai_service = ai_service
         self.daily_activities_service = daily_activities_service
+
+        # Dashboard assembly: sections run concurrently, each bounded by
+        # section_timeout_s; complete dashboards are reused for dashboard_ttl_s
+        self.section_timeout_s = section_timeout_s if section_timeout_s is not None else settings.PARENT_DASHBOARD_SECTION_TIMEOUT_S
+        self.dashboard_ttl_s = dashboard_ttl_s if dashboard_ttl_s is not None else settings.PARENT_DASHBOARD_TTL_S
+        self.access_ttl_s = access_ttl_s if access_ttl_s is not None else settings.PARENT_ACCESS_CACHE_TTL_S
+
+        # (parent_uid, student_id) -> (cached_at, dashboard)
+        self._dashboard_cache: Dict[Tuple[str, int], Tuple[float, ParentDashboard]] = {}
+        # parent_uid -> (cached_at, verified student ids); only grants are served from it
+        self._access_cache: Dict[str, Tuple[float, Set[int]]] = {}
+        self._counters = {
+            "dashboards": 0,
+            "snapshot_hits": 0,
+            "partial_dashboards": 0,
+            "access_cache_hits": 0,
+            "access_lookups": 0,
+        }
+        self._section_stats: Dict[str, Dict[str, float]] = {}
         logger.info("ParentPortalService initialized")
 
     # ============================================================================
@@ -113,6 +145,7 @@ class ParentPortalService:
 
             # Store link in Cosmos DB
             await self.cosmos_db.create_parent_student_link(link_data)
+            self._access_cache.pop(parent_uid, None)
 
             # Update parent account with linked student
             parent_account = await self.get_parent_account(parent_uid)
@@ -138,12 +171,19 @@ class ParentPortalService:
 
     async def verify_parent_access(self, parent_uid: str, student_id: int) -> bool:
         """Verify that a parent has access to a student's data"""
+        # Verified links are cached per parent for access_ttl_s; a student not
+        # in the cached set is always re-checked, so new links apply at once
+        cached = self._access_cache.get(parent_uid)
+        if cached and time.monotonic() - cached[0] < self.access_ttl_s and student_id in cached[1]:
+            self._counters["access_cache_hits"] += 1
+            return True
+
         try:
+            self._counters["access_lookups"] += 1
             links = await self.cosmos_db.get_parent_student_links(parent_uid)
-            for link in links:
-                if link.get('student_id') == student_id and link.get('verified', False):
-                    return True
-            return False
+            verified = {link.get('student_id') for link in links if link.get('verified', False)}
+            self._access_cache[parent_uid] = (time.monotonic(), verified)
+            return student_id in verified
         except Exception as e:
             logger.error(f"❌ Failed to verify parent access: {e}")
             return False
@@ -231,228 +271,307 @@ class ParentPortalService:
             if not has_access:
                 raise PermissionError(f"Parent {parent_uid} does not have access to student {student_id}")
 
+            # Short-lived snapshot: repeat views within dashboard_ttl_s skip the fan-out
+            cache_key = (parent_uid, student_id)
+            cached = self._dashboard_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < self.dashboard_ttl_s:
+                self._counters["snapshot_hits"] += 1
+                return cached[1]
+
             # Get student name (from user profiles or default)
             student_name = f"Student {student_id}"  # TODO: Fetch from user profiles service
 
-            # Fetch all dashboard components in parallel
-            todays_plan = await self._get_todays_plan_summary(student_id)
-            weekly_summary = await self._get_weekly_summary(student_id)
-            key_insights = await self._get_key_insights(student_id)
+            # Fetch all dashboard components in parallel, each with its own timeout
+            started = time.monotonic()
+            (todays_plan, plan_ok), (weekly_summary, weekly_ok), (key_insights, insights_ok) = await asyncio.gather(
+                self._run_section("todays_plan", lambda: self._get_todays_plan_summary(student_id),
+                                  self._empty_todays_plan),
+                self._run_section("weekly_summary", lambda: self._get_weekly_summary(student_id),
+                                  self._empty_weekly_summary),
+                self._run_section("key_insights", lambda: self._get_key_insights(student_id), list),
+            )
+            incomplete = [name for name, ok in (("todays_plan", plan_ok), ("weekly_summary", weekly_ok),
+                                                ("key_insights", insights_ok)) if not ok]
 
             dashboard = ParentDashboard(
                 student_id=student_id,
                 student_name=student_name,
                 todays_plan=todays_plan,
                 weekly_summary=weekly_summary,
-                key_insights=key_insights
+                key_insights=key_insights,
+                incomplete_sections=incomplete
             )
 
-            logger.info(f"✅ Generated parent dashboard for student {student_id}")
+            self._counters["dashboards"] += 1
+            if incomplete:
+                self._counters["partial_dashboards"] += 1
+            else:
+                self._dashboard_cache[cache_key] = (time.monotonic(), dashboard)
+
+            logger.info(f"✅ Generated parent dashboard for student {student_id} in "
+                        f"{(time.monotonic() - started) * 1000:.0f}ms"
+                        f"{f' (incomplete: {incomplete})' if incomplete else ''}")
             return dashboard
 
         except Exception as e:
             logger.error(f"❌ Failed to generate parent dashboard: {e}")
             raise
 
-    async def _get_todays_plan_summary(self, student_id: int) -> TodaysPlanSummary:
-        """Get today's plan summary in parent-friendly format"""
+    async def _run_section(
+        self,
+        name: str,
+        fetch: Callable[[], Awaitable[Any]],
+        fallback: Callable[[], Any]
+    ) -> Tuple[Any, bool]:
+        """Run one dashboard section under the section timeout; (result, completed)
+
+        Sections raise rather than return placeholders, so a failure shows up
+        as incomplete (and keeps the dashboard out of the snapshot cache).
+        """
+        stats = self._section_stats.setdefault(
+            name, {"calls": 0, "timeouts": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        started = time.monotonic()
         try:
-            # Get today's daily plan
-            today_str = datetime.utcnow().strftime("%Y-%m-%d")
-            daily_plan = await self.daily_activities_service.get_or_generate_daily_plan(
-                student_id,
-                date=today_str,
-                force_refresh=False
-            )
+            result, ok = await asyncio.wait_for(fetch(), timeout=self.section_timeout_s), True
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            logger.warning(f"⚠️ Parent dashboard section {name} timed out after {self.section_timeout_s}s")
+            result, ok = fallback(), False
+        except PartialSectionError as e:
+            stats["errors"] += 1
+            logger.error(f"❌ Parent dashboard section {name} incomplete: {e}")
+            result, ok = e.result, False
+        except Exception as e:
+            stats["errors"] += 1
+            logger.error(f"❌ Parent dashboard section {name} failed: {e}")
+            result, ok = fallback(), False
+
+        elapsed_ms = (time.monotonic() - started) * 1000
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        return result, ok
+
+    def stats(self) -> Dict[str, Any]:
+        """Dashboard cache hit rates and per-section latency (for profiling)"""
+        return {
+            **self._counters,
+            "cached_dashboards": len(self._dashboard_cache),
+            "sections": {
+                name: {
+                    "calls": int(s["calls"]),
+                    "timeouts": int(s["timeouts"]),
+                    "errors": int(s["errors"]),
+                    "avg_ms": round(s["total_ms"] / s["calls"], 1) if s["calls"] else None,
+                    "max_ms": round(s["max_ms"], 1),
+                }
+                for name, s in self._section_stats.items()
+            },
+        }
+
+    @staticmethod
+    def _empty_todays_plan() -> TodaysPlanSummary:
+        return TodaysPlanSummary(
+            date=datetime.utcnow().strftime("%Y-%m-%d"),
+            total_activities=0,
+            completed_activities=0,
+            estimated_total_time=0,
+            subjects_covered=[],
+            activities_preview=[]
+        )
 
-            # Extract subjects covered
-            subjects_covered = []
-            for activity in daily_plan.activities:
-                if activity.curriculum_metadata:
-                    subject = activity.curriculum_metadata.subject
-                    if subject and subject not in subjects_covered:
-                        subjects_covered.append(subject)
-
-            # Count completed activities
-            completed_activities = sum(
-                1 for activity in daily_plan.activities
-                if activity.metadata.get('is_complete', False)
-            )
+    @staticmethod
+    def _empty_weekly_summary() -> WeeklySummaryMetrics:
+        return WeeklySummaryMetrics(
+            week_start_date=(datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%d"),
+            week_end_date=datetime.utcnow().strftime("%Y-%m-%d"),
+            total_time_spent_minutes=0,
+            problems_completed=0,
+            average_mastery=0.0,
+            subjects_progress=[],
+            streak_days=0,
+            top_skill=None
+        )
 
-            # Estimate total time
-            estimated_total_time = sum(
-                int(activity.estimated_time.split()[0])
-                for activity in daily_plan.activities
-                if activity.estimated_time and activity.estimated_time.split()[0].isdigit()
-            )
+    async def _get_todays_plan_summary(self, student_id: int) -> TodaysPlanSummary:
+        """Get today's plan summary in parent-friendly format"""
+        # Get today's daily plan
+        today_str = datetime.utcnow().strftime("%Y-%m-%d")
+        daily_plan = await self.daily_activities_service.get_or_generate_daily_plan(
+            student_id,
+            date=today_str,
+            force_refresh=False
+        )
 
-            # Create simplified activity previews
-            activities_preview = [
-                {
-                    'title': activity.title,
-                    'type': activity.type,
-                    'subject': activity.curriculum_metadata.subject if activity.curriculum_metadata else 'General',
-                    'estimated_time': activity.estimated_time,
-                    'is_complete': activity.metadata.get('is_complete', False)
-                }
-                for activity in daily_plan.activities[:5]  # Show first 5
-            ]
-
-            return TodaysPlanSummary(
-                date=today_str,
-                total_activities=len(daily_plan.activities),
-                completed_activities=completed_activities,
-                estimated_total_time=estimated_total_time,
-                subjects_covered=subjects_covered,
-                activities_preview=activities_preview
-            )
+        # Extract subjects covered
+        subjects_covered = []
+        for activity in daily_plan.activities:
+            if activity.curriculum_metadata:
+                subject = activity.curriculum_metadata.subject
+                if subject and subject not in subjects_covered:
+                    subjects_covered.append(subject)
+
+        # Count completed activities
+        completed_activities = sum(
+            1 for activity in daily_plan.activities
+            if activity.metadata.get('is_complete', False)
+        )
 
-        except Exception as e:
-            logger.error(f"❌ Failed to get today's plan summary: {e}")
-            # Return empty summary on error
-            return TodaysPlanSummary(
-                date=datetime.utcnow().strftime("%Y-%m-%d"),
-                total_activities=0,
-                completed_activities=0,
-                estimated_total_time=0,
-                subjects_covered=[],
-                activities_preview=[]
-            )
+        # Estimate total time
+        estimated_total_time = sum(
+            int(activity.estimated_time.split()[0])
+            for activity in daily_plan.activities
+            if activity.estimated_time and activity.estimated_time.split()[0].isdigit()
+        )
+
+        # Create simplified activity previews
+        activities_preview = [
+            {
+                'title': activity.title,
+                'type': activity.type,
+                'subject': activity.curriculum_metadata.subject if activity.curriculum_metadata else 'General',
+                'estimated_time': activity.estimated_time,
+                'is_complete': activity.metadata.get('is_complete', False)
+            }
+            for activity in daily_plan.activities[:5]  # Show first 5
+        ]
+
+        return TodaysPlanSummary(
+            date=today_str,
+            total_activities=len(daily_plan.activities),
+            completed_activities=completed_activities,
+            estimated_total_time=estimated_total_time,
+            subjects_covered=subjects_covered,
+            activities_preview=activities_preview
+        )
 
     async def _get_weekly_summary(self, student_id: int) -> WeeklySummaryMetrics:
         """Get 7-day summary metrics for parent dashboard"""
-        try:
-            # Get date range for past 7 days
-            end_date = datetime.utcnow()
-            start_date = end_date - timedelta(days=7)
-
-            # Fetch hierarchical metrics from BigQuery
-            metrics = await self.analytics_service.get_hierarchical_metrics(
-                student_id=student_id,
-                subject=None,
-                start_date=start_date,
-                end_date=end_date
-            )
-
-            summary = metrics.get('summary', {})
-            hierarchical_data = metrics.get('hierarchical_data', [])
-
-            # Calculate subjects progress
-            subjects_progress = []
-            top_skill = None
-            max_progress = 0
-
-            for unit in hierarchical_data:
-                subject = unit.get('unit_title', 'Unknown')
-                mastery = unit.get('mastery', 0.0)
-                completion = unit.get('completion', 0.0)
-
-                subjects_progress.append({
-                    'subject': subject,
-                    'mastery': mastery,
-                    'completion': completion,
-                    'attempted_skills': unit.get('attempted_skills', 0),
-                    'total_skills': unit.get('total_skills', 0)
-                })
-
-                # Track top skill
-                if completion > max_progress:
-                    max_progress = completion
-                    top_skill = subject
-
-            # Get streak from user profile (TODO: integrate with user_profiles service)
-            streak_days = 0  # Placeholder
-
-            return WeeklySummaryMetrics(
-                week_start_date=start_date.strftime("%Y-%m-%d"),
-                week_end_date=end_date.strftime("%Y-%m-%d"),
-                total_time_spent_minutes=0,  # TODO: Calculate from activity logs
-                problems_completed=summary.get('attempt_count', 0),
-                average_mastery=summary.get('mastery', 0.0),
-                subjects_progress=subjects_progress,
-                streak_days=streak_days,
-                top_skill=top_skill
-            )
+        # Get date range for past 7 days
+        end_date = datetime.utcnow()
+        start_date = end_date - timedelta(days=7)
+
+        # Fetch hierarchical metrics from BigQuery
+        metrics = await self.analytics_service.get_hierarchical_metrics(
+            student_id=student_id,
+            subject=None,
+            start_date=start_date,
+            end_date=end_date
+        )
 
-        except Exception as e:
-            logger.error(f"❌ Failed to get weekly summary: {e}")
-            # Return empty summary on error
-            return WeeklySummaryMetrics(
-                week_start_date=(datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%d"),
-                week_end_date=datetime.utcnow().strftime("%Y-%m-%d"),
-                total_time_spent_minutes=0,
-                problems_completed=0,
-                average_mastery=0.0,
-                subjects_progress=[],
-                streak_days=0,
-                top_skill=None
-            )
+        summary = metrics.get('summary', {})
+        hierarchical_data = metrics.get('hierarchical_data', [])
+
+        # Calculate subjects progress
+        subjects_progress = []
+        top_skill = None
+        max_progress = 0
+
+        for unit in hierarchical_data:
+            subject = unit.get('unit_title', 'Unknown')
+            mastery = unit.get('mastery', 0.0)
+            completion = unit.get('completion', 0.0)
+
+            subjects_progress.append({
+                'subject': subject,
+                'mastery': mastery,
+                'completion': completion,
+                'attempted_skills': unit.get('attempted_skills', 0),
+                'total_skills': unit.get('total_skills', 0)
+            })
+
+            # Track top skill
+            if completion > max_progress:
+                max_progress = completion
+                top_skill = subject
+
+        # Get streak from user profile (TODO: integrate with user_profiles service)
+        streak_days = 0  # Placeholder
+
+        return WeeklySummaryMetrics(
+            week_start_date=start_date.strftime("%Y-%m-%d"),
+            week_end_date=end_date.strftime("%Y-%m-%d"),
+            total_time_spent_minutes=0,  # TODO: Calculate from activity logs
+            problems_completed=summary.get('attempt_count', 0),
+            average_mastery=summary.get('mastery', 0.0),
+            subjects_progress=subjects_progress,
+            streak_days=streak_days,
+            top_skill=top_skill
+        )
 
     async def _get_key_insights(self, student_id: int) -> List[KeyInsight]:
         """Generate key insights from AI recommendations and analytics"""
-        try:
-            insights = []
+        insights = []
 
-            # Get AI recommendations
-            ai_recommendations = await self.ai_service.get_ai_recommendations(
+        # AI recommendations and velocity metrics are independent: fetch both at once
+        ai_recommendations, velocity_metrics = await asyncio.gather(
+            self.ai_service.get_ai_recommendations(
                 student_id=student_id,
                 target_count=5,
                 session_type='daily'
-            )
-
-            if ai_recommendations:
-                # Get top recommendation
-                top_rec = ai_recommendations[0]
+            ),
+            self.analytics_service.get_velocity_metrics(student_id),
+            return_exceptions=True
+        )
+        # One failed source still yields the other's insights, reported as partial
+        failures = [f"{source}: {result}" for source, result in (
+            ("ai_recommendations", ai_recommendations), ("velocity_metrics", velocity_metrics)
+        ) if isinstance(result, Exception)]
+        if isinstance(ai_recommendations, Exception):
+            ai_recommendations = []
+        if isinstance(velocity_metrics, Exception):
+            velocity_metrics = []
+
+        if ai_recommendations:
+            # Get top recommendation
+            top_rec = ai_recommendations[0]
+            insights.append(KeyInsight(
+                insight_type='recommendation',
+                priority='high',
+                title=f"Focus on {top_rec.get('subject', 'Learning')}",
+                message=self._translate_to_parent_language(top_rec.get('reason', '')),
+                subject=top_rec.get('subject'),
+                action_items=[
+                    f"Encourage practice in {top_rec.get('subskill_description', 'this area')}",
+                    f"Estimated time: {top_rec.get('estimated_time', 20)} minutes"
+                ]
+            ))
+
+        # Velocity metrics for progress insights
+        for metric in velocity_metrics:
+            velocity_status = metric.get('velocity_status', 'on_pace')
+            subject = metric.get('subject', 'Learning')
+
+            if velocity_status == 'ahead':
                 insights.append(KeyInsight(
-                    insight_type='recommendation',
+                    insight_type='progress',
+                    priority='medium',
+                    title=f"Great progress in {subject}!",
+                    message=f"Your child is ahead of pace in {subject}. They're doing excellent work!",
+                    subject=subject,
+                    action_items=[
+                        "Celebrate their progress",
+                        "Consider introducing more challenging topics"
+                    ]
+                ))
+            elif velocity_status == 'behind':
+                insights.append(KeyInsight(
+                    insight_type='struggle',
                     priority='high',
-                    title=f"Focus on {top_rec.get('subject', 'Learning')}",
-                    message=self._translate_to_parent_language(top_rec.get('reason', '')),
-                    subject=top_rec.get('subject'),
+                    title=f"{subject} needs attention",
+                    message=f"Your child could use some extra support in {subject}.",
+                    subject=subject,
                     action_items=[
-                        f"Encourage practice in {top_rec.get('subskill_description', 'this area')}",
-                        f"Estimated time: {top_rec.get('estimated_time', 20)} minutes"
+                        f"Spend 15-20 extra minutes on {subject} this week",
+                        "Check the 'Ways to Help' section for activity ideas"
                     ]
                 ))
 
-            # Get velocity metrics for progress insights
-            velocity_metrics = await self.analytics_service.get_velocity_metrics(student_id)
-
-            for metric in velocity_metrics:
-                velocity_status = metric.get('velocity_status', 'on_pace')
-                subject = metric.get('subject', 'Learning')
-
-                if velocity_status == 'ahead':
-                    insights.append(KeyInsight(
-                        insight_type='progress',
-                        priority='medium',
-                        title=f"Great progress in {subject}!",
-                        message=f"Your child is ahead of pace in {subject}. They're doing excellent work!",
-                        subject=subject,
-                        action_items=[
-                            "Celebrate their progress",
-                            "Consider introducing more challenging topics"
-                        ]
-                    ))
-                elif velocity_status == 'behind':
-                    insights.append(KeyInsight(
-                        insight_type='struggle',
-                        priority='high',
-                        title=f"{subject} needs attention",
-                        message=f"Your child could use some extra support in {subject}.",
-                        subject=subject,
-                        action_items=[
-                            f"Spend 15-20 extra minutes on {subject} this week",
-                            "Check the 'Ways to Help' section for activity ideas"
-                        ]
-                    ))
-
-            # Limit to top 5 insights
-            return insights[:5]
-
-        except Exception as e:
-            logger.error(f"❌ Failed to generate key insights: {e}")
-            return []
+        # Limit to top 5 insights
+        if failures:
+            raise PartialSectionError("; ".join(failures), insights[:5])
+        return insights[:5]
 
     def _translate_to_parent_language(self, ai_reason: str) -> str:
         """Translate technical AI reasoning into parent-friendly language"""
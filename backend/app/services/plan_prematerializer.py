@@ -0,0 +1,221 @@
+# backend/app/services/plan_prematerializer.py
+"""Overnight pre-materialization of daily session plans and forecasts.
+
+`PlanningService.get_daily_session_plan` and `ForecastService.get_student_forecast`
+are get-or-create: the first visit of the day pays for the whole build (weekly
+plan, knowledge-graph progress per subject, selectors, lesson grouping, the
+projection). This job runs the same get-or-create paths for a target day —
+normally tomorrow — for every active student before the school day starts, so
+morning requests are single document reads.
+
+  bounded     — at most `concurrency` students are built at once.
+  resumable   — students whose plan and forecast docs already exist for the
+                day are skipped, and an optional JSON checkpoint records
+                finished students so a restarted run (including a dry run)
+                picks up where it stopped.
+  dry run     — builds in memory with the same code paths and persists nothing
+                (PlanningService.read_only() suppresses the promotion
+                writes a plan build would otherwise make).
+
+Per-student failures are logged and counted; the run always completes.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class FileCheckpoint:
+    """Finished student ids for one target date, persisted as JSON.
+
+    A checkpoint written for a different date is ignored, so a stale file
+    from last night never suppresses tonight's run.
+    """
+
+    def __init__(self, path: str, target_date: str, flush_every: int = 25):
+        self.path = Path(path)
+        self.target_date = target_date
+        self.flush_every = flush_every
+        self.done: Set[int] = set()
+        self._unflushed = 0
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                if data.get("date") == target_date:
+                    self.done = {int(sid) for sid in data.get("done", [])}
+            except (ValueError, OSError) as e:
+                logger.warning(f"[PREMATERIALIZE] Unreadable checkpoint {self.path}, starting fresh: {e}")
+
+    def mark(self, student_id: int) -> None:
+        self.done.add(student_id)
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"date": self.target_date, "done": sorted(self.done)}))
+        os.replace(tmp, self.path)
+        self._unflushed = 0
+
+    def clear(self) -> None:
+        """Forget the run (it finished), so the file cannot skip a later one."""
+        self.done = set()
+        self._unflushed = 0
+        self.path.unlink(missing_ok=True)
+
+
+@dataclass
+class PrematerializeStats:
+    target_date: str
+    dry_run: bool
+    students: int = 0
+    checkpointed: int = 0
+    plans_built: int = 0
+    plans_skipped: int = 0
+    forecasts_built: int = 0
+    forecasts_skipped: int = 0
+    failed: int = 0
+    elapsed_s: float = 0.0
+    durations_ms: List[float] = field(default_factory=list, repr=False)
+    errors: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        durations = sorted(self.durations_ms)
+
+        def pct(p: float) -> Optional[float]:
+            if not durations:
+                return None
+            return round(durations[min(len(durations) - 1, math.ceil(p * len(durations)) - 1)], 1)
+
+        processed = len(durations)
+        return {
+            "target_date": self.target_date,
+            "dry_run": self.dry_run,
+            "students": self.students,
+            "checkpointed": self.checkpointed,
+            "processed": processed,
+            "plans_built": self.plans_built,
+            "plans_skipped": self.plans_skipped,
+            "forecasts_built": self.forecasts_built,
+            "forecasts_skipped": self.forecasts_skipped,
+            "failed": self.failed,
+            "elapsed_s": round(self.elapsed_s, 2),
+            "students_per_s": round(processed / self.elapsed_s, 2) if self.elapsed_s else None,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "errors": self.errors[:20],
+        }
+
+
+class PlanPrematerializer:
+    """Builds one day's session plans and forecasts for a list of students."""
+
+    def __init__(
+        self,
+        firestore_service,
+        planning_service,
+        forecast_service,
+        concurrency: int = 8,
+        dry_run: bool = False,
+        overwrite: bool = False,
+    ):
+        self.firestore = firestore_service
+        self.planning = planning_service
+        self.forecast = forecast_service
+        self.concurrency = max(1, concurrency)
+        self.dry_run = dry_run
+        self.overwrite = overwrite
+
+    async def run(
+        self,
+        student_ids: Iterable[int],
+        target_date: str,
+        checkpoint: Optional[FileCheckpoint] = None,
+    ) -> PrematerializeStats:
+        ids = list(dict.fromkeys(student_ids))
+        stats = PrematerializeStats(target_date=target_date, dry_run=self.dry_run, students=len(ids))
+        if checkpoint is not None:
+            stats.checkpointed = sum(1 for sid in ids if sid in checkpoint.done)
+            ids = [sid for sid in ids if sid not in checkpoint.done]
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for sid in ids:
+            queue.put_nowait(sid)
+
+        async def worker() -> None:
+            while True:
+                try:
+                    sid = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.monotonic()
+                try:
+                    await self._materialize_student(sid, target_date, stats)
+                    if checkpoint is not None:
+                        checkpoint.mark(sid)
+                except Exception as e:
+                    stats.failed += 1
+                    stats.errors.append({"student_id": sid, "error": f"{type(e).__name__}: {e}"})
+                    logger.error(f"[PREMATERIALIZE] Student {sid} failed for {target_date}: {e}")
+                finally:
+                    stats.durations_ms.append((time.monotonic() - started) * 1000)
+
+        logger.info(
+            f"[PREMATERIALIZE] {len(ids)} student(s) for {target_date} "
+            f"(concurrency={self.concurrency}, dry_run={self.dry_run})"
+        )
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(ids)) or 1)))
+        stats.elapsed_s = time.monotonic() - started
+        if checkpoint is not None:
+            checkpoint.flush()
+        logger.info(f"[PREMATERIALIZE] Done: {stats.to_dict()}")
+        return stats
+
+    async def _materialize_student(self, student_id: int, target_date: str, stats: PrematerializeStats) -> None:
+        plan_exists, forecast_exists = False, False
+        if not self.overwrite:
+            plan_doc, forecast_doc = await asyncio.gather(
+                self.firestore.get_daily_session_plan_doc(student_id, target_date),
+                self.firestore.get_forecast_doc(student_id, target_date),
+            )
+            plan_exists, forecast_exists = plan_doc is not None, forecast_doc is not None
+
+        if plan_exists:
+            stats.plans_skipped += 1
+        else:
+            await self._build_plan(student_id, target_date)
+            stats.plans_built += 1
+
+        if forecast_exists:
+            stats.forecasts_skipped += 1
+        else:
+            await self._build_forecast(student_id, target_date)
+            stats.forecasts_built += 1
+
+    async def _build_plan(self, student_id: int, target_date: str) -> None:
+        if self.dry_run:
+            with self.planning.pinned_clock(date.fromisoformat(target_date)), self.planning.read_only():
+                await self.planning._build_daily_session_plan(student_id)
+        else:
+            await self.planning.get_daily_session_plan(
+                student_id, force_refresh=self.overwrite, plan_date=target_date
+            )
+
+    async def _build_forecast(self, student_id: int, target_date: str) -> None:
+        if self.dry_run:
+            await self.forecast._build_forecast(student_id, target_date)
+        else:
+            await self.forecast.get_student_forecast(
+                student_id, force_refresh=self.overwrite, forecast_date=target_date
+            )
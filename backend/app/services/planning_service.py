@@ -15,9 +15,12 @@ Data sources (all Firestore):
   - curriculum_graphs        — prerequisite relationships (via LearningPathsService)
 """
 
+import asyncio
 import logging
 import math
-from datetime import datetime, date, timedelta, timezone
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, date, time, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
 from ..core.config import settings
@@ -56,6 +59,14 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_CAPACITY = 25
 
+# Clock pin for building a future day's plan ahead of time (overnight
+# pre-materialization). A ContextVar keeps the pin local to the task doing
+# the build, so concurrent requests on the same service see the wall clock.
+_pinned_now: ContextVar[Optional[datetime]] = ContextVar("planning_pinned_now", default=None)
+# Read-only build (pre-materialization dry run): side-effect writes made while
+# building — promotion-ready records, grade overrides — are skipped.
+_read_only: ContextVar[bool] = ContextVar("planning_read_only", default=False)
+
 
 class PlanningService:
     """
@@ -79,6 +90,10 @@ class PlanningService:
         # session-scope selector (select_session_targets) — ONE selection
         # brain shared with the Lesson Builder's Recommended fill mode.
         self.analytics = analytics_service
+        # Single-flight session plan builds keyed by (student_id, date): two
+        # tabs or a client retry share one get-or-create instead of racing.
+        # Values are (task, force_refresh).
+        self._plan_builds: Dict[Tuple[int, str], Tuple[asyncio.Task, bool]] = {}
         logger.info("PlanningService initialized")
 
     def _now(self) -> datetime:
@@ -89,10 +104,39 @@ class PlanningService:
         simulated timeline. Production FirestoreService has no such attribute
         → wall clock, unchanged behavior. The isinstance guard also keeps
         MagicMock stores (unit tests) on the wall clock.
+
+        Inside `pinned_clock(day)` the start of that day wins over both.
         """
+        pinned = _pinned_now.get()
+        if pinned is not None:
+            return pinned
         vn = getattr(self.firestore, "virtual_now", None)
         return vn if isinstance(vn, datetime) else datetime.now(timezone.utc)
 
+    @contextmanager
+    def pinned_clock(self, day: date):
+        """Run planning code as of the start of `day` (UTC) in this task only."""
+        token = _pinned_now.set(datetime.combine(day, time.min, tzinfo=timezone.utc))
+        try:
+            yield
+        finally:
+            _pinned_now.reset(token)
+
+    @contextmanager
+    def read_only(self):
+        """Build plans in this task without persisting planning-field writes."""
+        token = _read_only.set(True)
+        try:
+            yield
+        finally:
+            _read_only.reset(token)
+
+    async def _update_planning_fields(self, student_id: int, fields: Dict[str, Any]) -> None:
+        if _read_only.get():
+            logger.debug(f"[PLANNING] Read-only build: not persisting {sorted(fields)} for student {student_id}")
+            return
+        await self.firestore.update_student_planning_fields(student_id, fields)
+
     # ====================================================================
     # Status mapping (PRD §16.5 — stability-based retention model)
     # ====================================================================
@@ -838,7 +882,10 @@ class PlanningService:
     # ====================================================================
 
     async def get_daily_session_plan(
-        self, student_id: int, force_refresh: bool = False
+        self,
+        student_id: int,
+        force_refresh: bool = False,
+        plan_date: Optional[str] = None,
     ) -> "DailySessionPlan":
         """
         Get-or-create today's structured session plan.
@@ -853,10 +900,46 @@ class PlanningService:
         force_refresh regenerates today's plan but carries finished work
         forward: completed blocks (and their completion marks) never
         disappear from the student's view.
+
+        plan_date (YYYY-MM-DD) gets-or-creates that day's plan instead, with
+        the builder's clock pinned to the start of the day — the overnight
+        pre-materialization job uses it to build tomorrow's plan tonight.
         """
+        if plan_date is not None:
+            with self.pinned_clock(date.fromisoformat(plan_date)):
+                return await self.get_daily_session_plan(student_id, force_refresh)
+
+        # Concurrent callers for the same student and day join the build in
+        # flight. A refresh only joins another refresh: behind a normal build
+        # (which may just return the stored plan) it waits for that build to
+        # finish, then starts its own. The task is shielded so one caller
+        # disconnecting does not cancel the others' build.
+        today_str = self._now().date().isoformat()
+        key = (student_id, today_str)
+        while True:
+            task, forced = self._plan_builds.get(key, (None, False))
+            if task is None or task.done():
+                task = asyncio.create_task(
+                    self._get_or_create_session_plan(student_id, today_str, force_refresh)
+                )
+                self._plan_builds[key] = (task, force_refresh)
+                task.add_done_callback(
+                    lambda t, k=key: self._plan_builds.pop(k, None)
+                    if self._plan_builds.get(k, (None,))[0] is t else None
+                )
+                break
+            if forced or not force_refresh:
+                logger.info(f"[SESSION_PLAN] Joining in-flight plan build for {student_id}/{today_str}")
+                break
+            await asyncio.wait({task})
+        return await asyncio.shield(task)
+
+    async def _get_or_create_session_plan(
+        self, student_id: int, today_str: str, force_refresh: bool
+    ) -> "DailySessionPlan":
+        """Body of get_daily_session_plan — runs once per (student, day) at a time."""
         from ..models.lesson_plan import BlockTimeEntry, DailySessionPlan, LessonBlock
 
-        today_str = self._now().date().isoformat()
         stored = await self.firestore.get_daily_session_plan_doc(student_id, today_str)
 
         if stored and not force_refresh:
@@ -1254,8 +1337,10 @@ class PlanningService:
             )
             return total, done, teachable
 
-        paces: List[SubjectPace] = []
-        for subj in subjects:
+        # Subjects are independent graph reads — load them concurrently, then
+        # keep the input order. Promotion warnings are collected per subject
+        # so their order does not depend on which graph returned first.
+        async def _subject_pace(subj: str, warnings_out: List[str]) -> Optional[SubjectPace]:
             subj_grade = self._subject_grade(subj, grade, grade_overrides)
             try:
                 total, done, teachable = await _graph_counts(subj, subj_grade)
@@ -1263,7 +1348,7 @@ class PlanningService:
                 logger.info(
                     f"[SESSION_PLAN] Pace allocation: no graph for {subj} ({e})"
                 )
-                continue
+                return None
 
             # Grade frontier exhausted: mastery exists and no reachable
             # subskill is left to teach. Record the signal (never silent),
@@ -1271,7 +1356,7 @@ class PlanningService:
             if total > 0 and done > 0 and teachable == 0 and subj_grade is not None:
                 promoted_grade = await self._handle_frontier_exhausted(
                     student_id, subj, subj_grade, done,
-                    grade_overrides, promotion_ready, promo_warnings,
+                    grade_overrides, promotion_ready, warnings_out,
                 )
                 if promoted_grade:
                     subj_grade = promoted_grade
@@ -1283,14 +1368,23 @@ class PlanningService:
                             f"{promoted_grade} but its graph failed to load: {e}"
                         )
 
-            paces.append(SubjectPace(
+            return SubjectPace(
                 subject=subj,
                 total_subskills=total,
                 remaining_subskills=total - done,
                 weight=0.0,
                 allocated_minutes=0.0,
                 selector_count=0,
-            ))
+            )
+
+        subject_warnings: List[List[str]] = [[] for _ in subjects]
+        results = await asyncio.gather(*(
+            _subject_pace(subj, subject_warnings[i]) for i, subj in enumerate(subjects)
+        ))
+        if promo_warnings is not None:
+            for w in subject_warnings:
+                promo_warnings.extend(w)
+        paces: List[SubjectPace] = [p for p in results if p is not None]
         if not paces:
             return None
 
@@ -1396,7 +1490,7 @@ class PlanningService:
             if promotion_ready is not None:
                 promotion_ready[key] = record
             try:
-                await self.firestore.update_student_planning_fields(
+                await self._update_planning_fields(
                     student_id, {"promotion_ready": {key: record}}
                 )
             except Exception as e:
@@ -1454,7 +1548,7 @@ class PlanningService:
         if promotion_ready is not None:
             promotion_ready[key] = applied
         try:
-            await self.firestore.update_student_planning_fields(
+            await self._update_planning_fields(
                 student_id,
                 {
                     "subject_grade_overrides": {key: next_grade},
@@ -0,0 +1,259 @@
+# backend/app/services/problem_pool.py
+"""Pre-generated problem pool served ahead of live generation.
+
+`ProblemService.get_problems` used to run the full three-phase LLM pipeline on
+the request path for every recommendation. The pool keeps a stock of already
+generated problems per (subject, subskill, difficulty band), grouped by problem
+type inside one document, so the common case is one pool read plus one read of
+the student's served set. Live generation only covers what the pool cannot.
+
+Replenishment is background work: when a student's unserved stock for a key
+drops below the low watermark, one task per key (single-flight) tops the pool
+up to the target size in the BATCH lane of the model governor, so it never
+competes with interactive requests for model slots.
+
+Problems that target an active misconception are never pooled — they are
+student-specific and are always generated live.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Set
+
+from .model_governor import Priority, model_call_priority
+
+logger = logging.getLogger(__name__)
+
+# Fields that differ between otherwise identical generations; ignored when
+# fingerprinting so a re-generated duplicate is not pooled twice.
+_VOLATILE_FIELDS = {"id", "pool_problem_id", "pooled_at", "generated_at", "student_id"}
+
+PoolGenerator = Callable[[str, Dict[str, Any], int], Awaitable[List[Dict[str, Any]]]]
+
+
+def difficulty_band(difficulty: Optional[float]) -> str:
+    """Bucket a 1–10 recommender difficulty into easy / medium / hard."""
+    try:
+        value = float(difficulty) if difficulty is not None else 5.0
+    except (TypeError, ValueError):
+        value = 5.0
+    if value < 4:
+        return "easy"
+    if value > 7:
+        return "hard"
+    return "medium"
+
+
+def pool_key(subject: str, subskill_id: str, band: str) -> str:
+    # Firestore document IDs cannot contain '/'.
+    return "__".join(part.replace("/", "_") for part in (subject, subskill_id, band))
+
+
+def _fingerprint(problem: Dict[str, Any]) -> str:
+    stable = {k: v for k, v in problem.items() if k not in _VOLATILE_FIELDS and k != "metadata"}
+    return hashlib.sha256(json.dumps(stable, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+class ProblemPoolStore(Protocol):
+    async def get_problem_pool(self, pool_key: str) -> Dict[str, Dict[str, Dict[str, Any]]]: ...
+
+    async def add_problem_pool_items(
+        self, pool_key: str, pool_meta: Dict[str, Any], items: List[Dict[str, Any]]
+    ) -> bool: ...
+
+    async def get_served_pool_problem_ids(self, student_id: int, pool_key: str) -> Set[str]: ...
+
+    async def mark_pool_problems_served(
+        self, student_id: int, pool_key: str, pool_problem_ids: List[str]
+    ) -> None: ...
+
+
+class InMemoryProblemPoolStore:
+    """Process-local store with the FirestoreService pool interface.
+
+    Used when Firestore is unavailable (local dev) and in tests.
+    """
+
+    def __init__(self):
+        self._pools: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {}
+        self._served: Dict[tuple, Set[str]] = {}
+
+    async def get_problem_pool(self, pool_key: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return {t: dict(items) for t, items in self._pools.get(pool_key, {}).items()}
+
+    async def add_problem_pool_items(self, pool_key, pool_meta, items) -> bool:
+        pool = self._pools.setdefault(pool_key, {})
+        for item in items:
+            pool.setdefault(item["problem_type"], {})[item["pool_problem_id"]] = item
+        return True
+
+    async def get_served_pool_problem_ids(self, student_id, pool_key) -> Set[str]:
+        return set(self._served.get((student_id, pool_key), set()))
+
+    async def mark_pool_problems_served(self, student_id, pool_key, pool_problem_ids) -> None:
+        self._served.setdefault((student_id, pool_key), set()).update(pool_problem_ids)
+
+
+class ProblemPoolService:
+    """Serve pooled problems with per-student de-dup; replenish in the background."""
+
+    def __init__(
+        self,
+        store: ProblemPoolStore,
+        generator: Optional[PoolGenerator] = None,
+        low_watermark: int = 3,
+        target_size: int = 12,
+        max_pool_size: int = 60,
+    ):
+        self.store = store
+        self.generator = generator
+        self.low_watermark = low_watermark
+        self.target_size = target_size
+        self.max_pool_size = max_pool_size
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats = {
+            "served": 0,
+            "requested": 0,
+            "replenishments": 0,
+            "replenish_errors": 0,
+            "generated": 0,
+            "duplicates_skipped": 0,
+        }
+
+    @staticmethod
+    def is_poolable(rec: Dict[str, Any]) -> bool:
+        subskill = rec.get("subskill") or {}
+        return bool(subskill.get("id")) and not rec.get("misconception_to_address")
+
+    @staticmethod
+    def key_for(subject: str, rec: Dict[str, Any]) -> str:
+        return pool_key(subject, rec["subskill"]["id"], difficulty_band(rec.get("difficulty")))
+
+    async def take(
+        self,
+        student_id: int,
+        subject: str,
+        rec: Dict[str, Any],
+        count: int,
+        problem_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return up to `count` pooled problems this student has not been served.
+
+        Never raises: a store failure is treated as an empty pool so the
+        caller falls through to live generation.
+        """
+        self._stats["requested"] += count
+        key = self.key_for(subject, rec)
+        try:
+            pool, served = await asyncio.gather(
+                self.store.get_problem_pool(key),
+                self.store.get_served_pool_problem_ids(student_id, key),
+            )
+        except Exception as e:
+            logger.warning(f"[PROBLEM_POOL] Read failed for {key}: {e}")
+            return []
+
+        available = {
+            ptype: [item for pid, item in items.items() if pid not in served]
+            for ptype, items in pool.items()
+            if problem_type is None or ptype == problem_type
+        }
+        picked = self._pick(available, count)
+        remaining = sum(len(v) for v in available.values()) - len(picked)
+
+        if picked:
+            try:
+                await self.store.mark_pool_problems_served(
+                    student_id, key, [p["pool_problem_id"] for p in picked]
+                )
+            except Exception as e:
+                logger.warning(f"[PROBLEM_POOL] Could not record served set for {key}: {e}")
+            self._stats["served"] += len(picked)
+
+        if remaining < self.low_watermark:
+            self.schedule_replenish(subject, rec, pool_size=sum(len(v) for v in pool.values()))
+
+        logger.info(
+            f"[PROBLEM_POOL] {key}: served {len(picked)}/{count} to student {student_id}, "
+            f"{remaining} unserved left"
+        )
+        return [dict(p) for p in picked]
+
+    @staticmethod
+    def _pick(available: Dict[str, List[Dict[str, Any]]], count: int) -> List[Dict[str, Any]]:
+        # Round-robin across problem types so a batch keeps the mix the
+        # type-selection phase produced instead of draining one type first.
+        queues = [sorted(items, key=lambda p: p.get("pooled_at", "")) for items in available.values() if items]
+        picked: List[Dict[str, Any]] = []
+        while queues and len(picked) < count:
+            for queue in list(queues):
+                if len(picked) >= count:
+                    break
+                picked.append(queue.pop(0))
+                if not queue:
+                    queues.remove(queue)
+        return picked
+
+    def schedule_replenish(self, subject: str, rec: Dict[str, Any], pool_size: int = 0) -> Optional[asyncio.Task]:
+        """Start a background top-up for this key unless one is already running."""
+        if self.generator is None or not self.is_poolable(rec):
+            return None
+        key = self.key_for(subject, rec)
+        task = self._inflight.get(key)
+        if task is not None and not task.done():
+            return task
+        need = min(self.target_size, self.max_pool_size - pool_size)
+        if need <= 0:
+            return None
+        task = asyncio.create_task(self.replenish(subject, rec, need))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t, k=key: self._inflight.pop(k, None) if self._inflight.get(k) is t else None)
+        return task
+
+    async def replenish(self, subject: str, rec: Dict[str, Any], count: int) -> int:
+        """Generate `count` problems for this key and add the new ones. Returns items added."""
+        key = self.key_for(subject, rec)
+        self._stats["replenishments"] += 1
+        try:
+            with model_call_priority(Priority.BATCH):
+                problems = await self.generator(subject, rec, count)
+            existing = await self.store.get_problem_pool(key)
+            seen = {_fingerprint(item) for items in existing.values() for item in items.values()}
+
+            now = datetime.now(timezone.utc).isoformat()
+            items = []
+            for problem in problems or []:
+                if not problem.get("problem_type"):
+                    continue
+                fingerprint = _fingerprint(problem)
+                if fingerprint in seen:
+                    self._stats["duplicates_skipped"] += 1
+                    continue
+                seen.add(fingerprint)
+                items.append({**problem, "pool_problem_id": uuid.uuid4().hex, "pooled_at": now})
+
+            if items:
+                await self.store.add_problem_pool_items(key, {
+                    "subject": subject,
+                    "subskill_id": rec["subskill"]["id"],
+                    "difficulty_band": difficulty_band(rec.get("difficulty")),
+                }, items)
+            self._stats["generated"] += len(items)
+            logger.info(f"[PROBLEM_POOL] Replenished {key} with {len(items)} problems")
+            return len(items)
+        except Exception as e:
+            self._stats["replenish_errors"] += 1
+            logger.error(f"[PROBLEM_POOL] Replenishment failed for {key}: {e}")
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        requested = self._stats["requested"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["served"] / requested, 3) if requested else 0.0,
+            "replenishing": sorted(k for k, t in self._inflight.items() if not t.done()),
+        }
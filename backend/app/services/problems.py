@@ -1,7 +1,9 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from .base_ai_service import BaseAIService
 from .ai_service_factory import AIServiceFactory
+from .llm_response_cache import get_llm_response_cache
+from .model_governor import govern_genai_client
 import logging
 import json
 import random
@@ -35,6 +37,7 @@ class ProblemService:
         self.master_context_generator = None  # Will be set by dependency injection
         self.context_primitives_generator = None  # Will be set by dependency injection
         self.user_profiles_service = None  # Will be set by dependency injection (for misconceptions)
+        self.problem_pool = None  # Will be set by dependency injection (ProblemPoolService)
         self.curriculum_service = curriculum_service  # For BigQuery TIER 1 foundations
         self._problem_history = {}  # In-memory storage for now
         self._current_ai_service_type = "gemini"  # Default to Gemini for JSON schema support
@@ -48,7 +51,7 @@ class ProblemService:
         if not settings.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY is required. Please check your configuration.")
 
-        self.client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        self.client = govern_genai_client(genai.Client(api_key=settings.GEMINI_API_KEY))
         logger.info(f"Gemini client initialized for {self.__class__.__name__}")
 
     # ============================================================================
@@ -602,7 +605,8 @@ Think about what will be most effective and engaging for 5-6 year olds learning
         recommendations: List[Dict[str, Any]],
         num_problems: int,
         context_primitives: Optional[Dict[str, Any]] = None,
-        enable_ai_coach: bool = False
+        enable_ai_coach: bool = False,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         PHASE 2: Generate problems of a single type using focused schema.
@@ -617,6 +621,7 @@ Think about what will be most effective and engaging for 5-6 year olds learning
             num_problems: Number of problems of this type to generate
             context_primitives: Optional context primitives for variety
             enable_ai_coach: Whether to add live_interaction_config for AI coaching
+            use_cache: Whether a primitive-free prompt may reuse a cached response
 
         Returns:
             Dict with type and generated problems:
@@ -704,19 +709,36 @@ CRITICAL REQUIREMENTS:
 
             logger.info(f"[PHASE_2] Calling {model} for {problem_type} generation")
 
-            # Call appropriate Gemini model
-            response = await self.client.aio.models.generate_content(
-                model=model,
-                contents=prompt,
-                config=GenerateContentConfig(
-                    response_mime_type='application/json',
-                    response_schema=schema,
+            async def _call() -> str:
+                # Call appropriate Gemini model
+                response = await self.client.aio.models.generate_content(
+                    model=model,
+                    contents=prompt,
+                    config=GenerateContentConfig(
+                        response_mime_type='application/json',
+                        response_schema=schema,
+                        temperature=0.7,
+                        max_output_tokens=max_tokens
+                    )
+                )
+                return response.text
+
+            # Context primitives are randomly sampled into the prompt, so only
+            # the primitive-free prompt is deterministic enough to cache.
+            if context_primitives or not use_cache:
+                response_text = await _call()
+            else:
+                response_text = await get_llm_response_cache().get_or_generate(
+                    _call,
+                    model=model,
+                    prompt=prompt,
+                    schema=schema,
                     temperature=0.7,
-                    max_output_tokens=max_tokens
+                    namespace="problems.generate_single_type",
+                    validate=json.loads,
                 )
-            )
 
-            result = json.loads(response.text)
+            result = json.loads(response_text)
             problems = result.get('problems', [])
 
             logger.info(f"[PHASE_2] ✅ Generated {len(problems)} {problem_type} problems")
@@ -908,7 +930,8 @@ This problem type typically doesn't use complex visuals, but simple illustration
         subject: str,
         recommendations: List[Dict[str, Any]],
         count: int = 5,
-        context_primitives: Optional[Dict[str, Any]] = None
+        context_primitives: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
     ) -> Optional[str]:
         """
         THREE-PHASE problem generation using scalable per-type architecture.
@@ -922,6 +945,7 @@ This problem type typically doesn't use complex visuals, but simple illustration
             recommendations: List of recommendation objects
             count: Number of problems to generate
             context_primitives: Optional context primitives for problem variety
+            use_cache: Whether per-type generation may reuse cached responses
 
         Returns:
             JSON string with problems array organized by type
@@ -981,7 +1005,8 @@ This problem type typically doesn't use complex visuals, but simple illustration
                     recommendations=batch_recs,
                     num_problems=num_problems,
                     context_primitives=context_primitives,
-                    enable_ai_coach=enable_ai_coach
+                    enable_ai_coach=enable_ai_coach,
+                    use_cache=use_cache
                 )
 
                 generation_results.append(result)
@@ -1187,6 +1212,12 @@ This problem type typically doesn't use complex visuals, but simple illustration
                     if misconception_text:
                         logger.info(f"📝 [MISCONCEPTION_ENGINE] Added misconception to recommendation for problem generation")
             
+            # PROBLEM POOL: serve what the pre-generated stock covers; only the
+            # remainder (and every misconception-targeted rec) is generated live.
+            if self.problem_pool and formatted_recs:
+                pooled, formatted_recs = await self._take_from_pool(student_id, subject, formatted_recs)
+                final_problems.extend(pooled)
+
             # Generate problems if we have recommendations that need new problems
             if formatted_recs:
                 # Get context primitives for variety (using first recommendation)
@@ -1219,20 +1250,11 @@ This problem type typically doesn't use complex visuals, but simple illustration
                                 for gemini_problem in response_data[problem_type]:
                                     if problem_counter < len(formatted_recs):
                                         # MISCONCEPTION-DRIVEN PRACTICE ENGINE
-                                        # Add remediation metadata if this problem targets a misconception
-                                        metadata = {
-                                            'subject': subject,
-                                            'unit': formatted_recs[problem_counter].get('unit'),
-                                            'skill': formatted_recs[problem_counter].get('skill'),
-                                            'subskill': formatted_recs[problem_counter].get('subskill'),
-                                            'difficulty': formatted_recs[problem_counter].get('difficulty'),
-                                            'objectives': formatted_recs[problem_counter].get('detailed_objectives')
-                                        }
+                                        # Metadata carries the remediation tag if this problem targets a misconception
+                                        metadata = self._problem_metadata(subject, formatted_recs[problem_counter])
 
-                                        # Add remediation tag if problem targets a misconception
                                         if formatted_recs[problem_counter].get('misconception_to_address'):
                                             subskill_id = formatted_recs[problem_counter]['subskill']['id']
-                                            metadata['remediation_for_subskill_id'] = subskill_id
                                             logger.info(f"🏷️ [MISCONCEPTION_ENGINE] ✅ Tagged problem #{problem_counter+1} as REMEDIAL for subskill {subskill_id}")
                                             logger.info(f"🏷️ [MISCONCEPTION_ENGINE] Problem type: {problem_type}, Problem ID: {gemini_problem.get('id', 'unknown')}")
                                         else:
@@ -1277,6 +1299,89 @@ This problem type typically doesn't use complex visuals, but simple illustration
             traceback.print_exc()
             return []
 
+    @staticmethod
+    def _problem_metadata(subject: str, rec: Dict[str, Any]) -> Dict[str, Any]:
+        """Problem metadata for a formatted recommendation (remediation-tagged if applicable)."""
+        metadata = {
+            'subject': subject,
+            'unit': rec.get('unit'),
+            'skill': rec.get('skill'),
+            'subskill': rec.get('subskill'),
+            'difficulty': rec.get('difficulty'),
+            'objectives': rec.get('detailed_objectives')
+        }
+        if rec.get('misconception_to_address'):
+            metadata['remediation_for_subskill_id'] = rec['subskill']['id']
+        return metadata
+
+    async def _take_from_pool(
+        self,
+        student_id: int,
+        subject: str,
+        formatted_recs: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Serve formatted recommendations from the problem pool.
+
+        Returns (pooled problems, recommendations still needing live generation).
+        Recs sharing a pool key are served by one read.
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        remaining: List[Dict[str, Any]] = []
+        for rec in formatted_recs:
+            if self.problem_pool.is_poolable(rec):
+                groups.setdefault(self.problem_pool.key_for(subject, rec), []).append(rec)
+            else:
+                remaining.append(rec)
+
+        pooled: List[Dict[str, Any]] = []
+        for recs in groups.values():
+            taken = await self.problem_pool.take(student_id, subject, recs[0], len(recs))
+            for problem in taken:
+                problem['student_id'] = student_id
+                problem['served_from_pool'] = True
+                pooled.append(problem)
+            remaining.extend(recs[len(taken):])
+
+        if pooled:
+            logger.info(f"[PROBLEM_POOL] Served {len(pooled)}/{len(formatted_recs)} problems from pool for student {student_id}")
+        return pooled, remaining
+
+    async def generate_pool_problems(
+        self,
+        subject: str,
+        rec: Dict[str, Any],
+        count: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate student-agnostic problems for the problem pool (replenishment path).
+
+        Same three-phase pipeline as get_problems, but never served from the
+        response cache: a top-up exists to add new problems, and a cached
+        response would only repeat ones the pool already holds.
+        """
+        context_primitives = await self.get_or_generate_context_primitives(subject, rec)
+        raw_response = await self.generate_problem(
+            subject, [rec], count, context_primitives, use_cache=False
+        )
+        if not raw_response:
+            return []
+
+        response_data = json.loads(raw_response)
+        metadata = self._problem_metadata(subject, rec)
+        generated_at = datetime.now().isoformat()
+        problems = []
+        for problem_type in ALL_PROBLEM_TYPES:
+            for gemini_problem in response_data.get(problem_type) or []:
+                problems.append({
+                    **gemini_problem,
+                    'problem_type': problem_type,
+                    'generated_at': generated_at,
+                    'composable_template': None,
+                    'metadata': metadata
+                })
+        return problems
+
     async def get_or_generate_context_primitives(self, subject: str, recommendation: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Get context primitives with 3-tier fallback: BigQuery → CosmosDB → AI generation
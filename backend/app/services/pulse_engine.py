@@ -304,15 +304,14 @@ class PulseEngine:
             or e.get("relationship", "prerequisite") == "prerequisite"
         ]
 
-        # Use DAGAnalysisEngine to compute metrics and select midpoints
-        topo_order = DAGAnalysisEngine.topological_sort(all_nodes, prereq_edges)
-        metrics = DAGAnalysisEngine.compute_node_metrics(
-            all_nodes, prereq_edges, topo_order
-        )
+        # Graph structure (topo order, metrics, chains) is memoized per
+        # graph version — only probe selection runs per session.
+        structure = DAGAnalysisEngine.structure(all_nodes, prereq_edges)
 
         # Select midpoints of independent chains
         probes = DAGAnalysisEngine.select_initial_probes(
-            metrics, all_nodes, prereq_edges, max_probes=item_count,
+            structure.metrics, all_nodes, prereq_edges,
+            max_probes=item_count, chains=structure.chains,
         )
 
         items: List[PulseItemSpec] = []
@@ -703,11 +702,13 @@ class PulseEngine:
             if e.get("is_prerequisite", False)
             or e.get("relationship", "prerequisite") == "prerequisite"
         ]
-        topo_order = DAGAnalysisEngine.topological_sort(all_nodes, prereq_edges)
-        metrics = DAGAnalysisEngine.compute_node_metrics(
-            all_nodes, prereq_edges, topo_order
+        structure = DAGAnalysisEngine.structure(all_nodes, prereq_edges)
+        metrics = structure.metrics
+        max_depth = structure.max_depth
+        reachability = (
+            None if is_cold_start
+            else DAGAnalysisEngine.reachability_index(all_nodes, all_edges)
         )
-        max_depth = max((m.depth for m in metrics.values()), default=0)
 
         # Frontier depth = avg depth of frontier-band items
         frontier_depths = []
@@ -736,10 +737,8 @@ class PulseEngine:
                 frontier_depths.append(ctx.dag_distance)
 
                 # Find ancestors that would be inferred on leapfrog
-                if not is_cold_start:
-                    ancestors = DAGAnalysisEngine.get_ancestors(
-                        item.subskill_id, all_edges
-                    )
+                if reachability is not None:
+                    ancestors = reachability.ancestors(item.subskill_id)
                     # Filter to non-mastered ancestors (would be inferred)
                     inferable = [
                         a for a in ancestors
@@ -1185,9 +1184,8 @@ class PulseEngine:
         all_nodes = graph_data["graph"].get("nodes", [])
         node_map = {n["id"]: n for n in all_nodes}
 
-        all_ancestor_ids: Set[str] = set()
-        for probed_id in probed_skills:
-            all_ancestor_ids.update(DAGAnalysisEngine.get_ancestors(probed_id, all_edges))
+        reachability = DAGAnalysisEngine.reachability_index(all_nodes, all_edges)
+        all_ancestor_ids: Set[str] = reachability.ancestors_of_all(probed_skills)
 
         candidate_ids = list(set(probed_skills) | all_ancestor_ids)
 
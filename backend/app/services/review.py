@@ -10,6 +10,8 @@ from google.genai.types import GenerateContentConfig, Content, Part, Blob
 from google.genai import types
 from .base_ai_service import BaseAIService
 from .ai_service_factory import AIServiceFactory
+from .llm_response_cache import get_llm_response_cache
+from .model_governor import govern_genai_client
 from ..generators.content_schemas import PROBLEM_REVIEW_SCHEMA
 from ..core.config import settings
 from ..db.firestore_service import FirestoreService
@@ -22,10 +24,10 @@ class ReviewService:
         self.firestore_service = None  # Will be set by dependency injection
         # Initialize Gemini client directly (similar to practice problems generator)
         try:
-            self.client = genai.Client(
+            self.client = govern_genai_client(genai.Client(
                 api_key=settings.GEMINI_GENERATE_KEY,
                 http_options={"api_version": "v1alpha"},
-            )
+            ))
             self.model_id = 'gemini-2.5-flash-preview-05-20'
             logger.info("Review service initialized with Gemini Flash")
         except Exception as e:
@@ -120,23 +122,37 @@ Evaluate the student's work holistically, considering both correctness and under
                     
                     logger.info("Sending review request to Gemini Flash with structured JSON...")
                     
-                    # Generate response with structured JSON schema
-                    response = await self.client.aio.models.generate_content(
-                        model=f'models/{self.model_id}',
-                        contents=contents,
-                        config=GenerateContentConfig(
-                            response_mime_type='application/json',
-                            response_schema=PROBLEM_REVIEW_SCHEMA,
-                            temperature=0.6,
-                            max_output_tokens=2048
+                    async def _call() -> str:
+                        # Generate response with structured JSON schema
+                        response = await self.client.aio.models.generate_content(
+                            model=f'models/{self.model_id}',
+                            contents=contents,
+                            config=GenerateContentConfig(
+                                response_mime_type='application/json',
+                                response_schema=PROBLEM_REVIEW_SCHEMA,
+                                temperature=0.6,
+                                max_output_tokens=2048
+                            )
                         )
+                        logger.info("Received structured response from Gemini Flash")
+                        if response and response.candidates and response.candidates[0].content.parts:
+                            return response.candidates[0].content.parts[0].text.strip()
+                        return ""
+
+                    # Keyed on the image bytes + problem prompt: a resubmitted
+                    # identical canvas for the same problem reuses its review.
+                    response_text = await get_llm_response_cache().get_or_generate(
+                        _call,
+                        model=self.model_id,
+                        prompt=[image_bytes, prompt_text],
+                        schema=PROBLEM_REVIEW_SCHEMA,
+                        temperature=0.6,
+                        namespace="review.review_problem",
+                        validate=json.loads,
                     )
                     
-                    logger.info("Received structured response from Gemini Flash")
-                    
                     # Parse the JSON response directly
-                    if response and response.candidates and response.candidates[0].content.parts:
-                        response_text = response.candidates[0].content.parts[0].text.strip()
+                    if response_text:
                         structured_review = json.loads(response_text)
                         logger.debug(f"Successfully parsed structured JSON: {json.dumps(structured_review, indent=2)}")
                     else:
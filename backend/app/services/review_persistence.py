@@ -0,0 +1,235 @@
+# backend/app/services/review_persistence.py
+"""Problem review dual-write (Cosmos DB + Firestore) with a local outbox.
+
+SubmissionService used to save each review to Cosmos and then to Firestore,
+one after the other, so every submission paid the sum of both round trips,
+and a failure on either side was only logged — the two stores drifted apart
+with nothing to reconcile them.
+
+  concurrent — both writes start together on the event loop; each store
+               runs its blocking SDK calls on a worker thread, so the
+               submission pays max(latency) and the loop stays free.
+  outbox     — a write that fails is recorded as one JSON file under
+               logs/review-outbox/ (store name + write arguments) before
+               save() returns. The retry loop replays due entries with
+               exponential backoff; after max_attempts an entry moves to
+               dead/ for manual replay rather than being dropped.
+  idempotent — both stores receive the same pre-generated review id, so a
+               replay after an ambiguous failure overwrites instead of
+               duplicating.
+
+stats() exposes per-store outcomes and the divergence counters
+(/health/review-persistence).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_DIR = Path(__file__).resolve().parents[2] / "logs" / "review-outbox"
+
+
+class ReviewPersistence:
+    """Writes each review to every configured store concurrently."""
+
+    def __init__(
+        self,
+        cosmos_db=None,
+        firestore_service=None,
+        outbox_dir: Optional[Path] = None,
+        retry_interval_s: float = 30.0,
+        max_backoff_s: float = 900.0,
+        max_attempts: int = 8,
+    ):
+        # Each store exposes save_problem_review(**kwargs).
+        self.stores: Dict[str, Any] = {}
+        if cosmos_db is not None:
+            self.stores["cosmos"] = cosmos_db
+        if firestore_service is not None:
+            self.stores["firestore"] = firestore_service
+        self.outbox_dir = Path(outbox_dir or OUTBOX_DIR)
+        self.retry_interval_s = retry_interval_s
+        self.max_backoff_s = max_backoff_s
+        self.max_attempts = max_attempts
+        self._task: Optional[asyncio.Task] = None
+        self._counters = {
+            "reviews": 0,
+            "all_ok": 0,
+            "diverged": 0,  # at least one store written, at least one failed
+            "all_failed": 0,
+            "rejected": 0,  # permission errors: not retried
+            "outboxed": 0,
+            "outbox_write_failed": 0,
+            "retried_ok": 0,
+            "retry_failed": 0,
+            "dead_lettered": 0,
+        }
+        self._by_store = {name: {"ok": 0, "failed": 0} for name in self.stores}
+        self._write_ms_total = 0.0
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _store_kwargs(store: str, review_kwargs: Dict[str, Any], attempt_id: Optional[str]) -> Dict[str, Any]:
+        # attempt_id goes to Firestore only — it's the join key to the
+        # attempt doc written by CompetencyService in the same request.
+        if store == "firestore":
+            return {**review_kwargs, "attempt_id": attempt_id}
+        return dict(review_kwargs)
+
+    async def _write(self, store: str, kwargs: Dict[str, Any]) -> Optional[BaseException]:
+        try:
+            await self.stores[store].save_problem_review(**kwargs)
+            return None
+        except Exception as e:
+            return e
+
+    async def save(self, review_kwargs: Dict[str, Any], attempt_id: Optional[str] = None) -> Dict[str, bool]:
+        """Write one review to every store at once. Never raises.
+
+        Returns {store: written}; a store reported False has an outbox entry
+        (unless the write was rejected outright).
+        """
+        if not self.stores:
+            return {}
+        review_kwargs = {**review_kwargs, "review_id": review_kwargs.get("review_id") or str(uuid.uuid4())}
+        per_store = {name: self._store_kwargs(name, review_kwargs, attempt_id) for name in self.stores}
+
+        started = time.monotonic()
+        errors = await asyncio.gather(*(self._write(name, kwargs) for name, kwargs in per_store.items()))
+        self._write_ms_total += (time.monotonic() - started) * 1000
+
+        results: Dict[str, bool] = {}
+        for (name, kwargs), error in zip(per_store.items(), errors):
+            results[name] = error is None
+            if error is None:
+                self._by_store[name]["ok"] += 1
+                continue
+            self._by_store[name]["failed"] += 1
+            if isinstance(error, PermissionError):
+                self._counters["rejected"] += 1
+                logger.error(f"[REVIEW_PERSISTENCE] {name} rejected review {review_kwargs['review_id']}: {error}")
+            else:
+                logger.error(f"[REVIEW_PERSISTENCE] {name} write failed for review "
+                             f"{review_kwargs['review_id']}, queued for retry: {error}")
+                self._enqueue(name, kwargs, error)
+
+        self._counters["reviews"] += 1
+        written = sum(results.values())
+        if written == len(results):
+            self._counters["all_ok"] += 1
+        elif written:
+            self._counters["diverged"] += 1
+        else:
+            self._counters["all_failed"] += 1
+        return results
+
+    # ------------------------------------------------------------------
+    # Outbox
+    # ------------------------------------------------------------------
+
+    def _write_entry(self, path: Path, entry: Dict[str, Any]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(entry, default=str), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _enqueue(self, store: str, kwargs: Dict[str, Any], error: BaseException) -> None:
+        entry = {
+            "store": store,
+            "kwargs": kwargs,
+            "attempts": 0,
+            "next_attempt_at": time.time() + self.retry_interval_s,
+            "last_error": f"{type(error).__name__}: {error}",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        try:
+            self._write_entry(self.outbox_dir / f"{store}-{kwargs['review_id']}.json", entry)
+            self._counters["outboxed"] += 1
+        except OSError as e:
+            self._counters["outbox_write_failed"] += 1
+            logger.error(f"[REVIEW_PERSISTENCE] Could not record outbox entry for review {kwargs['review_id']}: {e}")
+
+    def _entries(self) -> List[Path]:
+        if not self.outbox_dir.is_dir():
+            return []
+        return sorted(self.outbox_dir.glob("*.json"))
+
+    async def retry_due(self, now: Optional[float] = None) -> int:
+        """Replay every outbox entry whose backoff has elapsed. Returns how many succeeded."""
+        now = time.time() if now is None else now
+        replayed = 0
+        for path in self._entries():
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.error(f"[REVIEW_PERSISTENCE] Unreadable outbox entry {path.name}: {e}")
+                continue
+            store = entry.get("store")
+            if entry.get("next_attempt_at", 0) > now or store not in self.stores:
+                continue
+
+            error = await self._write(store, entry["kwargs"])
+            if error is None:
+                path.unlink(missing_ok=True)
+                self._counters["retried_ok"] += 1
+                self._by_store[store]["ok"] += 1
+                replayed += 1
+                continue
+
+            self._counters["retry_failed"] += 1
+            entry["attempts"] += 1
+            entry["last_error"] = f"{type(error).__name__}: {error}"
+            if entry["attempts"] >= self.max_attempts or isinstance(error, PermissionError):
+                self._write_entry(self.outbox_dir / "dead" / path.name, entry)
+                path.unlink(missing_ok=True)
+                self._counters["dead_lettered"] += 1
+                logger.error(f"[REVIEW_PERSISTENCE] Gave up on {path.name} after "
+                             f"{entry['attempts']} retries: {entry['last_error']}")
+            else:
+                backoff = min(self.retry_interval_s * 2 ** entry["attempts"], self.max_backoff_s)
+                entry["next_attempt_at"] = now + backoff
+                self._write_entry(path, entry)
+        return replayed
+
+    async def _retry_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.retry_interval_s)
+            try:
+                await self.retry_due()
+            except Exception as e:
+                logger.error(f"[REVIEW_PERSISTENCE] Outbox retry pass failed: {e}", exc_info=True)
+
+    def start(self) -> asyncio.Task:
+        """Run the outbox retry loop in the background (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._retry_loop(), name="review-outbox")
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        dead_dir = self.outbox_dir / "dead"
+        return {
+            **self._counters,
+            "stores": {name: dict(counts) for name, counts in self._by_store.items()},
+            "avg_write_ms": round(self._write_ms_total / self._counters["reviews"], 1)
+            if self._counters["reviews"] else None,
+            "outbox_pending": len(self._entries()),
+            "outbox_dead": len(list(dead_dir.glob("*.json"))) if dead_dir.is_dir() else 0,
+            "retry_loop_running": self._task is not None and not self._task.done(),
+        }
@@ -10,16 +10,34 @@ Contract: strictly passive. Every method swallows every exception — telemetry
 must never be able to break a live tutoring session. On Cloud Run the
 filesystem is ephemeral, so the ledger complements stdout logging on a dev
 machine; it does not replace it.
+
+Writes are buffered: `write()` only stamps the record and hands it to one
+process-wide writer thread, which serializes, batches and flushes (every
+SESSION_LEDGER_FLUSH_RECORDS records or SESSION_LEDGER_FLUSH_INTERVAL_S
+seconds), so disk latency never lands on the event loop relaying audio. A file
+past SESSION_LEDGER_ROTATE_MB rotates to `<name>.partN.jsonl`; rotated and
+closed files are gzip-compressed (`.jsonl.gz`). If the writer falls behind
+and its queue is full, records are dropped and counted rather than blocking;
+a close is never dropped — it is deferred until the queue drains, so no
+session leaves its file handle open.
 """
 
+import gzip
 import json
 import logging
+import queue
 import re
+import shutil
+import threading
 import time
 import uuid
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Deque, Dict, Optional
+
+from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -46,28 +64,259 @@ def classify_cue(text: str) -> str:
     return f"[{match.group(1)}]" if match else "text"
 
 
+_WRITE, _CLOSE, _FLUSH = "write", "close", "flush"
+
+
+def _gzip(path: Path) -> Path:
+    """Compress `path` to `path.gz` and remove the original."""
+    target = path.with_name(path.name + ".gz")
+    with open(path, "rb") as src, gzip.open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    path.unlink()
+    return target
+
+
+@dataclass
+class _OpenLedger:
+    path: Path
+    handle: Any
+    size: int = 0
+    parts: int = 0
+    pending: int = 0
+
+
+class _LedgerWriter:
+    """Background thread that owns every ledger file in the process."""
+
+    def __init__(
+        self,
+        *,
+        flush_records: int = 64,
+        flush_interval_s: float = 0.5,
+        rotate_bytes: int = 16 * 1024 * 1024,
+        compress: bool = True,
+        queue_size: int = 10000,
+    ):
+        self.flush_records = max(1, flush_records)
+        self.flush_interval_s = flush_interval_s
+        self.rotate_bytes = rotate_bytes
+        self.compress = compress
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._files: Dict[Path, _OpenLedger] = {}
+        # Closes that found the queue full; applied once it drains, after the
+        # writes queued ahead of them.
+        self._deferred_closes: Deque[Path] = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.records_written = 0
+        self.batches = 0
+        self.flushes = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.compressed = 0
+        self.errors = 0
+
+    # -- producer side (event loop) ---------------------------------------
+
+    def submit(self, op: str, path: Path, payload: Any = None) -> bool:
+        """Queue one operation for the writer thread. Never blocks."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((op, path, payload))
+            return True
+        except queue.Full:
+            if op == _CLOSE:
+                self._deferred_closes.append(path)
+                return True
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is on disk (tests, shutdown)."""
+        done = threading.Event()
+        try:
+            self._ensure_started()
+            self._queue.put((_FLUSH, None, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            with self._start_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run, name="session-ledger-writer", daemon=True
+                    )
+                    self._thread.start()
+
+    # -- writer thread -----------------------------------------------------
+
+    def _run(self) -> None:
+        try:
+            self._loop()
+        finally:
+            # Never leave handles open behind a dead writer thread.
+            for path in list(self._files):
+                self._apply(_CLOSE, path, None)
+
+    def _loop(self) -> None:
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, last_flush + self.flush_interval_s - time.monotonic())
+            if not self._pending():
+                # Bounded even when idle, so a close deferred just as the
+                # queue drained is still picked up.
+                timeout = self.flush_interval_s
+            try:
+                batch = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                batch = []
+            while len(batch) < self.flush_records:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch:
+                self.batches += 1
+            for op, path, payload in batch:
+                try:
+                    self._apply(op, path, payload)
+                except Exception as e:
+                    self.errors += 1
+                    logger.debug(f"Session ledger {op} failed for {path}: {e}")
+            while self._deferred_closes and self._queue.empty():
+                path = self._deferred_closes.popleft()
+                try:
+                    self._apply(_CLOSE, path, None)
+                except Exception as e:
+                    self.errors += 1
+                    logger.debug(f"Session ledger close failed for {path}: {e}")
+            if (
+                self._pending() >= self.flush_records
+                or time.monotonic() - last_flush >= self.flush_interval_s
+            ):
+                self._flush_all()
+                last_flush = time.monotonic()
+
+    def _pending(self) -> int:
+        return sum(f.pending for f in self._files.values())
+
+    def _apply(self, op: str, path: Optional[Path], payload: Any) -> None:
+        if op == _WRITE:
+            ledger = self._files.get(path) or self._open(path)
+            line = json.dumps(payload, ensure_ascii=False, default=str) + "\n"
+            ledger.handle.write(line)
+            ledger.size += len(line)
+            ledger.pending += 1
+            self.records_written += 1
+            if ledger.size >= self.rotate_bytes:
+                self._rotate(ledger)
+        elif op == _CLOSE:
+            ledger = self._files.pop(path, None)
+            if ledger is not None:
+                ledger.handle.close()
+                self.flushes += 1
+                if self.compress:
+                    _gzip(ledger.path)
+                    self.compressed += 1
+        elif op == _FLUSH:
+            self._flush_all()
+            payload.set()
+
+    def _open(self, path: Path) -> _OpenLedger:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        ledger = _OpenLedger(path=path, handle=open(path, "a", encoding="utf-8"))
+        self._files[path] = ledger
+        return ledger
+
+    def _rotate(self, ledger: _OpenLedger) -> None:
+        ledger.handle.close()
+        ledger.parts += 1
+        part = ledger.path.with_name(f"{ledger.path.stem}.part{ledger.parts}.jsonl")
+        ledger.path.rename(part)
+        if self.compress:
+            _gzip(part)
+            self.compressed += 1
+        ledger.handle = open(ledger.path, "a", encoding="utf-8")
+        ledger.size = 0
+        ledger.pending = 0
+        self.rotations += 1
+
+    def _flush_all(self) -> None:
+        for ledger in self._files.values():
+            if ledger.pending:
+                try:
+                    ledger.handle.flush()
+                    self.flushes += 1
+                except Exception:
+                    self.errors += 1
+                ledger.pending = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "open_files": len(self._files),
+            "queue_depth": self._queue.qsize(),
+            "records_written": self.records_written,
+            "batches": self.batches,
+            "flushes": self.flushes,
+            "dropped": self.dropped,
+            "rotations": self.rotations,
+            "compressed": self.compressed,
+            "errors": self.errors,
+        }
+
+
+_writer: Optional[_LedgerWriter] = None
+
+
+def get_ledger_writer() -> _LedgerWriter:
+    """Process-wide ledger writer, configured from settings."""
+    global _writer
+    if _writer is None:
+        _writer = _LedgerWriter(
+            flush_records=settings.SESSION_LEDGER_FLUSH_RECORDS,
+            flush_interval_s=settings.SESSION_LEDGER_FLUSH_INTERVAL_S,
+            rotate_bytes=settings.SESSION_LEDGER_ROTATE_MB * 1024 * 1024,
+            compress=settings.SESSION_LEDGER_COMPRESS,
+            queue_size=settings.SESSION_LEDGER_QUEUE_SIZE,
+        )
+    return _writer
+
+
 class SessionLedger:
-    """Append-only JSONL event stream for one tutor WebSocket session."""
+    """Append-only JSONL event stream for one tutor WebSocket session.
+
+    Field values are serialized later, on the writer thread — pass values
+    (str/int/list copies), not containers the session keeps mutating.
+    """
 
-    def __init__(self, kind: str = "lumina-tutor"):
+    def __init__(
+        self,
+        kind: str = "lumina-tutor",
+        *,
+        writer: Optional[_LedgerWriter] = None,
+        directory: Optional[Path] = None,
+    ):
         self.run_id = uuid.uuid4().hex[:12]
         self._started = time.monotonic()
         self._seq = 0
-        self._file = None
+        self._writer: Optional[_LedgerWriter] = None
         self.path: Optional[Path] = None
         try:
-            LEDGER_DIR.mkdir(parents=True, exist_ok=True)
             stamp = datetime.now(timezone.utc).strftime("%Y-%m-%d-%H%M%S")
-            self.path = LEDGER_DIR / f"{stamp}-{kind}-{self.run_id}.jsonl"
-            self._file = open(self.path, "a", encoding="utf-8")
+            self.path = (directory or LEDGER_DIR) / f"{stamp}-{kind}-{self.run_id}.jsonl"
+            self._writer = writer or get_ledger_writer()
             logger.info(f"Session ledger opened: {self.path} (server_run_id={self.run_id})")
         except Exception as e:
             logger.warning(f"Session ledger unavailable ({e}); session continues without one")
-            self._file = None
+            self._writer = None
 
     def write(self, event: str, **fields: Any) -> None:
-        """Append one event record. Never raises."""
+        """Queue one event record for the writer thread. Never raises."""
         try:
+            if self._writer is None:
+                return
             self._seq += 1
             record = {
                 "seq": self._seq,
@@ -76,16 +325,15 @@ class SessionLedger:
                 "event": event,
                 **fields,
             }
-            if self._file is not None:
-                self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
-                self._file.flush()
+            self._writer.submit(_WRITE, self.path, record)
         except Exception:
             pass
 
     def close(self) -> None:
+        """Flush and close the file (compressing it) on the writer thread."""
         try:
-            if self._file is not None:
-                self._file.close()
-                self._file = None
+            if self._writer is not None:
+                self._writer.submit(_CLOSE, self.path)
+                self._writer = None
         except Exception:
             pass
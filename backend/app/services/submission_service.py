@@ -20,6 +20,7 @@ from ..schemas.mcq_problems import MCQSubmission, MCQResponse, MCQOption
 from ..services.review import ReviewService
 from ..services.competency import CompetencyService
 from ..services.problem_converter import ProblemConverter
+from ..services.review_persistence import ReviewPersistence
 from ..services.universal_validator import UniversalValidator
 from ..shared.question_types import Question, QuestionEvaluation
 
@@ -29,13 +30,15 @@ logger = logging.getLogger(__name__)
 class SubmissionService:
     """Universal problem submission handler"""
 
-    def __init__(self, review_service: ReviewService, competency_service: CompetencyService, cosmos_db=None, user_profiles_service=None, curriculum_mapping_service=None, firestore_service=None):
+    def __init__(self, review_service: ReviewService, competency_service: CompetencyService, cosmos_db=None, user_profiles_service=None, curriculum_mapping_service=None, firestore_service=None, misconception_pipeline=None, review_persistence=None):
         self.review_service = review_service
         self.competency_service = competency_service
         self.cosmos_db = cosmos_db
         self.user_profiles_service = user_profiles_service
         self.curriculum_mapping_service = curriculum_mapping_service
         self.firestore_service = firestore_service
+        self.misconception_pipeline = misconception_pipeline
+        self.review_persistence = review_persistence or ReviewPersistence(cosmos_db, firestore_service)
     
     async def handle_submission(
         self,
@@ -126,7 +129,7 @@ class SubmissionService:
             logger.info(f"🔍 [MISCONCEPTION_ENGINE] Evaluation - is_correct: {evaluation.is_correct}, score: {evaluation.score}")
 
             remediation_successful = False
-            misconception_created = False
+            misconception_queued = False
 
             if evaluation.is_correct and evaluation.score >= 8:
                 # ======================================================================
@@ -173,71 +176,28 @@ class SubmissionService:
 
                         logger.info(f"🔍 [MISCONCEPTION_ENGINE] Extracted subskill_id: {subskill_id}")
                         logger.info(f"🔍 [MISCONCEPTION_ENGINE] submission.subskill_id: {submission.subskill_id}")
-                        logger.info(f"🔍 [MISCONCEPTION_ENGINE] user_profiles_service available: {bool(self.user_profiles_service)}")
-
-                        if subskill_id and subskill_id != 'unknown' and self.user_profiles_service:
-                            logger.info(f"🧠 [MISCONCEPTION_ENGINE] ========== INVOKING AI MISCONCEPTION ANALYSIS ==========")
-                            logger.info(f"🧠 [MISCONCEPTION_ENGINE] Standard problem answered incorrectly - analyzing root cause with AI")
-                            logger.info(f"🧠 [MISCONCEPTION_ENGINE] This will identify WHY the student got it wrong (student-specific)")
-                            logger.info(f"🧠 [MISCONCEPTION_ENGINE] NOT just explaining what the correct answer is (problem-specific)")
-
-                            # Use AI to analyze the misconception
-                            # Pass the standardized question + evaluation data
-                            misconception_text = await self.review_service.analyze_misconception(
+                        logger.info(f"🔍 [MISCONCEPTION_ENGINE] misconception_pipeline available: {bool(self.misconception_pipeline)}")
+
+                        if subskill_id and subskill_id != 'unknown' and self.misconception_pipeline:
+                            # Root-cause analysis is an LLM call; queue it so a wrong
+                            # answer returns as fast as a right one. The pipeline
+                            # diagnoses per student/subskill and writes the profile.
+                            misconception_queued = await self.misconception_pipeline.enqueue(
+                                student_id=student_id,
+                                firebase_uid=firebase_uid,
+                                subskill_id=subskill_id,
                                 question=standard_question,
-                                evaluation=evaluation
+                                evaluation=evaluation,
+                                attempt_id=attempt_id,
+                                skill_description=submission.problem.get('metadata', {}).get('skill', {}).get('description'),
                             )
-
-                            logger.info(f"🔙 [MISCONCEPTION_ENGINE] Returned from AI analysis")
-
-                            if misconception_text:
-                                # Store the AI-generated misconception
-                                logger.info(f"💾 [MISCONCEPTION_ENGINE] AI analysis successful! Storing student-specific misconception...")
-                                logger.info(f"💾 [MISCONCEPTION_ENGINE] Misconception text: \"{misconception_text[:150]}...\"")
-
-                                try:
-                                    success = await self.user_profiles_service.add_or_update_misconception(
-                                        uid=firebase_uid,
-                                        subskill_id=subskill_id,
-                                        misconception_text=misconception_text,
-                                        assessment_id="practice_session_analysis"  # New source ID for AI-driven analysis
-                                    )
-
-                                    if success:
-                                        misconception_created = True
-                                        logger.info(f"✅ [MISCONCEPTION_ENGINE] ========== AI-DRIVEN MISCONCEPTION STORED ==========")
-                                        logger.info(f"✅ [MISCONCEPTION_ENGINE] User: {firebase_uid[:8]}..., Subskill: {subskill_id}")
-                                        logger.info(f"✅ [MISCONCEPTION_ENGINE] Source: practice_session_analysis (AI-powered)")
-                                        logger.info(f"✅ [MISCONCEPTION_ENGINE] Misconception captures student's thinking error, not correct answer explanation")
-                                    else:
-                                        logger.warning(f"⚠️ [MISCONCEPTION_ENGINE] Failed to store misconception in user profile")
-                                except Exception as e:
-                                    logger.error(f"❌ [MISCONCEPTION_ENGINE] Error storing misconception: {e}")
-                                    import traceback
-                                    logger.error(f"❌ [MISCONCEPTION_ENGINE] Traceback: {traceback.format_exc()}")
-                            else:
-                                # Fallback: AI analysis failed, store generic misconception
-                                logger.warning(f"⚠️ [MISCONCEPTION_ENGINE] AI analysis failed. Storing generic misconception.")
-                                skill_desc = submission.problem.get('metadata', {}).get('skill', {}).get('description', 'this concept')
-                                fallback_text = f"Student requires further review on {skill_desc}."
-
-                                try:
-                                    success = await self.user_profiles_service.add_or_update_misconception(
-                                        uid=firebase_uid,
-                                        subskill_id=subskill_id,
-                                        misconception_text=fallback_text,
-                                        assessment_id="practice_session_fallback"
-                                    )
-                                    if success:
-                                        misconception_created = True
-                                        logger.info(f"✅ [MISCONCEPTION_ENGINE] Fallback misconception stored")
-                                except Exception as e:
-                                    logger.error(f"❌ [MISCONCEPTION_ENGINE] Error storing fallback misconception: {e}")
+                            if misconception_queued:
+                                logger.info(f"🧠 [MISCONCEPTION_ENGINE] Queued misconception analysis for subskill {subskill_id}")
                         else:
                             if not subskill_id or subskill_id == 'unknown':
                                 logger.warning(f"⚠️ [MISCONCEPTION_ENGINE] Cannot create misconception - subskill_id is missing or 'unknown'")
-                            elif not self.user_profiles_service:
-                                logger.warning(f"⚠️ [MISCONCEPTION_ENGINE] Cannot create misconception - user_profiles_service not available")
+                            elif not self.misconception_pipeline:
+                                logger.warning(f"⚠️ [MISCONCEPTION_ENGINE] Cannot create misconception - misconception_pipeline not available")
                 elif evaluation.score < 8:
                     logger.info(f"⚠️ [MISCONCEPTION_ENGINE] Score too low ({evaluation.score}) - could track misconception in future")
 
@@ -247,8 +207,8 @@ class SubmissionService:
                 review['metadata'] = review.get('metadata', {})
                 if remediation_successful:
                     review['metadata']['remediation_successful'] = True
-                if misconception_created:
-                    review['metadata']['misconception_created'] = True
+                if misconception_queued:
+                    review['metadata']['misconception_queued'] = True
 
                 await self._save_review(
                     submission, user_context, review, standard_question.dict(),
@@ -884,6 +844,9 @@ class SubmissionService:
     ) -> None:
         """Save the problem review to CosmosDB and Firestore (dual write).
 
+        Delegates to ReviewPersistence: both writes run at once, and a store
+        that fails gets an outbox entry instead of silently diverging.
+
         Attempt persistence is owned by
         CompetencyService.update_competency_from_problem, which saves the attempt
         (with primitive_type / eval_mode / success) and then reads it back to
@@ -913,23 +876,10 @@ class SubmissionService:
                 firebase_uid=firebase_uid,
             )
 
-            if self.cosmos_db:
-                try:
-                    await self.cosmos_db.save_problem_review(**review_kwargs)
-                    logger.info(f"Saved review to CosmosDB for student {student_id}")
-                except Exception as e:
-                    logger.error(f"Error saving review to CosmosDB: {str(e)}")
-
-            if self.firestore_service:
-                try:
-                    # attempt_id goes to Firestore only — it's the join key to the
-                    # attempt doc written by CompetencyService in this same request.
-                    await self.firestore_service.save_problem_review(
-                        **review_kwargs, attempt_id=attempt_id
-                    )
-                    logger.info(f"Saved review to Firestore for student {student_id}")
-                except Exception as e:
-                    logger.error(f"Error saving review to Firestore: {str(e)}")
+            # Both stores are written concurrently; a failed write lands in
+            # the persistence layer's outbox and is retried in the background.
+            results = await self.review_persistence.save(review_kwargs, attempt_id=attempt_id)
+            logger.info(f"Saved review for student {student_id}: {results}")
 
         except Exception as e:
             logger.error(f"Error saving review to databases: {str(e)}")
@@ -4,16 +4,19 @@ User Profiles Service Layer
 Handles all user profile business logic, data operations, and onboarding management
 """
 
-from datetime import datetime, timedelta
+import asyncio
+from datetime import datetime
 from typing import Optional, Dict, Any, List, Tuple
 import logging
 import uuid
-from collections import defaultdict
 
+from azure.core import MatchConditions
 from azure.cosmos import PartitionKey
+from azure.cosmos.exceptions import CosmosAccessConditionFailedError
 from fastapi import HTTPException
 
 from ..core.middleware import get_cosmos_db_service
+from .engagement_ledger import empty_counters, xp_windows
 from ..models.user_profiles import (
     UserProfile, OnboardingData, ActivityLog, ActivityResponse,
     UserStats, DashboardResponse, StudentMisconception
@@ -68,6 +71,7 @@ class UserProfilesService:
             profile_data['type'] = 'user_profile'
             profile_data['created_at'] = profile_data['created_at'].isoformat()
             profile_data['last_login'] = profile_data['last_login'].isoformat()
+            profile_data['engagement_counters'] = empty_counters()
             
             user_profiles_container = self.cosmos_db.database.create_container_if_not_exists(
                 id="user_profiles",
@@ -120,59 +124,7 @@ class UserProfilesService:
             if results:
                 # Keep the original document for potential migration
                 original_doc = results[0]
-                # Work with a copy for datetime conversions
-                user_data = results[0].copy()
-
-                # Convert ISO strings back to datetime objects
-                datetime_fields = ['created_at', 'last_login', 'last_activity', 'onboarding_completed_at']
-                for field in datetime_fields:
-                    if isinstance(user_data.get(field), str) and user_data.get(field):
-                        user_data[field] = datetime.fromisoformat(user_data[field])
-
-                # Parse misconceptions from raw dict to StudentMisconception objects
-                raw_misconceptions = user_data.get('misconceptions', [])
-                parsed_misconceptions = []
-                if raw_misconceptions:
-                    for raw_misc in raw_misconceptions:
-                        try:
-                            # Convert last_detected_at string to datetime if needed
-                            if isinstance(raw_misc.get('last_detected_at'), str):
-                                raw_misc['last_detected_at'] = datetime.fromisoformat(raw_misc['last_detected_at'])
-
-                            # Convert resolved_at string to datetime if exists
-                            if 'resolved_at' in raw_misc and isinstance(raw_misc.get('resolved_at'), str):
-                                raw_misc['resolved_at'] = datetime.fromisoformat(raw_misc['resolved_at'])
-
-                            parsed_misconceptions.append(StudentMisconception(**raw_misc))
-                        except Exception as e:
-                            logger.warning(f"⚠️ [USER_PROFILES] Failed to parse misconception: {str(e)}")
-                            continue
-                
-                # Clean data for UserProfile model
-                profile_fields = {
-                    'uid': user_data.get('uid'),
-                    'student_id': user_data.get('student_id'),
-                    'email': user_data.get('email'),
-                    'display_name': user_data.get('display_name'),
-                    'grade_level': user_data.get('grade_level'),
-                    'email_verified': user_data.get('email_verified', False),
-                    'created_at': user_data.get('created_at'),
-                    'last_login': user_data.get('last_login'),
-                    'last_activity': user_data.get('last_activity'),
-                    # XP System fields (new)
-                    'total_xp': user_data.get('total_xp', user_data.get('total_points', 0)),  # Fallback to legacy
-                    'current_level': user_data.get('current_level', user_data.get('level', 1)),  # Fallback to legacy
-                    'xp_for_next_level': user_data.get('xp_for_next_level', 100),
-                    'current_streak': user_data.get('current_streak', 0),
-                    'longest_streak': user_data.get('longest_streak', 0),
-                    'last_activity_date': user_data.get('last_activity_date'),
-                    'badges': user_data.get('badges', []),
-                    'preferences': user_data.get('preferences', {}),
-                    'onboarding_completed': user_data.get('onboarding_completed', False),
-                    'onboarding_completed_at': user_data.get('onboarding_completed_at'),
-                    # Misconception tracking (new) - use parsed StudentMisconception objects
-                    'misconceptions': parsed_misconceptions
-                }
+                user_profile = self._profile_from_doc(original_doc)
 
                 # Migration: If misconceptions field doesn't exist in Cosmos DB, add it
                 if 'misconceptions' not in original_doc:
@@ -187,7 +139,7 @@ class UserProfilesService:
                         import traceback
                         logger.warning(f"⚠️ [USER_PROFILES] Traceback: {traceback.format_exc()}")
                 
-                return UserProfile(**profile_fields)
+                return user_profile
             else:
                 return None
                 
@@ -195,6 +147,64 @@ class UserProfilesService:
             logger.error(f"❌ Failed to get user profile: {str(e)}")
             return None
     
+    def _profile_from_doc(self, doc: dict) -> UserProfile:
+        """Build a UserProfile from a raw user_profile document"""
+        # Work with a copy for datetime conversions
+        user_data = doc.copy()
+
+        # Convert ISO strings back to datetime objects
+        datetime_fields = ['created_at', 'last_login', 'last_activity', 'onboarding_completed_at']
+        for field in datetime_fields:
+            if isinstance(user_data.get(field), str) and user_data.get(field):
+                user_data[field] = datetime.fromisoformat(user_data[field])
+
+        # Parse misconceptions from raw dict to StudentMisconception objects
+        raw_misconceptions = user_data.get('misconceptions', [])
+        parsed_misconceptions = []
+        if raw_misconceptions:
+            for raw_misc in raw_misconceptions:
+                try:
+                    # Convert last_detected_at string to datetime if needed
+                    if isinstance(raw_misc.get('last_detected_at'), str):
+                        raw_misc['last_detected_at'] = datetime.fromisoformat(raw_misc['last_detected_at'])
+
+                    # Convert resolved_at string to datetime if exists
+                    if 'resolved_at' in raw_misc and isinstance(raw_misc.get('resolved_at'), str):
+                        raw_misc['resolved_at'] = datetime.fromisoformat(raw_misc['resolved_at'])
+
+                    parsed_misconceptions.append(StudentMisconception(**raw_misc))
+                except Exception as e:
+                    logger.warning(f"⚠️ [USER_PROFILES] Failed to parse misconception: {str(e)}")
+                    continue
+        
+        # Clean data for UserProfile model
+        profile_fields = {
+            'uid': user_data.get('uid'),
+            'student_id': user_data.get('student_id'),
+            'email': user_data.get('email'),
+            'display_name': user_data.get('display_name'),
+            'grade_level': user_data.get('grade_level'),
+            'email_verified': user_data.get('email_verified', False),
+            'created_at': user_data.get('created_at'),
+            'last_login': user_data.get('last_login'),
+            'last_activity': user_data.get('last_activity'),
+            # XP System fields (new)
+            'total_xp': user_data.get('total_xp', user_data.get('total_points', 0)),  # Fallback to legacy
+            'current_level': user_data.get('current_level', user_data.get('level', 1)),  # Fallback to legacy
+            'xp_for_next_level': user_data.get('xp_for_next_level', 100),
+            'current_streak': user_data.get('current_streak', 0),
+            'longest_streak': user_data.get('longest_streak', 0),
+            'last_activity_date': user_data.get('last_activity_date'),
+            'badges': user_data.get('badges', []),
+            'preferences': user_data.get('preferences', {}),
+            'onboarding_completed': user_data.get('onboarding_completed', False),
+            'onboarding_completed_at': user_data.get('onboarding_completed_at'),
+            # Misconception tracking (new) - use parsed StudentMisconception objects
+            'misconceptions': parsed_misconceptions
+        }
+
+        return UserProfile(**profile_fields)
+    
     async def update_user_profile(self, uid: str, updates: dict) -> bool:
         """Update user profile in Cosmos DB"""
         try:
@@ -418,6 +428,18 @@ class UserProfilesService:
         Returns:
             bool: True if successful, False otherwise
         """
+        # The Cosmos SDK is synchronous; keep the read-modify-replace off the event loop.
+        return await asyncio.to_thread(
+            self._add_or_update_misconception_sync, uid, subskill_id, misconception_text, assessment_id
+        )
+
+    def _add_or_update_misconception_sync(
+        self,
+        uid: str,
+        subskill_id: str,
+        misconception_text: str,
+        assessment_id: str
+    ) -> bool:
         try:
             user_profiles_container = self.cosmos_db.database.create_container_if_not_exists(
                 id="user_profiles",
@@ -644,6 +666,63 @@ class UserProfilesService:
             logger.error(f"❌ Failed to write activity log entry: {str(e)}")
             # Don't re-raise, as this is often in a background task
     
+    async def upsert_activity_log_entries(self, user_id: str, entries: List[dict]) -> None:
+        """Write pre-built activity docs (ids assigned by the caller).
+
+        Upsert by id, so re-sending a batch after a failed flush never
+        duplicates an activity. Raises on failure — the engagement ledger
+        keeps the batch pending and retries.
+        """
+        activities_container = self.cosmos_db.database.create_container_if_not_exists(
+            id="user_activities",
+            partition_key=PartitionKey(path="/firebase_uid")
+        )
+        for entry in entries:
+            activities_container.upsert_item(body={**entry, 'firebase_uid': user_id, 'type': 'user_activity'})
+
+    async def get_all_user_activities(self, user_id: str) -> List[dict]:
+        """Every activity doc for a user, oldest first (engagement replay)."""
+        activities_container = self.cosmos_db.database.create_container_if_not_exists(
+            id="user_activities",
+            partition_key=PartitionKey(path="/firebase_uid")
+        )
+        query = """
+        SELECT * FROM c
+        WHERE c.firebase_uid = @firebase_uid
+        AND c.type = 'user_activity'
+        ORDER BY c.timestamp ASC
+        """
+        params = [{"name": "@firebase_uid", "value": user_id}]
+        return list(activities_container.query_items(query=query, parameters=params, partition_key=user_id))
+
+    async def get_profile_document(self, uid: str) -> Optional[dict]:
+        """Raw user_profile doc, including its `_etag`, or None."""
+        user_profiles_container = self.cosmos_db.database.create_container_if_not_exists(
+            id="user_profiles",
+            partition_key=PartitionKey(path="/firebase_uid")
+        )
+        query = "SELECT * FROM c WHERE c.firebase_uid = @firebase_uid AND c.type = 'user_profile'"
+        params = [{"name": "@firebase_uid", "value": uid}]
+        results = list(user_profiles_container.query_items(query=query, parameters=params, partition_key=uid))
+        return results[0] if results else None
+
+    async def replace_profile_document_if_unchanged(self, doc: dict, etag: str) -> Optional[dict]:
+        """Replace a profile doc only if it still has `etag`.
+
+        Returns the stored doc (with its new `_etag`), or None when another
+        writer got there first — the caller re-reads and re-applies.
+        """
+        user_profiles_container = self.cosmos_db.database.create_container_if_not_exists(
+            id="user_profiles",
+            partition_key=PartitionKey(path="/firebase_uid")
+        )
+        try:
+            return user_profiles_container.replace_item(
+                item=doc['id'], body=doc, etag=etag, match_condition=MatchConditions.IfNotModified
+            )
+        except CosmosAccessConditionFailedError:
+            return None
+
     async def get_user_activities(self, user_id: str, limit: int = 20) -> List[dict]:
         """Get user activities from Cosmos DB"""
         try:
@@ -683,90 +762,54 @@ class UserProfilesService:
     # STATISTICS AND DASHBOARD
     # ============================================================================
     
+    async def _get_profile_document_with_counters(self, user_id: str) -> Optional[dict]:
+        """Profile doc with its engagement counters, backfilling them on first use"""
+        doc = await self.get_profile_document(user_id)
+        if doc is not None and doc.get('engagement_counters') is None:
+            # Profiles from before the counters existed: one replay of the
+            # activity log into the counters (totals untouched), after which
+            # the ledger keeps them current
+            from ..services.engagement_service import engagement_service
+            logger.info(f"🔄 [USER_PROFILES] Backfilling engagement counters for {user_id}")
+            doc = await engagement_service.backfill_counters(user_id) or doc
+        return doc
+    
+    def _stats_from_doc(self, user_profile: UserProfile, doc: dict) -> UserStats:
+        """UserStats from the profile's maintained engagement counters (no activity scan)"""
+        counters = doc.get('engagement_counters') or empty_counters()
+        windows = xp_windows(counters, datetime.utcnow().date())
+        accuracy_count = counters.get('accuracy_count', 0)
+        
+        return UserStats(
+            # Legacy fields for backward compatibility (points == XP)
+            total_points=user_profile.total_xp,
+            level=user_profile.current_level,
+            today_points=windows['today'],
+            week_points=windows['week'],
+            month_points=windows['month'],
+            # New XP fields as per PRD
+            total_xp=user_profile.total_xp,
+            current_level=user_profile.current_level,
+            xp_for_next_level=user_profile.xp_for_next_level,
+            today_xp=windows['today'],
+            week_xp=windows['week'],
+            month_xp=windows['month'],
+            # Common fields
+            current_streak=user_profile.current_streak,
+            longest_streak=user_profile.longest_streak,
+            total_activities=counters.get('activities', 0),
+            activities_by_type=dict(counters.get('by_type', {})),
+            average_accuracy=counters['accuracy_sum'] / accuracy_count if accuracy_count else None
+        )
+    
     async def calculate_user_stats(self, user_id: str) -> UserStats:
         """Calculate comprehensive user statistics"""
         try:
-            user_profile = await self.get_user_profile(user_id)
-            if not user_profile:
+            doc = await self._get_profile_document_with_counters(user_id)
+            if not doc:
                 raise HTTPException(status_code=404, detail="User profile not found")
             
-            activities = await self.get_user_activities(user_id, 100)
-            
-            # Calculate time-based points
-            now = datetime.utcnow()
-            today = now.date()
-            week_ago = now - timedelta(days=7)
-            month_ago = now - timedelta(days=30)
-            
-            # Calculate time-based points (legacy)
-            today_points = sum(
-                act.get('points_earned', 0) for act in activities 
-                if act.get('created_at') and datetime.fromisoformat(act['created_at']).date() == today
-            )
-            
-            week_points = sum(
-                act.get('points_earned', 0) for act in activities 
-                if act.get('created_at') and datetime.fromisoformat(act['created_at']) >= week_ago
-            )
-            
-            month_points = sum(
-                act.get('points_earned', 0) for act in activities 
-                if act.get('created_at') and datetime.fromisoformat(act['created_at']) >= month_ago
-            )
-            
-            # Calculate time-based XP (new)
-            today_xp = sum(
-                act.get('xp_earned', act.get('points_earned', 0)) for act in activities 
-                if act.get('created_at') and datetime.fromisoformat(act['created_at']).date() == today
-            )
-            
-            week_xp = sum(
-                act.get('xp_earned', act.get('points_earned', 0)) for act in activities 
-                if act.get('created_at') and datetime.fromisoformat(act['created_at']) >= week_ago
-            )
-            
-            month_xp = sum(
-                act.get('xp_earned', act.get('points_earned', 0)) for act in activities 
-                if act.get('created_at') and datetime.fromisoformat(act['created_at']) >= month_ago
-            )
-            
-            # Calculate activities by type and accuracy
-            activities_by_type = defaultdict(int)
-            total_accuracy = []
-            
-            for activity in activities:
-                activity_type = activity.get('activity_type', 'unknown')
-                activities_by_type[activity_type] += 1
-                
-                if activity.get('accuracy_percentage') is not None:
-                    total_accuracy.append(activity['accuracy_percentage'])
-            
-            average_accuracy = sum(total_accuracy) / len(total_accuracy) if total_accuracy else None
-            
-            # Calculate XP for next level
-            xp_for_next_level = getattr(user_profile, 'xp_for_next_level', 100)
-            
-            return UserStats(
-                # Legacy fields for backward compatibility
-                total_points=user_profile.total_xp,
-                level=user_profile.current_level,
-                today_points=today_points,
-                week_points=week_points,
-                month_points=month_points,
-                # New XP fields as per PRD
-                total_xp=user_profile.total_xp,
-                current_level=user_profile.current_level,
-                xp_for_next_level=xp_for_next_level,
-                today_xp=today_xp,
-                week_xp=week_xp,
-                month_xp=month_xp,
-                # Common fields
-                current_streak=user_profile.current_streak,
-                longest_streak=user_profile.longest_streak,
-                total_activities=len(activities),
-                activities_by_type=dict(activities_by_type),
-                average_accuracy=average_accuracy
-            )
+            return self._stats_from_doc(self._profile_from_doc(doc), doc)
             
         except Exception as e:
             logger.error(f"❌ Failed to calculate user stats: {str(e)}")
@@ -775,11 +818,13 @@ class UserProfilesService:
     async def get_user_dashboard(self, user_id: str) -> DashboardResponse:
         """Get complete user dashboard data"""
         try:
-            profile = await self.get_user_profile(user_id)
-            if not profile:
+            # One profile read serves both the profile and the stats
+            doc = await self._get_profile_document_with_counters(user_id)
+            if not doc:
                 raise HTTPException(status_code=404, detail="User profile not found")
             
-            stats = await self.calculate_user_stats(user_id)
+            profile = self._profile_from_doc(doc)
+            stats = self._stats_from_doc(profile, doc)
             recent_activities = await self.get_user_activities(user_id, 5)
             recommendations = self._generate_recommendations(profile, stats)
             
@@ -11,15 +11,23 @@ Key concepts:
   - Velocity = earnedMastery / adjustedExpectedMastery
   - Decomposition: introduction / pass-through / closure velocities
 
-Data source: mastery_lifecycle subcollection (unified — PRD §2).
+Data source: the per-subject mastery aggregate (services/mastery_aggregate.py),
+kept current from mastery_lifecycle on every eval — no lifecycle scan per
+request.
 """
 
+import asyncio
 import logging
 from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
 from ..db.firestore_service import FirestoreService
 from ..services.curriculum_service import CurriculumService
+from ..services.mastery_aggregate import (
+    UNKNOWN_DATE,
+    load_mastery_aggregates,
+    subject_key,
+)
 from ..models.planning import SchoolBreak, SchoolYearConfig
 from ..models.velocity import (
     AggregateVelocity,
@@ -33,10 +41,15 @@ from ..models.velocity import (
 logger = logging.getLogger(__name__)
 
 
+def _count(value: Optional[float]) -> int:
+    """Aggregate counters are Increment-maintained numbers; read them as counts."""
+    return int(round(value or 0))
+
+
 class VelocityService:
     """
-    Stateless velocity calculator. Reads live Firestore mastery_lifecycle
-    state and computes pipeline-adjusted mastery velocity on demand.
+    Stateless velocity calculator. Reads the student's mastery aggregate
+    and computes pipeline-adjusted mastery velocity on demand.
     """
 
     def __init__(
@@ -60,8 +73,14 @@ class VelocityService:
         """
         today = date.today()
 
-        # 1. School year context
-        config = await self._get_school_year_config()
+        # 1. Independent reads: school year, mastery aggregate, subjects,
+        #    velocity history (for trends)
+        config, aggregates, subjects_list, history = await asyncio.gather(
+            self._get_school_year_config(),
+            load_mastery_aggregates(self.firestore, student_id),
+            self.curriculum.get_available_subjects(),
+            self.firestore.get_velocity_history(student_id, limit=8),
+        )
         year_start = date.fromisoformat(config.start_date)
         year_end = date.fromisoformat(config.end_date)
         total_days = (year_end - year_start).days or 1
@@ -75,11 +94,7 @@ class VelocityService:
             weeksRemaining=weeks_remaining,
         )
 
-        # 2. Load all mastery lifecycles
-        all_lifecycles = await self.firestore.get_all_mastery_lifecycles(student_id)
-
-        # 3. Get available subjects and their total skill counts
-        subjects_list = await self.curriculum.get_available_subjects()
+        # 2. Subjects and their total skill counts
         subject_names: List[str] = []
         for s in subjects_list:
             if isinstance(s, dict):
@@ -87,40 +102,40 @@ class VelocityService:
             else:
                 subject_names.append(str(s))
 
-        # 4. Load velocity history for trends
-        history = await self.firestore.get_velocity_history(student_id, limit=8)
+        curricula = await asyncio.gather(
+            *(self.curriculum.get_curriculum(subj) for subj in subject_names)
+        )
 
-        # 5. Compute per-subject velocity
+        # 3. Compute per-subject velocity
         subjects: Dict[str, SubjectVelocity] = {}
         total_earned = 0.0
         total_expected = 0.0
 
-        for subj in subject_names:
-            curriculum_data = await self.curriculum.get_curriculum(subj)
+        for subj, curriculum_data in zip(subject_names, curricula):
             total_skills = self._count_subskills(curriculum_data)
 
             if total_skills == 0:
                 continue
 
-            subj_lcs = [lc for lc in all_lifecycles if lc.get("subject") == subj]
+            agg = aggregates.get(subject_key(subj), {})
 
             # Core calculations
-            earned = self._compute_earned_mastery(subj_lcs)
-            closed = sum(1 for lc in subj_lcs if lc.get("current_gate", 0) >= 4)
+            earned = self._compute_earned_mastery(agg)
+            closed = _count(agg.get("by_gate", {}).get("4"))
             in_review_earned = round(earned - closed, 2)
             adjusted_expected = self._compute_adjusted_expected(
-                subj_lcs, total_skills, fraction_elapsed, today
+                agg, total_skills, fraction_elapsed, today
             )
 
             velocity = round(earned / adjusted_expected, 3) if adjusted_expected > 0 else 1.0
 
             # Decomposition
             decomposition = self._compute_decomposition(
-                subj_lcs, total_skills, fraction_elapsed, today
+                agg, total_skills, fraction_elapsed, today
             )
 
             # Primary driver
-            primary_driver = self._identify_primary_driver(decomposition, subj_lcs, today)
+            primary_driver = self._identify_primary_driver(decomposition, agg)
 
             # Trend: extract historical values for this subject, append current
             trend = self._extract_subject_trend(history, subj)
@@ -141,7 +156,7 @@ class VelocityService:
                 primaryDriver=primary_driver,
             )
 
-        # 6. Aggregate
+        # 4. Aggregate
         agg_velocity = round(total_earned / total_expected, 3) if total_expected > 0 else 1.0
         agg_trend = self._extract_aggregate_trend(history)
         agg_trend.append(round(agg_velocity, 2))
@@ -182,25 +197,41 @@ class VelocityService:
     # ====================================================================
 
     @staticmethod
-    def _compute_earned_mastery(lifecycles: List[Dict[str, Any]]) -> float:
+    def _compute_earned_mastery(agg: Dict[str, Any]) -> float:
         """
         Earned mastery = Σ 1.0 (closed) + Σ completion_pct (in-pipeline).
 
         Analogous to earned premium in insurance: credit for work done,
-        including work in progress.
+        including work in progress. Maintained as the aggregate's
+        `earned` counter.
         """
-        earned = 0.0
-        for lc in lifecycles:
-            gate = lc.get("current_gate", 0)
-            if gate >= 4:
-                earned += 1.0
-            elif gate >= 1 or lc.get("lesson_eval_count", 0) > 0:
-                earned += lc.get("completion_pct", 0.0)
-        return earned
+        return max(0.0, agg.get("earned", 0.0))
 
     @staticmethod
+    def _pipeline_weight(intro_date: str, today: date) -> float:
+        """Expected completion for a skill introduced on intro_date."""
+        if intro_date == UNKNOWN_DATE:
+            return 0.25
+        weeks_in_pipeline = (today - date.fromisoformat(intro_date)).days / 7.0
+        if weeks_in_pipeline >= 4:
+            return 1.0
+        elif weeks_in_pipeline >= 2:
+            return 0.75
+        elif weeks_in_pipeline >= 1:
+            return 0.50
+        return 0.25
+
+    @classmethod
+    def _expected_by_intro_date(cls, intro_dates: Dict[str, float], today: date) -> float:
+        """Σ count × pipeline weight over an {intro_date: count} counter."""
+        return sum(
+            _count(n) * cls._pipeline_weight(d, today) for d, n in intro_dates.items()
+        )
+
+    @classmethod
     def _compute_adjusted_expected(
-        lifecycles: List[Dict[str, Any]],
+        cls,
+        agg: Dict[str, Any],
         total_skills: int,
         fraction_elapsed: float,
         today: date,
@@ -221,45 +252,19 @@ class VelocityService:
           Gate 3→4: 14 days (~2 weeks)
           Total pipeline: 24 days (~3.5 weeks)
         """
-        introduced = [
-            lc for lc in lifecycles
-            if lc.get("current_gate", 0) > 0 or lc.get("lesson_eval_count", 0) > 0
-        ]
-        adjusted = 0.0
-
-        for lc in introduced:
-            created = lc.get("created_at")
-            if not created:
-                adjusted += 0.25
-                continue
-
-            try:
-                intro_date = date.fromisoformat(created[:10])
-            except (ValueError, TypeError):
-                adjusted += 0.25
-                continue
-
-            weeks_in_pipeline = (today - intro_date).days / 7.0
-
-            if weeks_in_pipeline >= 4:
-                adjusted += 1.0
-            elif weeks_in_pipeline >= 2:
-                adjusted += 0.75
-            elif weeks_in_pipeline >= 1:
-                adjusted += 0.50
-            else:
-                adjusted += 0.25
+        adjusted = cls._expected_by_intro_date(agg.get("intro_dates", {}), today)
 
         # Account for skills that should have been introduced by now
         expected_introduced = total_skills * fraction_elapsed
-        shortfall = max(0.0, expected_introduced - len(introduced))
+        shortfall = max(0.0, expected_introduced - _count(agg.get("introduced")))
         adjusted += shortfall * 0.5
 
         return adjusted
 
-    @staticmethod
+    @classmethod
     def _compute_decomposition(
-        lifecycles: List[Dict[str, Any]],
+        cls,
+        agg: Dict[str, Any],
         total_skills: int,
         fraction_elapsed: float,
         today: date,
@@ -271,71 +276,36 @@ class VelocityService:
         Pass-through velocity: Are in-pipeline skills advancing?
         Closure velocity: Are mature skills actually closing?
         """
-        introduced = [
-            lc for lc in lifecycles
-            if lc.get("current_gate", 0) > 0 or lc.get("lesson_eval_count", 0) > 0
-        ]
-        in_pipeline = [
-            lc for lc in lifecycles
-            if 1 <= lc.get("current_gate", 0) <= 3
-        ]
-        closed_lcs = [lc for lc in lifecycles if lc.get("current_gate", 0) >= 4]
+        introduced = _count(agg.get("introduced"))
+        in_pipeline = _count(agg.get("pipeline"))
+        closed = _count(agg.get("by_gate", {}).get("4"))
 
         # --- Introduction velocity ---
         expected_introduced = total_skills * fraction_elapsed
         intro_velocity = (
-            len(introduced) / expected_introduced
+            introduced / expected_introduced
             if expected_introduced > 0
             else 1.0
         )
 
         # --- Pass-through velocity ---
         if in_pipeline:
-            avg_completion = sum(lc.get("completion_pct", 0.0) for lc in in_pipeline) / len(in_pipeline)
-            expected_completions = []
-            for lc in in_pipeline:
-                created = lc.get("created_at")
-                if not created:
-                    expected_completions.append(0.25)
-                    continue
-                try:
-                    intro_date = date.fromisoformat(created[:10])
-                except (ValueError, TypeError):
-                    expected_completions.append(0.25)
-                    continue
-
-                weeks = (today - intro_date).days / 7.0
-                if weeks >= 4:
-                    expected_completions.append(1.0)
-                elif weeks >= 2:
-                    expected_completions.append(0.75)
-                elif weeks >= 1:
-                    expected_completions.append(0.50)
-                else:
-                    expected_completions.append(0.25)
-
-            expected_avg = sum(expected_completions) / len(expected_completions) if expected_completions else 0.25
+            avg_completion = agg.get("pipeline_completion_sum", 0.0) / in_pipeline
+            expected_avg = cls._expected_by_intro_date(
+                agg.get("pipeline_intro_dates", {}), today
+            ) / in_pipeline
             pass_through_velocity = avg_completion / expected_avg if expected_avg > 0 else 1.0
         else:
             pass_through_velocity = 1.0
 
         # --- Closure velocity ---
         # Expected closures: skills introduced >= 4 weeks ago should be closed
-        mature_lcs = []
-        for lc in introduced:
-            created = lc.get("created_at")
-            if not created:
-                continue
-            try:
-                intro_date = date.fromisoformat(created[:10])
-            except (ValueError, TypeError):
-                continue
-            if (today - intro_date).days >= 28:  # 4 weeks
-                mature_lcs.append(lc)
-
-        expected_closed = len(mature_lcs)
+        expected_closed = sum(
+            _count(n) for d, n in agg.get("intro_dates", {}).items()
+            if d != UNKNOWN_DATE and (today - date.fromisoformat(d)).days >= 28
+        )
         closure_velocity = (
-            len(closed_lcs) / expected_closed
+            closed / expected_closed
             if expected_closed > 0
             else 1.0
         )
@@ -349,8 +319,7 @@ class VelocityService:
     @staticmethod
     def _identify_primary_driver(
         decomposition: VelocityDecomposition,
-        lifecycles: List[Dict[str, Any]],
-        today: date,
+        agg: Dict[str, Any],
     ) -> PrimaryDriver:
         """
         Identify the single biggest factor driving velocity.
@@ -382,11 +351,7 @@ class VelocityService:
                 "review burden may be crowding out new skills"
             )
         elif worst_key == "pass_through":
-            low_pass = sum(
-                1 for lc in lifecycles
-                if 1 <= lc.get("current_gate", 0) <= 3
-                and lc.get("blended_pass_rate", 1.0) < 0.7
-            )
+            low_pass = _count(agg.get("pipeline_low_pass"))
             if low_pass > 0:
                 explanation = (
                     f"{low_pass} skill{'s' if low_pass != 1 else ''} "
@@ -0,0 +1,139 @@
+# backend/app/services/warmup.py
+"""Startup warm-up and readiness.
+
+Every cache behind the first student request — curriculum subjects, the
+lineage resolver, the subskill location index, flattened curriculum graphs,
+the retrieval matcher's subskill embeddings — is filled lazily, so each new
+Cloud Run instance used to serve its first students cold. The warm-up phase
+preloads them concurrently at startup and records per-component timing;
+/health/ready reports 503 until it has finished, so traffic (or a startup
+probe) only reaches a warm instance.
+
+A failed or timed-out component does not keep the instance out of service:
+the caches it covers simply fill lazily, as before, and readiness reports
+"degraded" with the error.
+
+Components are registered in dependencies.warmup_components() and selected
+with WARMUP_COMPONENTS.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ComponentWarmup:
+    """Outcome of warming one component."""
+
+    name: str
+    status: str = "pending"  # pending | running | ok | failed | timeout
+    elapsed_ms: Optional[float] = None
+    detail: Any = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "elapsed_ms": self.elapsed_ms,
+            "detail": self.detail,
+            "error": self.error,
+        }
+
+
+class Warmup:
+    """Runs the warm-up components concurrently and tracks readiness."""
+
+    def __init__(self):
+        self.state = "not_started"  # not_started | warming | ready | degraded | disabled
+        self.components: Dict[str, ComponentWarmup] = {}
+        self.elapsed_ms: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state in ("ready", "degraded", "disabled")
+
+    def disable(self) -> None:
+        self.state = "disabled"
+
+    async def run(
+        self,
+        components: Dict[str, Callable[[], Awaitable[Any]]],
+        timeout: float = 60.0,
+    ) -> str:
+        """Warm every component at once, each bounded by `timeout` seconds.
+
+        A component's return value is kept as its `detail` (e.g. how many
+        graphs it loaded). Returns the final state.
+        """
+        self.state = "warming"
+        self.components = {name: ComponentWarmup(name) for name in components}
+        started = time.monotonic()
+        await asyncio.gather(*(
+            self._run_one(self.components[name], factory, timeout)
+            for name, factory in components.items()
+        ))
+        self.elapsed_ms = round((time.monotonic() - started) * 1000, 1)
+        failed = [c.name for c in self.components.values() if c.status != "ok"]
+        self.state = "degraded" if failed else "ready"
+        logger.info(
+            f"[WARMUP] {self.state} in {self.elapsed_ms}ms: "
+            + ", ".join(f"{c.name}={c.status}/{c.elapsed_ms}ms" for c in self.components.values())
+        )
+        return self.state
+
+    def start(
+        self,
+        components: Dict[str, Callable[[], Awaitable[Any]]],
+        timeout: float = 60.0,
+    ) -> asyncio.Task:
+        """Run the warm-up in the background; readiness flips when it finishes."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(components, timeout), name="warmup")
+        return self._task
+
+    async def _run_one(
+        self,
+        component: ComponentWarmup,
+        factory: Callable[[], Awaitable[Any]],
+        timeout: float,
+    ) -> None:
+        component.status = "running"
+        started = time.monotonic()
+        try:
+            component.detail = await asyncio.wait_for(factory(), timeout)
+            component.status = "ok"
+        except asyncio.TimeoutError:
+            component.status = "timeout"
+            component.error = f"not warm after {timeout}s"
+            logger.warning(f"[WARMUP] {component.name} timed out after {timeout}s")
+        except Exception as e:
+            component.status = "failed"
+            component.error = f"{type(e).__name__}: {e}"
+            logger.error(f"[WARMUP] {component.name} failed: {e}")
+        finally:
+            component.elapsed_ms = round((time.monotonic() - started) * 1000, 1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "elapsed_ms": self.elapsed_ms,
+            "components": {name: c.to_dict() for name, c in self.components.items()},
+        }
+
+
+_warmup: Optional[Warmup] = None
+
+
+def get_warmup() -> Warmup:
+    """Process-wide warm-up tracker."""
+    global _warmup
+    if _warmup is None:
+        _warmup = Warmup()
+    return _warmup
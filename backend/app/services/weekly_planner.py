@@ -17,6 +17,8 @@ from google import genai
 from google.genai.types import GenerateContentConfig
 
 from ..core.config import settings
+from .llm_response_cache import get_llm_response_cache
+from .model_governor import govern_genai_client
 from ..models.weekly_plan import (
     WeeklyPlan, PlannedActivity, ActivityStatus,
     ActivityPriority, ActivityType
@@ -45,7 +47,7 @@ class WeeklyPlannerService:
         if not settings.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY is required for weekly planner")
 
-        self.gemini_client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        self.gemini_client = govern_genai_client(genai.Client(api_key=settings.GEMINI_API_KEY))
 
         logger.info("📅 WeeklyPlannerService initialized")
         if learning_paths_service:
@@ -114,7 +116,9 @@ class WeeklyPlannerService:
                 week_start_date,
                 analytics_snapshot,
                 target_activities,
-                assessment_feedback=assessment_feedback
+                assessment_feedback=assessment_feedback,
+                # A forced regeneration must produce a fresh plan, not the cached one.
+                cache=not force_regenerate
             )
 
             logger.info(f"✅ WEEKLY_PLANNER: LLM generated {len(weekly_plan_data['planned_activities'])} activities")
@@ -382,11 +386,16 @@ class WeeklyPlannerService:
         week_start_date: str,
         analytics_snapshot: Dict[str, Any],
         target_activities: int,
-        assessment_feedback: Optional[Dict[str, Any]] = None
+        assessment_feedback: Optional[Dict[str, Any]] = None,
+        cache: bool = True
     ) -> Dict[str, Any]:
         """
         Call Gemini LLM to generate structured weekly learning plan
         Uses strict JSON schema output for reliability
+
+        The prompt is built only from the analytics snapshot and allocations,
+        so students with identical inputs share one cached response
+        (cache=False bypasses the LLM response cache).
         """
         logger.info(f"🤖 LLM_WEEKLY: Generating weekly plan via Gemini")
 
@@ -452,25 +461,40 @@ class WeeklyPlannerService:
             logger.info(f"🤖 LLM_WEEKLY: Calling Gemini with prompt length: {len(prompt)} chars")
             logger.debug(f"🤖 LLM_WEEKLY: Prompt preview: {prompt[:500]}...")
 
-            # Call Gemini with structured output
-            response = await self.gemini_client.aio.models.generate_content(
-                model='gemini-2.5-flash',
-                contents=prompt,
-                config=GenerateContentConfig(
-                    response_mime_type='application/json',
-                    response_schema=weekly_plan_schema,
-                    temperature=0.5,  # Balanced creativity and consistency
-                    max_output_tokens=15000  # Larger for weekly planning
+            async def _call() -> str:
+                # Call Gemini with structured output
+                response = await self.gemini_client.aio.models.generate_content(
+                    model='gemini-2.5-flash',
+                    contents=prompt,
+                    config=GenerateContentConfig(
+                        response_mime_type='application/json',
+                        response_schema=weekly_plan_schema,
+                        temperature=0.5,  # Balanced creativity and consistency
+                        max_output_tokens=15000  # Larger for weekly planning
+                    )
                 )
-            )
+                return response.text if response else ""
+
+            if cache:
+                response_text = await get_llm_response_cache().get_or_generate(
+                    _call,
+                    model='gemini-2.5-flash',
+                    prompt=prompt,
+                    schema=weekly_plan_schema,
+                    temperature=0.5,
+                    namespace="weekly_planner.weekly_planning",
+                    validate=json.loads,
+                )
+            else:
+                response_text = await _call()
 
-            if not response or not response.text:
+            if not response_text:
                 raise Exception("Empty response from Gemini")
 
-            logger.info(f"🤖 LLM_WEEKLY: Received response: {len(response.text)} chars")
+            logger.info(f"🤖 LLM_WEEKLY: Received response: {len(response_text)} chars")
 
             # Parse and validate response
-            weekly_plan_data = json.loads(response.text)
+            weekly_plan_data = json.loads(response_text)
 
             # Add unique activity UIDs if not provided and mark assessment-driven activities
             for activity in weekly_plan_data['planned_activities']:
@@ -19,17 +19,34 @@ Run it once per student before trusting the rollup-served endpoints
 fall back to the legacy scans until then. Re-running also re-attributes any
 legacy "General"/mis-labeled rows to their true subject + grade.
 
+Platform-wide runs (--all) fan out over a bounded pool of --workers students
+at a time. Writes go through Firestore's BulkWriter, which batches across
+students and ramps its write rate (500 ops/s start, +50% every 5 minutes, the
+"500/50/5" rule) up to --max-ops, retrying transient errors. With --checkpoint
+a student is recorded as finished only after its writes are flushed, so a
+crashed or interrupted run resumes where it stopped. The checkpoint is keyed
+on the mode and --run-id (default: today's UTC date) and deleted once a run
+finishes without failures, so a leftover file never skips students in a new
+run. --verify rebuilds in memory and diffs against the stored rollups instead
+of writing.
+
 Usage:
     python scripts/backfill_daily_rollups.py --student 1004        # dry run, one student
     python scripts/backfill_daily_rollups.py --all                 # dry run, every student
     python scripts/backfill_daily_rollups.py --student 1004 --apply  # write
+    python scripts/backfill_daily_rollups.py --all --apply --workers 16 \\
+        --checkpoint /tmp/rollup-backfill.json                     # resumable rebuild
+    python scripts/backfill_daily_rollups.py --all --verify         # drift report only
 """
 
 import argparse
 import asyncio
 import sys
+import time
 from collections import defaultdict
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
@@ -69,7 +86,10 @@ async def aggregate_student(fs, student_id: int):
     grade_subskill_sets = defaultdict(lambda: defaultdict(lambda: defaultdict(set)))
 
     count = 0
-    for doc in fs._attempts_subcollection(student_id).stream():
+    # The attempts scan is the slow, blocking part; run it off the event loop
+    # so parallel workers overlap their Firestore reads.
+    docs = await asyncio.to_thread(lambda: list(fs._attempts_subcollection(student_id).stream()))
+    for doc in docs:
         a = doc.to_dict() or {}
         ts = a.get("timestamp") or a.get("created_at") or ""
         if len(ts) < 10:
@@ -154,12 +174,7 @@ async def aggregate_student(fs, student_id: int):
     return rollups, profile, count
 
 
-async def backfill_student(fs, student_id: int, apply: bool) -> None:
-    rollups, profile, count = await aggregate_student(fs, student_id)
-    if count == 0:
-        print(f"student {student_id}: no attempts, skipping")
-        return
-
+def _summarize(student_id: int, rollups: Dict, profile: Dict, count: int) -> str:
     days = sorted(rollups.keys())
     # Show the per-(subject, grade) shape the read model will serve.
     parts = []
@@ -170,30 +185,239 @@ async def backfill_student(fs, student_id: int, apply: bool) -> None:
         flag = " *unresolved" if v.get("unresolved") else ""
         parts.append(f"{k}[{grades}]{flag}")
     subj_summary = "  ".join(parts)
-    print(
+    return (
         f"student {student_id}: {count} attempts -> {len(rollups)} rollup days "
         f"({days[0]}..{days[-1]}), avg score "
         f"{profile['sum_score'] / max(profile['total_attempts'], 1):.2f}\n"
         f"    {subj_summary}"
     )
+
+
+def _student_of(ref) -> Optional[int]:
+    """Student id owning a document under students/{sid}/..., walking up the refs."""
+    doc = ref
+    while doc is not None:
+        collection = doc.parent
+        if collection.id == "students":
+            return int(doc.id) if doc.id.isdigit() else None
+        doc = collection.parent
+    return None
+
+
+class ThrottledWriter:
+    """Firestore BulkWriter with per-student failure tracking.
+
+    BulkWriter batches sets across students, throttles itself (500/50/5 ramp
+    up to `max_ops_per_second`) and retries transient errors; a write that
+    exhausts its retries marks its student failed so the checkpoint skips it.
+    """
+
+    def __init__(self, client, max_ops_per_second: int = 5000, max_attempts: int = 10):
+        from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions
+
+        self.max_attempts = max_attempts
+        self.failed: Set[int] = set()
+        self.writes = 0
+        self._writer = client.bulk_writer(
+            options=BulkWriterOptions(max_ops_per_second=max_ops_per_second)
+        )
+        self._writer.on_write_error(self._on_error)
+
+    def _on_error(self, failure, bulk_writer) -> bool:
+        if failure.attempts < self.max_attempts:
+            return True
+        ref = failure.operation.reference
+        student = _student_of(ref)
+        print(f"  WRITE FAILED student {student} ({ref.id}): {failure.code} {failure.message}")
+        if student is not None:
+            self.failed.add(student)
+        return False
+
+    def set(self, ref, doc: Dict[str, Any]) -> None:
+        self._writer.set(ref, doc)
+        self.writes += 1
+
+    async def flush(self) -> None:
+        await asyncio.to_thread(self._writer.flush)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._writer.close)
+
+
+async def backfill_student(fs, student_id: int, apply: bool, writer: Optional[ThrottledWriter] = None) -> bool:
+    """Rebuild one student; with `writer`, queue the docs on it. False if no attempts."""
+    rollups, profile, count = await aggregate_student(fs, student_id)
+    if count == 0:
+        print(f"student {student_id}: no attempts, skipping")
+        return False
+
+    print(_summarize(student_id, rollups, profile, count))
     if not apply:
-        return
+        return True
 
-    batch = fs.client.batch()
-    pending = 0
     for day, r in rollups.items():
-        batch.set(fs._daily_rollups_subcollection(student_id).document(day), r)
-        pending += 1
-        if pending >= 400:  # Firestore batch limit is 500 writes
-            batch.commit()
-            batch = fs.client.batch()
-            pending = 0
-    batch.set(fs._profile_summary_ref(student_id), profile)
-    batch.commit()
-    print(f"  WROTE {len(rollups)} rollup docs + profile summary")
+        writer.set(fs._daily_rollups_subcollection(student_id).document(day), r)
+    writer.set(fs._profile_summary_ref(student_id), profile)
+    print(f"  QUEUED {len(rollups)} rollup docs + profile summary")
+    return True
+
+
+def _day_proj(doc: Dict[str, Any]) -> tuple:
+    return (
+        int(doc.get("attempts", 0)),
+        round(float(doc.get("sum_score", 0.0)), 3),
+        tuple(sorted(doc.get("subskills", []) or [])),
+        tuple(sorted(
+            (k, int(v.get("attempts", 0)), round(float(v.get("sum_score", 0.0)), 3))
+            for k, v in (doc.get("subjects") or {}).items()
+        )),
+    )
+
+
+def _profile_proj(doc: Dict[str, Any]) -> tuple:
+    return (
+        int(doc.get("total_attempts", 0)),
+        round(float(doc.get("sum_score", 0.0)), 3),
+        doc.get("last_activity_at"),
+        tuple(sorted(
+            (k, int(v.get("attempts", 0)), round(float(v.get("sum_score", 0.0)), 3))
+            for k, v in (doc.get("subjects") or {}).items()
+        )),
+    )
+
+
+def diff_rollups(replay_rollups: Dict, replay_profile: Dict, stored_rollups: Dict, stored_profile: Dict) -> List[str]:
+    """Human-readable differences between a replay and the stored read model."""
+    mismatches = []
+    for day in sorted(set(replay_rollups) | set(stored_rollups)):
+        r, s = replay_rollups.get(day), stored_rollups.get(day)
+        if r is None or s is None:
+            mismatches.append(f"{day}: present only in {'stored' if r is None else 'replay'}")
+        elif _day_proj(r) != _day_proj(s):
+            mismatches.append(f"{day}: replay={_day_proj(r)} stored={_day_proj(s)}")
+    if _profile_proj(replay_profile) != _profile_proj(stored_profile or {}):
+        mismatches.append(
+            f"profile: replay={_profile_proj(replay_profile)} stored={_profile_proj(stored_profile or {})}"
+        )
+    return mismatches
+
+
+async def verify_student(fs, student_id: int) -> List[str]:
+    """Replay attempts and diff against the stored rollups; [] when in sync."""
+    rollups, profile, count = await aggregate_student(fs, student_id)
+
+    def read_stored():
+        stored = {
+            d["date"]: d
+            for d in (doc.to_dict() or {} for doc in fs._daily_rollups_subcollection(student_id).stream())
+            if d.get("date")
+        }
+        summary = fs._profile_summary_ref(student_id).get()
+        return stored, (summary.to_dict() if summary.exists else None)
+
+    stored_rollups, stored_profile = await asyncio.to_thread(read_stored)
+    if count == 0 and not stored_rollups and stored_profile is None:
+        return []
+    mismatches = diff_rollups(rollups, profile, stored_rollups, stored_profile)
+    if mismatches:
+        print(f"student {student_id}: {len(mismatches)} mismatch(es)")
+        for line in mismatches[:5]:
+            print(f"    {line}")
+    return mismatches
+
+
+async def run_pool(student_ids: Iterable[int], handle, workers: int) -> None:
+    """Run `handle(student_id)` for every id with at most `workers` in flight."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for sid in student_ids:
+        queue.put_nowait(sid)
+
+    async def worker():
+        while True:
+            try:
+                sid = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await handle(sid)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+
+
+async def backfill_all(
+    fs,
+    student_ids: List[int],
+    *,
+    apply: bool,
+    verify: bool = False,
+    workers: int = 8,
+    checkpoint=None,
+    writer: Optional[ThrottledWriter] = None,
+    flush_every: int = 50,
+) -> Dict[str, Any]:
+    """Backfill (or verify) many students in parallel; returns run stats.
+
+    With `checkpoint`, finished students are skipped, and a student written
+    through `writer` is only marked done after a flush confirms its docs. A
+    run that ends with no failures clears the checkpoint.
+    """
+    stats = {"students": len(student_ids), "checkpointed": 0, "processed": 0,
+             "empty": 0, "failed": 0, "mismatched": 0}
+    if checkpoint is not None:
+        todo = [sid for sid in student_ids if sid not in checkpoint.done]
+        stats["checkpointed"] = len(student_ids) - len(todo)
+    else:
+        todo = list(student_ids)
+
+    unconfirmed: List[int] = []
+    flush_lock = asyncio.Lock()
+
+    async def confirm() -> None:
+        async with flush_lock:
+            batch = unconfirmed[:]
+            del unconfirmed[:len(batch)]
+            if writer is not None and batch:
+                await writer.flush()
+            for sid in batch:
+                if writer is not None and sid in writer.failed:
+                    stats["failed"] += 1
+                elif checkpoint is not None:
+                    checkpoint.mark(sid)
+
+    async def handle(sid: int) -> None:
+        try:
+            if verify:
+                if await verify_student(fs, sid):
+                    stats["mismatched"] += 1
+            elif not await backfill_student(fs, sid, apply=apply, writer=writer):
+                stats["empty"] += 1
+            stats["processed"] += 1
+        except Exception as e:
+            stats["failed"] += 1
+            print(f"student {sid}: FAILED {type(e).__name__}: {e}")
+            return
+        unconfirmed.append(sid)
+        if len(unconfirmed) >= flush_every:
+            await confirm()
+
+    started = time.monotonic()
+    await run_pool(todo, handle, workers)
+    await confirm()
+    if checkpoint is not None:
+        if stats["failed"]:
+            checkpoint.flush()
+        else:
+            checkpoint.clear()
+    elapsed = time.monotonic() - started
+    stats["elapsed_s"] = round(elapsed, 1)
+    stats["students_per_s"] = round(stats["processed"] / elapsed, 2) if elapsed else None
+    if writer is not None:
+        stats["writes"] = writer.writes
+    return stats
 
 
 async def run(args) -> None:
+    from app.services.plan_prematerializer import FileCheckpoint
+
     fs = get_service()
 
     if args.all:
@@ -204,22 +428,48 @@ async def run(args) -> None:
     else:
         student_ids = args.student
 
-    for sid in student_ids:
-        await backfill_student(fs, sid, apply=args.apply)
-
-    if not args.apply:
+    mode = "verify" if args.verify else ("apply" if args.apply else "dry-run")
+    # Keyed by mode and run: a verify pass never suppresses a later --apply,
+    # and a file left by an earlier run never suppresses a new one.
+    run_id = args.run_id or datetime.now(timezone.utc).date().isoformat()
+    checkpoint = FileCheckpoint(args.checkpoint, f"rollups-{mode}-{run_id}") if args.checkpoint else None
+    writer = ThrottledWriter(fs.client, max_ops_per_second=args.max_ops) if args.apply else None
+    try:
+        stats = await backfill_all(
+            fs, student_ids,
+            apply=args.apply,
+            verify=args.verify,
+            workers=args.workers,
+            checkpoint=checkpoint,
+            writer=writer,
+        )
+    finally:
+        if writer is not None:
+            await writer.close()
+    print(f"\n{mode}: {stats}")
+
+    if args.verify:
+        print(f"VERIFY - {stats['mismatched']} student(s) drifted from their attempts.")
+    elif not args.apply:
         print("\nDRY RUN - nothing written. Re-run with --apply to write rollups.")
 
 
 def main() -> None:
-    parser = argparse.ArgumentParser(description=__doc__)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument("--student", type=int, action="append", help="Student id (repeatable)")
     parser.add_argument("--all", action="store_true", help="Backfill every student doc")
     parser.add_argument("--apply", action="store_true", help="Write docs (default: dry run)")
+    parser.add_argument("--verify", action="store_true", help="Diff stored rollups against attempts; write nothing")
+    parser.add_argument("--workers", type=int, default=8, help="Students processed concurrently")
+    parser.add_argument("--max-ops", type=int, default=5000, help="BulkWriter ceiling, writes/s")
+    parser.add_argument("--checkpoint", help="JSON file recording finished students for resume")
+    parser.add_argument("--run-id", help="Checkpoint key; reuse it to resume a run (default: today's UTC date)")
     args = parser.parse_args()
 
     if not args.student and not args.all:
         parser.error("pass --student N (repeatable) or --all")
+    if args.apply and args.verify:
+        parser.error("--verify writes nothing; drop --apply")
 
     asyncio.run(run(args))
 
@@ -1,10 +1,11 @@
 """
 Curriculum-Fit Sweep — batch driver behind `/curriculum-fit <domain>`.
 
-Runs the same CurriculumRetrievalMatcher.probe() as curriculum_fit_probe.py, but
-initializes the service ONCE and loops every primitive in a catalog domain. The
-curriculum embeddings cache per (subject, grade), so the only per-primitive cost
-is embedding that primitive's description.
+Runs the same retrieval as curriculum_fit_probe.py, but initializes the service
+ONCE and probes every primitive in a catalog domain at every grade in a single
+CurriculumRetrievalMatcher.probe_many() call: all descriptions are embedded in
+one request and scored against the cached (subject, grade) matrices with one
+matrix multiply per subject. Verdicts are identical to per-primitive probe().
 
 Extracts (id, description) pairs straight from the catalog TS so the embedded
 signal is byte-identical to what /api/problems/submit uses.
@@ -90,16 +91,23 @@ async def main():
             # in _PRIMITIVE_TO_SUBJECT (a `di` sweep must send di-shapes and
             # di-math-facts to MATHEMATICS, not the domain's LANGUAGE_ARTS).
             grades_by_subject = {subject: grades}
+            planned, queries = [], []
             for pid, desc in prims:
                 p_subject = matcher.subject_for_primitive(pid, args.domain) or subject
                 if p_subject not in grades_by_subject:
                     grades_by_subject[p_subject] = await discover_grades(cs, p_subject) or ["Kindergarten"]
-                p_grades = grades_by_subject[p_subject]
                 query = CurriculumMappingService._build_retrieval_query(desc, "", "", "", pid)
+                planned.append((pid, p_subject, query, len(queries)))
+                queries.extend(
+                    {"subject": p_subject, "grade_level": grade, "query_text": query, "primitive_type": pid}
+                    for grade in grades_by_subject[p_subject]
+                )
+            probes = await matcher.probe_many(queries)
+
+            for pid, p_subject, query, first in planned:
+                p_grades = grades_by_subject[p_subject]
                 per_grade = []
-                for grade in p_grades:
-                    p = await matcher.probe(subject=p_subject, grade_level=grade,
-                                            query_text=query, primitive_type=pid)
+                for grade, p in zip(p_grades, probes[first:first + len(p_grades)]):
                     p.pop("mapping", None)
                     top1 = p["top_k"][0] if p.get("top_k") else {}
                     per_grade.append({
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Pre-build tomorrow's daily session plans and forecasts for active students.
+
+Schedule nightly (before the school day, e.g. Cloud Scheduler → Cloud Run job).
+Each student's plan and forecast for the target date are built through the
+same get-or-create paths the endpoints use, so the morning's first visit is a
+single document read. Students whose docs already exist are skipped; pass
+--checkpoint to also resume an interrupted run without re-checking finished
+students.
+
+Active = profile summary shows activity within PREMATERIALIZE_ACTIVE_DAYS.
+
+Usage:
+    python scripts/prematerialize_daily_plans.py                      # tomorrow, all active students
+    python scripts/prematerialize_daily_plans.py --dry-run --student 1004
+    python scripts/prematerialize_daily_plans.py --date 2026-03-02 --concurrency 16 \\
+        --checkpoint /tmp/prematerialize.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from dotenv import load_dotenv
+
+load_dotenv(backend_dir / ".env")
+
+
+async def run(args) -> None:
+    from app.core.config import settings
+    from app.db.firestore_service import FirestoreService
+    from app.services.curriculum_service import CurriculumService
+    from app.services.firestore_analytics import FirestoreAnalyticsService
+    from app.services.forecast_service import ForecastService
+    from app.services.learning_paths import LearningPathsService
+    from app.services.plan_prematerializer import FileCheckpoint, PlanPrematerializer
+    from app.services.planning_service import PlanningService
+
+    now = datetime.now(timezone.utc)
+    target_date = args.date or (now.date() + timedelta(days=1)).isoformat()
+
+    fs = FirestoreService()  # scripts MUST reuse this client (hand-rolled clients 403)
+    learning_paths = LearningPathsService(firestore_service=fs, project_id=settings.GCP_PROJECT_ID)
+    curriculum = CurriculumService(firestore_service=fs)
+    await curriculum.initialize()
+    analytics = FirestoreAnalyticsService(
+        firestore_service=fs,
+        curriculum_service=curriculum,
+        learning_paths_service=learning_paths,
+    )
+    planning = PlanningService(
+        firestore_service=fs,
+        curriculum_service=curriculum,
+        learning_paths_service=learning_paths,
+        analytics_service=analytics,
+    )
+    forecast = ForecastService(fs, curriculum, analytics)
+
+    if args.student:
+        student_ids = args.student
+    else:
+        since = (now - timedelta(days=args.active_days)).isoformat()
+        student_ids = await fs.list_active_student_ids(since)
+        print(f"{len(student_ids)} student(s) active since {since[:10]}")
+
+    checkpoint = FileCheckpoint(args.checkpoint, target_date) if args.checkpoint else None
+    job = PlanPrematerializer(
+        fs, planning, forecast,
+        concurrency=args.concurrency,
+        dry_run=args.dry_run,
+        overwrite=args.overwrite,
+    )
+    stats = await job.run(student_ids, target_date, checkpoint=checkpoint)
+    print(json.dumps(stats.to_dict(), indent=2))
+
+    if args.dry_run:
+        print("\nDRY RUN - nothing written.")
+
+
+def main() -> None:
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--date", help="Target day YYYY-MM-DD (default: tomorrow, UTC)")
+    parser.add_argument("--student", type=int, action="append", help="Student id (repeatable; default: all active)")
+    parser.add_argument("--active-days", type=int, default=settings.PREMATERIALIZE_ACTIVE_DAYS)
+    parser.add_argument("--concurrency", type=int, default=settings.PREMATERIALIZE_CONCURRENCY)
+    parser.add_argument("--checkpoint", help="JSON file recording finished students for resume")
+    parser.add_argument("--overwrite", action="store_true", help="Rebuild docs that already exist")
+    parser.add_argument("--dry-run", action="store_true", help="Build in memory, persist nothing")
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Recompute user_profiles XP, level and streaks from user_activities.
+
+Profile totals are maintained incrementally by the engagement ledger
+(services/engagement_ledger.py), which writes each activity doc before adding
+its xp_earned to the profile. This script is the replay half: it sums the
+activity log oldest-first, re-derives the streaks from activity dates and
+the per-day XP / per-type engagement counters, and overwrites the profile
+totals with an etag-conditional write — so it is safe to run while the user
+is active, and repairs totals that drifted under the old read-then-overwrite
+path.
+
+Usage:
+    python scripts/rebuild_engagement_totals.py --uid <firebase_uid>          # dry run
+    python scripts/rebuild_engagement_totals.py --uid <uid> --uid <uid> --apply
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from dotenv import load_dotenv
+
+load_dotenv(backend_dir / ".env")
+
+
+async def run(args) -> int:
+    from app.services.engagement_service import engagement_service
+
+    drifted = 0
+    for uid in args.uid:
+        result = await engagement_service.rebuild_totals(uid, dry_run=not args.apply)
+        if result is None:
+            print(f"{uid}: no profile")
+            continue
+        changed = result["before"] != result["after"]
+        drifted += changed
+        print(f"{uid}: {result['activities']} activities  before={result['before']}  "
+              f"after={result['after']}{'  (drift)' if changed else ''}")
+    mode = "rewritten" if args.apply else "would be rewritten (dry run)"
+    print(f"\n{drifted} of {len(args.uid)} profile(s) {mode}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uid", action="append", required=True, help="Firebase uid (repeatable)")
+    parser.add_argument("--apply", action="store_true", help="Write the rebuilt totals (default: dry run)")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Load harness for the shared Gemini Live relay core (app/services/live_relay.py).
+
+Answers "how many concurrent Live sessions can one backend worker carry?"
+without spending Live API quota: every session runs the real LiveRelay (writer,
+bounded queues, supervised workers) between a fake client WebSocket and a fake
+Live session that answers each inbound audio chunk with model audio at the
+Live API's frame sizes. One process = one uvicorn worker = one event loop.
+
+For each concurrency level the harness runs N sessions for --duration seconds
+and reports per-frame latency (model frame produced -> client send completed),
+event-loop lag, drops and throughput. The highest level whose p95 latency and
+loop lag stay inside --budget-ms is the per-worker capacity.
+
+Usage:
+  python tests/live_relay_load/run_relay_load.py
+  python tests/live_relay_load/run_relay_load.py --levels 50 100 200 400 --duration 10
+  python tests/live_relay_load/run_relay_load.py --send-delay-ms 2 --binary-audio
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from app.services.live_relay import LiveRelay  # noqa: E402
+
+# Client mic: 16 kHz mono PCM16 in 20 ms chunks. Model audio: 24 kHz, 40 ms.
+CLIENT_CHUNK_BYTES = 640
+CLIENT_CHUNK_S = 0.020
+MODEL_CHUNK_BYTES = 1920
+
+
+class FakeClientSocket:
+    """Client side of the relay: streams mic audio, measures delivered frames."""
+
+    def __init__(self, duration_s: float, send_delay_s: float, latencies: List[float]):
+        self.deadline = time.monotonic() + duration_s
+        self.send_delay_s = send_delay_s
+        self.latencies = latencies
+        self.frames_received = 0
+
+    async def receive(self) -> Dict:
+        await asyncio.sleep(CLIENT_CHUNK_S)
+        if time.monotonic() >= self.deadline:
+            return {"type": "websocket.disconnect"}
+        return {"type": "websocket.receive", "bytes": b"\x00" * CLIENT_CHUNK_BYTES}
+
+    async def send_json(self, message: Dict) -> None:
+        if self.send_delay_s:
+            await asyncio.sleep(self.send_delay_s)
+        self.frames_received += 1
+        produced = message.get("t0")
+        if produced is not None:
+            self.latencies.append((time.monotonic() - produced) * 1000)
+
+    async def send_bytes(self, data: bytes) -> None:
+        if self.send_delay_s:
+            await asyncio.sleep(self.send_delay_s)
+        self.frames_received += 1
+        # Binary frames carry no envelope; the fake session stamps the
+        # production time into the first 8 bytes instead.
+        produced = int.from_bytes(data[:8], "big") / 1e9
+        self.latencies.append((time.monotonic() - produced) * 1000)
+
+
+class FakeLiveSession:
+    """Stand-in for a Gemini Live session: one model audio frame per input chunk."""
+
+    def __init__(self):
+        self._out: asyncio.Queue = asyncio.Queue()
+
+    async def send_realtime_input(self, audio: bytes) -> None:
+        stamp = int(time.monotonic() * 1e9).to_bytes(8, "big")
+        await self._out.put(stamp + b"\x00" * (MODEL_CHUNK_BYTES - 8))
+
+    async def receive(self):
+        while True:
+            yield await self._out.get()
+
+
+async def run_session(duration_s: float, send_delay_s: float, binary_audio: bool,
+                      latencies: List[float], totals: Dict[str, int]) -> None:
+    websocket = FakeClientSocket(duration_s, send_delay_s, latencies)
+    session = FakeLiveSession()
+    async with LiveRelay(websocket, "load_test", binary_audio=binary_audio) as relay:
+        audio_in = relay.queue("audio")
+
+        async def client_to_queue():
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                relay.record_inbound(len(message["bytes"]))
+                await audio_in.put(message["bytes"])
+
+        async def queue_to_gemini():
+            while True:
+                await session.send_realtime_input(audio=await audio_in.get())
+
+        async def gemini_to_client():
+            async for pcm in session.receive():
+                t0 = int.from_bytes(pcm[:8], "big") / 1e9
+                await relay.send_audio(pcm, type="ai_audio", format="raw-pcm", t0=t0)
+
+        await relay.run({
+            "client": client_to_queue(),
+            "send": queue_to_gemini(),
+            "receive": gemini_to_client(),
+        })
+    totals["frames"] += websocket.frames_received
+    totals["dropped"] += relay.metrics.dropped
+
+
+async def measure_loop_lag(stop: asyncio.Event, lags: List[float], interval: float = 0.01) -> None:
+    while not stop.is_set():
+        started = time.monotonic()
+        await asyncio.sleep(interval)
+        lags.append((time.monotonic() - started - interval) * 1000)
+
+
+def pct(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, math.ceil(p * len(ordered)) - 1)], 2)
+
+
+async def run_level(sessions: int, args) -> Dict:
+    latencies: List[float] = []
+    lags: List[float] = []
+    totals = {"frames": 0, "dropped": 0}
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop, lags))
+    started = time.monotonic()
+    await asyncio.gather(*(
+        run_session(args.duration, args.send_delay_ms / 1000, args.binary_audio, latencies, totals)
+        for _ in range(sessions)
+    ))
+    elapsed = time.monotonic() - started
+    stop.set()
+    await lag_task
+    return {
+        "sessions": sessions,
+        "frames_delivered": totals["frames"],
+        "frames_per_s": round(totals["frames"] / elapsed, 1),
+        "dropped": totals["dropped"],
+        "frame_latency_p50_ms": pct(latencies, 0.50),
+        "frame_latency_p95_ms": pct(latencies, 0.95),
+        "frame_latency_p99_ms": pct(latencies, 0.99),
+        "loop_lag_p95_ms": pct(lags, 0.95),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[10, 25, 50, 100, 200, 400])
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per level")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="p95 frame latency / loop lag budget")
+    parser.add_argument("--send-delay-ms", type=float, default=0.0, help="simulated per-send network time")
+    parser.add_argument("--binary-audio", action="store_true", help="send model audio as binary frames")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    capacity = 0
+    for level in args.levels:
+        result = await run_level(level, args)
+        within = (
+            (result["frame_latency_p95_ms"] or 0) <= args.budget_ms
+            and (result["loop_lag_p95_ms"] or 0) <= args.budget_ms
+        )
+        result["within_budget"] = within
+        results.append(result)
+        if not args.json:
+            print(
+                f"{level:>5} sessions | {result['frames_per_s']:>9} frames/s | "
+                f"latency p50/p95/p99 {result['frame_latency_p50_ms']}/"
+                f"{result['frame_latency_p95_ms']}/{result['frame_latency_p99_ms']} ms | "
+                f"loop lag p95 {result['loop_lag_p95_ms']} ms | dropped {result['dropped']}"
+                f"{'' if within else '  <-- over budget'}"
+            )
+        if not within:
+            break
+        capacity = level
+
+    if args.json:
+        print(json.dumps({"per_worker_capacity": capacity, "levels": results}, indent=2))
+    else:
+        print(f"\nPer-worker capacity within {args.budget_ms:.0f} ms p95: {capacity} concurrent sessions")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -103,6 +103,12 @@ class InMemoryFirestoreService:
         # students/{student_id}/mastery_lifecycle/{subskill_id} → lifecycle dict
         self._mastery_lifecycles: Dict[int, Dict[str, Dict[str, Any]]] = defaultdict(dict)
 
+        # students/{student_id}/mastery_aggregate/{subject | "_meta"} → aggregate dict
+        self._mastery_aggregates: Dict[int, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+
+        # students/{student_id}/velocityHistory/{week_id} → snapshot dict
+        self._velocity_history: Dict[int, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+
         # students/{student_id}/ability/{skill_id} → ability dict
         self._abilities: Dict[int, Dict[str, Dict[str, Any]]] = defaultdict(dict)
 
@@ -149,6 +155,9 @@ class InMemoryFirestoreService:
         # students/{sid}/misconceptions/{subskill_id}: one slot per subskill.
         self._misconceptions: Dict[int, Dict[str, Dict[str, Any]]] = defaultdict(dict)
 
+        # students/{sid}/pending_misconceptions/{attempt_id}
+        self._pending_misconceptions: Dict[int, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+
         # students/{sid}/dailySessionPlans/{YYYY-MM-DD}
         self._session_plans: Dict[int, Dict[str, Dict[str, Any]]] = defaultdict(dict)
 
@@ -331,8 +340,64 @@ class InMemoryFirestoreService:
             if subskill_id:
                 existing = self._mastery_lifecycles[student_id].get(subskill_id, {})
                 self._mastery_lifecycles[student_id][subskill_id] = self._deep_merge(existing, lc)
+        await self.invalidate_mastery_aggregates(student_id)
         return True
 
+    # ==================================================================
+    # MASTERY AGGREGATE
+    # ==================================================================
+
+    async def apply_mastery_aggregate_delta(
+        self, student_id: int, updates: Dict[str, Dict[str, Any]]
+    ) -> None:
+        self._write_count += 1
+        for key, update in updates.items():
+            doc = self._mastery_aggregates[student_id].setdefault(key, {})
+            doc["subject"] = update["subject"]
+            for path, delta in update["counters"].items():
+                node = doc
+                for part in path[:-1]:
+                    node = node.setdefault(part, {})
+                node[path[-1]] = node.get(path[-1], 0) + delta
+            rows = doc.setdefault("subskills", {})
+            for subskill_id, row in update["rows"].items():
+                if row is None:
+                    rows.pop(subskill_id, None)
+                else:
+                    rows[subskill_id] = {**rows.get(subskill_id, {}), **row}
+        meta = self._mastery_aggregates[student_id].setdefault("_meta", {})
+        meta["version"] = meta.get("version", 0) + 1
+
+    async def get_mastery_aggregates(
+        self, student_id: int
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        self._read_count += 1
+        docs = copy.deepcopy(self._mastery_aggregates.get(student_id, {}))
+        if "built_at" not in docs.pop("_meta", {}):
+            return None
+        return docs
+
+    async def get_mastery_aggregate_version(self, student_id: int) -> int:
+        self._read_count += 1
+        return self._mastery_aggregates.get(student_id, {}).get("_meta", {}).get("version", 0)
+
+    async def replace_mastery_aggregates(
+        self, student_id: int, aggregates: Dict[str, Dict[str, Any]]
+    ) -> None:
+        self._write_count += 1
+        meta = self._mastery_aggregates.get(student_id, {}).get("_meta", {})
+        self._mastery_aggregates[student_id] = {
+            **copy.deepcopy(aggregates),
+            "_meta": {
+                **meta,
+                "built_at": datetime.now(timezone.utc).isoformat(),
+                "subjects": len(aggregates),
+            },
+        }
+
+    async def invalidate_mastery_aggregates(self, student_id: int) -> None:
+        self._mastery_aggregates.get(student_id, {}).get("_meta", {}).pop("built_at", None)
+
     # ==================================================================
     # GLOBAL PRACTICE PASS RATE (stored on student doc)
     # ==================================================================
@@ -342,12 +407,27 @@ class InMemoryFirestoreService:
     ) -> Dict[str, Any]:
         self._read_count += 1
         doc = self._students.get(student_id, {})
+        passes = doc.get("global_practice_passes", 0)
+        fails = doc.get("global_practice_fails", 0)
+        total = passes + fails
         return {
-            "global_practice_passes": doc.get("global_practice_passes", 0),
-            "global_practice_fails": doc.get("global_practice_fails", 0),
-            "global_practice_pass_rate": doc.get("global_practice_pass_rate", 0.8),
+            "global_practice_passes": passes,
+            "global_practice_fails": fails,
+            "global_practice_pass_rate": (
+                round(passes / total, 4) if total > 0
+                else doc.get("global_practice_pass_rate", 0.8)
+            ),
         }
 
+    async def increment_global_practice_pass_rate(
+        self, student_id: int, passes: float, fails: float
+    ) -> None:
+        self._write_count += 1
+        self._ensure_student(student_id)
+        doc = self._students[student_id]
+        doc["global_practice_passes"] = doc.get("global_practice_passes", 0) + passes
+        doc["global_practice_fails"] = doc.get("global_practice_fails", 0) + fails
+
     async def update_global_practice_pass_rate(
         self, student_id: int, passes: int, fails: int
     ) -> None:
@@ -427,6 +507,42 @@ class InMemoryFirestoreService:
             if doc.get("status") == "active"
         }
 
+    async def queue_pending_misconception(self, student_id: int, attempt: Dict[str, Any]) -> None:
+        self._write_count += 1
+        self._pending_misconceptions[student_id][attempt["attempt_id"]] = copy.deepcopy(
+            {**attempt, "student_id": student_id}
+        )
+
+    async def get_pending_misconceptions(
+        self, student_id: int, subskill_id: str
+    ) -> List[Dict[str, Any]]:
+        self._read_count += 1
+        attempts = [
+            copy.deepcopy(a)
+            for a in self._pending_misconceptions.get(student_id, {}).values()
+            if a.get("subskill_id") == subskill_id
+        ]
+        return sorted(attempts, key=lambda a: a.get("queued_at") or "")
+
+    async def delete_pending_misconceptions(
+        self, student_id: int, attempt_ids: List[str]
+    ) -> None:
+        self._write_count += 1
+        for attempt_id in attempt_ids:
+            self._pending_misconceptions.get(student_id, {}).pop(attempt_id, None)
+
+    async def list_pending_misconception_keys(self, limit: int = 500) -> List[Dict[str, Any]]:
+        self._read_count += 1
+        keys: Dict[tuple, Dict[str, Any]] = {}
+        for student_id, attempts in self._pending_misconceptions.items():
+            for a in attempts.values():
+                keys.setdefault((student_id, a["subskill_id"]), {
+                    "student_id": student_id,
+                    "subskill_id": a["subskill_id"],
+                    "firebase_uid": a.get("firebase_uid"),
+                })
+        return list(keys.values())[:limit]
+
     async def get_student_ability(
         self, student_id: int, skill_id: str
     ) -> Optional[Dict[str, Any]]:
@@ -1071,6 +1187,19 @@ class InMemoryFirestoreService:
         self._write_count += 1
         self._school_year_config = copy.deepcopy(data)
 
+    async def get_velocity_history(
+        self, student_id: int, limit: int = 9
+    ) -> List[Dict[str, Any]]:
+        self._read_count += 1
+        weeks = self._velocity_history.get(student_id, {})
+        return [copy.deepcopy(weeks[w]) for w in sorted(weeks)[-limit:]]
+
+    async def save_velocity_snapshot(
+        self, student_id: int, week_id: str, data: Dict[str, Any]
+    ) -> None:
+        self._write_count += 1
+        self._velocity_history[student_id][week_id] = copy.deepcopy(data)
+
     async def get_published_curriculum(
         self, subject_id: str, grade: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
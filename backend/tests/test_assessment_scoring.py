@@ -0,0 +1,149 @@
+"""
+Tests for the assessment scoring pipeline — concurrent scoring across skills,
+in-order submissions within a skill, order preservation, stage timings in the stored results, and no orphaned AI
+summary call when assembly fails. Storage, the submission service and the AI
+summary are in-memory fakes.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# Importing the service builds module-level singletons (user profiles → Cosmos),
+# so give settings placeholder values and keep the Cosmos client off the network.
+for _name in ("COSMOS_ENDPOINT", "COSMOS_KEY", "COSMOS_DATABASE", "GEMINI_API_KEY",
+              "GEMINI_GENERATE_KEY", "GEMINI_ASSESSMENT_PROMPT", "GEMINI_TUTOR_PROMPT",
+              "GEMINI_STT_API_KEY", "GCP_PROJECT_ID"):
+    os.environ.setdefault(_name, "test")
+os.environ.setdefault("DEFAULT_AI_SERVICE", "gemini")
+os.environ.setdefault("DEFAULT_AI_REVIEW_SERVICE", "gemini")
+os.environ.setdefault("IMAGE_LIBRARY_PATH", "/tmp")
+
+with patch("azure.cosmos.CosmosClient", MagicMock()):
+    from app.services import assessment_service as assessment_module
+    from app.services.assessment_service import AssessmentService
+
+
+class _Submissions:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.active_by_skill = {}
+        self.overlapped_skills = set()
+        self.order = []
+
+    async def handle_submission(self, submission, user_context):
+        skill = submission.skill_id
+        if self.active_by_skill.get(skill):
+            self.overlapped_skills.add(skill)
+        self.active_by_skill[skill] = self.active_by_skill.get(skill, 0) + 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.order.append(submission.problem["id"])
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        self.active_by_skill[skill] -= 1
+        correct = submission.student_answer == "right"
+        return SimpleNamespace(review={"correct": correct, "score": 10 if correct else 0})
+
+
+class _Cosmos:
+    def __init__(self, assessment):
+        self.assessment = assessment
+        self.stored = None
+
+    async def get_assessment(self, assessment_id, student_id, firebase_uid=None):
+        return self.assessment
+
+    async def update_assessment_with_results(self, assessment_id, student_id, final_results, answers,
+                                             time_taken_minutes=None, firebase_uid=None):
+        self.stored = final_results
+        return True
+
+
+class _AISummary:
+    async def generate_enhanced_assessment_summary(self, blueprint, submission_result, review_items_data):
+        return {"problem_insights": [], "skill_insights": []}
+
+
+def _service(problem_count, skills=1):
+    problems = [
+        {"id": f"p{i}", "problem_type": "short_answer", "subskill_id": f"s{i % skills}", "skill_id": f"k{i % skills}",
+         "subject": "Mathematics", "correct_answer": "right"}
+        for i in range(problem_count)
+    ]
+    service = AssessmentService.__new__(AssessmentService)
+    service.submission_service = _Submissions()
+    service.cosmos = _Cosmos({"problems": problems, "blueprint": {"subject": "Mathematics"}, "subject": "Mathematics"})
+    service.ai_assessment = _AISummary()
+    return service
+
+
+class TestScoreAssessment(unittest.TestCase):
+    def setUp(self):
+        self._limit = assessment_module.settings.ASSESSMENT_SCORING_CONCURRENCY
+        assessment_module.settings.ASSESSMENT_SCORING_CONCURRENCY = 3
+
+    def tearDown(self):
+        assessment_module.settings.ASSESSMENT_SCORING_CONCURRENCY = self._limit
+
+    def test_skills_are_scored_concurrently_under_the_limit(self):
+        service = _service(9, skills=9)
+        answers = {f"p{i}": ("right" if i % 2 == 0 else "wrong") for i in range(9)}
+        asyncio.run(service.score_assessment("a1", 1, answers))
+        self.assertEqual(service.submission_service.peak, 3)
+
+    def test_problems_on_one_skill_are_submitted_in_order(self):
+        service = _service(6, skills=2)
+        answers = {f"p{i}": "right" for i in range(6)}
+        asyncio.run(service.score_assessment("a1", 1, answers))
+
+        submissions = service.submission_service
+        self.assertEqual(submissions.overlapped_skills, set())
+        self.assertEqual(submissions.peak, 2)
+        for skill in range(2):
+            own = [p for p in submissions.order if int(p[1:]) % 2 == skill]
+            self.assertEqual(own, [f"p{i}" for i in range(skill, 6, 2)])
+
+    def test_results_keep_problem_order_and_record_timings(self):
+        service = _service(5)
+        answers = {f"p{i}": "right" for i in range(5)}
+        result = asyncio.run(service.score_assessment("a1", 1, answers))
+
+        stored = service.cosmos.stored
+        self.assertEqual([r["problem_id"] for r in stored["problem_reviews"]], [f"p{i}" for i in range(5)])
+        for stage in ("fetch", "process_problems", "build", "ai_summary"):
+            self.assertIn(stage, stored["timings_ms"])
+        self.assertEqual(result["assessment_id"], "a1")
+
+    def test_failed_build_cancels_the_ai_summary(self):
+        service = _service(2)
+
+        class _SlowAISummary:
+            async def generate_enhanced_assessment_summary(self, **kwargs):
+                await asyncio.sleep(10)
+
+        def broken(processed_reviews):
+            raise ValueError("bad review payload")
+
+        service.ai_assessment = _SlowAISummary()
+        service._build_problem_reviews = broken
+
+        async def scenario():
+            with self.assertRaises(Exception):
+                await service.score_assessment("a1", 1, {"p0": "right", "p1": "wrong"})
+            await asyncio.sleep(0)
+            return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+        self.assertEqual(asyncio.run(scenario()), [])
+        self.assertIsNone(service.cosmos.stored)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+"""
+Tests for the parallel daily-rollup backfill (scripts/backfill_daily_rollups.py)
+— bounded workers, checkpointed resume that only records flushed students and
+is scoped to one run, and verify mode's drift report. Firestore and the BulkWriter are in-memory fakes.
+"""
+
+import asyncio
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.db.firestore_service import FirestoreService
+from app.services.plan_prematerializer import FileCheckpoint
+
+_spec = importlib.util.spec_from_file_location(
+    "backfill_daily_rollups", backend_dir / "scripts" / "backfill_daily_rollups.py"
+)
+backfill = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(backfill)
+
+
+class _Doc:
+    def __init__(self, data, doc_id=None):
+        self._data = data
+        self.id = doc_id
+        self.exists = data is not None
+
+    def to_dict(self):
+        return self._data
+
+
+class _Ref:
+    def __init__(self, store, path):
+        self.store = store
+        self.path = path
+
+    def get(self):
+        return _Doc(self.store.docs.get(self.path))
+
+
+class _Collection:
+    def __init__(self, store, path, docs=None):
+        self.store = store
+        self.path = path
+        self._docs = docs
+
+    def document(self, doc_id):
+        return _Ref(self.store, f"{self.path}/{doc_id}")
+
+    def stream(self):
+        if self._docs is not None:
+            return [_Doc(d) for d in self._docs]
+        prefix = self.path + "/"
+        return [_Doc(v) for k, v in sorted(self.store.docs.items())
+                if k.startswith(prefix) and "/" not in k[len(prefix):]]
+
+
+class _Store:
+    normalize_grade_code = staticmethod(FirestoreService.normalize_grade_code)
+    rollup_subject_key = staticmethod(FirestoreService.rollup_subject_key)
+
+    def __init__(self, attempts):
+        self.attempts = attempts
+        self.docs = {}
+        self.active = 0
+        self.peak = 0
+
+    def _attempts_subcollection(self, student_id):
+        return _Collection(self, f"students/{student_id}/attempts", self.attempts.get(student_id, []))
+
+    def _daily_rollups_subcollection(self, student_id):
+        return _Collection(self, f"students/{student_id}/daily_rollups")
+
+    def _profile_summary_ref(self, student_id):
+        return _Ref(self, f"students/{student_id}/profile/summary")
+
+    async def resolve_subskill_location(self, subskill_id):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.005)
+        self.active -= 1
+        return {"subject": "Mathematics", "grade": "Kindergarten"} if subskill_id else None
+
+
+class _Writer:
+    def __init__(self, store, fail_for=()):
+        self.store = store
+        self.fail_for = set(fail_for)
+        self.queued = {}
+        self.failed = set()
+        self.writes = 0
+        self.flushes = 0
+
+    def set(self, ref, doc):
+        self.queued[ref.path] = doc
+        self.writes += 1
+
+    async def flush(self):
+        self.flushes += 1
+        for path, doc in self.queued.items():
+            sid = int(path.split("/")[1])
+            if sid in self.fail_for:
+                self.failed.add(sid)
+            else:
+                self.store.docs[path] = doc
+        self.queued = {}
+
+
+def _attempt(day, subskill="MATH-K-1", score=8.0):
+    return {"timestamp": f"{day}T10:00:00+00:00", "subskill_id": subskill, "score": score}
+
+
+def _attempts(n):
+    return {sid: [_attempt("2026-03-02"), _attempt("2026-03-03", score=6.0)] for sid in range(1, n + 1)}
+
+
+class TestBackfillAll(unittest.TestCase):
+    def test_apply_writes_every_student_with_bounded_workers(self):
+        store = _Store(_attempts(6))
+        writer = _Writer(store)
+        stats = asyncio.run(backfill.backfill_all(
+            store, list(range(1, 7)), apply=True, workers=3, writer=writer, flush_every=4,
+        ))
+
+        self.assertEqual(store.peak, 3)
+        self.assertEqual(stats["processed"], 6)
+        self.assertEqual(writer.writes, 6 * 3)  # two days + profile each
+        self.assertEqual(store.docs["students/4/daily_rollups/2026-03-03"]["sum_score"], 6.0)
+        self.assertEqual(store.docs["students/4/profile/summary"]["total_attempts"], 2)
+
+    def test_checkpoint_only_records_flushed_students(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "checkpoint.json")
+            store = _Store(_attempts(4))
+            stats = asyncio.run(backfill.backfill_all(
+                store, [1, 2, 3, 4], apply=True, writer=_Writer(store, fail_for={2}),
+                checkpoint=FileCheckpoint(path, "rollups-apply"),
+            ))
+            self.assertEqual(stats["failed"], 1)
+
+            store = _Store(_attempts(4))
+            writer = _Writer(store)
+            stats = asyncio.run(backfill.backfill_all(
+                store, [1, 2, 3, 4], apply=True, writer=writer,
+                checkpoint=FileCheckpoint(path, "rollups-apply"),
+            ))
+            self.assertEqual(stats["checkpointed"], 3)
+            self.assertEqual({p.split("/")[1] for p in store.docs}, {"2"})
+            self.assertFalse(Path(path).exists())  # finished cleanly: a new run starts over
+
+    def test_checkpoint_from_another_run_is_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "checkpoint.json")
+            store = _Store(_attempts(3))
+            asyncio.run(backfill.backfill_all(
+                store, [1, 2, 3], apply=True, writer=_Writer(store, fail_for={3}),
+                checkpoint=FileCheckpoint(path, "rollups-apply-2026-03-01"),
+            ))
+            stats = asyncio.run(backfill.backfill_all(
+                store, [1, 2, 3], apply=True, writer=_Writer(store),
+                checkpoint=FileCheckpoint(path, "rollups-apply-2026-03-08"),
+            ))
+            self.assertEqual((stats["checkpointed"], stats["processed"]), (0, 3))
+
+    def test_write_failure_is_attributed_through_the_document_path(self):
+        def ref(*parts):  # alternating collection / document refs, like the SDK's
+            node = None
+            for part in parts:
+                node = SimpleNamespace(id=part, parent=node)
+            return node
+
+        self.assertEqual(backfill._student_of(ref("students", "42", "daily_rollups", "2026-03-02")), 42)
+        self.assertEqual(backfill._student_of(ref("students", "42", "profile", "summary")), 42)
+        self.assertIsNone(backfill._student_of(ref("config", "rollups")))
+
+    def test_verify_reports_drift_and_writes_nothing(self):
+        store = _Store(_attempts(3))
+        asyncio.run(backfill.backfill_all(store, [1, 2, 3], apply=True, writer=_Writer(store)))
+        store.docs["students/2/daily_rollups/2026-03-02"]["attempts"] = 5
+        del store.docs["students/3/daily_rollups/2026-03-03"]
+        before = dict(store.docs)
+
+        stats = asyncio.run(backfill.backfill_all(store, [1, 2, 3], apply=False, verify=True))
+
+        self.assertEqual(stats["mismatched"], 2)
+        self.assertEqual(store.docs, before)
+        self.assertEqual(asyncio.run(backfill.verify_student(store, 1)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
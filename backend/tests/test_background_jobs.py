@@ -0,0 +1,273 @@
+"""
+Tests for the in-process background job runner (keyed coalescing, debounce,
+bounded workers, drain) and the incremental global pass-rate flush that runs
+on it.
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services import mastery_lifecycle_engine as engine_module
+from app.services.background_jobs import BackgroundJobRunner
+from app.services.mastery_lifecycle_engine import MasteryLifecycleEngine
+from tests.pulse_agent.in_memory_firestore import InMemoryFirestoreService
+
+
+class TestBackgroundJobRunner(unittest.TestCase):
+    def test_pending_submits_for_one_key_coalesce(self):
+        runner = BackgroundJobRunner()
+        runs = []
+
+        async def main():
+            for i in range(5):
+                runner.submit("k:1", lambda i=i: _record(runs, i), debounce_s=0.01)
+            await runner.drain()
+
+        asyncio.run(main())
+        self.assertEqual(runs, [4])  # latest wins
+        self.assertEqual(runner.stats()["coalesced"], 4)
+
+    def test_submit_while_running_reruns_once(self):
+        runner = BackgroundJobRunner()
+        runs = []
+
+        async def slow(i):
+            runs.append(i)
+            await asyncio.sleep(0.02)
+
+        async def main():
+            runner.submit("k:1", lambda: slow(0))
+            await asyncio.sleep(0.005)
+            for i in range(1, 4):
+                runner.submit("k:1", lambda i=i: slow(i))
+            await runner.drain()
+
+        asyncio.run(main())
+        self.assertEqual(runs, [0, 3])
+
+    def test_workers_are_bounded(self):
+        runner = BackgroundJobRunner(max_workers=2)
+        active = 0
+        peak = 0
+
+        async def job():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        async def main():
+            for i in range(6):
+                runner.submit(f"k:{i}", job)
+            await runner.drain()
+
+        asyncio.run(main())
+        self.assertEqual(peak, 2)
+        self.assertEqual(runner.stats()["completed"], 6)
+
+    def test_failures_are_counted_not_raised(self):
+        runner = BackgroundJobRunner()
+
+        async def broken():
+            raise RuntimeError("firestore down")
+
+        async def main():
+            runner.submit("pass_rate:7", broken)
+            await runner.drain()
+
+        asyncio.run(main())
+        stats = runner.stats()
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(stats["by_kind"]["pass_rate"]["failed"], 1)
+        self.assertIn("firestore down", stats["recent_errors"][0]["error"])
+
+    def test_drain_cancels_jobs_past_timeout(self):
+        runner = BackgroundJobRunner()
+
+        async def main():
+            runner.submit("k:1", lambda: asyncio.sleep(10))
+            cancelled = await runner.drain(timeout=0.01)
+            accepted = runner.submit("k:2", lambda: asyncio.sleep(0))
+            return cancelled, accepted
+
+        cancelled, accepted = asyncio.run(main())
+        self.assertEqual(cancelled, 1)
+        self.assertFalse(accepted)
+
+    def test_drain_starts_debounced_jobs_at_once(self):
+        runner = BackgroundJobRunner()
+        runs = []
+
+        async def main():
+            runner.submit("k:1", lambda: _record(runs, 1), debounce_s=60)
+            return await runner.drain(timeout=1.0)
+
+        self.assertEqual(asyncio.run(main()), 0)
+        self.assertEqual(runs, [1])
+
+
+class TestIncrementalGlobalPassRate(unittest.TestCase):
+    def test_flush_matches_full_scan(self):
+        store = InMemoryFirestoreService()
+        engine = MasteryLifecycleEngine(firestore_service=store)
+
+        async def main():
+            for subskill, score in [("a", 9.0), ("a", 4.0), ("b", 10.0), ("c", 2.0)]:
+                await engine.process_eval_result(
+                    student_id=1, subskill_id=subskill, subject="Math",
+                    skill_id="s", score=score, source="practice",
+                )
+            await engine.flush_global_pass_rate(1)
+            incremental = await store.get_global_practice_pass_rate(1)
+            await engine.update_global_pass_rate(1)
+            scanned = await store.get_global_practice_pass_rate(1)
+            return incremental, scanned
+
+        incremental, scanned = asyncio.run(main())
+        self.assertAlmostEqual(incremental["global_practice_passes"], scanned["global_practice_passes"])
+        self.assertAlmostEqual(incremental["global_practice_fails"], scanned["global_practice_fails"])
+        self.assertAlmostEqual(incremental["global_practice_pass_rate"], scanned["global_practice_pass_rate"])
+
+    def test_failed_flush_keeps_delta_and_retries(self):
+        store = InMemoryFirestoreService()
+        runner = BackgroundJobRunner()
+        engine = MasteryLifecycleEngine(firestore_service=store, jobs=runner)
+        original = store.increment_global_practice_pass_rate
+        calls = []
+
+        async def flaky(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise RuntimeError("unavailable")
+            await original(*args)
+
+        store.increment_global_practice_pass_rate = flaky
+
+        async def main():
+            await engine.process_eval_result(
+                student_id=1, subskill_id="a", subject="Math",
+                skill_id="s", score=8.0, source="practice",
+            )
+            engine.schedule_global_pass_rate_flush(1)
+            await asyncio.sleep(0.2)  # first flush fails; the backoff retry lands
+            await runner.drain()
+            return await store.get_global_practice_pass_rate(1)
+
+        debounce = engine_module.settings.GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S
+        engine_module.settings.GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S = 0.01
+        try:
+            rate = asyncio.run(main())
+        finally:
+            engine_module.settings.GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S = debounce
+        self.assertEqual(len(calls), 2)
+        self.assertAlmostEqual(rate["global_practice_passes"], 0.8)
+        self.assertEqual(runner.stats()["failed"], 1)
+
+    def test_shutdown_flushes_deltas_the_drain_cancelled(self):
+        store = InMemoryFirestoreService()
+        runner = BackgroundJobRunner()
+        engine = MasteryLifecycleEngine(firestore_service=store, jobs=runner)
+        original = store.increment_global_practice_pass_rate
+
+        async def hang(*args):
+            await asyncio.sleep(10)
+
+        async def main():
+            await engine.process_eval_result(
+                student_id=1, subskill_id="a", subject="Math",
+                skill_id="s", score=8.0, source="practice",
+            )
+            store.increment_global_practice_pass_rate = hang
+            engine.schedule_global_pass_rate_flush(1)
+            cancelled = await runner.drain(timeout=0.05)  # flush is cut off mid-write
+            store.increment_global_practice_pass_rate = original
+            left = await engine.flush_all_pass_deltas(timeout=1.0)
+            return cancelled, left, await store.get_global_practice_pass_rate(1)
+
+        debounce = engine_module.settings.GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S
+        engine_module.settings.GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S = 60.0
+        try:
+            cancelled, left, rate = asyncio.run(main())
+        finally:
+            engine_module.settings.GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S = debounce
+        self.assertEqual((cancelled, left), (1, 0))
+        self.assertAlmostEqual(rate["global_practice_passes"], 0.8)
+
+    def test_failing_flushes_fall_back_to_a_reconcile(self):
+        store = InMemoryFirestoreService()
+        runner = BackgroundJobRunner()
+        engine = MasteryLifecycleEngine(firestore_service=store, jobs=runner)
+
+        async def down(*args):
+            raise RuntimeError("unavailable")
+
+        store.increment_global_practice_pass_rate = down
+
+        async def main():
+            await engine.process_eval_result(
+                student_id=1, subskill_id="a", subject="Math",
+                skill_id="s", score=8.0, source="practice",
+            )
+            engine.schedule_global_pass_rate_flush(1)
+            await asyncio.sleep(0.3)  # flushes keep failing; the reconcile lands
+            await runner.drain(timeout=0.01)
+            return await store.get_global_practice_pass_rate(1)
+
+        settings = engine_module.settings
+        saved = (settings.GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S, settings.GLOBAL_PASS_RATE_RECONCILE_INTERVAL_S)
+        settings.GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S = 0.01
+        settings.GLOBAL_PASS_RATE_RECONCILE_INTERVAL_S = 0.1
+        try:
+            rate = asyncio.run(main())
+        finally:
+            settings.GLOBAL_PASS_RATE_FLUSH_DEBOUNCE_S, settings.GLOBAL_PASS_RATE_RECONCILE_INTERVAL_S = saved
+        self.assertAlmostEqual(rate["global_practice_passes"], 0.8)
+        self.assertEqual(engine._pending_pass_deltas, {})
+        self.assertEqual(engine._pass_flush_failures, {})
+
+    def test_eval_during_reconcile_is_counted_once(self):
+        store = InMemoryFirestoreService()
+        engine = MasteryLifecycleEngine(firestore_service=store)
+        scan = store.get_all_mastery_lifecycles
+        scans = []
+
+        async def eval_mid_scan(student_id):
+            lifecycles = await scan(student_id)
+            scans.append(len(lifecycles))
+            if len(scans) == 1:
+                # Lands after the scan read the docs, before the reconcile writes.
+                await engine.process_eval_result(
+                    student_id=1, subskill_id="b", subject="Math",
+                    skill_id="s", score=10.0, source="practice",
+                )
+            return lifecycles
+
+        async def main():
+            await engine.process_eval_result(
+                student_id=1, subskill_id="a", subject="Math",
+                skill_id="s", score=9.0, source="practice",
+            )
+            store.get_all_mastery_lifecycles = eval_mid_scan
+            await engine.update_global_pass_rate(1)
+            store.get_all_mastery_lifecycles = scan
+            await engine.flush_global_pass_rate(1)
+            return await store.get_global_practice_pass_rate(1), await scan(1)
+
+        rate, lifecycles = asyncio.run(main())
+        self.assertEqual(scans, [1, 2])
+        self.assertAlmostEqual(rate["global_practice_passes"], sum(lc["passes"] for lc in lifecycles))
+        self.assertAlmostEqual(rate["global_practice_fails"], sum(lc["fails"] for lc in lifecycles))
+
+
+async def _record(runs, i):
+    runs.append(i)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Tests for CurriculumRetrievalMatcher.probe_many — the batch probe must return
+the same per-query verdicts, attributions and top-k as probe(), embed every
+query text in one request, and keep probe()'s scoping/abstain behaviour.
+Curriculum and embeddings are in-memory fakes (seeded random vectors).
+"""
+
+import asyncio
+import sys
+import unittest
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.curriculum_retrieval_service import CurriculumRetrievalMatcher
+
+_DIM = 8
+
+
+class _Curriculum:
+    """Two subjects x two grades; units of skills whose subskills cluster."""
+
+    def __init__(self):
+        self.units = {}
+        for subject in ("MATHEMATICS", "SCIENCE"):
+            for grade in ("Kindergarten", "1"):
+                self.units[(subject, grade)] = [
+                    {
+                        "id": f"{subject[:3]}{grade[:1]}{u}",
+                        "title": f"Unit {u}",
+                        "skills": [
+                            {
+                                "id": f"{subject[:3]}{grade[:1]}{u}-0{s}",
+                                "description": f"{subject} {grade} unit {u} skill {s}",
+                                "subskills": [
+                                    {"id": f"{subject[:3]}{grade[:1]}{u}-0{s}-{c}",
+                                     "description": f"subskill {c}"}
+                                    for c in "ABC"
+                                ],
+                            }
+                            for s in range(1, 4)
+                        ],
+                    }
+                    for u in range(1, 4)
+                ]
+
+    async def get_available_subjects(self):
+        return [{"subject_id": s, "grade": g} for s, g in self.units]
+
+    async def get_curriculum(self, subject, grade=None):
+        return self.units.get((subject, grade), [])
+
+
+class _Matcher(CurriculumRetrievalMatcher):
+    """Embeds text as a seeded vector near its unit/skill centroid; a query
+    joining several texts with "|" lands between them (a diffuse plateau)."""
+
+    def __init__(self):
+        super().__init__(_Curriculum())
+        self.embed_calls = 0
+
+    def _embed(self, texts):
+        self.embed_calls += 1
+        rows = []
+        for text in texts:
+            v = np.zeros(_DIM)
+            for part in text.split("|"):
+                rng = np.random.default_rng(zlib.crc32(part.encode()))
+                anchor = np.random.default_rng(zlib.crc32(part.split(" skill")[0].encode()))
+                v += anchor.normal(size=_DIM) + rng.normal(size=_DIM)
+            rows.append(v / np.linalg.norm(v))
+        return np.vstack(rows).astype(np.float32)
+
+
+def _queries():
+    queries = []
+    for subject in ("MATHEMATICS", "SCIENCE"):
+        for grade in ("Kindergarten", "1", "elementary", None):
+            for u in range(1, 4):
+                for s in range(1, 4):
+                    queries.append({
+                        "subject": subject,
+                        "grade_level": grade,
+                        "query_text": f"{subject} {grade or 'Kindergarten'} unit {u} skill {s}: probe",
+                        "primitive_type": f"p-{u}-{s}",
+                    })
+            queries.append({"subject": subject, "grade_level": grade,
+                            "query_text": f"unrelated text {grade}", "primitive_type": "noise"})
+            for units in ((1, 2), (1, 2, 3), (2, 3)):
+                g = grade or "Kindergarten"
+                queries.append({
+                    "subject": subject, "grade_level": grade, "primitive_type": "omnibus",
+                    "query_text": "|".join(f"{subject} {g} unit {u} skill {u}" for u in units),
+                })
+    queries.append({"subject": "ART", "grade_level": "1", "query_text": "paint", "primitive_type": "x"})
+    return queries
+
+
+class TestProbeMany(unittest.TestCase):
+    def test_batch_matches_single_probe_for_every_query(self):
+        matcher = _Matcher()
+        queries = _queries()
+
+        async def main():
+            single = [await matcher.probe(**q) for q in queries]
+            batch = await matcher.probe_many(queries)
+            return single, batch
+
+        single, batch = asyncio.run(main())
+        self.assertEqual(len(batch), len(queries))
+        # The fixture exercises every gate outcome, so parity covers them all.
+        self.assertEqual(
+            {r["abstain_reason"] for r in single},
+            {None, "weak", "diffuse", "scattered", "no_scope"},
+        )
+        for one, many in zip(single, batch):
+            self.assertEqual(one["verdict"], many["verdict"])
+            self.assertEqual(one["abstain_reason"], many["abstain_reason"])
+            self.assertEqual(one["grade"], many["grade"])
+            self.assertEqual(one["n_candidates"], many["n_candidates"])
+            self.assertEqual(one.get("coherent"), many.get("coherent"))
+            self.assertEqual(one.get("coherent_skill"), many.get("coherent_skill"))
+            self.assertEqual([t["subskill_id"] for t in one["top_k"]],
+                             [t["subskill_id"] for t in many["top_k"]])
+            self.assertEqual(
+                [(g["grade"], g["reason"]) for g in one.get("per_grade", [])],
+                [(g["grade"], g["reason"]) for g in many.get("per_grade", [])],
+            )
+            if one["mapping"] is not None:
+                self.assertEqual(one["mapping"].subskill_id, many["mapping"].subskill_id)
+                self.assertAlmostEqual(one["mapping"].confidence, many["mapping"].confidence, places=3)
+
+    def test_all_query_texts_are_embedded_in_one_request(self):
+        matcher = _Matcher()
+        queries = _queries()
+
+        async def main():
+            await matcher.probe_many(queries)  # warm the curriculum matrices
+            before = matcher.embed_calls
+            await matcher.probe_many(queries)
+            return matcher.embed_calls - before
+
+        self.assertEqual(asyncio.run(main()), 1)
+
+    def test_embed_failure_abstains_every_scoped_query(self):
+        matcher = _Matcher()
+
+        def boom(texts):
+            raise RuntimeError("quota")
+
+        matcher._embed = boom
+        results = asyncio.run(matcher.probe_many([
+            {"subject": "MATHEMATICS", "grade_level": "1", "query_text": "a", "primitive_type": "a"},
+            {"subject": "ART", "grade_level": "1", "query_text": "b", "primitive_type": "b"},
+        ]))
+        self.assertEqual([r["abstain_reason"] for r in results], ["embed_error", "no_scope"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Unit tests for ReachabilityIndex — the transitive-closure index must agree
+with the BFS ancestor/descendant walks on DAGs and on cyclic knowledge graphs —
+and for the per-version DAGStructure memo built on the same graph cache.
+
+No Firestore, no IO.
+"""
+
+import random
+
+import pytest
+from app.services.dag_analysis import (
+    DAGAnalysisEngine,
+    DiagnosticStatus,
+    ReachabilityIndex,
+    SubskillClassification,
+    graph_cache,
+    graph_fingerprint,
+)
+
+
+def _edge(source: str, target: str) -> dict:
+    return {"source": source, "target": target}
+
+
+def _random_graph(n: int, m: int, seed: int, allow_cycles: bool):
+    rng = random.Random(seed)
+    ids = [f"n{i}" for i in range(n)]
+    edges = []
+    for _ in range(m):
+        a, b = rng.sample(range(n), 2)
+        if not allow_cycles and a > b:
+            a, b = b, a
+        edges.append(_edge(ids[a], ids[b]))
+    return [{"id": nid} for nid in ids], edges
+
+
+class TestReachabilityIndex:
+    def test_diamond(self):
+        edges = [_edge("A", "B"), _edge("A", "C"), _edge("B", "D"), _edge("C", "D")]
+        index = ReachabilityIndex("ABCD", edges)
+        assert index.ancestors("D") == {"A", "B", "C"}
+        assert index.descendants("A") == {"B", "C", "D"}
+        assert index.ancestors("A") == set()
+        assert index.is_ancestor("A", "D")
+        assert not index.is_ancestor("D", "A")
+
+    def test_unknown_node_has_no_relatives(self):
+        index = ReachabilityIndex(["A"], [])
+        assert index.ancestors("missing") == set()
+        assert index.descendants("missing") == set()
+
+    def test_cycle_members_reach_themselves(self):
+        edges = [_edge("A", "B"), _edge("B", "C"), _edge("C", "B"), _edge("C", "D")]
+        index = ReachabilityIndex([], edges)
+        assert index.ancestors("C") == DAGAnalysisEngine.get_ancestors("C", edges)
+        assert "C" in index.ancestors("C")
+        assert index.descendants("A") == {"B", "C", "D"}
+
+    @pytest.mark.parametrize("allow_cycles", [False, True])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_bfs(self, seed, allow_cycles):
+        nodes, edges = _random_graph(40, 90, seed, allow_cycles)
+        index = ReachabilityIndex((n["id"] for n in nodes), edges)
+        for node in nodes:
+            nid = node["id"]
+            assert index.ancestors(nid) == DAGAnalysisEngine.get_ancestors(nid, edges)
+            assert index.descendants(nid) == DAGAnalysisEngine.get_descendants(nid, edges)
+
+    def test_group_union_on_bitmaps(self):
+        nodes, edges = _random_graph(30, 60, seed=7, allow_cycles=False)
+        index = ReachabilityIndex((n["id"] for n in nodes), edges)
+        group = ["n5", "n17", "n29"]
+        expected = set().union(*(DAGAnalysisEngine.get_ancestors(g, edges) for g in group))
+        assert index.ancestors_of_all(group) == expected
+        assert index.to_ids(index.bits_of(group)) == set(group)
+
+
+class TestGraphCache:
+    def test_index_is_memoized_per_fingerprint(self):
+        graph_cache.clear()
+        nodes, edges = _random_graph(10, 15, seed=1, allow_cycles=False)
+        first = DAGAnalysisEngine.reachability_index(nodes, edges)
+        again = DAGAnalysisEngine.reachability_index(nodes, list(reversed(edges)))
+        assert first is again
+
+        changed = DAGAnalysisEngine.reachability_index(nodes, edges + [_edge("n0", "n9")])
+        assert changed is not first
+
+    def test_fingerprint_ignores_order_but_not_content(self):
+        nodes = [{"id": "A"}, {"id": "B"}]
+        edges = [_edge("A", "B")]
+        assert graph_fingerprint(nodes, edges) == graph_fingerprint(list(reversed(nodes)), edges)
+        assert graph_fingerprint(nodes, edges) != graph_fingerprint(nodes, [_edge("B", "A")])
+
+
+class TestDAGStructure:
+    def test_structure_matches_direct_computation_and_is_shared(self):
+        graph_cache.clear()
+        nodes, edges = _random_graph(25, 40, seed=3, allow_cycles=False)
+        structure = DAGAnalysisEngine.structure(nodes, edges)
+
+        topo = DAGAnalysisEngine.topological_sort(nodes, edges)
+        metrics = DAGAnalysisEngine.compute_node_metrics(nodes, edges, topo)
+        assert {k: v.depth for k, v in structure.metrics.items()} == {k: v.depth for k, v in metrics.items()}
+        assert structure.max_depth == max(m.depth for m in metrics.values())
+        assert structure.descendant_counts["n0"] == len(DAGAnalysisEngine.get_descendants("n0", edges))
+
+        assert DAGAnalysisEngine.structure(nodes, edges) is structure
+        assert graph_cache.stats()["hits"] >= 1
+
+    def test_probes_from_cached_chains_match(self):
+        nodes, edges = _random_graph(25, 20, seed=4, allow_cycles=False)
+        structure = DAGAnalysisEngine.structure(nodes, edges)
+        cached = DAGAnalysisEngine.select_initial_probes(
+            structure.metrics, nodes, edges, max_probes=4, chains=structure.chains,
+        )
+        direct = DAGAnalysisEngine.select_initial_probes(structure.metrics, nodes, edges, max_probes=4)
+        assert [p.subskill_id for p in cached] == [p.subskill_id for p in direct]
+
+    def test_inference_and_next_probes_agree_with_and_without_index(self):
+        graph_cache.clear()
+        nodes, edges = _random_graph(30, 45, seed=5, allow_cycles=False)
+        structure = DAGAnalysisEngine.structure(nodes, edges)
+        index = DAGAnalysisEngine.reachability_index(nodes, edges, fingerprint=structure.fingerprint)
+        misses = graph_cache.stats()["misses"]
+
+        def run(**kwargs):
+            classifications = {
+                n["id"]: SubskillClassification(subskill_id=n["id"], status=DiagnosticStatus.UNKNOWN)
+                for n in nodes
+            }
+            _, inferences = DAGAnalysisEngine.propagate_inference("n10", False, edges, classifications, **kwargs)
+            probes = DAGAnalysisEngine.select_next_probes(
+                structure.metrics, nodes, edges, classifications,
+                last_probed_id="n10", last_passed=False, **kwargs,
+            )
+            return sorted(i.affected_node for i in inferences), [p.subskill_id for p in probes]
+
+        assert run(index=index) == run()
+        assert graph_cache.stats()["misses"] == misses  # neither path fingerprints the graph
+
+    def test_cycle_is_not_cached(self):
+        nodes = [{"id": "A"}, {"id": "B"}]
+        edges = [_edge("A", "B"), _edge("B", "A")]
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                DAGAnalysisEngine.structure(nodes, edges)
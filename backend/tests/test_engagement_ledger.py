@@ -0,0 +1,277 @@
+"""
+Tests for the engagement ledger: concurrent activities (including from several
+app instances sharing one profile store) never lose XP, a burst of activities
+is one profile write, a retried batch is not double counted, rebuild()
+recomputes totals from the activity log, and the per-day XP counters behind
+user stats are kept (or backfilled, without touching totals) on the profile.
+The fake store enforces etags like Cosmos and yields between read and write
+so flushes interleave.
+"""
+
+import asyncio
+import copy
+import random
+import sys
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.background_jobs import BackgroundJobRunner
+from app.services.engagement_ledger import empty_counters, xp_windows
+from app.services.engagement_service import EngagementService
+
+UID = "uid-1"
+
+
+class _EtagProfileStore:
+    """user_profiles_service stand-in with conditional replace."""
+
+    def __init__(self, profile):
+        self.profiles = {profile["firebase_uid"]: {**profile, "_etag": "0"}}
+        self.activities = {}
+        self.reads = 0
+        self.replaces = 0
+        self.fail_after_write = 0  # replaces that commit, then raise
+
+    async def get_profile_document(self, uid):
+        self.reads += 1
+        await asyncio.sleep(0.001)
+        doc = self.profiles.get(uid)
+        return copy.deepcopy(doc) if doc else None
+
+    async def replace_profile_document_if_unchanged(self, doc, etag):
+        await asyncio.sleep(0.001)
+        current = self.profiles[doc["firebase_uid"]]
+        if current["_etag"] != etag:
+            return None
+        self.replaces += 1
+        stored = {**copy.deepcopy(doc), "_etag": str(int(etag) + 1)}
+        self.profiles[doc["firebase_uid"]] = stored
+        if self.fail_after_write:
+            self.fail_after_write -= 1
+            raise ConnectionError("response lost")
+        return copy.deepcopy(stored)
+
+    async def upsert_activity_log_entries(self, user_id, entries):
+        await asyncio.sleep(0)
+        for entry in entries:
+            self.activities[entry["id"]] = {**entry, "firebase_uid": user_id}
+
+    async def get_all_user_activities(self, user_id):
+        return sorted((a for a in self.activities.values() if a["firebase_uid"] == user_id),
+                      key=lambda a: a["timestamp"])
+
+
+def _profile(**fields):
+    return {"id": "doc-1", "firebase_uid": UID, "type": "user_profile", "total_xp": 0,
+            "current_level": 1, "current_streak": 0, "longest_streak": 0, **fields}
+
+
+class TestEngagementLedger(unittest.TestCase):
+    def _services(self, store, count=1, debounce_s=0.01):
+        runners = [BackgroundJobRunner(max_workers=4) for _ in range(count)]
+        services = [EngagementService(profile_store=store, jobs=runner) for runner in runners]
+        for service in services:
+            service.ledger.debounce_s = debounce_s
+        return services, runners
+
+    def test_concurrent_activities_across_instances_lose_no_xp(self):
+        yesterday = (datetime.utcnow() - timedelta(days=1)).isoformat()
+        store = _EtagProfileStore(_profile(total_xp=40, current_streak=2, longest_streak=2,
+                                           last_activity_date=yesterday))
+
+        async def scenario():
+            services, runners = self._services(store, count=3)
+            rng = random.Random(7)
+
+            async def one(i):
+                await asyncio.sleep(rng.random() * 0.05)
+                return await rng.choice(services).process_activity(
+                    UID, 7, "problem_submitted", {"is_correct": i % 3 != 0})
+
+            responses = await asyncio.gather(*(one(i) for i in range(300)))
+            for runner in runners:
+                await runner.drain()
+            return services, responses
+
+        services, responses = asyncio.run(scenario())
+
+        profile = store.profiles[UID]
+        logged_xp = sum(a["xp_earned"] for a in store.activities.values())
+        self.assertEqual(len(store.activities), 300)
+        self.assertEqual(logged_xp, sum(r.xp_earned for r in responses))
+        self.assertEqual(profile["total_xp"], 40 + logged_xp)
+        self.assertEqual((profile["current_streak"], profile["longest_streak"]), (3, 3))
+        self.assertEqual(len(profile["engagement_applied_ids"]), 200)
+
+        stats = [service.ledger.stats() for service in services]
+        self.assertGreater(sum(s["conflicts"] for s in stats), 0)  # the harness did contend
+        self.assertLess(store.replaces, 300)                        # and writes were coalesced
+        self.assertEqual(sum(s["pending_activities"] for s in stats), 0)
+
+    def test_burst_is_one_profile_write(self):
+        store = _EtagProfileStore(_profile())
+
+        async def scenario():
+            (service,), (runner,) = self._services(store, debounce_s=0.05)
+            responses = await asyncio.gather(*(
+                service.process_activity(UID, 7, "problem_submitted", {"is_correct": True}) for _ in range(20)))
+            await runner.drain()
+            return responses
+
+        responses = asyncio.run(scenario())
+        self.assertEqual((store.reads, store.replaces), (2, 1))  # snapshot + flush
+        self.assertEqual(sorted(r.total_xp for r in responses), [25 * n for n in range(1, 21)])
+        self.assertEqual(store.profiles[UID]["total_xp"], 500)
+        self.assertEqual(store.profiles[UID]["current_level"], 3)
+
+    def test_failed_flush_retries_and_is_not_double_counted(self):
+        store = _EtagProfileStore(_profile())
+        store.fail_after_write = 1
+
+        async def scenario():
+            (service,), (runner,) = self._services(store)
+            await service.process_activity(UID, 7, "problem_submitted", {"is_correct": True})
+            await asyncio.sleep(0.2)  # no further activity: the backoff retry writes it
+            self.assertEqual(service.ledger.stats()["pending_activities"], 0)
+            self.assertEqual(store.profiles[UID]["total_xp"], 25)
+            await service.process_activity(UID, 7, "problem_submitted", {"is_correct": False})
+            await runner.drain()
+            return service
+
+        service = asyncio.run(scenario())
+        self.assertEqual(store.profiles[UID]["total_xp"], 35)
+        stats = service.ledger.stats()
+        self.assertEqual((stats["flush_failed"], stats["flush_retries"], stats["already_applied"]), (1, 1, 1))
+
+    def test_cached_users_are_bounded(self):
+        store = _EtagProfileStore(_profile())
+        for i in range(5):
+            uid = f"uid-{i + 2}"
+            store.profiles[uid] = {**_profile(), "firebase_uid": uid, "_etag": "0"}
+
+        async def scenario():
+            (service,), (runner,) = self._services(store)
+            service.ledger.max_cached_users = 2
+            for uid in store.profiles:
+                await service.process_activity(uid, 7, "problem_submitted", {"is_correct": True})
+            await runner.drain()
+            return service.ledger
+
+        ledger = asyncio.run(scenario())
+        self.assertTrue(all(p["total_xp"] == 25 for p in store.profiles.values()))
+        self.assertLessEqual(ledger.stats()["cached_users"], 2)
+        self.assertLessEqual(len(ledger._locks), 2)
+        self.assertGreater(ledger.stats()["evicted"], 0)
+
+    def test_rebuild_replays_the_activity_log(self):
+        store = _EtagProfileStore(_profile(total_xp=9999, current_streak=40))
+        start = datetime(2026, 3, 1, 15)
+        for i, (day, xp) in enumerate([(0, 25), (1, 35), (1, 10), (2, 30), (5, 25)]):
+            store.activities[f"a{i}"] = {"id": f"a{i}", "firebase_uid": UID, "xp_earned": xp,
+                                         "timestamp": (start + timedelta(days=day, minutes=i)).isoformat()}
+
+        async def scenario():
+            (service,), _ = self._services(store)
+            dry = await service.rebuild_totals(UID, dry_run=True)
+            self.assertEqual(store.profiles[UID]["total_xp"], 9999)
+            return dry, await service.rebuild_totals(UID)
+
+        dry, result = asyncio.run(scenario())
+        self.assertEqual(dry["after"], result["after"])
+        self.assertEqual(result["before"]["total_xp"], 9999)
+        profile = store.profiles[UID]
+        self.assertEqual((profile["total_xp"], profile["current_level"]), (125, 2))
+        self.assertEqual((profile["current_streak"], profile["longest_streak"]), (1, 3))
+        self.assertEqual(profile["last_activity_date"], (start + timedelta(days=5, minutes=4)).isoformat())
+
+    def test_flush_maintains_daily_counters(self):
+        store = _EtagProfileStore(_profile(engagement_counters=empty_counters()))
+
+        async def scenario():
+            (service,), (runner,) = self._services(store)
+            for correct in (True, True, False):
+                await service.process_activity(UID, 7, "problem_submitted", {"is_correct": correct})
+            await service.process_activity(UID, 7, "assessment_generated", {})
+            await runner.drain()
+
+        asyncio.run(scenario())
+        counters = store.profiles[UID]["engagement_counters"]
+        today = datetime.utcnow().date()
+        self.assertEqual(counters["activities"], 4)
+        self.assertEqual(counters["by_type"], {"problem_submitted": 3, "assessment_generated": 1})
+        self.assertEqual(xp_windows(counters, today), {"today": 75, "week": 75, "month": 75})
+
+    def test_counters_are_backfilled_by_rebuild_and_windowed(self):
+        store = _EtagProfileStore(_profile())
+        today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+        # 150 activities, well past the old 100-activity scan
+        for i in range(150):
+            store.activities[f"a{i}"] = {
+                "id": f"a{i}", "firebase_uid": UID, "activity_type": "problem_submitted", "xp_earned": 10,
+                "accuracy_percentage": 50.0 if i % 2 else 100.0,
+                "timestamp": (today - timedelta(days=i // 3, minutes=i)).isoformat()}
+
+        async def scenario():
+            (service,), (runner,) = self._services(store)
+            await service.process_activity(UID, 7, "problem_submitted", {"is_correct": True})
+            await runner.drain()
+            self.assertNotIn("engagement_counters", store.profiles[UID])  # never partial
+            await service.rebuild_totals(UID)
+
+        asyncio.run(scenario())
+        counters = store.profiles[UID]["engagement_counters"]
+        self.assertEqual(counters["activities"], 151)
+        self.assertEqual(len(counters["daily_xp"]), 31)  # older days pruned
+        self.assertEqual(xp_windows(counters, today.date()), {"today": 30 + 25, "week": 210 + 25, "month": 900 + 25})
+        self.assertEqual(counters["accuracy_count"], 150)
+        self.assertAlmostEqual(counters["accuracy_sum"] / counters["accuracy_count"], 75.0)
+
+    def test_counter_backfill_leaves_totals_alone(self):
+        today = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+        store = _EtagProfileStore(_profile(total_xp=9999, current_level=7, current_streak=40, longest_streak=41,
+                                           last_activity_date=today.isoformat(),
+                                           engagement_applied_ids=["kept"]))
+        for i in range(5):
+            store.activities[f"a{i}"] = {"id": f"a{i}", "firebase_uid": UID, "activity_type": "problem_submitted",
+                                         "xp_earned": 10, "timestamp": (today - timedelta(days=i)).isoformat()}
+        # Logged but not yet applied to the profile: its own flush counts it
+        store.activities["late"] = {"id": "late", "firebase_uid": UID, "activity_type": "problem_submitted",
+                                    "xp_earned": 99, "timestamp": (today + timedelta(minutes=5)).isoformat()}
+
+        async def scenario():
+            (service,), _ = self._services(store)
+            first = await service.backfill_counters(UID)
+            second = await service.backfill_counters(UID)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        profile = store.profiles[UID]
+        self.assertEqual((profile["total_xp"], profile["current_level"]), (9999, 7))
+        self.assertEqual((profile["current_streak"], profile["longest_streak"]), (40, 41))
+        self.assertEqual(profile["engagement_applied_ids"], ["kept"])
+        counters = profile["engagement_counters"]
+        self.assertEqual(counters["activities"], 5)
+        self.assertEqual(xp_windows(counters, today.date()), {"today": 10, "week": 50, "month": 50})
+        self.assertEqual(store.replaces, 1)  # already backfilled: no second write
+        self.assertEqual(second["engagement_counters"], counters)
+
+    def test_missing_profile_earns_nothing(self):
+        store = _EtagProfileStore(_profile())
+
+        async def scenario():
+            (service,), (runner,) = self._services(store)
+            response = await service.process_activity("someone-else", 8, "problem_submitted", {})
+            await runner.drain()
+            return response
+
+        response = asyncio.run(scenario())
+        self.assertEqual(response.xp_earned, 0)
+        self.assertEqual(store.activities, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -250,6 +250,63 @@ class TestLearningPathsService(unittest.TestCase):
         # SKILL-01-A is mastered, should NOT appear
         self.assertNotIn("SKILL-01-A", rec_ids)
 
+    # ==================== Multi-subject / Cold Loads ====================
+
+    def test_all_subjects_load_concurrently_and_single_flight(self):
+        """Cold graphs for every subject load at once; concurrent callers share each load."""
+        science = _make_graph(
+            nodes=[
+                {"id": "SCI-01", "type": "skill", "description": "Sci 1"},
+                {"id": "SCI-02", "type": "skill", "description": "Sci 2"},
+            ],
+            edges=[{"source": "SCI-01", "target": "SCI-02", "threshold": 0.8}],
+        )
+        graphs = {"MATH": self.mock_graph, "SCIENCE": science}
+        calls = []
+        active = {"now": 0, "peak": 0}
+
+        async def load(subject_id, version_type):
+            calls.append(subject_id)
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return graphs.get(subject_id)
+
+        self.service._graph_cache.clear()
+        self.firestore_service.get_curriculum_graph = AsyncMock(side_effect=load)
+        self.firestore_service.get_all_published_subjects = AsyncMock(return_value=[
+            {"subject_id": "Math"}, {"subject_id": "SCIENCE"}, {"subject_id": "ART"},
+        ])
+        self.firestore_service.get_student_proficiency_map = AsyncMock(
+            return_value={"SCI-01": {"proficiency": 0.9}}
+        )
+
+        async def main():
+            return await asyncio.gather(*(
+                self.service.get_unlocked_entities(student_id=1) for _ in range(3)
+            ))
+
+        results = asyncio.run(main())
+
+        self.assertEqual(sorted(calls), ["ART", "MATH", "SCIENCE"])
+        self.assertEqual(active["peak"], 3)
+        for unlocked in results:
+            self.assertIn("SCI-02", unlocked)
+            self.assertIn("SKILL-01-A", unlocked)
+            self.assertNotIn("SKILL-01-B", unlocked)
+
+    def test_unlock_index_is_rebuilt_after_invalidation(self):
+        self.firestore_service.get_student_proficiency_map = AsyncMock(return_value={})
+        asyncio.run(self.service.get_unlocked_entities(student_id=1, subject="Math"))
+
+        relaxed = _make_graph(nodes=self.mock_graph["graph"]["nodes"], edges=[])
+        self.service._invalidate_graph_cache("MATH")
+        self.firestore_service.get_curriculum_graph = AsyncMock(return_value=relaxed)
+        unlocked = asyncio.run(self.service.get_unlocked_entities(student_id=1, subject="Math"))
+
+        self.assertIn("SKILL-01-B", unlocked)
+
     # ==================== Entity Type Detection ====================
 
     def test_detect_entity_type(self):
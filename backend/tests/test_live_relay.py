@@ -0,0 +1,136 @@
+"""
+Tests for the shared Gemini Live relay core — ordered single-writer sends,
+bounded backpressure, the audio envelope, supervised shutdown and metrics.
+The client WebSocket is an in-memory fake; no Live API.
+"""
+
+import asyncio
+import base64
+import sys
+import unittest
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi import WebSocketDisconnect
+
+from app.services.live_relay import LiveRelay, registry
+
+
+class _Socket:
+    def __init__(self, delay: float = 0.0, fail_after: int = -1):
+        self.sent = []
+        self.delay = delay
+        self.fail_after = fail_after
+
+    async def send_json(self, message):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail_after == len(self.sent):
+            raise WebSocketDisconnect(code=1006)
+        self.sent.append(message)
+
+    async def send_bytes(self, data):
+        self.sent.append(data)
+
+
+class TestLiveRelay(unittest.TestCase):
+    def test_sends_keep_production_order(self):
+        socket = _Socket(delay=0.001)
+
+        async def main():
+            async with LiveRelay(socket, "t") as relay:
+                await asyncio.gather(*(relay.send_json({"i": i}) for i in range(20)))
+
+        asyncio.run(main())
+        self.assertEqual([m["i"] for m in socket.sent], list(range(20)))
+
+    def test_audio_is_encoded_in_the_writer(self):
+        socket = _Socket()
+
+        async def main():
+            async with LiveRelay(socket, "t") as relay:
+                await relay.send_audio(b"\x01\x02", type="ai_audio", sampleRate=24000)
+            async with LiveRelay(socket, "t", binary_audio=True) as relay:
+                await relay.send_audio(b"\x03", type="ai_audio")
+            return relay
+
+        relay = asyncio.run(main())
+        self.assertEqual(socket.sent[0], {"type": "ai_audio", "sampleRate": 24000,
+                                          "data": base64.b64encode(b"\x01\x02").decode()})
+        self.assertEqual(socket.sent[1], b"\x03")
+        self.assertEqual(relay.metrics.audio_bytes_out, 1)
+
+    def test_full_send_queue_applies_backpressure(self):
+        socket = _Socket(delay=0.01)
+
+        async def main():
+            async with LiveRelay(socket, "t", send_queue_size=2) as relay:
+                for i in range(6):
+                    await relay.send_json({"i": i})
+                    self.assertLessEqual(relay.stats()["send_queue_depth"], 2)
+            return relay
+
+        relay = asyncio.run(main())
+        self.assertEqual(len(socket.sent), 6)
+        self.assertEqual(relay.metrics.send_queue_high_water, 2)
+
+    def test_client_disconnect_on_send_ends_the_session(self):
+        socket = _Socket(fail_after=1)
+        cancelled = []
+
+        async def producer(relay):
+            for i in range(10):
+                await relay.send_json({"i": i})
+                await asyncio.sleep(0.001)
+            await asyncio.sleep(10)
+
+        async def reader():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append("reader")
+                raise
+
+        async def main():
+            async with LiveRelay(socket, "t") as relay:
+                ended_by = await relay.run({"producer": producer(relay), "reader": reader()})
+                accepted = await relay.send_json({"late": True})
+            return ended_by, accepted, relay
+
+        ended_by, accepted, relay = asyncio.run(main())
+        self.assertEqual(ended_by, "writer")
+        self.assertFalse(accepted)
+        self.assertEqual(cancelled, ["reader"])
+        self.assertGreaterEqual(relay.metrics.dropped, 1)
+
+    def test_first_worker_to_finish_stops_the_rest(self):
+        socket = _Socket()
+
+        async def main():
+            async with LiveRelay(socket, "t") as relay:
+                queue = relay.queue("audio", maxsize=1)
+
+                async def client():
+                    for i in range(3):
+                        relay.record_inbound(4)
+                        await queue.put(i)
+
+                async def gemini():
+                    while True:
+                        await relay.send_json({"echo": await queue.get()})
+
+                ended_by = await relay.run({"client": client(), "gemini": gemini()})
+                active_during = registry.stats()["active_by_endpoint"].get("t")
+            return ended_by, active_during, relay
+
+        ended_by, active_during, relay = asyncio.run(main())
+        self.assertEqual(ended_by, "client")
+        self.assertEqual(active_during, 1)
+        self.assertEqual(relay.metrics.frames_in, 3)
+        self.assertNotIn("t", registry.stats()["active_by_endpoint"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Tests for the content-addressed LLM response cache.
+
+Uses the real SQLite backend against a temp file — no model calls; the
+producer is a counting stub.
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.llm_response_cache import (
+    LLMResponseCache,
+    SQLiteResponseBackend,
+    make_cache_key,
+)
+
+
+class _Producer:
+    def __init__(self, response="{\"ok\": true}"):
+        self.calls = 0
+        self.response = response
+
+    async def __call__(self):
+        self.calls += 1
+        return self.response
+
+
+class TestCacheKey(unittest.TestCase):
+    def test_key_is_stable_across_dict_order(self):
+        a = make_cache_key("m", "p", schema={"a": 1, "b": {"c": 2, "d": 3}}, temperature=0.5)
+        b = make_cache_key("m", "p", schema={"b": {"d": 3, "c": 2}, "a": 1}, temperature=0.5)
+        self.assertEqual(a, b)
+
+    def test_each_component_changes_key(self):
+        base = make_cache_key("m", "p", "sys", {"s": 1}, 0.5)
+        self.assertNotEqual(base, make_cache_key("m2", "p", "sys", {"s": 1}, 0.5))
+        self.assertNotEqual(base, make_cache_key("m", "p2", "sys", {"s": 1}, 0.5))
+        self.assertNotEqual(base, make_cache_key("m", "p", "sys2", {"s": 1}, 0.5))
+        self.assertNotEqual(base, make_cache_key("m", "p", "sys", {"s": 2}, 0.5))
+        self.assertNotEqual(base, make_cache_key("m", "p", "sys", {"s": 1}, 0.7))
+
+    def test_bytes_are_hashed(self):
+        a = make_cache_key("m", [b"image-one", "prompt"])
+        b = make_cache_key("m", [b"image-two", "prompt"])
+        self.assertNotEqual(a, b)
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.backend = SQLiteResponseBackend(Path(self._tmp.name) / "cache.sqlite3")
+
+    def tearDown(self):
+        self.backend._conn.close()
+        self._tmp.cleanup()
+
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    def test_second_identical_request_is_a_hit(self):
+        cache = LLMResponseCache(self.backend)
+        producer = _Producer()
+        kwargs = dict(model="m", prompt="same prompt", temperature=0.3, namespace="site")
+        first = self._run(cache.get_or_generate(producer, **kwargs))
+        second = self._run(cache.get_or_generate(producer, **kwargs))
+        self.assertEqual(first, second)
+        self.assertEqual(producer.calls, 1)
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["by_call_site"]["site"]["hit_rate"], 0.5)
+
+    def test_empty_response_not_stored(self):
+        cache = LLMResponseCache(self.backend)
+        producer = _Producer(response="")
+        self._run(cache.get_or_generate(producer, model="m", prompt="p"))
+        self._run(cache.get_or_generate(producer, model="m", prompt="p"))
+        self.assertEqual(producer.calls, 2)
+
+    def test_response_failing_validation_is_not_stored(self):
+        cache = LLMResponseCache(self.backend)
+        producer = _Producer(response='{"truncated": ')
+        kwargs = dict(model="m", prompt="p", namespace="site", validate=json.loads)
+        first = self._run(cache.get_or_generate(producer, **kwargs))
+        self.assertEqual(first, producer.response)  # the caller's own parse reports it
+        producer.response = '{"ok": true}'
+        self._run(cache.get_or_generate(producer, **kwargs))
+        self._run(cache.get_or_generate(producer, **kwargs))
+        self.assertEqual(producer.calls, 2)
+        self.assertEqual(cache.stats()["by_call_site"]["site"]["rejected"], 1)
+
+    def test_cached_entry_failing_validation_is_regenerated(self):
+        cache = LLMResponseCache(self.backend)
+        self.backend.set(make_cache_key("m", "p"), "m", "not json", now=time.time(), ttl_seconds=10_000)
+        producer = _Producer()
+        result = self._run(cache.get_or_generate(producer, model="m", prompt="p", validate=json.loads))
+        self.assertEqual((result, producer.calls), (producer.response, 1))
+        self.assertEqual(self._run(cache.get(make_cache_key("m", "p"))), producer.response)
+
+    def test_expired_entry_is_a_miss(self):
+        cache = LLMResponseCache(self.backend)
+        key = make_cache_key("m", "p")
+        self.backend.set(key, "m", "old", now=0.0, ttl_seconds=1)
+        self.assertIsNone(self._run(cache.get(key)))
+
+    def test_lru_eviction_respects_entry_budget(self):
+        for i in range(5):
+            self.backend.set(f"k{i}", "m", f"v{i}", now=float(i), ttl_seconds=10_000)
+        # Touch k0 so it becomes most recently used.
+        self.backend.get("k0", now=100.0)
+        removed = self.backend.evict(now=101.0, max_entries=3, max_bytes=10_000)
+        self.assertEqual(removed, 2)
+        self.assertIsNotNone(self.backend.get("k0", now=102.0))
+        self.assertIsNone(self.backend.get("k1", now=102.0))
+        self.assertIsNone(self.backend.get("k2", now=102.0))
+
+    def test_disabled_cache_always_calls_producer(self):
+        cache = LLMResponseCache(self.backend, enabled=False)
+        producer = _Producer()
+        self._run(cache.get_or_generate(producer, model="m", prompt="p"))
+        self._run(cache.get_or_generate(producer, model="m", prompt="p"))
+        self.assertEqual(producer.calls, 2)
+
+    def test_backend_errors_degrade_to_miss(self):
+        class _Broken:
+            def get(self, *a):
+                raise RuntimeError("disk gone")
+
+            def set(self, *a):
+                raise RuntimeError("disk gone")
+
+            def evict(self, *a):
+                return 0
+
+            def clear(self):
+                pass
+
+            def size(self):
+                return {}
+
+        cache = LLMResponseCache(_Broken())
+        producer = _Producer()
+        result = self._run(cache.get_or_generate(producer, model="m", prompt="p"))
+        self.assertEqual(result, producer.response)
+        self.assertEqual(cache.stats()["errors"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
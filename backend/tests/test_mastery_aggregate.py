@@ -0,0 +1,211 @@
+"""
+Tests for the per-student mastery aggregate: the deltas process_eval_result()
+applies keep it equal to a rebuild from a full lifecycle scan, and velocity,
+the mastery summary and the forecast are served from it without scanning
+mastery_lifecycle (a student without an aggregate is built once, then read
+incrementally).
+"""
+
+import asyncio
+import random
+import sys
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.mastery_aggregate import build_aggregates, load_mastery_aggregates
+from app.services.mastery_lifecycle_engine import MasteryLifecycleEngine
+from app.services.velocity_service import VelocityService
+from tests.pulse_agent.in_memory_firestore import InMemoryFirestoreService
+
+STUDENT = 1
+
+
+class _Curriculum:
+    def __init__(self, sizes):
+        self.sizes = sizes
+
+    async def get_available_subjects(self):
+        return [{"subject_id": s} for s in self.sizes]
+
+    async def get_curriculum(self, subject):
+        return [{"skills": [{"subskills": [{}] * self.sizes[subject]}]}]
+
+
+def _days_ago(n):
+    return (date.today() - timedelta(days=n)).isoformat() + "T12:00:00+00:00"
+
+
+def _lifecycle(subskill_id, subject, gate, completion, created_days_ago, **fields):
+    return {"student_id": STUDENT, "subskill_id": subskill_id, "subject": subject, "skill_id": "s1",
+            "current_gate": gate, "completion_pct": completion, "created_at": _days_ago(created_days_ago),
+            **fields}
+
+
+class _NoScans:
+    """Makes a lifecycle scan fail the test while active."""
+
+    def __init__(self, store):
+        self.store = store
+        self.scans = 0
+
+    def __enter__(self):
+        async def scan(*args, **kwargs):
+            self.scans += 1
+            raise AssertionError("mastery_lifecycle was scanned")
+        self.original = self.store.get_all_mastery_lifecycles
+        self.store.get_all_mastery_lifecycles = scan
+        return self
+
+    def __exit__(self, *exc):
+        self.store.get_all_mastery_lifecycles = self.original
+
+
+class TestMasteryAggregate(unittest.TestCase):
+    def assertAggregatesEqual(self, actual, expected, path=""):
+        if isinstance(expected, dict):
+            keys = {k for k, v in {**actual, **expected}.items() if v != 0}
+            for key in keys:
+                self.assertAggregatesEqual(actual.get(key, 0), expected.get(key, 0), f"{path}.{key}")
+        elif isinstance(expected, (int, float)) and not isinstance(expected, bool):
+            self.assertAlmostEqual(actual, expected, places=6, msg=path)
+        else:
+            self.assertEqual(actual, expected, path)
+
+    def test_incremental_deltas_match_a_rebuild(self):
+        store = InMemoryFirestoreService()
+        store._mastery_lifecycles[STUDENT]["legacy"] = {  # predates the aggregate
+            "student_id": STUDENT, "subskill_id": "legacy", "subject": "Math",
+            "current_gate": 2, "completion_pct": 0.5, "passes": 3.0}
+        engine = MasteryLifecycleEngine(firestore_service=store)
+        rng = random.Random(3)
+
+        async def scenario():
+            await load_mastery_aggregates(store, STUDENT)
+            for _ in range(200):
+                subject = rng.choice(["Math", "Science", "Reading"])
+                await engine.process_eval_result(
+                    student_id=STUDENT, subskill_id=f"{subject}-{rng.randrange(5)}", subject=subject,
+                    skill_id="s1", score=rng.choice([2.0, 6.0, 9.0, 10.0]),
+                    source=rng.choice(["lesson", "practice"]),
+                )
+            await engine.process_eval_result(
+                student_id=STUDENT, subskill_id="legacy", subject="Math",
+                skill_id="s1", score=10.0, source="practice",
+            )
+            incremental = await store.get_mastery_aggregates(STUDENT)
+            return incremental, build_aggregates(await store.get_all_mastery_lifecycles(STUDENT))
+
+        incremental, rebuilt = asyncio.run(scenario())
+        self.assertEqual(set(incremental), {"Math", "Science", "Reading"})
+        self.assertAggregatesEqual(incremental, rebuilt)
+
+    def test_reads_come_from_the_aggregate(self):
+        store = InMemoryFirestoreService()
+        for lc in [
+            _lifecycle("a", "Math", 4, 1.0, 40, retention_state="mastered", stability=60.0),
+            _lifecycle("b", "Math", 2, 0.5, 10),
+            _lifecycle("c", "Math", 1, 0.25, 0, blended_pass_rate=0.5),
+            _lifecycle("d", "Math", 0, 0.0, 0),
+        ]:
+            store._mastery_lifecycles[STUDENT][lc["subskill_id"]] = lc
+        asyncio.run(store.set_school_year_config({
+            "start_date": (date.today() - timedelta(days=50)).isoformat(),
+            "end_date": (date.today() + timedelta(days=50)).isoformat(),
+        }))
+        engine = MasteryLifecycleEngine(firestore_service=store)
+        velocity = VelocityService(store, _Curriculum({"Math": 10, "Science": 0}))
+
+        async def scenario():
+            first = await velocity.get_velocity(STUDENT)  # builds the aggregate: one scan
+            with _NoScans(store):
+                report = await velocity.get_velocity(STUDENT)
+                summary = await engine.get_student_mastery_summary(STUDENT)
+                forecast = await engine.get_forecast(STUDENT, "Math")
+            return first, report, summary, forecast
+
+        first, report, summary, forecast = asyncio.run(scenario())
+        self.assertEqual(first, report)
+
+        math = report.subjects["Math"]
+        self.assertEqual((math.totalSkills, math.closed), (10, 1))
+        self.assertAlmostEqual(math.earnedMastery, 1.75)
+        self.assertAlmostEqual(math.adjustedExpectedMastery, 2.75)  # 1 + .5 + .25 + (5 - 3) * .5
+        self.assertEqual(math.velocity, 0.636)
+        decomposition = math.decomposition
+        self.assertEqual(
+            (decomposition.introductionVelocity, decomposition.passThroughVelocity, decomposition.closureVelocity),
+            (0.6, 1.0, 1.0),
+        )
+        self.assertEqual(math.primaryDriver.component, "introduction")
+        self.assertNotIn("Science", report.subjects)
+
+        self.assertEqual(summary["total_subskills"], 4)
+        self.assertEqual(summary["by_gate"], {"0": 1, "1": 1, "2": 1, "3": 0, "4": 1})
+        self.assertEqual(summary["by_retention_state"], {"not_started": 1, "active": 2, "mastered": 1})
+        self.assertAlmostEqual(summary["average_completion_pct"], 0.4375)
+        self.assertEqual(summary["by_subject"]["Math"]["fully_mastered"], 1)
+        self.assertEqual(len(summary["by_subject"]["Math"]["subskills"]), 4)
+
+        statuses = {f["subskill_id"]: f["status"] for f in forecast["subskill_forecasts"]}
+        self.assertEqual(statuses, {"a": "mastered", "b": "in_progress", "c": "in_progress", "d": "not_started"})
+        self.assertEqual(forecast["by_unit"]["s1"]["mastered_count"], 1)
+
+    def test_bulk_lifecycle_write_triggers_a_rebuild(self):
+        store = InMemoryFirestoreService()
+        engine = MasteryLifecycleEngine(firestore_service=store)
+
+        async def scenario():
+            await engine.process_eval_result(
+                student_id=STUDENT, subskill_id="a", subject="Math",
+                skill_id="s1", score=9.0, source="practice",
+            )
+            before = await engine.get_student_mastery_summary(STUDENT)
+            await store.batch_write_mastery_lifecycles(STUDENT, [_lifecycle("b", "Math", 4, 1.0, 30)])
+            after = await engine.get_student_mastery_summary(STUDENT)
+            with _NoScans(store):
+                again = await engine.get_student_mastery_summary(STUDENT)
+            return before, after, again
+
+        before, after, again = asyncio.run(scenario())
+        self.assertEqual((before["total_subskills"], after["total_subskills"]), (1, 2))
+        self.assertEqual(after["fully_mastered"], 1)
+        self.assertEqual(after, again)
+
+    def test_delta_during_rebuild_is_not_overwritten(self):
+        store = InMemoryFirestoreService()
+        store._mastery_lifecycles[STUDENT]["a"] = _lifecycle("a", "Math", 2, 0.5, 10)
+        engine = MasteryLifecycleEngine(firestore_service=store)
+        scan = store.get_all_mastery_lifecycles
+        scans = []
+
+        async def eval_mid_scan(student_id):
+            lifecycles = await scan(student_id)
+            scans.append(len(lifecycles))
+            if len(scans) == 1:
+                # Its delta lands between the scan and the replace.
+                await engine.process_eval_result(
+                    student_id=STUDENT, subskill_id="b", subject="Math",
+                    skill_id="s1", score=9.0, source="practice",
+                )
+            return lifecycles
+
+        async def scenario():
+            store.get_all_mastery_lifecycles = eval_mid_scan
+            loaded = await load_mastery_aggregates(store, STUDENT)
+            store.get_all_mastery_lifecycles = scan
+            with _NoScans(store):
+                stored = await store.get_mastery_aggregates(STUDENT)
+            return loaded, stored, build_aggregates(await scan(STUDENT))
+
+        loaded, stored, rebuilt = asyncio.run(scenario())
+        self.assertEqual(scans, [1, 2])
+        self.assertAggregatesEqual(loaded, rebuilt)
+        self.assertAggregatesEqual(stored, rebuilt)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+"""
+Tests for the deferred misconception pipeline: wrong answers are queued on
+the submission path, then diagnosed once per student/subskill batch (repeated
+errors collapsed) by a fake review service, with the pending attempts kept in
+the store until the batch has been written.
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.schemas.problem_submission import ProblemSubmission
+from app.services.background_jobs import BackgroundJobRunner
+from app.services.misconception_pipeline import MisconceptionPipeline
+from app.services.submission_service import SubmissionService
+from tests.pulse_agent.in_memory_firestore import InMemoryFirestoreService
+
+STUDENT = {"firebase_uid": "uid-student-1", "student_id": 7, "email": "student@example.test"}
+
+
+class _FakeReviewService:
+    """Stands in for ReviewService.analyze_misconception (the LLM call)."""
+
+    def __init__(self, result="Thinks '<' points at the bigger number.", delay=0.0, error=None):
+        self.result = result
+        self.delay = delay
+        self.error = error
+        self.calls = []
+
+    async def analyze_misconception(self, question, evaluation):
+        self.calls.append((question.question_text, evaluation.student_answer))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class _FakeUserProfiles:
+    def __init__(self):
+        self.writes = []
+
+    async def add_or_update_misconception(self, uid, subskill_id, misconception_text, assessment_id):
+        self.writes.append((uid, subskill_id, misconception_text, assessment_id))
+        return True
+
+
+def _submission(subskill_id="SS1", question="Which is greater: 8 ___ 2?", picked="opt_a") -> ProblemSubmission:
+    return ProblemSubmission(
+        subject="Mathematics",
+        problem={
+            "id": f"{subskill_id}-{question}",
+            "problem_type": "multiple_choice",
+            "question": question,
+            "options": [{"id": "opt_a", "text": "<"}, {"id": "opt_b", "text": ">"}, {"id": "opt_c", "text": "="}],
+            "correct_option_id": "opt_b",
+            "metadata": {"skill": {"description": "Comparing numbers"}},
+        },
+        skill_id="SK1",
+        subskill_id=subskill_id,
+        student_answer="",
+        canvas_used=False,
+        primitive_response={"selected_option_id": picked},
+    )
+
+
+class TestMisconceptionPipeline(unittest.TestCase):
+    def setUp(self):
+        self.store = InMemoryFirestoreService()
+        self.review = _FakeReviewService()
+        self.profiles = _FakeUserProfiles()
+        self.jobs = BackgroundJobRunner()
+        self.pipeline = MisconceptionPipeline(
+            self.store, self.review, self.profiles, jobs=self.jobs, debounce_s=0.01,
+        )
+        self.service = SubmissionService(None, None, misconception_pipeline=self.pipeline)
+
+        async def no_competency(**_kwargs):
+            return {}
+
+        self.service._update_competency = no_competency
+
+    def _submit(self, submission):
+        return self.service.handle_submission(submission, STUDENT)
+
+    def test_wrong_answer_returns_before_analysis(self):
+        self.review.delay = 0.2
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            result = await self._submit(_submission())
+            elapsed = loop.time() - started
+            pending = await self.store.get_pending_misconceptions(7, "SS1")
+            await self.jobs.drain()
+            return result, elapsed, pending
+
+        result, elapsed, pending = asyncio.run(main())
+        self.assertFalse(result.review["correct"])
+        self.assertLess(elapsed, 0.1)
+        self.assertEqual(len(pending), 1)
+        self.assertEqual(self.review.calls, [("Which is greater: 8 ___ 2?", "<")])
+        self.assertEqual(self.profiles.writes, [
+            ("uid-student-1", "SS1", "Thinks '<' points at the bigger number.", "practice_session_analysis"),
+        ])
+        self.assertEqual(self.store._pending_misconceptions[7], {})
+
+    def test_repeated_errors_collapse_into_one_analysis_per_subskill(self):
+        async def main():
+            for picked in ("opt_a", "opt_a", "opt_c", "opt_a"):
+                await self._submit(_submission("SS1", picked=picked))
+            await self._submit(_submission("SS2", question="Which is less: 3 ___ 9?"))
+            await self.jobs.drain()
+
+        asyncio.run(main())
+        self.assertEqual(sorted(self.review.calls), [
+            ("Which is greater: 8 ___ 2?", "<"),
+            ("Which is less: 3 ___ 9?", "<"),
+        ])
+        self.assertEqual(sorted(w[1] for w in self.profiles.writes), ["SS1", "SS2"])
+        stats = self.pipeline.stats()
+        self.assertEqual((stats["enqueued"], stats["batches"], stats["duplicates_collapsed"]), (5, 2, 2))
+        self.assertEqual(self.store._pending_misconceptions[7], {})
+
+    def test_correct_answer_queues_nothing(self):
+        async def main():
+            result = await self._submit(_submission(picked="opt_b"))
+            await self.jobs.drain()
+            return result
+
+        result = asyncio.run(main())
+        self.assertTrue(result.review["correct"])
+        self.assertEqual(self.pipeline.stats()["enqueued"], 0)
+        self.assertEqual(self.review.calls, [])
+
+    def test_failed_analysis_falls_back_to_generic_text(self):
+        self.review.result = None
+
+        async def main():
+            await self._submit(_submission())
+            await self.jobs.drain()
+
+        asyncio.run(main())
+        self.assertEqual(self.profiles.writes, [
+            ("uid-student-1", "SS1", "Student requires further review on Comparing numbers.", "practice_session_fallback"),
+        ])
+
+    def test_crashed_batch_stays_pending_and_is_recovered(self):
+        self.review.error = RuntimeError("model unavailable")
+
+        async def first_instance():
+            await self._submit(_submission())
+            await self.jobs.drain()
+
+        asyncio.run(first_instance())
+        self.assertEqual(self.profiles.writes, [])
+        self.assertEqual(len(self.store._pending_misconceptions[7]), 1)
+
+        # A fresh instance (new runner, healthy model) resumes from the store.
+        self.review.error = None
+        restarted = MisconceptionPipeline(
+            self.store, self.review, self.profiles, jobs=BackgroundJobRunner(), debounce_s=0.0,
+        )
+
+        async def second_instance():
+            recovered = await restarted.recover()
+            await restarted.jobs.drain()
+            return recovered
+
+        self.assertEqual(asyncio.run(second_instance()), 1)
+        self.assertEqual([w[1] for w in self.profiles.writes], ["SS1"])
+        self.assertEqual(self.store._pending_misconceptions[7], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,266 @@
+"""
+Tests for the outbound model call governor — priority lanes, batch cap, the
+interactive rate reserve, rate-limit retries and the genai client wrapper.
+No network.
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.model_governor import (
+    MEDIA_PART_TOKENS,
+    GovernedGenAIClient,
+    ModelCallGovernor,
+    ModelLimits,
+    Priority,
+    TokenBucket,
+    estimate_tokens,
+    is_rate_limit_error,
+    model_call_priority,
+)
+
+
+class _RateLimited(Exception):
+    code = 429
+
+
+def _fast_governor(**kwargs):
+    kwargs.setdefault("default_limits", ModelLimits(1_000_000, 1_000_000_000))
+    kwargs.setdefault("backoff_base_s", 0.001)
+    kwargs.setdefault("backoff_cap_s", 0.002)
+    return ModelCallGovernor(**kwargs)
+
+
+class TestModelCallGovernor(unittest.TestCase):
+    def test_concurrency_is_bounded(self):
+        governor = _fast_governor(max_concurrency=3, batch_max_concurrency=3)
+        peak = 0
+        active = 0
+
+        async def call():
+            nonlocal peak, active
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return True
+
+        async def main():
+            await asyncio.gather(*(governor.run("m", call) for _ in range(12)))
+
+        asyncio.run(main())
+        self.assertEqual(peak, 3)
+        self.assertEqual(governor.stats()["models"]["m"]["calls"], 12)
+
+    def test_interactive_preempts_queued_batch(self):
+        governor = _fast_governor(max_concurrency=1, batch_max_concurrency=1)
+        order = []
+
+        def make(label):
+            async def call():
+                order.append(label)
+                await asyncio.sleep(0.005)
+            return call
+
+        async def main():
+            with model_call_priority(Priority.BATCH):
+                batch = [asyncio.create_task(governor.run("m", make(f"b{i}"))) for i in range(3)]
+            await asyncio.sleep(0)  # let b0 take the only slot
+            interactive = asyncio.create_task(governor.run("m", make("i")))
+            await asyncio.gather(*batch, interactive)
+
+        asyncio.run(main())
+        self.assertEqual(order[0], "b0")
+        self.assertEqual(order[1], "i")
+
+    def test_batch_cap_leaves_room_for_interactive(self):
+        governor = _fast_governor(max_concurrency=3, batch_max_concurrency=1)
+        release = None
+        batch_peak = 0
+        batch_active = 0
+
+        async def batch_call():
+            nonlocal batch_peak, batch_active
+            batch_active += 1
+            batch_peak = max(batch_peak, batch_active)
+            await release.wait()
+            batch_active -= 1
+
+        async def main():
+            nonlocal release
+            release = asyncio.Event()
+            with model_call_priority(Priority.BATCH):
+                tasks = [asyncio.create_task(governor.run("m", batch_call)) for _ in range(4)]
+            await asyncio.sleep(0.01)
+            # Interactive call completes even though batch work is backed up.
+            result = await asyncio.wait_for(governor.run("m", _value(42)), timeout=1)
+            release.set()
+            await asyncio.gather(*tasks)
+            return result
+
+        self.assertEqual(asyncio.run(main()), 42)
+        self.assertEqual(batch_peak, 1)
+
+    def test_rate_limit_errors_are_retried(self):
+        governor = _fast_governor(max_retries=3)
+        attempts = 0
+
+        async def flaky():
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise _RateLimited("429 RESOURCE_EXHAUSTED")
+            return "ok"
+
+        self.assertEqual(asyncio.run(governor.run("m", flaky)), "ok")
+        self.assertEqual(attempts, 3)
+        self.assertEqual(governor.stats()["models"]["m"]["retries"], 2)
+
+    def test_other_errors_are_not_retried(self):
+        governor = _fast_governor(max_retries=3)
+        attempts = 0
+
+        async def broken():
+            nonlocal attempts
+            attempts += 1
+            raise ValueError("bad schema")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(governor.run("m", broken))
+        self.assertEqual(attempts, 1)
+
+    def test_is_rate_limit_error(self):
+        self.assertTrue(is_rate_limit_error(_RateLimited()))
+        status_error = Exception("quota")
+        status_error.status = "RESOURCE_EXHAUSTED"
+        self.assertTrue(is_rate_limit_error(status_error))
+        http_error = Exception("too many requests")
+        http_error.response = SimpleNamespace(status_code=429)
+        self.assertTrue(is_rate_limit_error(http_error))
+        self.assertFalse(is_rate_limit_error(Exception("500 internal")))
+        # Digits in a message are not a status code.
+        self.assertFalse(is_rate_limit_error(Exception("request 4291 failed after 1429 tokens")))
+        self.assertFalse(is_rate_limit_error(Exception("RESOURCE_EXHAUSTED in a message")))
+
+    def test_large_request_does_not_block_small_ones(self):
+        # 600k tpm -> 100k capacity, 10k/s refill.
+        governor = _fast_governor(default_limits=ModelLimits(1_000_000, 600_000), max_concurrency=1)
+        finished = []
+
+        def make(label):
+            async def call():
+                finished.append(label)
+            return call
+
+        async def main():
+            await governor.run("m", make("drain"), est_tokens=98_000)
+            big = asyncio.create_task(governor.run("m", make("big"), est_tokens=4_000))
+            await asyncio.sleep(0.01)
+            # Fits in what is left: served while the big call waits for refill,
+            # which holds neither the bucket lock nor the only slot.
+            await asyncio.wait_for(governor.run("m", make("small"), est_tokens=500), timeout=0.1)
+            await big
+
+        asyncio.run(main())
+        self.assertEqual(finished, ["drain", "small", "big"])
+
+    def test_image_parts_are_estimated_at_a_fixed_cost(self):
+        image = {"inline_data": {"mime_type": "image/png", "data": b"\x89PNG" * 50_000}}
+        tokens = estimate_tokens(["Review this canvas.", image], SimpleNamespace(max_output_tokens=2048))
+        self.assertEqual(tokens, len("Review this canvas.") // 4 + MEDIA_PART_TOKENS + 2048)
+        part = SimpleNamespace(inline_data=SimpleNamespace(data=b"x" * 200_000), file_data=None)
+        self.assertEqual(estimate_tokens([part]), MEDIA_PART_TOKENS + 1024)
+
+    def test_request_bucket_throttles(self):
+        # 600 rpm -> burst capacity 100, then 10 requests/second.
+        governor = _fast_governor(default_limits=ModelLimits(600, 1_000_000_000))
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await asyncio.gather(*(governor.run("m", _value(None)) for _ in range(101)))
+            return loop.time() - start
+
+        # 100 burst + 1 refill at 10/s -> ~0.1s wait.
+        self.assertGreaterEqual(asyncio.run(main()), 0.05)
+
+    def test_interactive_call_is_not_starved_by_a_batch_burst(self):
+        # 600 rpm -> burst capacity 100 with 20 held back for INTERACTIVE.
+        governor = _fast_governor(default_limits=ModelLimits(600, 1_000_000_000),
+                                  max_concurrency=32, batch_max_concurrency=16)
+
+        async def main():
+            with model_call_priority(Priority.BATCH):
+                burst = [asyncio.create_task(governor.run("m", _value(None))) for _ in range(200)]
+            await asyncio.sleep(0.01)
+            served = sum(task.done() for task in burst)
+            # The burst saturates its share of the rate limit and queues up...
+            try:
+                # ...yet an INTERACTIVE call arriving after it is served at once.
+                result = await asyncio.wait_for(governor.run("m", _value("live")), timeout=0.05)
+            finally:
+                for task in burst:
+                    task.cancel()
+                await asyncio.gather(*burst, return_exceptions=True)
+            return served, result
+
+        served, result = asyncio.run(main())
+        self.assertEqual(served, 80)
+        self.assertEqual(result, "live")
+
+    def test_batch_waits_behind_a_waiting_interactive_call(self):
+        bucket = TokenBucket(10, 100, reserve=2)
+        order = []
+
+        async def take(label, amount, priority):
+            await bucket.acquire(amount, priority)
+            order.append(label)
+
+        async def main():
+            await bucket.acquire(10)
+            interactive = asyncio.create_task(take("interactive", 5, Priority.INTERACTIVE))
+            await asyncio.sleep(0)
+            # Needs less than the interactive call, but must not jump ahead of it.
+            batch = asyncio.create_task(take("batch", 1, Priority.BATCH))
+            await asyncio.gather(interactive, batch)
+
+        asyncio.run(main())
+        self.assertEqual(order, ["interactive", "batch"])
+
+
+class TestGovernedGenAIClient(unittest.TestCase):
+    def test_generate_content_goes_through_governor(self):
+        calls = []
+
+        class _Models:
+            async def generate_content(self, *, model, contents, config=None):
+                calls.append((model, contents))
+                return SimpleNamespace(text="{}")
+
+        raw = SimpleNamespace(aio=SimpleNamespace(models=_Models(), live="live-api"), files="files-api")
+        governor = _fast_governor()
+        client = GovernedGenAIClient(raw, governor)
+
+        response = asyncio.run(client.aio.models.generate_content(model="gemini-x", contents="hi"))
+        self.assertEqual(response.text, "{}")
+        self.assertEqual(calls, [("gemini-x", "hi")])
+        self.assertEqual(governor.stats()["models"]["gemini-x"]["calls"], 1)
+        # Everything else is forwarded untouched.
+        self.assertEqual(client.aio.live, "live-api")
+        self.assertEqual(client.files, "files-api")
+
+
+def _value(v):
+    async def call():
+        return v
+    return call
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""
+Tests for parent dashboard assembly: sections are fetched concurrently, a
+slow or failing section becomes a placeholder (and marks the dashboard
+incomplete) without holding up the rest, complete dashboards and verified
+parent→student links are cached, and per-section latency is reported by
+stats().
+"""
+
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.parent_portal import ParentPortalService
+
+PARENT = "parent-1"
+
+
+class _Links:
+    def __init__(self, *student_ids):
+        self.student_ids = set(student_ids)
+        self.lookups = 0
+
+    async def get_parent_student_links(self, parent_uid):
+        self.lookups += 1
+        return [{"student_id": sid, "verified": True} for sid in self.student_ids]
+
+
+class _Plans:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def get_or_generate_daily_plan(self, student_id, date=None, force_refresh=False):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(activities=[])
+
+
+class _Analytics:
+    def __init__(self, latency=0.0, velocity=None):
+        self.latency = latency
+        self.velocity = velocity or []
+
+    async def get_hierarchical_metrics(self, student_id, subject=None, start_date=None, end_date=None):
+        await asyncio.sleep(self.latency)
+        return {"summary": {"attempt_count": 12, "mastery": 0.7},
+                "hierarchical_data": [{"unit_title": "Math", "mastery": 0.7, "completion": 0.5}]}
+
+    async def get_velocity_metrics(self, student_id):
+        await asyncio.sleep(self.latency)
+        return self.velocity
+
+
+class _Recommendations:
+    def __init__(self, latency=0.0, error=None):
+        self.latency = latency
+        self.error = error
+
+    async def get_ai_recommendations(self, student_id, target_count=5, session_type="daily"):
+        await asyncio.sleep(self.latency)
+        if self.error:
+            raise self.error
+        return [{"subject": "Math", "reason": "subskill mastery is low", "subskill_description": "fractions"}]
+
+
+class TestParentDashboard(unittest.TestCase):
+    def _service(self, links=None, plans=None, analytics=None, ai=None, **kwargs):
+        kwargs.setdefault("section_timeout_s", 1.0)
+        kwargs.setdefault("dashboard_ttl_s", 60.0)
+        kwargs.setdefault("access_ttl_s", 300.0)
+        return ParentPortalService(
+            cosmos_db=links or _Links(7),
+            analytics_service=analytics or _Analytics(),
+            ai_service=ai or _Recommendations(),
+            daily_activities_service=plans or _Plans(),
+            **kwargs,
+        )
+
+    def test_sections_are_fetched_concurrently(self):
+        service = self._service(plans=_Plans(0.1), analytics=_Analytics(0.1), ai=_Recommendations(0.1))
+
+        started = time.monotonic()
+        dashboard = asyncio.run(service.get_parent_dashboard(PARENT, 7))
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.25)  # serial would be >= 0.3 (plus insights' own two calls)
+        self.assertEqual(dashboard.incomplete_sections, [])
+        self.assertEqual(dashboard.weekly_summary.problems_completed, 12)
+        self.assertEqual(dashboard.key_insights[0].title, "Focus on Math")
+        sections = service.stats()["sections"]
+        self.assertEqual(set(sections), {"todays_plan", "weekly_summary", "key_insights"})
+        self.assertGreaterEqual(sections["todays_plan"]["avg_ms"], 90)
+
+    def test_slow_section_times_out_to_a_partial_dashboard(self):
+        plans = _Plans(latency=0.5)
+        service = self._service(plans=plans, section_timeout_s=0.1)
+
+        async def scenario():
+            first = await service.get_parent_dashboard(PARENT, 7)
+            second = await service.get_parent_dashboard(PARENT, 7)
+            return first, second
+
+        started = time.monotonic()
+        first, second = asyncio.run(scenario())
+        self.assertLess(time.monotonic() - started, 0.4)
+
+        self.assertEqual(first.incomplete_sections, ["todays_plan"])
+        self.assertEqual(first.todays_plan.total_activities, 0)
+        self.assertEqual(first.weekly_summary.problems_completed, 12)
+        self.assertEqual(plans.calls, 2)  # partial dashboards are not cached
+        stats = service.stats()
+        self.assertEqual((stats["partial_dashboards"], stats["sections"]["todays_plan"]["timeouts"]), (2, 2))
+
+    def test_snapshot_and_access_links_are_cached(self):
+        links, plans = _Links(7), _Plans()
+        service = self._service(links=links, plans=plans)
+
+        async def scenario():
+            first = await service.get_parent_dashboard(PARENT, 7)
+            second = await service.get_parent_dashboard(PARENT, 7)
+            self.assertIs(first, second)
+            with self.assertRaises(PermissionError):
+                await service.get_parent_dashboard(PARENT, 8)
+            links.student_ids.add(8)  # linked elsewhere: not in the cached set, so re-checked
+            await service.get_parent_dashboard(PARENT, 8)
+
+        asyncio.run(scenario())
+        self.assertEqual(plans.calls, 2)
+        self.assertEqual(links.lookups, 3)
+        stats = service.stats()
+        self.assertEqual((stats["snapshot_hits"], stats["access_cache_hits"]), (1, 1))
+
+    def test_snapshot_expires(self):
+        plans = _Plans()
+        service = self._service(plans=plans, dashboard_ttl_s=0.05)
+
+        async def scenario():
+            await service.get_parent_dashboard(PARENT, 7)
+            await asyncio.sleep(0.06)
+            await service.get_parent_dashboard(PARENT, 7)
+
+        asyncio.run(scenario())
+        self.assertEqual(plans.calls, 2)
+
+    def test_insights_survive_a_failed_recommendation_call(self):
+        service = self._service(
+            analytics=_Analytics(velocity=[{"subject": "Reading", "velocity_status": "behind"}]),
+            ai=_Recommendations(error=RuntimeError("model unavailable")),
+        )
+        dashboard = asyncio.run(service.get_parent_dashboard(PARENT, 7))
+        self.assertEqual([i.title for i in dashboard.key_insights], ["Reading needs attention"])
+        self.assertEqual(dashboard.incomplete_sections, ["key_insights"])
+        self.assertEqual(service.stats()["cached_dashboards"], 0)
+
+    def test_failed_section_is_incomplete_and_not_cached(self):
+        class _BrokenAnalytics(_Analytics):
+            async def get_hierarchical_metrics(self, *args, **kwargs):
+                raise RuntimeError("BigQuery unavailable")
+
+        plans = _Plans()
+        service = self._service(plans=plans, analytics=_BrokenAnalytics())
+
+        async def scenario():
+            await service.get_parent_dashboard(PARENT, 7)
+            return await service.get_parent_dashboard(PARENT, 7)
+
+        dashboard = asyncio.run(scenario())
+        self.assertEqual(dashboard.incomplete_sections, ["weekly_summary"])
+        self.assertEqual(dashboard.weekly_summary.problems_completed, 0)
+        self.assertEqual(plans.calls, 2)
+        self.assertEqual(service.stats()["sections"]["weekly_summary"]["errors"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Tests for the overnight plan/forecast pre-materialization job — skip-if-present,
+bounded concurrency, dry run, checkpoint resume — and the planning clock pin it
+relies on. Planning and forecast services are in-memory fakes.
+"""
+
+import asyncio
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import MagicMock
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.plan_prematerializer import FileCheckpoint, PlanPrematerializer
+from app.services.planning_service import PlanningService
+
+
+class _Store:
+    def __init__(self):
+        self.plans = {}
+        self.forecasts = {}
+
+    async def get_daily_session_plan_doc(self, student_id, plan_date):
+        return self.plans.get((student_id, plan_date))
+
+    async def get_forecast_doc(self, student_id, forecast_date):
+        return self.forecasts.get((student_id, forecast_date))
+
+
+class _Planning:
+    def __init__(self, store, fail_for=()):
+        self.store = store
+        self.fail_for = set(fail_for)
+        self.active = 0
+        self.peak = 0
+        self.built = []
+
+    def pinned_clock(self, day):
+        return PlanningService.pinned_clock(self, day)
+
+    def read_only(self):
+        return PlanningService.read_only(self)
+
+    async def _build_daily_session_plan(self, student_id):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if student_id in self.fail_for:
+            raise RuntimeError("graph unavailable")
+        self.built.append(student_id)
+
+    async def get_daily_session_plan(self, student_id, force_refresh=False, plan_date=None):
+        await self._build_daily_session_plan(student_id)
+        self.store.plans[(student_id, plan_date)] = {"date": plan_date}
+
+
+class _Forecast:
+    def __init__(self, store):
+        self.store = store
+        self.built = []
+
+    async def _build_forecast(self, student_id, today_str):
+        self.built.append(student_id)
+
+    async def get_student_forecast(self, student_id, force_refresh=False, forecast_date=None):
+        await self._build_forecast(student_id, forecast_date)
+        self.store.forecasts[(student_id, forecast_date)] = {"date": forecast_date}
+
+
+def _job(store, concurrency=3, dry_run=False, fail_for=()):
+    planning, forecast = _Planning(store, fail_for), _Forecast(store)
+    job = PlanPrematerializer(store, planning, forecast, concurrency=concurrency, dry_run=dry_run)
+    return job, planning, forecast
+
+
+class TestPlanPrematerializer(unittest.TestCase):
+    def test_builds_and_persists_under_the_concurrency_limit(self):
+        store = _Store()
+        job, planning, _ = _job(store, concurrency=3)
+        stats = asyncio.run(job.run(range(10), "2026-03-02"))
+
+        self.assertEqual(planning.peak, 3)
+        self.assertEqual(stats.plans_built, 10)
+        self.assertEqual(stats.forecasts_built, 10)
+        self.assertIn((4, "2026-03-02"), store.plans)
+        self.assertIsNotNone(stats.to_dict()["students_per_s"])
+
+    def test_existing_docs_are_skipped(self):
+        store = _Store()
+        store.plans[(1, "2026-03-02")] = {"date": "2026-03-02"}
+        job, planning, forecast = _job(store)
+        stats = asyncio.run(job.run([1, 2], "2026-03-02"))
+
+        self.assertEqual(planning.built, [2])
+        self.assertEqual(sorted(forecast.built), [1, 2])
+        self.assertEqual((stats.plans_skipped, stats.forecasts_skipped), (1, 0))
+
+    def test_dry_run_persists_nothing(self):
+        store = _Store()
+        job, planning, forecast = _job(store, dry_run=True)
+        stats = asyncio.run(job.run([1, 2], "2026-03-02"))
+
+        self.assertEqual(store.plans, {})
+        self.assertEqual(store.forecasts, {})
+        self.assertEqual(sorted(planning.built), [1, 2])
+        self.assertTrue(stats.to_dict()["dry_run"])
+
+    def test_dry_run_plan_build_makes_no_firestore_writes(self):
+        class _RecordingStore(_Store):
+            def __init__(self):
+                super().__init__()
+                self.writes = []
+
+            async def update_student_planning_fields(self, student_id, fields):
+                self.writes.append((student_id, fields))
+
+        class _Analytics:
+            async def get_knowledge_graph_progress(self, student_id, subject, include_nodes=False, grade=None):
+                return {"nodes": [{"entity_type": "subskill"}]}
+
+        store = _RecordingStore()
+        planning = PlanningService(store, MagicMock(), analytics_service=_Analytics())
+
+        async def build(student_id):
+            # The real frontier-exhausted path: records promotion-ready and,
+            # with AUTO_GRADE_PROMOTION, a grade override.
+            await planning._handle_frontier_exhausted(student_id, "Mathematics", "K", 30, {}, {}, [])
+
+        planning._build_daily_session_plan = build
+        job = PlanPrematerializer(store, planning, _Forecast(store), dry_run=True)
+        stats = asyncio.run(job.run([1, 2], "2026-03-02"))
+
+        self.assertEqual(stats.plans_built, 2)
+        self.assertEqual(store.writes, [])
+        asyncio.run(build(1))  # outside a dry run the same build does write
+        self.assertTrue(store.writes)
+
+    def test_failures_are_counted_and_retried_from_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "checkpoint.json")
+            job, _, _ = _job(_Store(), fail_for={3})
+            stats = asyncio.run(job.run([1, 2, 3], "2026-03-02", FileCheckpoint(path, "2026-03-02")))
+            self.assertEqual(stats.failed, 1)
+            self.assertIn("graph unavailable", stats.errors[0]["error"])
+
+            job, planning, _ = _job(_Store())
+            stats = asyncio.run(job.run([1, 2, 3], "2026-03-02", FileCheckpoint(path, "2026-03-02")))
+            self.assertEqual(stats.checkpointed, 2)
+            self.assertEqual(planning.built, [3])
+
+            # A checkpoint from another night does not suppress this one.
+            self.assertEqual(FileCheckpoint(path, "2026-03-03").done, set())
+
+
+class TestPlanningClockPin(unittest.TestCase):
+    def test_pinned_clock_overrides_now_only_inside_the_block(self):
+        service = PlanningService(MagicMock(), MagicMock())
+        with service.pinned_clock(date(2026, 3, 2)):
+            self.assertEqual(service._now().date(), date(2026, 3, 2))
+            self.assertEqual(service._now().hour, 0)
+        self.assertNotEqual(service._now().date(), date(2026, 3, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ Covers:
   - Behind/ahead detection
   - Daily plan review queue ordering (mastery retests)
   - Capacity allocation (review vs new slots)
+  - Session plan: concurrent per-subject graph loads, single-flight builds
 """
 
 import asyncio
@@ -321,5 +322,97 @@ class TestDailyPlan(unittest.TestCase):
         self.assertLessEqual(len(plan.sessions), 25)
 
 
+
+class TestSessionPlanConcurrency(unittest.TestCase):
+    """Per-subject graph loads overlap; concurrent callers share one build."""
+
+    def setUp(self):
+        self.firestore = MagicMock()
+        self.firestore.get_school_year_config = AsyncMock(return_value={
+            "start_date": "2025-08-25",
+            "end_date": "2026-05-29",
+            "breaks": [],
+            "school_days_per_week": 5,
+        })
+        self.firestore.get_daily_session_plan_doc = AsyncMock(return_value=None)
+        self.firestore.save_daily_session_plan_doc = AsyncMock(return_value=True)
+
+        self.active = 0
+        self.peak = 0
+
+        async def graph(student_id, subject, include_nodes=True, grade=None):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+            if subject == "Science":
+                raise ValueError("no published curriculum")
+            remaining = {"Math": 3, "Reading": 1}[subject]
+            return {"nodes": [
+                {"entity_type": "subskill", "status": "frontier" if i < remaining else "mastered"}
+                for i in range(4)
+            ]}
+
+        self.analytics = MagicMock()
+        self.analytics.get_knowledge_graph_progress = graph
+        self.service = PlanningService(
+            firestore_service=self.firestore,
+            curriculum_service=MagicMock(),
+            analytics_service=self.analytics,
+        )
+
+    def test_subject_graphs_load_concurrently_in_input_order(self):
+        allocation = asyncio.run(self.service._allocate_subject_minutes(
+            1, ["Math", "Science", "Reading"], budget_minutes=60,
+        ))
+        self.assertEqual(self.peak, 3)
+        self.assertEqual([p.subject for p in allocation.subjects], ["Math", "Reading"])
+        self.assertEqual([p.remaining_subskills for p in allocation.subjects], [3, 1])
+
+    def test_concurrent_callers_share_one_build(self):
+        builds = []
+
+        async def build(student_id):
+            builds.append(student_id)
+            await asyncio.sleep(0.01)
+            return MagicMock(blocks=[MagicMock()])
+
+        self.service._build_daily_session_plan = build
+
+        async def main():
+            return await asyncio.gather(*(self.service.get_daily_session_plan(7) for _ in range(3)))
+
+        plans = asyncio.run(main())
+        self.assertEqual(builds, [7])
+        self.assertIs(plans[0], plans[2])
+        self.assertEqual(self.firestore.save_daily_session_plan_doc.await_count, 1)
+        self.assertEqual(self.service._plan_builds, {})
+
+    def test_refresh_does_not_join_a_normal_build(self):
+        builds = []
+
+        async def build(student_id):
+            builds.append(student_id)
+            await asyncio.sleep(0.01)
+            return MagicMock(blocks=[MagicMock()])
+
+        self.service._build_daily_session_plan = build
+
+        async def main():
+            normal = asyncio.ensure_future(self.service.get_daily_session_plan(7))
+            await asyncio.sleep(0)
+            return await asyncio.gather(
+                normal,
+                self.service.get_daily_session_plan(7, force_refresh=True),
+                self.service.get_daily_session_plan(7, force_refresh=True),
+            )
+
+        plans = asyncio.run(main())
+        self.assertEqual(builds, [7, 7])
+        self.assertIsNot(plans[0], plans[1])
+        self.assertIs(plans[1], plans[2])
+        self.assertEqual(self.service._plan_builds, {})
+
+
 if __name__ == "__main__":
     unittest.main()
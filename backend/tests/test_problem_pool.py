@@ -0,0 +1,132 @@
+"""
+Tests for the pre-generated problem pool — per-student de-dup, low-watermark
+replenishment (single-flight) and duplicate suppression. Uses the in-memory
+store and a stub generator; no model calls.
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.problem_pool import (
+    InMemoryProblemPoolStore,
+    ProblemPoolService,
+    difficulty_band,
+    pool_key,
+)
+
+REC = {"subskill": {"id": "MATH001-01-A"}, "difficulty": 5.0}
+
+
+class _Generator:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self._n = 0
+
+    async def __call__(self, subject, rec, count):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        problems = []
+        for _ in range(count):
+            self._n += 1
+            ptype = "multiple_choice" if self._n % 2 else "true_false"
+            problems.append({"problem_type": ptype, "question": f"q{self._n}"})
+        return problems
+
+
+class TestPoolKeys(unittest.TestCase):
+    def test_difficulty_bands(self):
+        self.assertEqual(difficulty_band(2), "easy")
+        self.assertEqual(difficulty_band(5.0), "medium")
+        self.assertEqual(difficulty_band(None), "medium")
+        self.assertEqual(difficulty_band(9), "hard")
+
+    def test_pool_key_is_document_safe(self):
+        self.assertNotIn("/", pool_key("math", "A/B", "easy"))
+
+
+class TestProblemPoolService(unittest.TestCase):
+    def _pool(self, generator=None, **kwargs):
+        return ProblemPoolService(InMemoryProblemPoolStore(), generator, **kwargs)
+
+    def test_student_is_never_served_the_same_problem_twice(self):
+        async def main():
+            pool = self._pool(_Generator(), low_watermark=0)
+            await pool.replenish("math", REC, 4)
+            first = await pool.take(1, "math", REC, 3)
+            second = await pool.take(1, "math", REC, 3)
+            other_student = await pool.take(2, "math", REC, 4)
+            return first, second, other_student
+
+        first, second, other = asyncio.run(main())
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 1)
+        ids = {p["pool_problem_id"] for p in first + second}
+        self.assertEqual(len(ids), 4)
+        self.assertEqual(len(other), 4)
+
+    def test_take_mixes_problem_types(self):
+        async def main():
+            pool = self._pool(_Generator(), low_watermark=0)
+            await pool.replenish("math", REC, 6)
+            return await pool.take(1, "math", REC, 2)
+
+        picked = asyncio.run(main())
+        self.assertEqual({p["problem_type"] for p in picked}, {"multiple_choice", "true_false"})
+
+    def test_low_watermark_triggers_single_flight_replenish(self):
+        generator = _Generator(delay=0.01)
+
+        async def main():
+            pool = self._pool(generator, low_watermark=3, target_size=5)
+            # Empty pool: concurrent misses share one replenishment.
+            results = await asyncio.gather(*(pool.take(i, "math", REC, 1) for i in range(5)))
+            for task in list(pool._inflight.values()):
+                await task
+            calls_after_misses = generator.calls
+            refilled = await pool.take(99, "math", REC, 5)
+            return results, calls_after_misses, refilled
+
+        results, calls_after_misses, refilled = asyncio.run(main())
+        self.assertTrue(all(r == [] for r in results))
+        self.assertEqual(calls_after_misses, 1)
+        self.assertEqual(len(refilled), 5)
+
+    def test_misconception_recs_are_not_pooled(self):
+        pool = self._pool(_Generator())
+        rec = {**REC, "misconception_to_address": "compares decimals by digit count"}
+        self.assertFalse(pool.is_poolable(rec))
+        self.assertIsNone(pool.schedule_replenish("math", rec))
+
+    def test_duplicate_generations_are_skipped(self):
+        class _Same:
+            async def __call__(self, subject, rec, count):
+                return [{"problem_type": "true_false", "statement": "2 + 2 = 4"}] * count
+
+        async def main():
+            pool = self._pool(_Same())
+            added_first = await pool.replenish("math", REC, 3)
+            added_second = await pool.replenish("math", REC, 3)
+            return added_first, added_second, pool.stats()
+
+        first, second, stats = asyncio.run(main())
+        self.assertEqual(first, 1)
+        self.assertEqual(second, 0)
+        self.assertEqual(stats["duplicates_skipped"], 5)
+
+    def test_generator_failure_is_contained(self):
+        async def broken(subject, rec, count):
+            raise RuntimeError("model down")
+
+        pool = self._pool(broken)
+        self.assertEqual(asyncio.run(pool.replenish("math", REC, 3)), 0)
+        self.assertEqual(pool.stats()["replenish_errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
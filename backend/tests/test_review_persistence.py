@@ -0,0 +1,145 @@
+"""
+Tests for the review dual-write layer: Cosmos and Firestore writes overlap,
+a failed write is recorded in the on-disk outbox and replayed with backoff
+(then dead-lettered), and divergence is counted. The fake stores run a
+blocking round trip on a worker thread, as the real stores do.
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.review_persistence import ReviewPersistence
+
+REVIEW = dict(
+    student_id=7,
+    subject="Mathematics",
+    skill_id="SK1",
+    subskill_id="SS1",
+    problem_id="p1",
+    review_data={"evaluation": {"score": 3}},
+    problem_content={"question": "Which is greater?"},
+    firebase_uid="uid-1",
+)
+
+
+class _BlockingStore:
+    """save_problem_review with a blocking round trip and switchable failure."""
+
+    def __init__(self, latency=0.0, error=None):
+        self.latency = latency
+        self.error = error
+        self.saved = {}
+
+    async def save_problem_review(self, **kwargs):
+        await asyncio.to_thread(time.sleep, self.latency)
+        if self.error:
+            raise self.error
+        self.saved[kwargs["review_id"]] = kwargs
+        return kwargs
+
+
+class TestReviewPersistence(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.outbox = Path(self._tmp.name)
+        self.cosmos = _BlockingStore()
+        self.firestore = _BlockingStore()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _persistence(self, **kwargs):
+        return ReviewPersistence(self.cosmos, self.firestore, outbox_dir=self.outbox, **kwargs)
+
+    def test_writes_overlap_and_share_the_review_id(self):
+        self.cosmos.latency = self.firestore.latency = 0.15
+        persistence = self._persistence()
+
+        started = time.monotonic()
+        results = asyncio.run(persistence.save(REVIEW, attempt_id="att-1"))
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(results, {"cosmos": True, "firestore": True})
+        self.assertLess(elapsed, 0.28)
+        (cosmos_id,), (firestore_id,) = self.cosmos.saved, self.firestore.saved
+        self.assertEqual(cosmos_id, firestore_id)
+        self.assertNotIn("attempt_id", self.cosmos.saved[cosmos_id])
+        self.assertEqual(self.firestore.saved[firestore_id]["attempt_id"], "att-1")
+        self.assertEqual(persistence.stats()["all_ok"], 1)
+
+    def test_failed_write_is_outboxed_and_replayed(self):
+        self.firestore.error = ConnectionError("deadline exceeded")
+        persistence = self._persistence(retry_interval_s=30)
+
+        results = asyncio.run(persistence.save(REVIEW, attempt_id="att-1"))
+        self.assertEqual(results, {"cosmos": True, "firestore": False})
+        stats = persistence.stats()
+        self.assertEqual((stats["diverged"], stats["outboxed"], stats["outbox_pending"]), (1, 1, 1))
+
+        # Not due yet: the entry waits out its backoff.
+        self.assertEqual(asyncio.run(persistence.retry_due()), 0)
+
+        self.firestore.error = None
+        self.assertEqual(asyncio.run(persistence.retry_due(now=time.time() + 60)), 1)
+        (cosmos_id,) = self.cosmos.saved
+        self.assertEqual(self.firestore.saved[cosmos_id]["attempt_id"], "att-1")
+        stats = persistence.stats()
+        self.assertEqual((stats["retried_ok"], stats["outbox_pending"]), (1, 0))
+
+    def test_outbox_survives_a_restart(self):
+        self.cosmos.error = ConnectionError("service unavailable")
+        asyncio.run(self._persistence().save(REVIEW))
+
+        self.cosmos.error = None
+        restarted = self._persistence()
+        self.assertEqual(restarted.stats()["outbox_pending"], 1)
+        self.assertEqual(asyncio.run(restarted.retry_due(now=time.time() + 60)), 1)
+        self.assertEqual(len(self.cosmos.saved), 1)
+
+    def test_persistent_failure_backs_off_then_dead_letters(self):
+        self.cosmos.error = ConnectionError("service unavailable")
+        persistence = self._persistence(retry_interval_s=10, max_backoff_s=25, max_attempts=3)
+        asyncio.run(persistence.save(REVIEW))
+        (entry_path,) = self.outbox.glob("*.json")
+
+        now = time.time() + 11
+        asyncio.run(persistence.retry_due(now=now))
+        entry = json.loads(entry_path.read_text())
+        self.assertEqual(entry["attempts"], 1)
+        self.assertAlmostEqual(entry["next_attempt_at"], now + 20)
+
+        asyncio.run(persistence.retry_due(now=now + 21))
+        entry = json.loads(entry_path.read_text())
+        self.assertAlmostEqual(entry["next_attempt_at"], now + 21 + 25)  # capped
+
+        asyncio.run(persistence.retry_due(now=now + 100))
+        stats = persistence.stats()
+        self.assertEqual((stats["outbox_pending"], stats["outbox_dead"], stats["dead_lettered"]), (0, 1, 1))
+
+    def test_both_failing_keeps_both_copies(self):
+        self.cosmos.error = ConnectionError("down")
+        self.firestore.error = ConnectionError("down")
+        persistence = self._persistence()
+        asyncio.run(persistence.save(REVIEW))
+        stats = persistence.stats()
+        self.assertEqual((stats["all_failed"], stats["outbox_pending"]), (1, 2))
+
+    def test_permission_error_is_not_retried(self):
+        self.cosmos.error = PermissionError("no access to student 7")
+        persistence = self._persistence()
+        asyncio.run(persistence.save(REVIEW))
+        stats = persistence.stats()
+        self.assertEqual((stats["rejected"], stats["outbox_pending"]), (1, 0))
+        self.assertEqual(len(self.firestore.saved), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
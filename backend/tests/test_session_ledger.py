@@ -0,0 +1,134 @@
+"""
+Tests for the buffered session ledger — records reach disk off the caller's
+thread in order, size/interval flushing, rotation + gzip, and the never-raise
+contract (with no leaked file handles) when the writer falls behind. Files go to a temp directory.
+"""
+
+import gzip
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.session_ledger import SessionLedger, _LedgerWriter
+
+
+def _records(path: Path):
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestSessionLedger(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_records_are_written_in_order_and_compressed_on_close(self):
+        writer = _LedgerWriter(flush_records=4, flush_interval_s=10)
+        ledger = SessionLedger(writer=writer, directory=self.dir)
+        for i in range(10):
+            ledger.write("turn", n=i)
+        ledger.close()
+        self.assertTrue(writer.flush())
+
+        self.assertFalse(ledger.path.exists())
+        records = _records(ledger.path.with_name(ledger.path.name + ".gz"))
+        self.assertEqual([r["n"] for r in records], list(range(10)))
+        self.assertEqual([r["seq"] for r in records], list(range(1, 11)))
+        self.assertEqual(writer.stats()["open_files"], 0)
+
+    def test_interval_flush_makes_records_visible_while_open(self):
+        writer = _LedgerWriter(flush_records=1000, flush_interval_s=0.05, compress=False)
+        ledger = SessionLedger(writer=writer, directory=self.dir)
+        ledger.write("connection-accepted")
+        self.assertTrue(writer.flush())
+
+        self.assertEqual(_records(ledger.path)[0]["event"], "connection-accepted")
+        ledger.close()
+        writer.flush()
+        self.assertTrue(ledger.path.exists())
+
+    def test_rotation_compresses_full_parts(self):
+        writer = _LedgerWriter(rotate_bytes=200)
+        ledger = SessionLedger(writer=writer, directory=self.dir)
+        for i in range(12):
+            ledger.write("ai-transcript", text="x" * 40, n=i)
+        ledger.close()
+        writer.flush()
+
+        parts = sorted(self.dir.glob("*.part*.jsonl.gz"))
+        self.assertGreaterEqual(len(parts), 2)
+        self.assertEqual(writer.stats()["rotations"], len(parts))
+        files = sorted(parts, key=lambda p: int(p.name.split(".part")[1].split(".")[0]))
+        files.append(ledger.path.with_name(ledger.path.name + ".gz"))
+        numbers = [r["n"] for path in files for r in _records(path)]
+        self.assertEqual(numbers, list(range(12)))
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        writer = _LedgerWriter(queue_size=2)
+        gate = threading.Event()
+        # Park the writer thread inside a flush marker so the queue fills up.
+        writer._ensure_started()
+        writer._queue.put(("flush", None, _Blocking(gate)))
+        ledger = SessionLedger(writer=writer, directory=self.dir)
+        for i in range(10):
+            ledger.write("audio", n=i)
+        gate.set()
+        writer.flush()
+
+        self.assertGreater(writer.stats()["dropped"], 0)
+
+    def test_close_is_deferred_not_dropped_when_the_queue_is_full(self):
+        writer = _LedgerWriter(queue_size=1, compress=False)
+        gate = threading.Event()
+        writer._ensure_started()
+        blocking = _Blocking(gate)
+        writer._queue.put(("flush", None, blocking))
+        self.assertTrue(blocking.entered.wait(5))  # thread parked, queue empty
+        ledger = SessionLedger(writer=writer, directory=self.dir)
+        ledger.write("turn", n=0)
+        for i in range(1, 5):
+            ledger.write("audio", n=i)  # dropped: the queue is full
+        ledger.close()
+        gate.set()
+        writer.flush()
+        writer.flush()  # the deferred close runs once the queue has drained
+
+        self.assertEqual(writer.stats()["open_files"], 0)
+        self.assertEqual([r["n"] for r in _records(ledger.path)], [0])
+
+    def test_never_raises_when_the_directory_is_unwritable(self):
+        blocker = self.dir / "not-a-dir"
+        blocker.write_text("")
+        writer = _LedgerWriter()
+        ledger = SessionLedger(writer=writer, directory=blocker)
+        ledger.write("auth-ok", uid="u1")
+        ledger.close()
+        ledger.write("after-close")
+        writer.flush()
+        self.assertGreaterEqual(writer.stats()["errors"], 1)
+
+
+class _Blocking:
+    """Flush-marker stand-in whose set() waits for the test to release it."""
+
+    def __init__(self, gate: threading.Event):
+        self.gate = gate
+        self.entered = threading.Event()
+
+    def set(self):
+        self.entered.set()
+        self.gate.wait(5)
+
+
+if __name__ == "__main__":
+    unittest.main()
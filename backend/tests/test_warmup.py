@@ -0,0 +1,107 @@
+"""
+Tests for the startup warm-up runner — components warm concurrently with
+per-component timing, failures and timeouts degrade instead of blocking
+readiness — and the learning-paths graph warm hook it drives.
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.learning_paths import LearningPathsService
+from app.services.warmup import Warmup
+
+
+class TestWarmup(unittest.TestCase):
+    def test_components_warm_concurrently_with_timings(self):
+        active = {"now": 0, "peak": 0}
+
+        def component(result):
+            async def warm():
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+                await asyncio.sleep(0.02)
+                active["now"] -= 1
+                return result
+            return warm
+
+        warmup = Warmup()
+        self.assertFalse(warmup.ready)
+        state = asyncio.run(warmup.run({"a": component(3), "b": component(None), "c": component("x")}))
+
+        self.assertEqual(state, "ready")
+        self.assertTrue(warmup.ready)
+        self.assertEqual(active["peak"], 3)
+        stats = warmup.stats()
+        self.assertEqual(stats["components"]["a"]["detail"], 3)
+        self.assertGreaterEqual(stats["components"]["b"]["elapsed_ms"], 15)
+        self.assertLess(stats["elapsed_ms"], 60)
+
+    def test_failures_and_timeouts_degrade_but_still_ready(self):
+        async def boom():
+            raise RuntimeError("firestore unavailable")
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        async def fine():
+            return 1
+
+        warmup = Warmup()
+        state = asyncio.run(warmup.run({"boom": boom, "slow": slow, "fine": fine}, timeout=0.05))
+
+        self.assertEqual(state, "degraded")
+        self.assertTrue(warmup.ready)
+        components = warmup.stats()["components"]
+        self.assertEqual(components["boom"]["status"], "failed")
+        self.assertIn("firestore unavailable", components["boom"]["error"])
+        self.assertEqual(components["slow"]["status"], "timeout")
+        self.assertEqual(components["fine"]["status"], "ok")
+
+    def test_background_start_flips_readiness_when_done(self):
+        async def main():
+            warmup = Warmup()
+            gate = asyncio.Event()
+
+            async def waits():
+                await gate.wait()
+
+            warmup.start({"waits": waits})
+            await asyncio.sleep(0)
+            during = (warmup.ready, warmup.state)
+            gate.set()
+            await warmup._task
+            return during, warmup.ready
+
+        during, after = asyncio.run(main())
+        self.assertEqual(during, (False, "warming"))
+        self.assertTrue(after)
+
+
+class TestLearningGraphWarm(unittest.TestCase):
+    def test_warm_graphs_caches_every_subject(self):
+        firestore = MagicMock()
+        firestore.get_all_published_subjects = AsyncMock(
+            return_value=[{"subject_id": "MATHEMATICS"}, {"subject_id": "SCIENCE"}, {"subject_id": "ART"}]
+        )
+
+        async def graph(subject_id, version_type):
+            if subject_id == "ART":
+                return None
+            return {"graph": {"nodes": [{"id": f"{subject_id}-01"}], "edges": []}}
+
+        firestore.get_curriculum_graph = AsyncMock(side_effect=graph)
+        service = LearningPathsService(firestore_service=firestore, project_id="test")
+
+        self.assertEqual(asyncio.run(service.warm_graphs()), 2)
+        self.assertEqual(sorted(service._graph_cache), ["MATHEMATICS:published", "SCIENCE:published"])
+        self.assertEqual(sorted(service._unlock_index), ["MATHEMATICS:published", "SCIENCE:published"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -52,6 +52,9 @@ class Settings(BaseSettings):
 
     # Cache Configuration
     CACHE_TTL_MINUTES: int = 30
+    # Node-text embeddings kept in memory across suggestion runs, keyed by
+    # content hash (~12 KB each at 3072 float32 dims)
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 5000
 
     # Version Control
     DEFAULT_VERSION_DESCRIPTION: str = "Initial version"
@@ -22,6 +22,7 @@ from copy import deepcopy
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+from app.db.firestore_curriculum_reader import firestore_reader
 from app.db.firestore_curriculum_service import firestore_curriculum_sync
 
 logger = logging.getLogger(__name__)
@@ -94,11 +95,13 @@ class DraftCurriculumService:
             {"grade": canonical}, merge=True
         )
         self._ref(grade, subject_id).set(data)
+        firestore_reader.invalidate_subject(grade, subject_id)
         logger.info(f"Saved draft for {subject_id} (grade={canonical})")
 
     async def delete_draft(self, grade: str, subject_id: str) -> None:
         """Delete a draft document."""
         self._ref(grade, subject_id).delete()
+        firestore_reader.invalidate_subject(grade, subject_id)
         logger.info(f"Deleted draft for {subject_id}")
 
     # ==================== List / Discovery ====================
@@ -660,6 +663,7 @@ class DraftCurriculumService:
         published["deployed_by"] = deployed_by
 
         await firestore_graph_service.deploy_curriculum(subject_id, published)
+        firestore_reader.invalidate_subject(grade, subject_id)
 
         logger.info(
             f"Published {subject_id}: "
@@ -1,7 +1,14 @@
 """
 Firestore-native read layer for curriculum entities.
 
-All methods require (grade, subject_id) — no scanning, no caching.
+All methods require (grade, subject_id) — no scanning, no process-wide caching.
+
+Subject docs can be memoized for the length of one operation: inside
+``with firestore_reader.subject_doc_scope():`` each (grade, subject_id) doc is
+read from Firestore once, and every accessor in the block (get_skill,
+get_unit, get_subskill, ...) reuses it. DraftCurriculumService bumps the
+subject's write generation on every save, so a scope never serves a doc
+older than the last local write.
 
 Reads from hierarchical draft documents:
   curriculum_drafts/{grade}/subjects/{subject_id}
@@ -14,13 +21,37 @@ Graph data (edges, suggestions) lives in:
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 
 from app.db.firestore_curriculum_service import firestore_curriculum_sync
 
 logger = logging.getLogger(__name__)
 
 
+class SubjectDocScope:
+    """Subject docs read during one operation, plus read counters.
+
+    ``docs`` maps (canonical grade, subject_id) to the write generation the
+    doc was read at and the doc itself (None when neither draft nor
+    published exists).
+    """
+
+    def __init__(self):
+        self.docs: Dict[Tuple[str, str], Tuple[int, Optional[Dict[str, Any]]]] = {}
+        self.reads = 0  # Firestore document gets issued
+        self.hits = 0   # _get_subject_doc calls answered from the scope
+
+    def stats(self) -> Dict[str, int]:
+        return {"reads": self.reads, "hits": self.hits, "subjects": len(self.docs)}
+
+
+_subject_doc_scope: ContextVar[Optional[SubjectDocScope]] = ContextVar(
+    "subject_doc_scope", default=None
+)
+
+
 class FirestoreCurriculumReader:
     """Read-only queries against curriculum draft/published docs and graph subcollections.
 
@@ -28,6 +59,10 @@ class FirestoreCurriculumReader:
     No scanning, no grade cache, no ambiguity.
     """
 
+    def __init__(self):
+        # (canonical grade, subject_id) -> local write generation
+        self._generations: Dict[Tuple[str, str], int] = {}
+
     @property
     def _client(self):
         return firestore_curriculum_sync.client
@@ -81,12 +116,52 @@ class FirestoreCurriculumReader:
         """
         return await firestore_curriculum_sync._resolve_grade(subject_id)
 
+    # ==================== Operation scope ====================
+
+    @staticmethod
+    def _subject_key(grade: str, subject_id: str) -> Tuple[str, str]:
+        from app.models.grades import GRADE_ALIASES
+        return (GRADE_ALIASES.get(grade, grade), subject_id)
+
+    @contextmanager
+    def subject_doc_scope(self) -> Iterator[SubjectDocScope]:
+        """Read each subject doc at most once inside the block.
+
+        Nested scopes share the outermost one. The scope travels with the
+        asyncio context, so tasks spawned inside the block use it too.
+        """
+        current = _subject_doc_scope.get()
+        if current is not None:
+            yield current
+            return
+        scope = SubjectDocScope()
+        token = _subject_doc_scope.set(scope)
+        try:
+            yield scope
+        finally:
+            _subject_doc_scope.reset(token)
+
+    def invalidate_subject(self, grade: str, subject_id: str) -> None:
+        """Mark a subject as written so open scopes re-read it.
+
+        Called by DraftCurriculumService after every draft save/delete and
+        after publish.
+        """
+        key = self._subject_key(grade, subject_id)
+        self._generations[key] = self._generations.get(key, 0) + 1
+
+    def _count_read(self) -> None:
+        scope = _subject_doc_scope.get()
+        if scope is not None:
+            scope.reads += 1
+
     # ==================== Draft doc access ====================
 
     async def _get_draft_doc(self, grade: str, subject_id: str) -> Optional[Dict[str, Any]]:
         """Get the hierarchical draft doc for a subject.
         Tries the given grade and its alias (e.g. '1' then '1st Grade')."""
         for g in self._grade_variants(grade):
+            self._count_read()
             doc = (
                 self._client.collection("curriculum_drafts")
                 .document(g)
@@ -102,6 +177,7 @@ class FirestoreCurriculumReader:
         """Get the hierarchical published doc for a subject.
         Tries the given grade and its alias."""
         for g in self._grade_variants(grade):
+            self._count_read()
             doc = (
                 self._client.collection("curriculum_published")
                 .document(g)
@@ -114,7 +190,28 @@ class FirestoreCurriculumReader:
         return None
 
     async def _get_subject_doc(self, grade: str, subject_id: str) -> Optional[Dict[str, Any]]:
-        """Get draft doc, falling back to published. Grade is required."""
+        """Get draft doc, falling back to published. Grade is required.
+
+        Inside a subject_doc_scope() the doc is served from the scope unless
+        the subject was written since it was read.
+        """
+        scope = _subject_doc_scope.get()
+        if scope is None:
+            return await self._read_subject_doc(grade, subject_id)
+
+        key = self._subject_key(grade, subject_id)
+        generation = self._generations.get(key, 0)
+        cached = scope.docs.get(key)
+        if cached is not None and cached[0] == generation:
+            scope.hits += 1
+            return cached[1]
+        doc = await self._read_subject_doc(grade, subject_id)
+        # Tag with the generation seen before the read: a write that lands
+        # mid-read leaves the entry stale rather than wrongly current.
+        scope.docs[key] = (generation, doc)
+        return doc
+
+    async def _read_subject_doc(self, grade: str, subject_id: str) -> Optional[Dict[str, Any]]:
         doc = await self._get_draft_doc(grade, subject_id)
         if doc:
             return doc
@@ -6,12 +6,22 @@ metrics, anomalies, and impact projections. Used by the agentic layer
 (CurriculumGraphAgentService) and the health dashboard API.
 
 Same design philosophy as backend DAGAnalysisEngine: all static methods,
-pure functions, no side effects.
+pure functions, no side effects. Health metrics are memoized per graph
+fingerprint (same result for the same graph), since the agent, anomaly
+detection and every impact projection recompute the baseline.
+
+Ranking many candidate edges against one graph goes through
+ImpactEvaluator, which builds the baseline (components, per-root BFS
+distances, prerequisite reachability) once and scores each edge
+incrementally.
 """
 
 from __future__ import annotations
 
-from collections import defaultdict, Counter
+import hashlib
+import json
+import threading
+from collections import defaultdict, deque, Counter, OrderedDict
 from typing import Dict, List, Optional, Set, Tuple
 
 from app.models.suggestions import (
@@ -19,6 +29,22 @@ from app.models.suggestions import (
 )
 
 
+_HEALTH_CACHE_MAX_ENTRIES = 64
+_health_cache: "OrderedDict[str, GraphHealthMetrics]" = OrderedDict()
+_health_cache_lock = threading.Lock()
+
+
+def graph_fingerprint(nodes: List[Dict], edges: List[Dict]) -> str:
+    """Order-insensitive hash of the fields health metrics depend on."""
+    node_keys = sorted((n["id"], n.get("unit_id", "")) for n in nodes)
+    edge_keys = sorted(
+        (e["source"], e["target"], bool(e.get("is_prerequisite", True)))
+        for e in edges
+    )
+    payload = json.dumps([node_keys, edge_keys], separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
 class GraphAnalysisEngine:
     """Pure graph analysis algorithms for curriculum knowledge graphs."""
 
@@ -31,7 +57,29 @@ class GraphAnalysisEngine:
         nodes: List[Dict],
         edges: List[Dict],
     ) -> GraphHealthMetrics:
-        """Compute structural health metrics for a knowledge graph."""
+        """Compute structural health metrics for a knowledge graph.
+
+        Memoized by graph fingerprint; callers get their own copy.
+        """
+        key = graph_fingerprint(nodes, edges)
+        with _health_cache_lock:
+            cached = _health_cache.get(key)
+            if cached is not None:
+                _health_cache.move_to_end(key)
+                return cached.model_copy(deep=True)
+
+        metrics = GraphAnalysisEngine._compute_health_metrics(nodes, edges)
+        with _health_cache_lock:
+            _health_cache[key] = metrics
+            while len(_health_cache) > _HEALTH_CACHE_MAX_ENTRIES:
+                _health_cache.popitem(last=False)
+        return metrics.model_copy(deep=True)
+
+    @staticmethod
+    def _compute_health_metrics(
+        nodes: List[Dict],
+        edges: List[Dict],
+    ) -> GraphHealthMetrics:
         node_ids = {n["id"] for n in nodes}
         node_count = len(node_ids)
 
@@ -255,6 +303,15 @@ class GraphAnalysisEngine:
             health_score_delta=round(after_score - before_score, 1),
         )
 
+    @staticmethod
+    def impact_evaluator(nodes: List[Dict], edges: List[Dict]) -> "ImpactEvaluator":
+        """Baseline for scoring many single-edge proposals against one graph.
+
+        ``evaluator.impact(e)`` equals ``compute_impact(nodes, edges, [e])``
+        and ``evaluator.validate(e)`` equals ``validate_edge(nodes, edges, e)``.
+        """
+        return ImpactEvaluator(nodes, edges)
+
     # ------------------------------------------------------------------ #
     #  Edge Validation
     # ------------------------------------------------------------------ #
@@ -449,3 +506,226 @@ class GraphAnalysisEngine:
                     if child not in visited:
                         queue.append((child, depth + 1))
         return visited - start
+
+
+_REACH_HOPS = 5
+
+
+class ImpactEvaluator:
+    """Incremental impact projection and validation for single proposed edges.
+
+    Adding one edge s -> t can only merge two components, turn s from a
+    dead end into a source, connect s and t, drop t from the prerequisite
+    roots, and extend each root's 5-hop reach by the nodes within
+    ``5 - dist(root, s) - 1`` hops of t. All of those are answered from the
+    baseline built here, so each proposal costs a hop-bounded BFS from t
+    rather than two full health-metric passes.
+    """
+
+    def __init__(self, nodes: List[Dict], edges: List[Dict]):
+        self.nodes = nodes
+        self.edges = edges
+        self.before = GraphAnalysisEngine.compute_health_metrics(nodes, edges)
+        self.before_score = GraphAnalysisEngine.compute_health_score(self.before)
+
+        self.node_ids = {n["id"] for n in nodes}
+        self.node_unit: Dict[str, str] = {n["id"]: n.get("unit_id", "") for n in nodes}
+
+        self._parent: Dict[str, str] = {nid: nid for nid in self.node_ids}
+        for e in edges:
+            if e["source"] in self.node_ids and e["target"] in self.node_ids:
+                ra, rb = self._find(e["source"]), self._find(e["target"])
+                if ra != rb:
+                    self._parent[ra] = rb
+        self.component_count = len({self._find(nid) for nid in self.node_ids})
+
+        self.cross_unit = sum(1 for e in edges if self._is_cross_unit(e["source"], e["target"]))
+        self.has_outgoing: Set[str] = {e["source"] for e in edges}
+        self.connected: Set[str] = self.has_outgoing | {e["target"] for e in edges}
+
+        self.forward: Dict[str, List[str]] = defaultdict(list)
+        self.prereq_forward: Dict[str, List[str]] = defaultdict(list)
+        self.prereq_source_counts: Counter = Counter()
+        self.pairs: Dict[Tuple[str, str], List[Optional[str]]] = defaultdict(list)
+        prereq_targets: Set[str] = set()
+        for e in edges:
+            self.forward[e["source"]].append(e["target"])
+            self.pairs[(e["source"], e["target"])].append(e.get("relationship"))
+            if e.get("is_prerequisite", True):
+                self.prereq_forward[e["source"]].append(e["target"])
+                self.prereq_source_counts[e["source"]] += 1
+                prereq_targets.add(e["target"])
+        self.roots = self.node_ids - prereq_targets
+
+        # Per-root shortest hop counts (within the reach horizon), and the
+        # inverse: for each node, the roots that reach it and how far away.
+        self.root_dist: Dict[str, Dict[str, int]] = {}
+        self.reached_by: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        self.total_reach = 0
+        for r in self.roots:
+            dist = self._hop_distances(r, _REACH_HOPS)
+            self.root_dist[r] = dist
+            self.total_reach += len(dist) - 1  # reach excludes the root itself
+            for nid, d in dist.items():
+                self.reached_by[nid].append((r, d))
+
+        self._prereq_reach: Dict[str, Set[str]] = {}
+
+    # ------------------------------------------------------------------ #
+    #  Impact
+    # ------------------------------------------------------------------ #
+
+    def impact(self, edge: Dict) -> SuggestionImpact:
+        """Before/after metrics delta for adding ``edge`` to the baseline."""
+        before = self.before
+        if before.node_count == 0:
+            return SuggestionImpact()
+        s, t = edge["source"], edge["target"]
+        is_prereq = edge.get("is_prerequisite", True)
+
+        component_count = self.component_count
+        if s in self.node_ids and t in self.node_ids and self._find(s) != self._find(t):
+            component_count -= 1
+
+        edge_count = len(self.edges) + 1
+        cross_unit = self.cross_unit + (1 if self._is_cross_unit(s, t) else 0)
+
+        dead_end_count = len(self.node_ids - self.has_outgoing)
+        if s in self.node_ids and s not in self.has_outgoing:
+            dead_end_count -= 1
+
+        orphan_count = before.orphan_count
+        for nid in {s, t}:
+            if nid in self.node_ids and nid not in self.connected:
+                orphan_count -= 1
+
+        root_count = len(self.roots)
+        total_reach = self.total_reach + self._reach_gain(s, t)
+        if is_prereq and t in self.roots:
+            # t gains an incoming prerequisite and stops being a root; its
+            # own reach is unaffected by the new edge (it only leads back to t).
+            root_count -= 1
+            total_reach -= len(self.root_dist[t]) - 1
+
+        bottlenecks = before.bottleneck_nodes
+        if is_prereq and self.prereq_source_counts[s] == 2:
+            bottlenecks = bottlenecks + [s]
+
+        after = before.model_copy(update={
+            "edge_count": edge_count,
+            "edge_density": round(edge_count / before.node_count, 3),
+            "component_count": component_count,
+            "cross_unit_ratio": round(cross_unit / edge_count, 3),
+            "avg_bfs_reach": round(total_reach / root_count, 2) if root_count else 0.0,
+            "dead_end_ratio": round(dead_end_count / before.node_count, 3),
+            "orphan_count": orphan_count,
+            "bottleneck_nodes": bottlenecks,
+        })
+        after_score = GraphAnalysisEngine.compute_health_score(after)
+
+        return SuggestionImpact(
+            bfs_reach_delta=round(after.avg_bfs_reach - before.avg_bfs_reach, 2),
+            component_count_delta=after.component_count - before.component_count,
+            cross_unit_ratio_delta=round(after.cross_unit_ratio - before.cross_unit_ratio, 3),
+            health_score_delta=round(after_score - self.before_score, 1),
+        )
+
+    def _reach_gain(self, s: str, t: str) -> int:
+        """Nodes newly within the reach horizon of some root via s -> t.
+
+        A shortest path uses the new edge at most once, so a root r reaches v
+        in ``dist(r, s) + 1 + dist(t, v)`` hops through it, with both
+        distances taken in the baseline graph.
+        """
+        via = [(r, d) for r, d in self.reached_by.get(s, ()) if d < _REACH_HOPS]
+        if not via:
+            return 0
+        from_t = self._hop_distances(t, _REACH_HOPS - 1 - min(d for _, d in via))
+        gain = 0
+        for r, d in via:
+            budget = _REACH_HOPS - 1 - d
+            reached = self.root_dist[r]
+            gain += sum(
+                1 for v, dv in from_t.items()
+                if dv <= budget and v != r and v not in reached
+            )
+        return gain
+
+    # ------------------------------------------------------------------ #
+    #  Validation
+    # ------------------------------------------------------------------ #
+
+    def validate(self, new_edge: Dict) -> Tuple[bool, List[str]]:
+        """Same verdict and warnings as GraphAnalysisEngine.validate_edge."""
+        warnings: List[str] = []
+        s, t = new_edge.get("source"), new_edge.get("target")
+
+        if s not in self.node_ids:
+            return False, [f"Source {s} not found in graph"]
+        if t not in self.node_ids:
+            return False, [f"Target {t} not found in graph"]
+        if s == t:
+            return False, ["Self-loop: source and target are the same node"]
+
+        if new_edge.get("is_prerequisite", False):
+            # A path back from t to s closes a cycle; the new edge itself
+            # cannot shorten that path, so baseline reachability decides.
+            if s in self._prereq_reachable(t):
+                return False, ["Prerequisite cycle detected"]
+            if t in self._prereq_reachable(s):
+                warnings.append("Transitively redundant: target already reachable from source via existing prerequisites")
+
+        relationship = new_edge.get("relationship")
+        existing = self.pairs.get((s, t), [])
+        if relationship in existing:
+            return False, [f"Duplicate edge: {s} -> {t} ({relationship}) already exists"]
+        for rel in existing:
+            warnings.append(f"Edge already exists with relationship '{rel}'; adding '{relationship}' creates a multi-edge")
+
+        return True, warnings
+
+    def _prereq_reachable(self, start: str) -> Set[str]:
+        """Nodes reachable from ``start`` over baseline prerequisite edges
+        (including ``start`` itself), memoized per start node."""
+        cached = self._prereq_reach.get(start)
+        if cached is None:
+            cached = {start}
+            queue = deque([start])
+            while queue:
+                for child in self.prereq_forward.get(queue.popleft(), []):
+                    if child not in cached:
+                        cached.add(child)
+                        queue.append(child)
+            self._prereq_reach[start] = cached
+        return cached
+
+    # ------------------------------------------------------------------ #
+    #  Private helpers
+    # ------------------------------------------------------------------ #
+
+    def _find(self, x: str) -> str:
+        parent = self._parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def _is_cross_unit(self, s: str, t: str) -> bool:
+        su, tu = self.node_unit.get(s, ""), self.node_unit.get(t, "")
+        return bool(su and tu and su != tu)
+
+    def _hop_distances(self, start: str, max_hops: int) -> Dict[str, int]:
+        """Shortest hop count from ``start`` to every node within
+        ``max_hops`` over all baseline edges (``start`` maps to 0)."""
+        dist = {start: 0}
+        queue = deque([start])
+        while queue:
+            nid = queue.popleft()
+            d = dist[nid]
+            if d >= max_hops:
+                continue
+            for child in self.forward.get(nid, []):
+                if child not in dist:
+                    dist[child] = d + 1
+                    queue.append(child)
+        return dist
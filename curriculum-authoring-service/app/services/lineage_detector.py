@@ -6,13 +6,20 @@ rename, merge, split, and retire operations.  Heuristic-based with
 author annotation override support.
 
 Called from draft_curriculum_service.publish() before deploying.
+
+Only pairs scoring at least RENAME_SIMILARITY_THRESHOLD can become a rename,
+so the exact similarity is computed only for pairs whose LCS upper bound
+clears it (see _shortlist_similarities). The bound never drops a qualifying
+pair, so bulk restructures produce the same records as scoring every pair.
 """
 
 from __future__ import annotations
 
 import logging
 from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +70,10 @@ def detect_changes(
         skill = new_index[aid].get("skill_id", "")
         added_by_skill.setdefault(skill, []).append(aid)
 
+    # Similarity of every (removed, added) pair that clears the rename
+    # threshold; no other pair can ever be matched.
+    shortlist = _shortlist_similarities(removed, added, old_index, new_index)
+
     # Track which removed/added IDs we've matched
     matched_removed = set()
     matched_added = set()
@@ -74,7 +85,7 @@ def detect_changes(
             continue
 
         # Try to match by description similarity
-        pairs = _find_best_matches(r_ids, a_ids, old_index, new_index)
+        pairs = _find_best_matches(r_ids, a_ids, shortlist)
         for old_id, new_id, sim in pairs:
             if sim >= RENAME_SIMILARITY_THRESHOLD:
                 records.append(_make_record(
@@ -141,7 +152,7 @@ def detect_changes(
         if old_id in matched_removed:
             continue
         # Check if there are any unmatched added IDs in ANY skill with high similarity
-        best_match, best_sim = _find_cross_skill_match(old_id, added - matched_added, old_index, new_index)
+        best_match, best_sim = _find_cross_skill_match(old_id, matched_added, shortlist)
         if best_match and best_sim >= RENAME_SIMILARITY_THRESHOLD:
             records.append(_make_record(
                 old_id=old_id,
@@ -178,21 +189,26 @@ def detect_changes(
 def _find_best_matches(
     removed_ids: List[str],
     added_ids: List[str],
-    old_index: Dict[str, Any],
-    new_index: Dict[str, Any],
+    shortlist: Dict[str, Dict[str, float]],
 ) -> List[Tuple[str, str, float]]:
-    """Find the best 1:1 matches between removed and added IDs by description similarity."""
+    """Find the best 1:1 matches between removed and added IDs by description similarity.
+
+    Only shortlisted pairs are considered: a pair below the rename threshold
+    sorts after every pair above it, so it can never displace one from the
+    greedy matching and is dropped by the caller anyway.
+    """
     if not removed_ids or not added_ids:
         return []
 
-    # Compute all pairwise similarities
     pairs = []
     for rid in removed_ids:
-        old_desc = old_index[rid].get("subskill_description", "")
+        candidates = shortlist.get(rid)
+        if not candidates:
+            continue
         for aid in added_ids:
-            new_desc = new_index[aid].get("subskill_description", "")
-            sim = _similarity(old_desc, new_desc)
-            pairs.append((rid, aid, sim))
+            sim = candidates.get(aid)
+            if sim is not None:
+                pairs.append((rid, aid, sim))
 
     # Greedy 1:1 matching (highest similarity first)
     pairs.sort(key=lambda x: x[2], reverse=True)
@@ -211,23 +227,97 @@ def _find_best_matches(
 
 def _find_cross_skill_match(
     old_id: str,
-    candidate_adds: set,
-    old_index: Dict[str, Any],
-    new_index: Dict[str, Any],
+    matched_adds: set,
+    shortlist: Dict[str, Dict[str, float]],
 ) -> Tuple[Optional[str], float]:
-    """Find the best description match for old_id across all unmatched added IDs."""
-    old_desc = old_index[old_id].get("subskill_description", "")
+    """Find the best shortlisted description match for old_id among added IDs
+    not yet matched. Equal similarities resolve to the smallest ID."""
     best_id = None
     best_sim = 0.0
-    for aid in candidate_adds:
-        new_desc = new_index[aid].get("subskill_description", "")
-        sim = _similarity(old_desc, new_desc)
-        if sim > best_sim:
+    for aid, sim in shortlist.get(old_id, {}).items():
+        if aid in matched_adds:
+            continue
+        if sim > best_sim or (sim == best_sim and best_id is not None and aid < best_id):
             best_sim = sim
             best_id = aid
     return best_id, best_sim
 
 
+class _PackedLCS:
+    """LCS length of one string against many, bit-parallel (Hyyrö 2004).
+
+    The ``targets`` are laid side by side in one integer, each followed by a
+    zero guard bit that absorbs the carry out of its segment, so a single
+    pass over the query string updates every target's bit vector at once.
+    """
+
+    def __init__(self, targets: List[str]):
+        self.lengths = np.array([len(t) for t in targets], dtype=np.int64)
+        self.offsets = np.zeros(len(targets), dtype=np.int64)
+        self.masks: Dict[str, int] = {}
+        self.data = 0
+        pos = 0
+        for i, text in enumerate(targets):
+            self.offsets[i] = pos
+            for j, ch in enumerate(text):
+                self.masks[ch] = self.masks.get(ch, 0) | (1 << (pos + j))
+            self.data |= ((1 << len(text)) - 1) << pos
+            pos += len(text) + 1
+        self.nbytes = (pos + 7) // 8
+
+    def lcs_lengths(self, query: str) -> np.ndarray:
+        v = self.data
+        for ch in query:
+            u = v & self.masks.get(ch, 0)
+            v = ((v + u) | (v - u)) & self.data
+        bits = np.unpackbits(
+            np.frombuffer(v.to_bytes(self.nbytes, "little"), dtype=np.uint8),
+            bitorder="little",
+        )
+        # Each remaining set bit is a target position left unmatched.
+        return self.lengths - np.add.reduceat(bits, self.offsets)
+
+
+def _shortlist_similarities(
+    removed: Iterable[str],
+    added: Iterable[str],
+    old_index: Dict[str, Any],
+    new_index: Dict[str, Any],
+    threshold: float = RENAME_SIMILARITY_THRESHOLD,
+) -> Dict[str, Dict[str, float]]:
+    """Similarity of every (removed, added) pair scoring >= threshold.
+
+    SequenceMatcher's matching blocks form a common subsequence, so
+    ratio() <= 2 * LCS / (len(a) + len(b)). The LCS of each added
+    description against all removed ones comes from one bit-parallel sweep;
+    only pairs whose bound clears the threshold are scored exactly.
+    """
+    old_ids, old_descs = [], []
+    for rid in sorted(removed):
+        desc = old_index[rid].get("subskill_description", "")
+        if desc:
+            old_ids.append(rid)
+            old_descs.append(desc.lower())
+    if not old_ids:
+        return {}
+
+    packed = _PackedLCS(old_descs)
+    shortlist: Dict[str, Dict[str, float]] = {}
+    for aid in sorted(added):
+        new_desc = new_index[aid].get("subskill_description", "")
+        if not new_desc:
+            continue
+        new_desc = new_desc.lower()
+        totals = packed.lengths + len(new_desc)
+        # Small slack so float rounding at the boundary never drops a pair.
+        bound_ok = 2 * packed.lcs_lengths(new_desc) >= threshold * totals - 1e-9
+        for i in np.flatnonzero(bound_ok):
+            sim = _similarity(old_descs[i], new_desc)
+            if sim >= threshold:
+                shortlist.setdefault(old_ids[i], {})[aid] = sim
+    return shortlist
+
+
 def _make_record(
     old_id: str,
     canonical_id: Optional[str],
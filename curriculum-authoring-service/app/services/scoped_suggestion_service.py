@@ -112,21 +112,23 @@ class ScopedSuggestionService:
         """
         start = time.monotonic()
 
-        # 1. Load scoped nodes (subject_id passed for O(1) lookup)
-        source_nodes = await self._load_scoped_nodes(
-            request.grade,
-            request.subject_id,
-            request.scope.skill_ids,
-            request.scope.subskill_ids,
-        )
+        # 1. Load scoped nodes (subject_id passed for O(1) lookup). One
+        #    subject-doc read per subject, however many skills are scoped.
+        with firestore_reader.subject_doc_scope():
+            source_nodes = await self._load_scoped_nodes(
+                request.grade,
+                request.subject_id,
+                request.scope.skill_ids,
+                request.scope.subskill_ids,
+            )
 
-        # Load cross-grade nodes if requested
-        cross_grade_nodes: List[Dict] = []
-        if request.scope.cross_grade_subject_ids:
-            for sid in request.scope.cross_grade_subject_ids:
-                if sid != request.subject_id:
-                    cg_nodes = await self._load_subject_nodes(request.grade, sid)
-                    cross_grade_nodes.extend(cg_nodes)
+            # Load cross-grade nodes if requested
+            cross_grade_nodes: List[Dict] = []
+            if request.scope.cross_grade_subject_ids:
+                for sid in request.scope.cross_grade_subject_ids:
+                    if sid != request.subject_id:
+                        cg_nodes = await self._load_subject_nodes(request.grade, sid)
+                        cross_grade_nodes.extend(cg_nodes)
 
         all_nodes = source_nodes + cross_grade_nodes
 
@@ -186,12 +188,13 @@ class ScopedSuggestionService:
         start = time.monotonic()
 
         # Load both skills' subskill trees (subject_id for O(1) lookups)
-        source_nodes = await self._load_skill_subskills(
-            request.source_grade, request.source_subject_id, request.source_skill_id
-        )
-        target_nodes = await self._load_skill_subskills(
-            request.target_grade, request.target_subject_id, request.target_skill_id
-        )
+        with firestore_reader.subject_doc_scope():
+            source_nodes = await self._load_skill_subskills(
+                request.source_grade, request.source_subject_id, request.source_skill_id
+            )
+            target_nodes = await self._load_skill_subskills(
+                request.target_grade, request.target_subject_id, request.target_skill_id
+            )
 
         if not source_nodes or not target_nodes:
             return ConnectSkillsResponse(
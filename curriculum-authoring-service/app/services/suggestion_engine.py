@@ -13,12 +13,19 @@ and gemini-flash-latest for LLM refinement.
 
 Checkpointing: Each phase saves results to Firestore so the pipeline can
 resume from the last completed phase if something fails mid-run.
+
+Embeddings are cached in-process by content hash of the embedded text, so a
+re-run on an unchanged (or lightly edited) subject only embeds the nodes
+whose text changed. Similarity stages are matrix products with vectorized
+thresholding and top-k selection.
 """
 
+import hashlib
 import json
 import logging
+import threading
 import uuid
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -38,6 +45,73 @@ LLM_MODEL = "gemini-flash-latest"
 LLM_MODEL_LITE = "gemini-3.1-flash-lite-preview"
 
 
+class EmbeddingCache:
+    """Bounded LRU of embedding vectors keyed by hash(model, text)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vec = self._entries.get(key)
+            if vec is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vec
+
+    def put(self, key: str, vec: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = vec
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide embedding cache shared by every SuggestionEngine."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(settings.EMBEDDING_CACHE_MAX_ENTRIES)
+    return _embedding_cache
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _ranked(sims: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """Positions of ``sims`` by descending similarity, ties in position order
+    (what a stable sort of the row-major pair list gives). With ``k`` only
+    the best k are returned, selected with argpartition."""
+    if k is not None and k <= 0:
+        return np.arange(0)
+    if k is not None and k < len(sims):
+        kth = np.partition(sims, len(sims) - k)[len(sims) - k]
+        # Keep every tie with the k-th value so position order decides.
+        candidates = np.flatnonzero(sims >= kth)
+    else:
+        candidates = np.arange(len(sims))
+    order = candidates[np.lexsort((candidates, -sims[candidates]))]
+    return order[:k] if k is not None else order
+
+
 class PipelineCheckpoint:
     """Firestore-backed checkpoint storage for suggestion pipeline phases.
 
@@ -62,7 +136,6 @@ class PipelineCheckpoint:
         """Quick fingerprint so we invalidate checkpoints when the graph changes."""
         node_ids = sorted(n.get("id", "") for n in nodes)
         edge_keys = sorted(f"{e.get('source','')}->{e.get('target','')}" for e in edges)
-        import hashlib
         h = hashlib.md5(
             f"{len(node_ids)}:{','.join(node_ids[:10])}|{len(edge_keys)}".encode()
         ).hexdigest()[:12]
@@ -372,26 +445,23 @@ class SuggestionEngine:
             return []
 
         # Cosine similarity matrix
-        emb_array = np.array(embeddings)
-        norms = np.linalg.norm(emb_array, axis=1, keepdims=True)
-        norms = np.where(norms == 0, 1, norms)
-        normalized = emb_array / norms
+        normalized = _normalize_rows(np.asarray(embeddings, dtype=np.float64))
         sim_matrix = normalized @ normalized.T
 
-        # Collect pairs above threshold (skip same-unit for now — we want cross-unit)
-        pairs: List[Tuple[Dict, Dict, float]] = []
-        for i in range(len(skill_nodes)):
-            for j in range(i + 1, len(skill_nodes)):
-                sim = float(sim_matrix[i, j])
-                is_cross_unit = (
-                    skill_nodes[i].get("unit_id") != skill_nodes[j].get("unit_id")
-                )
-                # Lower threshold for cross-unit (more valuable)
-                threshold = similarity_threshold - 0.05 if is_cross_unit else similarity_threshold
-                if sim >= threshold:
-                    pairs.append((skill_nodes[i], skill_nodes[j], sim))
-
-        pairs.sort(key=lambda p: -p[2])
+        # Pairs above threshold over the upper triangle; cross-unit pairs get
+        # a lower threshold (more valuable).
+        unit_codes: Dict[Any, int] = {}
+        units = np.array([unit_codes.setdefault(s.get("unit_id"), len(unit_codes)) for s in skill_nodes])
+        rows, cols = np.triu_indices(len(skill_nodes), k=1)
+        sims = sim_matrix[rows, cols]
+        thresholds = np.where(
+            units[rows] != units[cols], similarity_threshold - 0.05, similarity_threshold
+        )
+        keep = np.flatnonzero(sims >= thresholds)
+        keep = keep[_ranked(sims[keep])]
+        pairs: List[Tuple[Dict, Dict, float]] = [
+            (skill_nodes[rows[p]], skill_nodes[cols[p]], float(sims[p])) for p in keep
+        ]
 
         logger.info(
             f"Phase 1: {len(pairs)} skill pairs above threshold "
@@ -563,14 +633,15 @@ Accept if there is a real pedagogical connection (shared concepts, progressive d
             logger.error(f"Phase 3 embedding failed: {e}")
             return []
 
-        # Build embedding lookup
-        emb_map: Dict[str, np.ndarray] = {}
-        for ss_id, emb in zip(ss_ids, embeddings):
-            vec = np.array(emb)
-            norm = np.linalg.norm(vec)
-            emb_map[ss_id] = vec / norm if norm > 0 else vec
+        # One similarity matrix over every embedded subskill; each skill pair
+        # reads its block from it.
+        normalized = _normalize_rows(np.asarray(embeddings, dtype=np.float64))
+        sim_matrix = normalized @ normalized.T
+        position = {ss_id: i for i, ss_id in enumerate(ss_ids)}
+        existing_by_source: Dict[str, set] = defaultdict(set)
+        for a, b in existing_pairs:
+            existing_by_source[a].add(b)
 
-        # For each approved skill pair, compare their subskills
         for skill_a, skill_b, skill_rationale in approved_skill_pairs:
             ss_a = skill_to_subskills.get(skill_a["id"], [])
             ss_b = skill_to_subskills.get(skill_b["id"], [])
@@ -578,23 +649,23 @@ Accept if there is a real pedagogical connection (shared concepts, progressive d
             if not ss_a or not ss_b:
                 continue
 
-            # Pairwise similarity
-            pair_scores: List[Tuple[Dict, Dict, float]] = []
-            for sa in ss_a:
-                for sb in ss_b:
-                    if (sa["id"], sb["id"]) in existing_pairs:
-                        continue
-                    ea = emb_map.get(sa["id"])
-                    eb = emb_map.get(sb["id"])
-                    if ea is None or eb is None:
-                        continue
-                    sim = float(np.dot(ea, eb))
-                    if sim >= similarity_threshold:
-                        pair_scores.append((sa, sb, sim))
+            block = sim_matrix[np.ix_(
+                [position[sa["id"]] for sa in ss_a],
+                [position[sb["id"]] for sb in ss_b],
+            )].copy()
+            col_of = {sb["id"]: j for j, sb in enumerate(ss_b)}
+            for i, sa in enumerate(ss_a):
+                for target in existing_by_source.get(sa["id"], ()):
+                    j = col_of.get(target)
+                    if j is not None:
+                        block[i, j] = -np.inf
 
             # Keep top N per skill pair
-            pair_scores.sort(key=lambda p: -p[2])
-            for sa, sb, sim in pair_scores[:max_per_skill_pair]:
+            flat = block.ravel()
+            above = np.flatnonzero(flat >= similarity_threshold)
+            for p in above[_ranked(flat[above], max_per_skill_pair)]:
+                sa, sb = ss_a[p // len(ss_b)], ss_b[p % len(ss_b)]
+                sim = float(flat[p])
                 all_candidates.append({
                     "source_id": sa["id"],
                     "target_id": sb["id"],
@@ -652,7 +723,12 @@ Accept if there is a real pedagogical connection (shared concepts, progressive d
         nodes: List[Dict],
         edges: List[Dict],
     ) -> List[EdgeSuggestion]:
-        """Impact simulation, validation, ranking."""
+        """Impact simulation, validation, ranking.
+
+        The baseline graph is analysed once; each suggestion is scored and
+        validated incrementally against it.
+        """
+        evaluator = self.analysis.impact_evaluator(nodes, edges)
         for suggestion in suggestions:
             proposed_edge = {
                 "source": suggestion.source_entity_id,
@@ -661,7 +737,7 @@ Accept if there is a real pedagogical connection (shared concepts, progressive d
                 "strength": suggestion.strength,
                 "is_prerequisite": suggestion.is_prerequisite,
             }
-            suggestion.impact = self.analysis.compute_impact(nodes, edges, [proposed_edge])
+            suggestion.impact = evaluator.impact(proposed_edge)
 
         valid = []
         for s in suggestions:
@@ -671,7 +747,7 @@ Accept if there is a real pedagogical connection (shared concepts, progressive d
                 "relationship": s.relationship,
                 "is_prerequisite": s.is_prerequisite,
             }
-            is_valid, warnings = self.analysis.validate_edge(nodes, edges, edge_dict)
+            is_valid, warnings = evaluator.validate(edge_dict)
             if is_valid:
                 valid.append(s)
             else:
@@ -729,19 +805,44 @@ Accept if there is a real pedagogical connection (shared concepts, progressive d
             return f"{hierarchy} > \"{label}\"{diff}"
         return f"\"{label}\"{diff}"
 
-    async def _compute_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Compute Gemini embeddings in batches of 100."""
-        results = []
+    async def _compute_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+        """Compute Gemini embeddings in batches of 100.
+
+        Texts already in the embedding cache are not re-sent; repeated texts
+        are embedded once.
+        """
+        cache = get_embedding_cache()
+        keys = [EmbeddingCache.key(EMBEDDING_MODEL, t) for t in texts]
+        vectors: Dict[str, np.ndarray] = {}
+        missing: Dict[str, str] = {}  # key -> text, first occurrence order
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+            vec = cache.get(key)
+            if vec is None:
+                missing[key] = text
+            else:
+                vectors[key] = vec
+
+        pending = list(missing.items())
         batch_size = 100
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
+        for i in range(0, len(pending), batch_size):
+            batch = pending[i:i + batch_size]
             response = self.client.models.embed_content(
                 model=EMBEDDING_MODEL,
-                contents=batch,
+                contents=[text for _, text in batch],
+            )
+            for (key, _), embedding in zip(batch, response.embeddings):
+                vec = np.asarray(embedding.values, dtype=np.float32)
+                cache.put(key, vec)
+                vectors[key] = vec
+
+        if pending:
+            logger.info(
+                f"Embeddings: {len(pending)} computed, "
+                f"{len(texts) - len(pending)} from cache"
             )
-            for embedding in response.embeddings:
-                results.append(embedding.values)
-        return results
+        return [vectors[key] for key in keys]
 
     async def _refine_batch(
         self,
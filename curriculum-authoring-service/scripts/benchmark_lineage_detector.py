@@ -0,0 +1,160 @@
+"""
+Benchmark lineage detection on a synthetic bulk restructure.
+
+Builds a subskill_index of N subskills (default 2,000) spread over skills,
+then republishes it with a mix of edits: reworded descriptions in place,
+subskills moved to another skill, merges, splits, retirements and brand-new
+subskills. Times detect_changes() with the LCS-bounded shortlist against
+the all-pairs scoring it replaced, and checks both produce the same records.
+
+Run: python -m scripts.benchmark_lineage_detector [--subskills 2000] [--seed 7]
+"""
+
+import argparse
+import random
+import time
+from difflib import SequenceMatcher
+
+from app.services import lineage_detector
+
+WORDS = (
+    "count compare add subtract numbers objects shapes sort group measure length "
+    "weight time money patterns sounds letters words read write sentences story "
+    "characters setting plants animals weather seasons map community rules share "
+    "identify describe explain draw build model predict observe record tens ones "
+    "place value fractions halves equal parts strategies facts fluently within"
+).split()
+
+
+def _description(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 11))).capitalize()
+
+
+def _reword(rng: random.Random, text: str) -> str:
+    words = text.split()
+    i = rng.randrange(len(words))
+    words[i] = rng.choice(WORDS)
+    return " ".join(words)
+
+
+def build_restructure(n_subskills: int, seed: int):
+    """Return (old_index, new_index) for a synthetic republish."""
+    rng = random.Random(seed)
+    n_skills = max(n_subskills // 8, 1)
+    old_index = {}
+    for i in range(n_subskills):
+        skill = f"SK{i % n_skills:04d}"
+        old_index[f"SS{i:05d}"] = {
+            "subskill_id": f"SS{i:05d}",
+            "skill_id": skill,
+            "subskill_description": _description(rng),
+        }
+
+    new_index = {}
+    next_id = n_subskills
+    ids = list(old_index)
+    rng.shuffle(ids)
+    for n, old_id in enumerate(ids):
+        entry = old_index[old_id]
+        bucket = n % 20
+        if bucket < 12:  # unchanged
+            new_index[old_id] = dict(entry)
+            continue
+        new_id = f"SS{next_id:05d}"
+        next_id += 1
+        if bucket < 15:  # reworded in place
+            new_index[new_id] = {**entry, "subskill_id": new_id,
+                                 "subskill_description": _reword(rng, entry["subskill_description"])}
+        elif bucket < 17:  # moved to another skill
+            new_index[new_id] = {**entry, "subskill_id": new_id,
+                                 "skill_id": f"SK{rng.randrange(n_skills):04d}",
+                                 "subskill_description": _reword(rng, entry["subskill_description"])}
+        elif bucket == 17:  # split into two
+            for _ in range(2):
+                new_index[new_id] = {**entry, "subskill_id": new_id, "subskill_description": _description(rng)}
+                new_id = f"SS{next_id:05d}"
+                next_id += 1
+        # buckets 18-19: retired (or merged, when a skill loses several)
+
+    for _ in range(n_subskills // 20):  # brand-new subskills
+        new_id = f"SS{next_id:05d}"
+        next_id += 1
+        new_index[new_id] = {"subskill_id": new_id, "skill_id": f"SK{rng.randrange(n_skills):04d}",
+                             "subskill_description": _description(rng)}
+    return old_index, new_index
+
+
+def _all_pairs_shortlist(removed, added, old_index, new_index, threshold=lineage_detector.RENAME_SIMILARITY_THRESHOLD):
+    """Score every (removed, added) pair — the pre-index behaviour."""
+    shortlist = {}
+    for rid in removed:
+        old_desc = old_index[rid].get("subskill_description", "")
+        matches = {}
+        for aid in added:
+            sim = lineage_detector._similarity(old_desc, new_index[aid].get("subskill_description", ""))
+            if sim >= threshold:
+                matches[aid] = sim
+        if matches:
+            shortlist[rid] = matches
+    return shortlist
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark lineage detection on a synthetic restructure",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--subskills", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip-baseline", action="store_true",
+                        help="Only time the indexed matcher")
+    args = parser.parse_args()
+
+    old_index, new_index = build_restructure(args.subskills, args.seed)
+    removed = set(old_index) - set(new_index)
+    added = set(new_index) - set(old_index)
+    print(f"{len(old_index)} subskills: {len(removed)} removed, {len(added)} added "
+          f"({len(removed) * len(added):,} candidate pairs)")
+
+    calls = {"n": 0}
+    real_ratio = SequenceMatcher.ratio
+
+    def counting_ratio(self):
+        calls["n"] += 1
+        return real_ratio(self)
+
+    SequenceMatcher.ratio = counting_ratio
+    try:
+        started = time.perf_counter()
+        records = lineage_detector.detect_changes(old_index, new_index, "BENCH", "1")
+        indexed_s = time.perf_counter() - started
+        indexed_calls = calls["n"]
+
+        ops = {}
+        for r in records:
+            ops[r["operation"]] = ops.get(r["operation"], 0) + 1
+        print(f"bounded:   {indexed_s:8.3f}s  {indexed_calls:>10,} ratio() calls  {ops}")
+
+        if args.skip_baseline:
+            return
+
+        calls["n"] = 0
+        indexed = lineage_detector._shortlist_similarities
+        lineage_detector._shortlist_similarities = _all_pairs_shortlist
+        try:
+            started = time.perf_counter()
+            baseline = lineage_detector.detect_changes(old_index, new_index, "BENCH", "1")
+            baseline_s = time.perf_counter() - started
+        finally:
+            lineage_detector._shortlist_similarities = indexed
+        print(f"all pairs: {baseline_s:8.3f}s  {calls['n']:>10,} ratio() calls")
+    finally:
+        SequenceMatcher.ratio = real_ratio
+
+    key = lambda r: (r["old_id"], r["operation"], tuple(r["canonical_ids"]))
+    same = sorted(map(key, records)) == sorted(map(key, baseline))
+    print(f"speedup: {baseline_s / indexed_s:.1f}x  identical records: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Parity tests for ImpactEvaluator — the incremental impact/validation path the
+suggestion engine ranks candidates with must agree with the full
+GraphAnalysisEngine.compute_impact / validate_edge on every proposed edge.
+Graphs are seeded random curricula (multiple units, prerequisite and
+non-prerequisite edges, dangling endpoints, duplicates and cycles).
+
+Run:
+  python -m pytest tests/test_impact_evaluator.py -q
+"""
+
+import random
+
+import pytest
+
+from app.services.graph_analysis import GraphAnalysisEngine
+
+RELATIONSHIPS = ["prerequisite", "builds_on", "reinforces", "parallel"]
+
+
+def _graph(seed, n_nodes=40, n_edges=55):
+    rng = random.Random(seed)
+    nodes = [
+        {"id": f"U{i % 4}-{i}", "type": "subskill", "unit_id": f"U{i % 4}"}
+        for i in range(n_nodes)
+    ]
+    ids = [n["id"] for n in nodes]
+    edges = []
+    for _ in range(n_edges):
+        a, b = rng.sample(ids, 2)
+        if rng.random() < 0.7:
+            # Mostly forward prerequisites so the prereq graph stays near-DAG.
+            a, b = sorted((a, b), key=ids.index)
+        edges.append({
+            "source": a,
+            "target": b,
+            "relationship": rng.choice(RELATIONSHIPS),
+            "is_prerequisite": rng.random() < 0.6,
+        })
+    # An edge to a node outside the graph still counts toward reach.
+    edges.append({"source": ids[0], "target": "GHOST", "relationship": "builds_on", "is_prerequisite": False})
+    return nodes, edges, ids
+
+
+def _proposals(seed, ids, edges, n=120):
+    rng = random.Random(seed + 1000)
+    proposals = [
+        {
+            "source": rng.choice(ids),
+            "target": rng.choice(ids),
+            "relationship": rng.choice(RELATIONSHIPS),
+            "is_prerequisite": rng.random() < 0.5,
+        }
+        for _ in range(n)
+    ]
+    # Exact duplicates, reversed prerequisites (cycles), self-loops, unknowns.
+    proposals += [dict(e) for e in edges[:5]]
+    proposals += [
+        {"source": e["target"], "target": e["source"], "relationship": "prerequisite", "is_prerequisite": True}
+        for e in edges[:10]
+    ]
+    proposals += [
+        {"source": ids[3], "target": ids[3], "relationship": "builds_on", "is_prerequisite": True},
+        {"source": "GHOST", "target": ids[1], "relationship": "builds_on", "is_prerequisite": True},
+    ]
+    return proposals
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_incremental_impact_matches_full_recompute(seed):
+    nodes, edges, ids = _graph(seed)
+    evaluator = GraphAnalysisEngine.impact_evaluator(nodes, edges)
+
+    for edge in _proposals(seed, ids, edges):
+        expected = GraphAnalysisEngine.compute_impact(nodes, edges, [edge])
+        assert evaluator.impact(edge) == expected, edge
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_incremental_validation_matches_full_traversal(seed):
+    nodes, edges, ids = _graph(seed)
+    evaluator = GraphAnalysisEngine.impact_evaluator(nodes, edges)
+
+    verdicts = set()
+    for edge in _proposals(seed, ids, edges):
+        expected = GraphAnalysisEngine.validate_edge(nodes, edges, edge)
+        assert evaluator.validate(edge) == expected, edge
+        verdicts.add(expected[1][0].split(":")[0] if expected[1] else expected[0])
+    assert "Duplicate edge" in verdicts
+
+
+def test_sparse_graph_reach_and_component_merge():
+    nodes = [{"id": n, "unit_id": u} for n, u in [("a", "U1"), ("b", "U1"), ("c", "U2"), ("d", "U2")]]
+    edges = [{"source": "a", "target": "b", "is_prerequisite": True}]
+    evaluator = GraphAnalysisEngine.impact_evaluator(nodes, edges)
+
+    bridge = {"source": "b", "target": "c", "is_prerequisite": True}
+    impact = evaluator.impact(bridge)
+    assert impact.component_count_delta == -1
+    assert impact == GraphAnalysisEngine.compute_impact(nodes, edges, [bridge])
+
+
+def test_empty_graph():
+    evaluator = GraphAnalysisEngine.impact_evaluator([], [])
+    edge = {"source": "a", "target": "b"}
+    assert evaluator.impact(edge) == GraphAnalysisEngine.compute_impact([], [], [edge])
+    assert evaluator.validate(edge) == GraphAnalysisEngine.validate_edge([], [], edge)
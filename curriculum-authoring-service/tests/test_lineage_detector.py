@@ -0,0 +1,140 @@
+"""
+Tests for publish-time lineage detection (app/services/lineage_detector.py).
+
+The rename matcher only scores (removed, added) pairs whose bit-parallel LCS
+bound can clear RENAME_SIMILARITY_THRESHOLD. These tests pin the detected
+operations on small hand-built republishes and check that the shortlist —
+and therefore every record — matches scoring all pairs on a seeded
+restructure. The 2,000-subskill timing lives in
+scripts/benchmark_lineage_detector.py.
+
+Run:
+  python -m pytest tests/test_lineage_detector.py -q
+"""
+
+import random
+
+import pytest
+
+from app.services import lineage_detector
+from app.services.lineage_detector import detect_changes
+
+
+def _entry(ss_id, skill_id, description):
+    return {"subskill_id": ss_id, "skill_id": skill_id, "subskill_description": description}
+
+
+def _ops(records):
+    # Split targets follow set iteration order, so compare them unordered.
+    return sorted((r["old_id"], r["operation"], tuple(sorted(r["canonical_ids"]))) for r in records)
+
+
+def _all_pairs(removed, added, old_index, new_index, threshold=lineage_detector.RENAME_SIMILARITY_THRESHOLD):
+    shortlist = {}
+    for rid in removed:
+        for aid in added:
+            sim = lineage_detector._similarity(
+                old_index[rid].get("subskill_description", ""),
+                new_index[aid].get("subskill_description", ""),
+            )
+            if sim >= threshold:
+                shortlist.setdefault(rid, {})[aid] = sim
+    return shortlist
+
+
+def _restructure(seed, n=180):
+    rng = random.Random(seed)
+    words = ("count compare add subtract shapes sort measure length patterns letters "
+             "read write story plants animals weather map tens ones halves equal").split()
+
+    def describe():
+        return " ".join(rng.choice(words) for _ in range(rng.randint(4, 9)))
+
+    old_index = {f"S{i:04d}": _entry(f"S{i:04d}", f"K{i % 30}", describe()) for i in range(n)}
+    new_index = {}
+    for i, (old_id, entry) in enumerate(old_index.items()):
+        if i % 3:
+            new_index[old_id] = entry
+            continue
+        words_ = entry["subskill_description"].split()
+        words_[rng.randrange(len(words_))] = rng.choice(words)
+        skill = entry["skill_id"] if i % 2 else f"K{rng.randrange(30)}"
+        new_index[f"N{i:04d}"] = _entry(f"N{i:04d}", skill, " ".join(words_) if i % 5 else describe())
+    new_index["N9999"] = _entry("N9999", "K0", "")
+    return old_index, new_index
+
+
+def test_rename_merge_split_and_retire():
+    old_index = {
+        "A1": _entry("A1", "SK1", "Count objects to 10"),
+        "B1": _entry("B1", "SK2", "Add within 5"),
+        "B2": _entry("B2", "SK2", "Take away from a group"),
+        "C1": _entry("C1", "SK3", "Compare lengths"),
+        "D1": _entry("D1", "SK4", "Name the days of the week"),
+        "E1": _entry("E1", "SK5", "Identify coins by value"),
+    }
+    new_index = {
+        "A2": _entry("A2", "SK1", "Count objects to 20"),
+        "B3": _entry("B3", "SK2", "Solve joining and separating problems"),
+        "C2": _entry("C2", "SK3", "Line up two objects to see which is longer"),
+        "C3": _entry("C3", "SK3", "Order three objects by height"),
+        "E2": _entry("E2", "SK9", "Identify coins by their value"),
+    }
+
+    records = detect_changes(old_index, new_index, subject_id="MATHEMATICS", grade="K")
+
+    assert _ops(records) == [
+        ("A1", "rename", ("A2",)),
+        ("B1", "merge", ("B3",)),
+        ("B2", "merge", ("B3",)),
+        ("C1", "split", ("C2", "C3")),
+        ("D1", "retire", ()),
+        ("E1", "rename", ("E2",)),
+    ]
+    cross = next(r for r in records if r["old_id"] == "E1")
+    assert cross["canonical_skill_id"] == "SK9"
+    assert cross["description"].startswith("Cross-skill rename")
+
+
+def test_cross_skill_tie_resolves_to_smallest_id():
+    old_index = {"A1": _entry("A1", "SK1", "Count to 10")}
+    new_index = {
+        "Z9": _entry("Z9", "SK2", "Count to 10"),
+        "M5": _entry("M5", "SK3", "Count to 10"),
+    }
+    records = detect_changes(old_index, new_index)
+    assert _ops(records) == [("A1", "rename", ("M5",))]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_shortlist_matches_all_pairs_scoring(seed, monkeypatch):
+    old_index, new_index = _restructure(seed)
+    removed = set(old_index) - set(new_index)
+    added = set(new_index) - set(old_index)
+
+    expected = _all_pairs(removed, added, old_index, new_index)
+    assert lineage_detector._shortlist_similarities(removed, added, old_index, new_index) == expected
+    assert sum(len(m) for m in expected.values()) > len(removed) // 2
+
+    records = detect_changes(old_index, new_index)
+    monkeypatch.setattr(lineage_detector, "_shortlist_similarities", _all_pairs)
+    assert _ops(records) == _ops(detect_changes(old_index, new_index))
+
+
+def test_packed_lcs_matches_dynamic_programming():
+    rng = random.Random(3)
+    targets = ["".join(rng.choice("abcde ") for _ in range(rng.randint(0, 70))) for _ in range(25)]
+    packed = lineage_detector._PackedLCS(targets)
+
+    def lcs(a, b):
+        prev = [0] * (len(b) + 1)
+        for x in a:
+            cur = [0]
+            for j, y in enumerate(b):
+                cur.append(prev[j] + 1 if x == y else max(prev[j + 1], cur[j]))
+            prev = cur
+        return prev[-1]
+
+    for _ in range(10):
+        query = "".join(rng.choice("abcdef ") for _ in range(rng.randint(1, 80)))
+        assert packed.lcs_lengths(query).tolist() == [lcs(t, query) for t in targets]
@@ -0,0 +1,171 @@
+"""
+Tests for the operation-scoped subject doc cache in FirestoreCurriculumReader.
+
+Every accessor (get_skill, get_unit, get_subskill, ...) used to re-read the
+whole subject doc, so one scoped-suggestion request read the same doc several
+times per subskill. Inside ``firestore_reader.subject_doc_scope()`` each
+subject doc is read once; a draft save bumps the subject's write generation so
+the scope re-reads it. The fake client counts document gets, which doubles as
+the reads-per-operation benchmark.
+
+Run:
+  python -m pytest tests/test_subject_doc_scope.py -q
+"""
+
+import asyncio
+
+import pytest
+
+
+def _run(coro):
+    """Drive an async coroutine without depending on pytest-asyncio mode."""
+    return asyncio.run(coro)
+
+
+# --------------------------------------------------------------------------- #
+#  Minimal Firestore document fake (collection/document chains + get/set)
+# --------------------------------------------------------------------------- #
+
+class _FakeSnapshot:
+    def __init__(self, data):
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class _FakeRef:
+    def __init__(self, client, path):
+        self._client = client
+        self._path = path
+
+    def collection(self, name):
+        return _FakeRef(self._client, self._path + (name,))
+
+    def document(self, doc_id):
+        return _FakeRef(self._client, self._path + (doc_id,))
+
+    def get(self):
+        self._client.gets += 1
+        return _FakeSnapshot(self._client.docs.get(self._path))
+
+    def set(self, data, merge=False):
+        self._client.docs[self._path] = data
+
+    def delete(self):
+        self._client.docs.pop(self._path, None)
+
+
+class _FakeClient:
+    def __init__(self):
+        self.docs = {}
+        self.gets = 0
+
+    def collection(self, name):
+        return _FakeRef(self, (name,))
+
+
+def _subject_doc(n_skills=3, n_subskills=4, title="Counting"):
+    curriculum = [{
+        "unit_id": "U1",
+        "unit_title": title,
+        "unit_order": 1,
+        "skills": [
+            {
+                "skill_id": f"S{s}",
+                "skill_description": f"Skill {s}",
+                "skill_order": s,
+                "subskills": [
+                    {"subskill_id": f"S{s}-{c}", "subskill_description": f"Subskill {s}-{c}",
+                     "subskill_order": c}
+                    for c in range(n_subskills)
+                ],
+            }
+            for s in range(n_skills)
+        ],
+    }]
+    index = {
+        ss["subskill_id"]: {**ss, "skill_id": sk["skill_id"], "unit_id": "U1"}
+        for sk in curriculum[0]["skills"] for ss in sk["subskills"]
+    }
+    return {"subject_id": "MATHEMATICS", "grade": "1st Grade", "version_id": "v1",
+            "curriculum": curriculum, "subskill_index": index}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from app.db.firestore_curriculum_service import firestore_curriculum_sync
+
+    fake = _FakeClient()
+    fake.docs[("curriculum_drafts", "1st Grade", "subjects", "MATHEMATICS")] = _subject_doc()
+    monkeypatch.setattr(firestore_curriculum_sync, "client", fake, raising=False)
+    return fake
+
+
+def _service():
+    from app.services.scoped_suggestion_service import ScopedSuggestionService
+    # The loaders only touch firestore_reader; skip the Gemini client.
+    return ScopedSuggestionService.__new__(ScopedSuggestionService)
+
+
+def _load_scoped(subskill_ids, skill_ids=()):
+    return _service()._load_scoped_nodes("1", "MATHEMATICS", list(skill_ids), list(subskill_ids))
+
+
+def test_scoped_load_reads_the_subject_doc_once(client):
+    from app.db.firestore_curriculum_reader import firestore_reader
+
+    subskills = [f"S{s}-{c}" for s in range(3) for c in range(4)]
+
+    unscoped = _run(_load_scoped(subskills, skill_ids=["S0", "S1"]))
+    unscoped_gets = client.gets
+
+    async def scoped():
+        with firestore_reader.subject_doc_scope() as scope:
+            nodes = await _load_scoped(subskills, skill_ids=["S0", "S1"])
+        return nodes, scope
+
+    client.gets = 0
+    nodes, scope = _run(scoped())
+
+    assert nodes == unscoped
+    # Three gets per subskill plus three per skill without the scope: the
+    # grade "1" misses on the short-code bucket before hitting "1st Grade".
+    assert unscoped_gets == 2 * (3 * len(subskills) + 3 * 2)
+    assert client.gets == scope.reads == 2
+    assert scope.stats() == {"reads": 2, "hits": 3 * len(subskills) + 3 * 2 - 1, "subjects": 1}
+
+
+def test_draft_save_invalidates_an_open_scope(client):
+    from app.db.draft_curriculum_service import draft_curriculum
+    from app.db.firestore_curriculum_reader import firestore_reader
+
+    async def main():
+        with firestore_reader.subject_doc_scope() as scope:
+            before = await firestore_reader.get_unit("1", "MATHEMATICS", "U1")
+            await draft_curriculum.save_draft("1", "MATHEMATICS", _subject_doc(title="Place Value"))
+            after = await firestore_reader.get_unit("1", "MATHEMATICS", "U1")
+            again = await firestore_reader.get_unit("K", "MATHEMATICS", "U1")
+        return before, after, again, scope
+
+    before, after, again, scope = _run(main())
+    assert before["unit_title"] == "Counting"
+    assert after["unit_title"] == "Place Value"
+    assert again is None
+    assert scope.stats()["subjects"] == 2
+
+
+def test_nested_scopes_share_the_outer_scope(client):
+    from app.db.firestore_curriculum_reader import firestore_reader
+
+    async def main():
+        with firestore_reader.subject_doc_scope() as outer:
+            await firestore_reader.get_skill("1", "MATHEMATICS", "S0")
+            with firestore_reader.subject_doc_scope() as inner:
+                await firestore_reader.get_subskill("1st Grade", "MATHEMATICS", "S0-1")
+        return outer, inner
+
+    outer, inner = _run(main())
+    assert inner is outer
+    assert outer.stats() == {"reads": 2, "hits": 1, "subjects": 1}
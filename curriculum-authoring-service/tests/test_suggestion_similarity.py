@@ -0,0 +1,169 @@
+"""
+Tests for the suggestion engine's similarity stages and embedding cache.
+
+Phase 1 (skill pairs) and Phase 3 (subskill drill-down) now threshold and
+rank with matrix operations; they must return the same pairs, in the same
+order, as the original pairwise loops (reimplemented here as the reference).
+Embeddings are seeded per text by a fake client, which also counts how many
+texts are sent so the content-hash cache can be checked.
+
+Run:
+  python -m pytest tests/test_suggestion_similarity.py -q
+"""
+
+import asyncio
+import zlib
+from collections import defaultdict
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+_DIM = 16
+
+
+def _run(coro):
+    """Drive an async coroutine without depending on pytest-asyncio mode."""
+    return asyncio.run(coro)
+
+
+def _vector(text):
+    # Texts sharing a unit title land near a shared anchor, so some pairs
+    # clear the thresholds and others do not.
+    anchor = np.random.default_rng(zlib.crc32(text.split(">")[0].encode())).normal(size=_DIM)
+    noise = np.random.default_rng(zlib.crc32(text.encode())).normal(size=_DIM)
+    return (anchor + 0.8 * noise).tolist()
+
+
+class _FakeModels:
+    def __init__(self):
+        self.texts_sent = 0
+
+    def embed_content(self, model, contents):
+        self.texts_sent += len(contents)
+        return SimpleNamespace(embeddings=[SimpleNamespace(values=_vector(t)) for t in contents])
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    from app.services import suggestion_engine as se
+
+    monkeypatch.setattr(se, "_embedding_cache", se.EmbeddingCache(max_entries=10_000))
+    engine = se.SuggestionEngine.__new__(se.SuggestionEngine)
+    engine.client = SimpleNamespace(models=_FakeModels())
+    return engine
+
+
+def _curriculum(n_units=4, n_skills=5, n_subskills=4):
+    skills, subskills = [], []
+    for u in range(n_units):
+        for k in range(n_skills):
+            skill_id = f"U{u}-S{k}"
+            skills.append({"id": skill_id, "type": "skill", "unit_id": f"U{u}",
+                           "unit_title": f"Unit {u % 2}", "label": f"skill {u}.{k}"})
+            for c in range(n_subskills):
+                subskills.append({"id": f"{skill_id}-{c}", "type": "subskill", "skill_id": skill_id,
+                                  "unit_id": f"U{u}", "unit_title": f"Unit {u % 2}",
+                                  "skill_description": f"skill {u}.{k}",
+                                  "label": f"subskill {c}"})
+    skill_to_subskills = defaultdict(list)
+    for ss in subskills:
+        skill_to_subskills[ss["skill_id"]].append(ss)
+    return skills, subskills, skill_to_subskills
+
+
+def _reference_phase1(skill_nodes, embeddings, similarity_threshold=0.70):
+    emb = np.array(embeddings, dtype=np.float64)
+    normalized = emb / np.linalg.norm(emb, axis=1, keepdims=True)
+    sim_matrix = normalized @ normalized.T
+    pairs = []
+    for i in range(len(skill_nodes)):
+        for j in range(i + 1, len(skill_nodes)):
+            sim = float(sim_matrix[i, j])
+            cross = skill_nodes[i].get("unit_id") != skill_nodes[j].get("unit_id")
+            threshold = similarity_threshold - 0.05 if cross else similarity_threshold
+            if sim >= threshold:
+                pairs.append((skill_nodes[i]["id"], skill_nodes[j]["id"], sim))
+    pairs.sort(key=lambda p: -p[2])
+    return pairs
+
+
+def _reference_phase3(approved, skill_to_subskills, existing_pairs, emb_map,
+                      similarity_threshold=0.60, max_per_skill_pair=5):
+    out = []
+    for skill_a, skill_b, _ in approved:
+        scores = []
+        for sa in skill_to_subskills.get(skill_a["id"], []):
+            for sb in skill_to_subskills.get(skill_b["id"], []):
+                if (sa["id"], sb["id"]) in existing_pairs:
+                    continue
+                sim = float(np.dot(emb_map[sa["id"]], emb_map[sb["id"]]))
+                if sim >= similarity_threshold:
+                    scores.append((sa["id"], sb["id"], sim))
+        scores.sort(key=lambda p: -p[2])
+        out.extend(scores[:max_per_skill_pair])
+    return out
+
+
+def test_phase1_matches_pairwise_loop(engine):
+    skills, _, skill_to_subskills = _curriculum()
+    pairs = _run(engine._phase1_skill_embedding(skills, skill_to_subskills))
+
+    texts = [engine._build_skill_embedding_text(s, skill_to_subskills[s["id"]]) for s in skills]
+    expected = _reference_phase1(skills, [_vector(t) for t in texts])
+
+    assert len(expected) > 5
+    assert [(a["id"], b["id"]) for a, b, _ in pairs] == [(a, b) for a, b, _ in expected]
+    np.testing.assert_allclose([s for _, _, s in pairs], [s for _, _, s in expected], atol=1e-5)
+
+
+def test_phase3_matches_pairwise_loop(engine):
+    skills, subskills, skill_to_subskills = _curriculum()
+    by_id = {s["id"]: s for s in skills}
+    approved = [(by_id[a], by_id[b], "r") for a, b in
+                [("U0-S0", "U2-S1"), ("U1-S3", "U3-S3"), ("U0-S4", "U1-S0"), ("U2-S2", "U0-S2")]]
+    existing = {("U0-S0-0", "U2-S1-0"), ("U2-S1-2", "U0-S0-2")}
+    existing |= {(b, a) for a, b in existing}
+
+    candidates = _run(engine._phase3_subskill_drilldown(
+        approved, skill_to_subskills, existing, max_per_skill_pair=3,
+    ))
+
+    emb_map = {}
+    for ss in subskills:
+        vec = np.array(_vector(engine._build_embedding_text(ss)))
+        emb_map[ss["id"]] = vec / np.linalg.norm(vec)
+    expected = _reference_phase3(approved, skill_to_subskills, existing, emb_map, max_per_skill_pair=3)
+
+    assert len(expected) > 3
+    assert [(c["source_id"], c["target_id"]) for c in candidates] == [(a, b) for a, b, _ in expected]
+    assert not {(c["source_id"], c["target_id"]) for c in candidates} & existing
+
+
+def test_rerun_only_embeds_changed_texts(engine):
+    from app.services import suggestion_engine as se
+
+    skills, _, skill_to_subskills = _curriculum()
+    _run(engine._phase1_skill_embedding(skills, skill_to_subskills))
+    first = engine.client.models.texts_sent
+    assert first == len(skills)
+
+    _run(engine._phase1_skill_embedding(skills, skill_to_subskills))
+    assert engine.client.models.texts_sent == first
+
+    skills[0] = {**skills[0], "label": "renamed skill"}
+    _run(engine._phase1_skill_embedding(skills, skill_to_subskills))
+    assert engine.client.models.texts_sent == first + 1
+    assert se.get_embedding_cache().stats()["entries"] == len(skills) + 1
+
+
+def test_cache_evicts_least_recently_used():
+    from app.services.suggestion_engine import EmbeddingCache
+
+    cache = EmbeddingCache(max_entries=2)
+    cache.put("a", np.zeros(2))
+    cache.put("b", np.ones(2))
+    assert cache.get("a") is not None
+    cache.put("c", np.ones(2))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None